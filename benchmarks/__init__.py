@@ -0,0 +1,22 @@
+# =================================================================================
+# PACOTE DE BENCHMARKS (benchmarks)
+#
+# OBJETIVO: Medir, de forma reproduzível, o desempenho da camada de dados e dos
+#           ViewModels em bancos sintéticos de 1 mil, 100 mil e 1 milhão de
+#           linhas, e comparar o resultado com uma linha de base gravada.
+#
+# COMO USAR (na raiz do projeto):
+#   python -m benchmarks                           # escalas 1k e 100k
+#   python -m benchmarks --escalas 1k,100k,1m      # inclui 1 milhão de linhas
+#   python -m benchmarks --comparar benchmarks/baseline.json
+#   python -m benchmarks --escalas 1k --salvar-baseline
+#
+# ESTRUTURA:
+#   - gerador_dados.py: gera o banco sintético (determinístico pela semente);
+#                  também pode ser usado sozinho (python -m benchmarks.gerador_dados).
+#   - cenarios.py: os cenários medidos; roda uma escala por processo.
+#   - __main__.py: executa as escalas, grava o JSON e compara com a base.
+#
+# Cada escala roda num processo separado, com o banco apontado pela variável
+# OFICINA_DB_ARQUIVO: o pool, os caches e o banco da oficina não se misturam.
+# =================================================================================
@@ -0,0 +1,134 @@
+# =================================================================================
+# EXECUTOR DOS BENCHMARKS (python -m benchmarks)
+#
+# OBJETIVO: Rodar os cenários em cada escala (um processo por escala), gravar
+#           o resultado em JSON e compará-lo com uma linha de base.
+#
+# COMPARAÇÃO: um cenário é uma regressão quando a mediana atual passa da
+# mediana da base em mais que `--tolerancia` (padrão 25%) E em mais que
+# `--minimo-ms` (padrão 0,5 ms), para que ruído em medições de microssegundos
+# não dispare alarmes. Com regressões, o processo termina com código 1.
+# =================================================================================
+import argparse
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime
+from typing import Any, Dict, List
+
+from benchmarks.cenarios import ESCALAS, SEMENTE_PADRAO, ambiente
+
+PASTA_BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+RAIZ_PROJETO = os.path.dirname(PASTA_BENCHMARKS)
+BASELINE_PADRAO = os.path.join(PASTA_BENCHMARKS, "baseline.json")
+PASTA_RESULTADOS = os.path.join(PASTA_BENCHMARKS, "resultados")
+
+
+def executar(escalas: List[str], semente: int, reusar: bool, repeticoes: int | None, filtro: str | None) -> Dict[str, Any]:
+    """Roda cada escala num processo filho e junta os resultados."""
+    resultado: Dict[str, Any] = {
+        "gerado_em": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "semente": semente,
+        "ambiente": ambiente(),
+        "escalas": {},
+    }
+    for escala in escalas:
+        print(f"Executando a escala {escala} ({ESCALAS[escala]} linhas)...", file=sys.stderr)
+        comando = [sys.executable, "-m", "benchmarks.cenarios", "--escala", escala, "--semente", str(semente)]
+        if reusar:
+            comando.append("--reusar-dados")
+        if repeticoes:
+            comando += ["--repeticoes", str(repeticoes)]
+        if filtro:
+            comando += ["--filtro", filtro]
+        processo = subprocess.run(comando, cwd=RAIZ_PROJETO, stdout=subprocess.PIPE, text=True)
+        if processo.returncode != 0:
+            raise SystemExit(f"A escala {escala} falhou (código {processo.returncode}).")
+        resultado["escalas"][escala] = json.loads(processo.stdout)
+    return resultado
+
+
+def comparar(atual: Dict[str, Any], base: Dict[str, Any], tolerancia: float, minimo_ms: float) -> List[Dict[str, Any]]:
+    """Compara as medianas com a base. Retorna uma linha por cenário presente nas duas."""
+    linhas = []
+    for escala, dados in atual["escalas"].items():
+        cenarios_base = base.get("escalas", {}).get(escala, {}).get("cenarios", {})
+        for nome, medicao in dados["cenarios"].items():
+            anterior = cenarios_base.get(nome)
+            if not anterior or "mediana_ms" not in medicao or "mediana_ms" not in anterior:
+                continue
+            diferenca = medicao["mediana_ms"] - anterior["mediana_ms"]
+            razao = medicao["mediana_ms"] / anterior["mediana_ms"] if anterior["mediana_ms"] else float("inf")
+            linhas.append({
+                "escala": escala, "cenario": nome,
+                "base_ms": anterior["mediana_ms"], "atual_ms": medicao["mediana_ms"], "razao": round(razao, 3),
+                "regressao": razao > 1 + tolerancia and diferenca > minimo_ms,
+            })
+    return linhas
+
+
+def imprimir_resumo(resultado: Dict[str, Any], comparacao: List[Dict[str, Any]] | None):
+    por_chave = {(c["escala"], c["cenario"]): c for c in comparacao or []}
+    for escala, dados in resultado["escalas"].items():
+        print(f"\n== Escala {escala} ({dados['n']} linhas; preparo {dados['preparo_s']} s) ==")
+        for nome, medicao in dados["cenarios"].items():
+            if "ignorado" in medicao:
+                print(f"  {nome:<52} ignorado: {medicao['ignorado']}")
+                continue
+            linha = f"  {nome:<52} mediana {medicao['mediana_ms']:>10.3f} ms  p95 {medicao['p95_ms']:>10.3f} ms"
+            c = por_chave.get((escala, nome))
+            if c:
+                linha += f"  base {c['base_ms']:>10.3f} ms  x{c['razao']:.2f}{'  <-- REGRESSÃO' if c['regressao'] else ''}"
+            print(linha)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks da camada de dados e dos ViewModels.")
+    parser.add_argument("--escalas", default="1k,100k",
+                        help=f"Escalas separadas por vírgula ({', '.join(ESCALAS)}). Padrão: 1k,100k.")
+    parser.add_argument("--semente", type=int, default=SEMENTE_PADRAO)
+    parser.add_argument("--reusar-dados", action="store_true",
+                        help="Reaproveita os bancos sintéticos já gerados (benchmarks/.dados).")
+    parser.add_argument("--repeticoes", type=int, help="Sobrescreve o número de repetições de todos os cenários.")
+    parser.add_argument("--filtro", help="Executa só os cenários cujo nome contém este texto.")
+    parser.add_argument("--saida", help="Arquivo JSON do resultado (padrão: benchmarks/resultados/<data>.json).")
+    parser.add_argument("--comparar", nargs="?", const=BASELINE_PADRAO, help="Linha de base para comparação.")
+    parser.add_argument("--salvar-baseline", nargs="?", const=BASELINE_PADRAO,
+                        help="Grava o resultado como nova linha de base.")
+    parser.add_argument("--tolerancia", type=float, default=0.25)
+    parser.add_argument("--minimo-ms", type=float, default=0.5)
+    argumentos = parser.parse_args()
+
+    escalas = [e.strip().lower() for e in argumentos.escalas.split(",") if e.strip()]
+    invalidas = [e for e in escalas if e not in ESCALAS]
+    if invalidas:
+        parser.error(f"Escalas desconhecidas: {', '.join(invalidas)}")
+
+    resultado = executar(escalas, argumentos.semente, argumentos.reusar_dados, argumentos.repeticoes, argumentos.filtro)
+
+    comparacao = None
+    if argumentos.comparar:
+        with open(argumentos.comparar, encoding="utf-8") as arquivo:
+            comparacao = comparar(resultado, json.load(arquivo), argumentos.tolerancia, argumentos.minimo_ms)
+        resultado["comparacao"] = {"baseline": argumentos.comparar, "tolerancia": argumentos.tolerancia,
+                                   "minimo_ms": argumentos.minimo_ms, "cenarios": comparacao}
+
+    saida = argumentos.saida or os.path.join(PASTA_RESULTADOS, f"resultado_{datetime.now():%Y%m%d_%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(saida)), exist_ok=True)
+    with open(saida, "w", encoding="utf-8") as arquivo:
+        json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
+    if argumentos.salvar_baseline:
+        with open(argumentos.salvar_baseline, "w", encoding="utf-8") as arquivo:
+            json.dump({k: v for k, v in resultado.items() if k != "comparacao"}, arquivo, ensure_ascii=False, indent=2)
+
+    imprimir_resumo(resultado, comparacao)
+    print(f"\nResultado gravado em {saida}")
+    regressoes = [c for c in comparacao or [] if c["regressao"]]
+    if regressoes:
+        print(f"{len(regressoes)} regressão(ões) em relação a {argumentos.comparar}.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
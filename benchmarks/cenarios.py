@@ -0,0 +1,251 @@
+# =================================================================================
+# MÓDULO DOS CENÁRIOS DE BENCHMARK (cenarios.py)
+#
+# OBJETIVO: Medir as funções mais usadas da camada de dados e dos ViewModels
+#           num banco sintético de uma escala.
+#
+# COMO FUNCIONA:
+#   - Roda como processo filho do `python -m benchmarks` (uma escala por
+#     processo). A variável OFICINA_DB_ARQUIVO é definida ANTES de importar o
+#     pacote `src`, para que o pool use o banco sintético.
+#   - Cada cenário tem uma função `preparar(contexto)` que devolve a chamada a
+#     ser medida. A chamada roda uma vez para aquecer e depois `repeticoes`
+#     vezes; o tempo de cada repetição é guardado.
+#   - O resultado (JSON) é impresso na saída padrão.
+# =================================================================================
+import argparse
+import json
+import logging
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+ESCALAS = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+SEMENTE_PADRAO = 42
+PASTA_BANCOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".dados")
+
+
+class Contexto:
+    """Dados compartilhados pelos cenários de uma escala."""
+
+    def __init__(self, n: int):
+        self.n = n
+        # Posição das chamadas de escrita (cada repetição usa peças diferentes).
+        self.sequencia = 0
+
+    def proximo(self) -> int:
+        self.sequencia += 1
+        return self.sequencia
+
+
+def _cenarios() -> List[Tuple[str, Callable[[Contexto], Optional[Callable[[], Any]]], int]]:
+    """
+    Lista (nome, preparar, repetições). Os imports de `src` ficam aqui porque
+    só podem acontecer depois de OFICINA_DB_ARQUIVO estar definida.
+    """
+    from src.database import queries
+    from src.database.database import get_db_connection
+    from src.viewmodels.paginador_busca import PaginadorBusca
+    from src.viewmodels.selecao_pecas import SelecaoPecas
+
+    def chave_do_meio(tabela: str) -> Tuple[str, int]:
+        with get_db_connection() as conn:
+            linha = conn.execute(
+                f"SELECT nome, id FROM {tabela} ORDER BY nome, id LIMIT 1 OFFSET ?",
+                (conn.execute(f"SELECT COUNT(*) FROM {tabela}").fetchone()[0] // 2,)).fetchone()
+        return linha["nome"], linha["id"]
+
+    def relatorio(nome_funcao: str, *argumentos):
+        # report_service importa fpdf e flet; sem eles o cenário é ignorado.
+        def preparar(ctx: Contexto):
+            try:
+                from src.services import report_service
+            except ImportError as e:
+                raise CenarioIgnorado(f"report_service indisponível: {e}")
+            funcao = getattr(report_service, nome_funcao)
+
+            def executar():
+                with get_db_connection() as conn:
+                    return funcao(conn, *argumentos)
+            return executar
+        return preparar
+
+    def entrada_lote(ctx: Contexto):
+        def executar():
+            inicio = ctx.proximo() * 50 % ctx.n
+            itens = [{"peca_id": (inicio + i) % ctx.n + 1, "quantidade": 5, "valor_custo": 10.0,
+                      "descricao": "benchmark"} for i in range(50)]
+            resultado = queries.registrar_entrada_estoque_lote(itens)
+            assert resultado["sucesso"], resultado
+        return executar
+
+    def ordem_servico(ctx: Contexto):
+        # As OS giram pelas peças 1 a 500; o estoque delas é reforçado antes.
+        reforco = queries.registrar_entrada_estoque_lote(
+            [{"peca_id": peca_id, "quantidade": 1000, "valor_custo": 10.0, "descricao": "benchmark"}
+             for peca_id in range(1, 501)])
+        assert reforco["sucesso"], reforco
+
+        def executar():
+            base = ctx.proximo() * 5 % 500
+            pecas = {base + i + 1: 1 for i in range(5)}
+            cliente_id = base + 1
+            resultado = queries.inserir_ordem_servico(cliente_id, cliente_id, pecas, 500.0, 100.0)
+            assert resultado["os_id"], resultado
+        return executar
+
+    def paginador(ctx: Contexto):
+        def executar():
+            pagina = PaginadorBusca(queries.buscar_pecas_por_termo, lambda p: (p.nome, p.id))
+            pagina.primeira_pagina("")
+            for _ in range(9):
+                pagina.proxima_pagina()
+        return executar
+
+    def selecao(ctx: Contexto):
+        def executar():
+            itens = SelecaoPecas()
+            for i in range(1000):
+                itens.adicionar(i % 200, 1, 10.0)
+            return itens.total_valor
+        return executar
+
+    def pagina_do_meio(ctx: Contexto):
+        apos = chave_do_meio("pecas")
+        return lambda: queries.buscar_pecas_por_termo("", limite=50, apos=apos)
+
+    def obter_pecas_frio(ctx: Contexto):
+        def executar():
+            queries.cache_pecas.invalidar()
+            return queries.obter_pecas()
+        return executar
+
+    return [
+        ("buscar_pecas_por_termo[vazio,pagina]", lambda ctx: lambda: queries.buscar_pecas_por_termo("", limite=50), 30),
+        ("buscar_pecas_por_termo[termo,pagina]", lambda ctx: lambda: queries.buscar_pecas_por_termo("filtro", limite=50), 30),
+        ("buscar_pecas_por_termo[termo,todos]", lambda ctx: lambda: queries.buscar_pecas_por_termo("filtro bosch"), 10),
+        ("buscar_pecas_por_termo[keyset,meio]", pagina_do_meio, 30),
+        ("buscar_clientes_por_termo[vazio,pagina]", lambda ctx: lambda: queries.buscar_clientes_por_termo("", limite=50), 30),
+        ("buscar_clientes_por_termo[termo,pagina]", lambda ctx: lambda: queries.buscar_clientes_por_termo("silva", limite=50), 30),
+        ("buscar_carros_por_termo[vazio,pagina]", lambda ctx: lambda: queries.buscar_carros_por_termo("", limite=50), 30),
+        ("buscar_carros_por_termo[placa]", lambda ctx: lambda: queries.buscar_carros_por_termo("AAA"), 30),
+        ("buscar_mecanicos_por_termo[vazio,pagina]", lambda ctx: lambda: queries.buscar_mecanicos_por_termo("", limite=50), 30),
+        ("buscar_servicos_por_termo[vazio,pagina]", lambda ctx: lambda: queries.buscar_servicos_por_termo("", limite=50), 30),
+        ("obter_pecas[cache_frio]", obter_pecas_frio, 5),
+        ("obter_pecas[cache_quente]", lambda ctx: queries.obter_pecas, 30),
+        ("obter_servicos_com_pecas[10]", lambda ctx: lambda: queries.obter_servicos_com_pecas(list(range(1, 11))), 30),
+        ("obter_kardex_peca[pagina]", lambda ctx: lambda: queries.obter_kardex_peca(1, None, None, limite=50), 30),
+        ("obter_saldo_estoque", lambda ctx: queries.obter_saldo_estoque, 5),
+        ("registrar_entrada_estoque_lote[50_itens]", entrada_lote, 20),
+        ("inserir_ordem_servico[5_pecas]", ordem_servico, 20),
+        ("viewmodel.PaginadorBusca[10_paginas]", paginador, 10),
+        ("viewmodel.SelecaoPecas[1000_adicoes]", selecao, 30),
+        ("report_service.carregar_dados_saldo_estoque", relatorio("carregar_dados_saldo_estoque"), 5),
+        ("report_service.carregar_dados_relatorio_os", relatorio("carregar_dados_relatorio_os"), 5),
+        ("report_service.carregar_dados_os_por_cliente",
+         relatorio("carregar_dados_os_por_cliente", 1, "2023-01-01", "2025-01-01"), 30),
+    ]
+
+
+class CenarioIgnorado(Exception):
+    """O cenário não pode rodar neste ambiente (ex.: dependência ausente)."""
+
+
+def medir(funcao: Callable[[], Any], repeticoes: int) -> Dict[str, float]:
+    """Executa `funcao` uma vez para aquecer e depois `repeticoes` vezes, cronometrando cada uma."""
+    funcao()
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    tempos.sort()
+    return {
+        "repeticoes": repeticoes,
+        "min_ms": round(tempos[0], 4),
+        "mediana_ms": round(statistics.median(tempos), 4),
+        "p95_ms": round(tempos[min(len(tempos) - 1, int(len(tempos) * 0.95))], 4),
+        "media_ms": round(statistics.fmean(tempos), 4),
+    }
+
+
+def preparar_banco(escala: str, semente: int, reusar: bool) -> Tuple[str, Dict[str, Any]]:
+    """
+    Cria (ou reaproveita) o banco sintético da escala e aponta o projeto para ele.
+    Deve ser chamada antes de qualquer import de `src`.
+    """
+    caminho = os.path.join(PASTA_BANCOS, f"bench_{escala}_{semente}.db")
+    existia = reusar and os.path.exists(caminho)
+    os.environ["OFICINA_DB_ARQUIVO"] = caminho
+
+    from src.database import database
+    from benchmarks.gerador_dados import calcular_volumes, contar_registros, gerar_banco
+
+    inicio = time.perf_counter()
+    if existia:
+        with database.get_db_connection() as conn:
+            registros = contar_registros(conn)
+    else:
+        # n clientes, n peças e n OS: os cenários usam ids de 1 a n.
+        n = ESCALAS[escala]
+        registros = gerar_banco(caminho, calcular_volumes(n, pecas=n, ordens=n, anos=2), semente,
+                                substituir=True)
+    database.initialize_database()
+    return caminho, {"registros": registros, "reaproveitado": existia,
+                     "preparo_s": round(time.perf_counter() - inicio, 2)}
+
+
+def executar_escala(escala: str, semente: int = SEMENTE_PADRAO, reusar: bool = False,
+                    repeticoes: Optional[int] = None, filtro: Optional[str] = None) -> Dict[str, Any]:
+    """Prepara o banco da escala e mede todos os cenários. Retorna o resultado da escala."""
+    caminho, dados = preparar_banco(escala, semente, reusar)
+    from src.database import database, queries
+
+    contexto = Contexto(ESCALAS[escala])
+    resultados: Dict[str, Dict[str, Any]] = {}
+    for nome, preparar, repeticoes_cenario in _cenarios():
+        if filtro and filtro not in nome:
+            continue
+        try:
+            funcao = preparar(contexto)
+            resultados[nome] = medir(funcao, repeticoes or repeticoes_cenario)
+        except CenarioIgnorado as e:
+            resultados[nome] = {"ignorado": str(e)}
+        print(f"  [{escala}] {nome}: {resultados[nome]}", file=sys.stderr)
+
+    queries.gravador_auditoria.encerrar()
+    database.fechar_conexoes()
+    return {"escala": escala, "n": ESCALAS[escala], "banco": caminho, **dados, "cenarios": resultados}
+
+
+def ambiente() -> Dict[str, str]:
+    """Versões que influenciam os tempos, gravadas junto com os resultados."""
+    return {
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "plataforma": platform.platform(),
+        "processador": platform.processor() or platform.machine(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Executa os cenários de benchmark de uma escala (processo filho).")
+    parser.add_argument("--escala", choices=sorted(ESCALAS), required=True)
+    parser.add_argument("--semente", type=int, default=SEMENTE_PADRAO)
+    parser.add_argument("--reusar-dados", action="store_true")
+    parser.add_argument("--repeticoes", type=int)
+    parser.add_argument("--filtro")
+    argumentos = parser.parse_args()
+    # Só os avisos do projeto aparecem durante as medições.
+    logging.disable(logging.INFO)
+    resultado = executar_escala(argumentos.escala, argumentos.semente, argumentos.reusar_dados,
+                                argumentos.repeticoes, argumentos.filtro)
+    json.dump(resultado, sys.stdout, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,632 @@
+# =================================================================================
+# GERADOR DE DADOS SINTÉTICOS DA OFICINA (gerador_dados.py)
+#
+# OBJETIVO: Criar um banco completo, com o esquema real da aplicação
+#           (`CREATE_TABLES_SQL` + migrações + índices FTS), cheio de dados
+#           verossímeis para testes de carga: clientes com nomes brasileiros,
+#           carros com placa Mercosul, catálogo de peças com fabricante e
+#           referência, kits de serviço, anos de ordens de serviço e de
+#           movimentações de estoque, e os logs de auditoria correspondentes.
+#
+# COMO USAR (na raiz do projeto):
+#   python -m benchmarks.gerador_dados --clientes 100000
+#   python -m benchmarks.gerador_dados --clientes 1000000 --anos 5 --arquivo data/carga.db
+#   python -m benchmarks.gerador_dados --clientes 5000 --arquivo data/database.db --substituir
+#
+# COMO FUNCIONA:
+#   - A mesma semente e os mesmos volumes geram sempre o mesmo banco. Cada
+#     etapa usa um gerador aleatório próprio, derivado da semente: aumentar o
+#     número de OS não muda os nomes dos clientes, por exemplo.
+#   - Carga rápida: as tabelas são criadas sem índices secundários, triggers
+#     e FTS, e preenchidas com `executemany` em lotes, com journal e
+#     sincronização desligados. Só depois as migrações criam os índices (uma
+#     ordenação por índice, em vez de uma inserção por linha) e o FTS e o
+#     saldo de estoque são povoados em massa a partir das tabelas.
+#   - O histórico é gerado em ordem cronológica. Cada OS baixa as peças do
+#     estoque; quando uma peça ficaria abaixo de ESTOQUE_MINIMO, uma compra de
+#     reposição é lançada antes. Assim o saldo nunca fica negativo e a coluna
+#     `quantidade_em_estoque` bate com as movimentações.
+#   - O banco é montado num arquivo temporário e só substitui o destino no
+#     final; uma geração interrompida não deixa um banco pela metade.
+# =================================================================================
+import argparse
+import logging
+import os
+import random
+import sqlite3
+import sys
+import time
+import unicodedata
+from array import array
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import bcrypt
+except ImportError:  # Só é usado para a senha dos usuários gerados.
+    bcrypt = None
+
+from src.database.database import CREATE_TABLES_SQL
+from src.database.migrations import aplicar_migracoes
+from src.database.search_index import criar_indices_busca
+
+logger = logging.getLogger(__name__)
+
+# --- PARÂMETROS PADRÃO ---
+
+SEMENTE_PADRAO = 42
+# Data fixa (e não "hoje") para que a mesma semente gere as mesmas datas.
+DATA_FINAL_PADRAO = date(2025, 12, 31)
+# Linhas acumuladas antes de cada `executemany`.
+TAMANHO_LOTE = 50_000
+# Saldo mínimo de cada peça; abaixo dele a oficina compra reposição.
+ESTOQUE_MINIMO = 2
+# Horário de funcionamento: das 8h, por 10 horas.
+ABERTURA_S = 8 * 3600
+EXPEDIENTE_S = 10 * 3600
+# Senha de todos os usuários gerados (login: "admin" e os dos mecânicos).
+SENHA_PADRAO = "oficina123"
+
+# Passos multiplicativos (primos entre si com o tamanho do espaço) que
+# embaralham os índices sem repetir valores: placas e referências únicas.
+_TOTAL_PLACAS = 26 ** 4 * 10 ** 3
+_PASSO_PLACA = 3 ** 18
+_TOTAL_REFERENCIAS = 10 ** 7
+_PASSO_REFERENCIA = 3 ** 13
+
+# --- VOCABULÁRIO ---
+
+PRENOMES = [
+    "Ana", "Maria", "Juliana", "Fernanda", "Patrícia", "Aline", "Camila", "Amanda", "Bruna", "Jéssica",
+    "Letícia", "Júlia", "Luciana", "Vanessa", "Mariana", "Gabriela", "Beatriz", "Larissa", "Daniela", "Renata",
+    "Adriana", "Sandra", "Simone", "Cristiane", "Tatiane", "Carla", "Débora", "Priscila", "Natália", "Raquel",
+    "Sônia", "Lúcia", "Helena", "Isabela", "Rafaela", "Kelly", "Viviane", "Elaine", "Cláudia", "Márcia",
+    "José", "João", "Antônio", "Francisco", "Carlos", "Paulo", "Pedro", "Lucas", "Luiz", "Marcos",
+    "Luís", "Gabriel", "Rafael", "Daniel", "Marcelo", "Bruno", "Eduardo", "Felipe", "Raimundo", "Rodrigo",
+    "Manoel", "Mateus", "André", "Fernando", "Fábio", "Leonardo", "Gustavo", "Guilherme", "Leandro", "Tiago",
+    "Anderson", "Ricardo", "Márcio", "Jorge", "Alexandre", "Roberto", "Edson", "Diego", "Vitor", "Sérgio",
+]
+SOBRENOMES = [
+    "Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves", "Pereira", "Lima", "Gomes",
+    "Costa", "Ribeiro", "Martins", "Carvalho", "Almeida", "Lopes", "Soares", "Fernandes", "Vieira", "Barbosa",
+    "Rocha", "Dias", "Nascimento", "Andrade", "Moreira", "Nunes", "Marques", "Machado", "Mendes", "Freitas",
+    "Cardoso", "Ramos", "Gonçalves", "Santana", "Teixeira", "Araújo", "Pinto", "Correia", "Cavalcanti", "Monteiro",
+    "Moura", "Batista", "Campos", "Rezende", "Barros", "Borges", "Medeiros", "Castro", "Fonseca", "Miranda",
+    "Azevedo", "Cunha", "Coelho", "Reis", "Pires", "Brito", "Sales", "Farias", "Macedo", "Queiroz",
+    "Tavares", "Guimarães", "Moraes", "Siqueira", "Prado", "Xavier", "Leite", "Vasconcelos", "Peixoto", "Bezerra",
+    "Duarte", "Aguiar", "Magalhães", "Pacheco", "Bastos", "Figueiredo", "Lacerda", "Toledo", "Assis", "Camargo",
+]
+SUFIXOS_NOME = ["Filho", "Júnior", "Neto", "Sobrinho"]
+# (cidade, UF, DDD): o telefone do cliente usa o DDD da cidade do endereço.
+CIDADES = [
+    ("São Paulo", "SP", 11), ("Guarulhos", "SP", 11), ("Campinas", "SP", 19), ("Santos", "SP", 13),
+    ("Ribeirão Preto", "SP", 16), ("Rio de Janeiro", "RJ", 21), ("Niterói", "RJ", 21), ("Belo Horizonte", "MG", 31),
+    ("Uberlândia", "MG", 34), ("Curitiba", "PR", 41), ("Londrina", "PR", 43), ("Porto Alegre", "RS", 51),
+    ("Florianópolis", "SC", 48), ("Joinville", "SC", 47), ("Salvador", "BA", 71), ("Recife", "PE", 81),
+    ("Fortaleza", "CE", 85), ("Goiânia", "GO", 62), ("Brasília", "DF", 61), ("Belém", "PA", 91),
+    ("Manaus", "AM", 92), ("Natal", "RN", 84), ("João Pessoa", "PB", 83), ("Campo Grande", "MS", 67),
+]
+LOGRADOUROS = ["Rua", "Rua", "Rua", "Avenida", "Avenida", "Travessa", "Alameda", "Praça"]
+HOMENAGEADOS = [
+    "XV de Novembro", "Sete de Setembro", "Tiradentes", "Dom Pedro II", "Marechal Deodoro", "Santos Dumont",
+    "Getúlio Vargas", "Rui Barbosa", "Castro Alves", "das Flores", "dos Andradas", "Barão do Rio Branco",
+    "Duque de Caxias", "São João", "Brasil", "Paulista", "Independência", "das Palmeiras", "Carlos Gomes",
+    "Monteiro Lobato", "Machado de Assis", "Oswaldo Cruz", "Presidente Vargas", "Bela Vista",
+]
+BAIRROS = ["Centro", "Jardim América", "Vila Nova", "Santa Cruz", "Boa Vista", "São José", "Industrial",
+           "Jardim das Flores", "Vila Operária", "Parque São Jorge", "Cidade Nova", "Alto da Glória"]
+PROVEDORES_EMAIL = ["gmail.com", "hotmail.com", "outlook.com", "yahoo.com.br", "uol.com.br", "bol.com.br"]
+# (modelo, primeiro ano, último ano)
+MODELOS_CARRO = [
+    ("Gol", 2000, 2023), ("Onix", 2013, 2025), ("HB20", 2012, 2025), ("Palio", 2000, 2017), ("Uno", 2000, 2021),
+    ("Corolla", 2003, 2025), ("Civic", 2004, 2021), ("Sandero", 2008, 2022), ("Ka", 2000, 2021),
+    ("Strada", 2000, 2025), ("Fox", 2004, 2021), ("Celta", 2000, 2016), ("Prisma", 2007, 2019),
+    ("Fiesta", 2000, 2019), ("Kwid", 2017, 2025), ("Argo", 2017, 2025), ("Mobi", 2016, 2025),
+    ("Polo", 2017, 2025), ("T-Cross", 2019, 2025), ("Compass", 2016, 2025), ("Renegade", 2015, 2025),
+    ("Creta", 2017, 2025), ("Hilux", 2005, 2025), ("S10", 2000, 2025), ("Saveiro", 2000, 2023),
+]
+CORES_CARRO = ["Prata", "Prata", "Branco", "Branco", "Preto", "Preto", "Cinza", "Vermelho", "Azul", "Bege", "Verde"]
+# (tipo de peça, faixa do preço de compra, fabricantes que a produzem, prefixo da referência)
+TIPOS_PECA = [
+    ("Filtro de Óleo", (12, 45), ["Tecfil", "Mann", "Fram", "Wega", "Bosch"], "FO"),
+    ("Filtro de Ar", (18, 70), ["Tecfil", "Mann", "Fram", "Wega"], "FA"),
+    ("Filtro de Combustível", (15, 60), ["Tecfil", "Mann", "Bosch", "Wega"], "FC"),
+    ("Filtro de Cabine", (20, 65), ["Tecfil", "Mann", "Wega"], "FK"),
+    ("Pastilha de Freio", (45, 180), ["Fras-le", "Cobreq", "Bosch", "TRW", "Jurid"], "PF"),
+    ("Disco de Freio", (90, 380), ["Fremax", "Hipper Freios", "TRW", "Bosch"], "DF"),
+    ("Lona de Freio", (40, 140), ["Fras-le", "Cobreq", "Jurid"], "LF"),
+    ("Vela de Ignição", (14, 60), ["NGK", "Bosch", "Denso"], "VI"),
+    ("Cabo de Vela", (60, 220), ["NGK", "Bosch", "Magneti Marelli"], "CV"),
+    ("Bobina de Ignição", (120, 450), ["Bosch", "Magneti Marelli", "Delphi"], "BI"),
+    ("Correia Dentada", (50, 210), ["Gates", "Contitech", "Dayco"], "CD"),
+    ("Tensor da Correia", (70, 260), ["SKF", "INA", "Gates"], "TC"),
+    ("Bomba d'Água", (90, 350), ["Urba", "Indisa", "SKF", "Nakata"], "BA"),
+    ("Amortecedor Dianteiro", (160, 520), ["Cofap", "Monroe", "Nakata", "Kayaba"], "AD"),
+    ("Amortecedor Traseiro", (130, 450), ["Cofap", "Monroe", "Nakata", "Kayaba"], "AT"),
+    ("Bieleta", (25, 90), ["Nakata", "Viemar", "TRW"], "BL"),
+    ("Pivô de Suspensão", (40, 150), ["Nakata", "Viemar", "TRW"], "PS"),
+    ("Terminal de Direção", (35, 130), ["Nakata", "Viemar", "TRW"], "TD"),
+    ("Kit de Embreagem", (350, 1300), ["Sachs", "LuK", "Valeo"], "KE"),
+    ("Radiador", (280, 950), ["Valeo", "Visconde", "Denso"], "RD"),
+    ("Bateria 60Ah", (320, 650), ["Moura", "Heliar", "Zetta"], "BT"),
+    ("Lâmpada do Farol", (15, 90), ["Philips", "Osram"], "LA"),
+    ("Palheta do Limpador", (20, 80), ["Bosch", "Dyna", "Valeo"], "PL"),
+    ("Óleo de Motor 5W30 (1L)", (28, 60), ["Mobil", "Shell", "Castrol", "Lubrax"], "OM"),
+    ("Fluido de Freio DOT4", (20, 45), ["Bosch", "Varga", "TRW"], "FL"),
+    ("Aditivo de Radiador", (18, 40), ["Paraflu", "Wurth", "Valeo"], "AR"),
+    ("Sonda Lambda", (180, 620), ["Bosch", "NGK", "Delphi"], "SL"),
+    ("Bomba de Combustível", (160, 540), ["Bosch", "Delphi", "Magneti Marelli"], "BC"),
+    ("Rolamento de Roda", (60, 240), ["SKF", "FAG", "NSK"], "RR"),
+    ("Junta do Cabeçote", (70, 260), ["Sabó", "Taranto", "Elring"], "JC"),
+]
+# (serviço, tipos de peça do kit, faixa da mão de obra)
+SERVICOS = [
+    ("Troca de Óleo e Filtro", ["Óleo de Motor 5W30 (1L)", "Filtro de Óleo"], (60, 120)),
+    ("Revisão dos 10.000 km", ["Óleo de Motor 5W30 (1L)", "Filtro de Óleo", "Filtro de Ar", "Filtro de Cabine"], (180, 320)),
+    ("Revisão dos 40.000 km", ["Óleo de Motor 5W30 (1L)", "Filtro de Óleo", "Filtro de Ar", "Filtro de Combustível",
+                               "Vela de Ignição", "Fluido de Freio DOT4"], (350, 600)),
+    ("Troca de Pastilhas de Freio", ["Pastilha de Freio"], (90, 180)),
+    ("Troca de Discos e Pastilhas", ["Disco de Freio", "Pastilha de Freio"], (160, 300)),
+    ("Revisão do Freio Traseiro", ["Lona de Freio", "Fluido de Freio DOT4"], (120, 220)),
+    ("Troca de Correia Dentada", ["Correia Dentada", "Tensor da Correia", "Bomba d'Água"], (250, 480)),
+    ("Troca de Embreagem", ["Kit de Embreagem"], (350, 700)),
+    ("Troca de Amortecedores Dianteiros", ["Amortecedor Dianteiro", "Bieleta"], (200, 380)),
+    ("Troca de Amortecedores Traseiros", ["Amortecedor Traseiro"], (160, 300)),
+    ("Revisão da Suspensão", ["Pivô de Suspensão", "Terminal de Direção", "Bieleta"], (180, 350)),
+    ("Troca de Velas e Cabos", ["Vela de Ignição", "Cabo de Vela"], (80, 160)),
+    ("Troca de Bobina", ["Bobina de Ignição"], (60, 130)),
+    ("Limpeza do Sistema de Arrefecimento", ["Aditivo de Radiador"], (120, 220)),
+    ("Troca de Radiador", ["Radiador", "Aditivo de Radiador"], (200, 380)),
+    ("Troca de Bateria", ["Bateria 60Ah"], (30, 60)),
+    ("Troca de Bomba de Combustível", ["Bomba de Combustível", "Filtro de Combustível"], (150, 300)),
+    ("Troca de Sonda Lambda", ["Sonda Lambda"], (80, 150)),
+    ("Troca de Rolamento de Roda", ["Rolamento de Roda"], (120, 240)),
+    ("Retífica do Cabeçote", ["Junta do Cabeçote"], (900, 1800)),
+    ("Substituição de Lâmpadas", ["Lâmpada do Farol"], (30, 60)),
+    ("Troca de Palhetas", ["Palheta do Limpador"], (20, 40)),
+]
+# Quantidade usada de cada tipo num kit (o padrão é 1).
+QUANTIDADE_NO_KIT = {"Óleo de Motor 5W30 (1L)": 4, "Vela de Ignição": 4, "Amortecedor Dianteiro": 2,
+                     "Amortecedor Traseiro": 2, "Bieleta": 2, "Pivô de Suspensão": 2, "Terminal de Direção": 2,
+                     "Lâmpada do Farol": 2, "Palheta do Limpador": 2, "Disco de Freio": 2}
+ESPECIALIDADES = ["Motor", "Suspensão e Direção", "Freios", "Elétrica", "Injeção Eletrônica", "Câmbio e Embreagem",
+                  "Arrefecimento", "Geral"]
+
+
+# --- VOLUMES ---
+
+def calcular_volumes(clientes: int, pecas: Optional[int] = None, ordens: Optional[int] = None,
+                     anos: int = 3) -> Dict[str, int]:
+    """
+    Deriva os volumes de todas as tabelas a partir do número de clientes.
+
+    :param clientes: Quantidade de clientes (cada um tem 1 ou 2 carros).
+    :param pecas: Itens do catálogo (padrão: metade dos clientes, mínimo 100).
+    :param ordens: Ordens de serviço no período (padrão: 3 por cliente).
+    :param anos: Anos de histórico, terminando em DATA_FINAL_PADRAO.
+    """
+    mecanicos = max(3, min(200, clientes // 2000))
+    return {
+        "clientes": clientes,
+        "pecas": pecas if pecas is not None else max(100, clientes // 2),
+        "ordens": ordens if ordens is not None else clientes * 3,
+        "anos": anos,
+        "mecanicos": mecanicos,
+        # Um usuário por mecânico (até 20), além do administrador.
+        "usuarios": 1 + min(mecanicos, 20),
+        "servicos": max(len(SERVICOS), min(len(SERVICOS) * len(MODELOS_CARRO), clientes // 500)),
+    }
+
+
+# --- FUNÇÕES AUXILIARES ---
+
+def _rng(semente: int, etapa: str) -> random.Random:
+    """Gerador próprio de cada etapa, derivado da semente."""
+    return random.Random(f"{semente}:{etapa}")
+
+
+def _sem_acentos(texto: str) -> str:
+    return unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode("ascii")
+
+
+def _placa(indice: int) -> str:
+    """Placa no padrão Mercosul (LLLNLNN); índices diferentes geram placas diferentes."""
+    letras = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    valor = (indice * _PASSO_PLACA) % _TOTAL_PLACAS
+    valor, nn = divmod(valor, 100)
+    valor, l4 = divmod(valor, 26)
+    valor, n1 = divmod(valor, 10)
+    valor, l3 = divmod(valor, 26)
+    l1, l2 = divmod(valor, 26)
+    return f"{letras[l1]}{letras[l2]}{letras[l3]}{n1}{letras[l4]}{nn:02d}"
+
+
+def _cpf(indice: int) -> str:
+    """CPF com dígitos verificadores válidos, único para cada índice."""
+    base = [int(d) for d in f"{(indice * 7_919 + 100_000_000) % 1_000_000_000:09d}"]
+    for tamanho in (9, 10):
+        soma = sum(d * peso for d, peso in zip(base, range(tamanho + 1, 1, -1)))
+        base.append(0 if soma % 11 < 2 else 11 - soma % 11)
+    return "".join(map(str, base))
+
+
+def _nome_pessoa(rng: random.Random) -> str:
+    partes = [rng.choice(PRENOMES)]
+    if rng.random() < 0.35:
+        partes.append(rng.choice(PRENOMES))
+    partes.append(rng.choice(SOBRENOMES))
+    if rng.random() < 0.7:
+        partes.append(rng.choice(SOBRENOMES))
+    return " ".join(partes)
+
+
+def _telefone(rng: random.Random, ddd: int, celular: bool = True) -> str:
+    if celular:
+        return f"({ddd}) 9{rng.randrange(6000, 10000)}-{rng.randrange(10000):04d}"
+    return f"({ddd}) {rng.randrange(2000, 6000)}-{rng.randrange(10000):04d}"
+
+
+def _endereco(rng: random.Random, cidade: Tuple[str, str, int]) -> str:
+    return (f"{rng.choice(LOGRADOUROS)} {rng.choice(HOMENAGEADOS)}, {rng.randrange(1, 3000)} - "
+            f"{rng.choice(BAIRROS)}, {cidade[0]}/{cidade[1]}")
+
+
+def _hash_senha() -> str:
+    """Hash bcrypt da SENHA_PADRAO; sem bcrypt, um valor que não permite login."""
+    if bcrypt is None:
+        logger.warning("bcrypt não instalado: os usuários gerados não poderão fazer login.")
+        return "!"
+    return bcrypt.hashpw(SENHA_PADRAO.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+
+
+class _Lotes:
+    """Buffers por tabela, gravados com `executemany` a cada TAMANHO_LOTE linhas."""
+
+    def __init__(self, cursor: sqlite3.Cursor, comandos: Dict[str, str]):
+        self.cursor = cursor
+        self.comandos = comandos
+        self.linhas: Dict[str, list] = {tabela: [] for tabela in comandos}
+        self.totais: Dict[str, int] = {tabela: 0 for tabela in comandos}
+
+    def adicionar(self, tabela: str, linha: tuple):
+        buffer = self.linhas[tabela]
+        buffer.append(linha)
+        if len(buffer) >= TAMANHO_LOTE:
+            self._gravar(tabela)
+
+    def _gravar(self, tabela: str):
+        buffer = self.linhas[tabela]
+        if buffer:
+            self.cursor.executemany(self.comandos[tabela], buffer)
+            self.totais[tabela] += len(buffer)
+            buffer.clear()
+
+    def descarregar(self):
+        for tabela in self.linhas:
+            self._gravar(tabela)
+
+
+# --- GERADOR ---
+
+class GeradorOficina:
+    """
+    Gera os registros de uma oficina. Os dados que as etapas seguintes
+    precisam consultar (dono de cada carro, preço e saldo de cada peça) ficam
+    em `array`s compactos, e não em objetos, para caber na memória em
+    escalas de milhões.
+    """
+
+    def __init__(self, volumes: Dict[str, int], semente: int = SEMENTE_PADRAO,
+                 data_final: date = DATA_FINAL_PADRAO):
+        self.volumes = volumes
+        self.semente = semente
+        self.data_final = data_final
+        self.data_inicial = data_final - timedelta(days=365 * volumes["anos"])
+        self.dono_carro = array("i", [0])       # índice = id do carro
+        self.tipo_peca = array("B", [0])        # índice = id da peça
+        self.preco_compra = array("d", [0.0])
+        self.preco_venda = array("d", [0.0])
+        self.estoque = array("i", [0])
+
+    # -- Cadastros --
+
+    def estabelecimento(self) -> tuple:
+        rng = _rng(self.semente, "estabelecimento")
+        cidade = rng.choice(CIDADES)
+        responsavel = _nome_pessoa(rng)
+        cnpj = f"{rng.randrange(10 ** 8):08d}0001{rng.randrange(100):02d}"
+        return (f"Auto Center {rng.choice(SOBRENOMES)}", _endereco(rng, cidade), _telefone(rng, cidade[2], False),
+                responsavel, cnpj, None, f"contato@oficina{rng.randrange(1000)}.com.br")
+
+    def usuarios(self) -> Iterator[tuple]:
+        rng = _rng(self.semente, "usuarios")
+        senha = _hash_senha()
+        yield ("admin", senha, "admin", 1)
+        usados = {"admin"}
+        for _ in range(self.volumes["usuarios"] - 1):
+            login = _sem_acentos(f"{rng.choice(PRENOMES)}.{rng.choice(SOBRENOMES)}").lower()
+            while login in usados:
+                login += str(rng.randrange(10))
+            usados.add(login)
+            yield (login, senha, "mecanico", 1)
+
+    def mecanicos(self) -> Iterator[tuple]:
+        rng = _rng(self.semente, "mecanicos")
+        for i in range(self.volumes["mecanicos"]):
+            cidade = rng.choice(CIDADES)
+            yield (_nome_pessoa(rng), _cpf(i), _endereco(rng, cidade), _telefone(rng, cidade[2]),
+                   rng.choice(ESPECIALIDADES))
+
+    def clientes(self) -> Iterator[tuple]:
+        """Clientes com nome único (a tabela tem UNIQUE (nome))."""
+        rng = _rng(self.semente, "clientes")
+        usados = set()
+        for i in range(self.volumes["clientes"]):
+            nome = _nome_pessoa(rng)
+            tentativas = 0
+            while nome in usados:
+                tentativas += 1
+                nome = _nome_pessoa(rng) if tentativas < 5 else f"{nome} {rng.choice(SUFIXOS_NOME)}"
+            usados.add(nome)
+            cidade = rng.choice(CIDADES)
+            partes = _sem_acentos(nome).lower().split()
+            email = f"{partes[0]}.{partes[-1]}{rng.randrange(100)}@{rng.choice(PROVEDORES_EMAIL)}"
+            yield (nome, _telefone(rng, cidade[2]), _endereco(rng, cidade), email if rng.random() < 0.8 else None)
+
+    def carros(self) -> Iterator[tuple]:
+        """Um carro por cliente, e um segundo para 25% deles."""
+        rng = _rng(self.semente, "carros")
+        indice = 0
+        for cliente_id in range(1, self.volumes["clientes"] + 1):
+            for _ in range(2 if rng.random() < 0.25 else 1):
+                modelo, primeiro_ano, ultimo_ano = rng.choice(MODELOS_CARRO)
+                indice += 1
+                self.dono_carro.append(cliente_id)
+                yield (modelo, rng.randint(primeiro_ano, ultimo_ano), rng.choice(CORES_CARRO), _placa(indice),
+                       cliente_id)
+
+    def precificar_pecas(self):
+        """Sorteia o tipo e os preços de cada peça (usados pelo histórico)."""
+        rng = _rng(self.semente, "precos")
+        for _ in range(self.volumes["pecas"]):
+            tipo = rng.randrange(len(TIPOS_PECA))
+            minimo, maximo = TIPOS_PECA[tipo][1]
+            compra = round(rng.uniform(minimo, maximo), 2)
+            self.tipo_peca.append(tipo)
+            self.preco_compra.append(compra)
+            self.preco_venda.append(round(compra * rng.uniform(1.4, 2.0), 1))
+            self.estoque.append(0)
+
+    def pecas(self) -> Iterator[tuple]:
+        """Catálogo com o saldo final do histórico (chamar depois de `historico`)."""
+        rng = _rng(self.semente, "pecas")
+        for peca_id in range(1, self.volumes["pecas"] + 1):
+            tipo, _, fabricantes, prefixo = TIPOS_PECA[self.tipo_peca[peca_id]]
+            fabricante = rng.choice(fabricantes)
+            modelo, primeiro_ano, ultimo_ano = rng.choice(MODELOS_CARRO)
+            referencia = f"{prefixo}{(peca_id * _PASSO_REFERENCIA) % _TOTAL_REFERENCIAS:07d}"
+            yield (f"{tipo} {modelo}", referencia, fabricante,
+                   f"{tipo} {fabricante} para {modelo} {primeiro_ano}-{ultimo_ano}",
+                   self.preco_compra[peca_id], self.preco_venda[peca_id], self.estoque[peca_id])
+
+    def servicos(self) -> Iterator[tuple]:
+        """Serviços do catálogo; acima de len(SERVICOS), variações por modelo de carro."""
+        rng = _rng(self.semente, "servicos")
+        for i in range(self.volumes["servicos"]):
+            nome, _, (minimo, maximo) = SERVICOS[i % len(SERVICOS)]
+            if i >= len(SERVICOS):
+                nome = f"{nome} - {MODELOS_CARRO[i // len(SERVICOS) - 1][0]}"
+            yield (nome, f"{nome} com peças do kit e teste final", round(rng.uniform(minimo, maximo), -1))
+
+    def kits(self) -> Iterator[tuple]:
+        """Peças de cada serviço: para cada tipo do kit, uma peça daquele tipo."""
+        rng = _rng(self.semente, "kits")
+        pecas_por_tipo: List[List[int]] = [[] for _ in TIPOS_PECA]
+        for peca_id in range(1, len(self.tipo_peca)):
+            pecas_por_tipo[self.tipo_peca[peca_id]].append(peca_id)
+        indice_tipo = {tipo[0]: i for i, tipo in enumerate(TIPOS_PECA)}
+        for servico_id in range(1, self.volumes["servicos"] + 1):
+            _, tipos, _ = SERVICOS[(servico_id - 1) % len(SERVICOS)]
+            for tipo in tipos:
+                candidatas = pecas_por_tipo[indice_tipo[tipo]]
+                if candidatas:
+                    yield (servico_id, rng.choice(candidatas), QUANTIDADE_NO_KIT.get(tipo, 1))
+
+    # -- Histórico --
+
+    def historico(self, lotes: "_Lotes"):
+        """
+        Gera, em ordem cronológica, o saldo de implantação, as OS com suas
+        peças, as baixas e reposições de estoque e os logs de auditoria.
+        """
+        rng = _rng(self.semente, "historico")
+        total_pecas = self.volumes["pecas"]
+        total_carros = len(self.dono_carro) - 1
+        total_ordens = self.volumes["ordens"]
+        usuarios = self.volumes["usuarios"]
+        # Curva ABC: 80% das saídas concentradas em 20% das peças.
+        pecas_a = max(1, total_pecas // 5)
+        estoque, preco_compra, preco_venda = self.estoque, self.preco_compra, self.preco_venda
+
+        abertura = datetime.combine(self.data_inicial, datetime.min.time()) + timedelta(seconds=ABERTURA_S)
+        implantacao = abertura.strftime("%Y-%m-%d %H:%M:%S")
+        for peca_id in range(1, total_pecas + 1):
+            quantidade = rng.randint(ESTOQUE_MINIMO, 20)
+            estoque[peca_id] = quantidade
+            lotes.adicionar("movimentacao_pecas", (peca_id, implantacao, "entrada", quantidade,
+                                                   preco_compra[peca_id], "Saldo de implantação", None))
+        lotes.adicionar("auditoria_logs", (1, "IMPLANTACAO_ESTOQUE", f"{total_pecas} peças", implantacao))
+
+        dias = (self.data_final - self.data_inicial).days
+        segundos_uteis = dias * EXPEDIENTE_S
+        nota_fiscal = 10_000
+        dia_atual = -1
+        inicio_dia = abertura
+        for os_id in range(1, total_ordens + 1):
+            # Instantes crescentes e espalhados por todo o período.
+            instante = int(segundos_uteis * (os_id - 1 + rng.random()) / total_ordens)
+            dia, segundo = divmod(instante, EXPEDIENTE_S)
+            if dia != dia_atual:
+                dia_atual = dia
+                inicio_dia = abertura + timedelta(days=dia)
+                for usuario_id in range(1, usuarios + 1):
+                    login = inicio_dia + timedelta(seconds=rng.randrange(1800))
+                    lotes.adicionar("auditoria_logs", (usuario_id, "LOGIN", None,
+                                                       login.strftime("%Y-%m-%d %H:%M:%S")))
+            momento = (inicio_dia + timedelta(seconds=segundo)).strftime("%Y-%m-%d %H:%M:%S")
+
+            carro_id = rng.randint(1, total_carros)
+            itens: Dict[int, int] = {}
+            for _ in range(rng.randint(1, 4)):
+                peca_id = (rng.randrange(pecas_a) if rng.random() < 0.8 else rng.randrange(total_pecas)) + 1
+                itens[peca_id] = itens.get(peca_id, 0) + rng.choice((1, 1, 1, 2, 4))
+            mao_de_obra = round(rng.uniform(60, 900), -1)
+            valor_total = mao_de_obra + sum(preco_venda[p] * q for p, q in itens.items())
+            usuario_id = rng.randint(1, usuarios)
+
+            lotes.adicionar("ordem_servico", (self.dono_carro[carro_id], carro_id, momento,
+                                              round(valor_total, 2), mao_de_obra))
+            for peca_id, quantidade in itens.items():
+                if estoque[peca_id] - quantidade < ESTOQUE_MINIMO:
+                    reposicao = quantidade + rng.randint(5, 30)
+                    nota_fiscal += 1
+                    estoque[peca_id] += reposicao
+                    lotes.adicionar("movimentacao_pecas", (peca_id, momento, "entrada", reposicao,
+                                                           preco_compra[peca_id], f"NF {nota_fiscal}", None))
+                    lotes.adicionar("auditoria_logs", (usuario_id, "ENTRADA_ESTOQUE",
+                                                       f"Peça {peca_id}: +{reposicao} (NF {nota_fiscal})", momento))
+                estoque[peca_id] -= quantidade
+                lotes.adicionar("PecasOrdemServico", (os_id, peca_id, quantidade))
+                lotes.adicionar("movimentacao_pecas", (peca_id, momento, "saida", quantidade, None,
+                                                       f"OS #{os_id}", os_id))
+            lotes.adicionar("auditoria_logs", (usuario_id, "CRIACAO_OS", f"OS #{os_id}", momento))
+
+
+# --- CARGA NO BANCO ---
+
+# Comandos de inserção do histórico (os cadastros usam os mesmos nomes de coluna).
+_INSERTS_HISTORICO = {
+    "ordem_servico": "INSERT INTO ordem_servico (cliente_id, carro_id, data_criacao, valor_total, mao_de_obra) "
+                     "VALUES (?, ?, ?, ?, ?)",
+    "PecasOrdemServico": "INSERT INTO PecasOrdemServico (ordem_servico_id, peca_id, quantidade) VALUES (?, ?, ?)",
+    "movimentacao_pecas": "INSERT INTO movimentacao_pecas (peca_id, data_movimentacao, tipo_movimentacao, "
+                          "quantidade, valor_custo, descricao, ordem_servico_id) VALUES (?, ?, ?, ?, ?, ?, ?)",
+    "auditoria_logs": "INSERT INTO auditoria_logs (usuario_id, acao, detalhes, data_hora) VALUES (?, ?, ?, ?)",
+}
+
+TABELAS_CONTADAS = ["estabelecimentos", "usuarios", "mecanicos", "clientes", "carros", "pecas", "servicos",
+                    "servicos_pecas", "ordem_servico", "PecasOrdemServico", "movimentacao_pecas", "auditoria_logs"]
+
+
+def contar_registros(conn: sqlite3.Connection) -> Dict[str, int]:
+    """Quantidade de linhas de cada tabela preenchida pelo gerador."""
+    return {tabela: conn.execute(f"SELECT COUNT(*) FROM {tabela}").fetchone()[0] for tabela in TABELAS_CONTADAS}
+
+
+def gerar_banco(caminho: str, volumes: Dict[str, int], semente: int = SEMENTE_PADRAO,
+                data_final: date = DATA_FINAL_PADRAO, substituir: bool = False) -> Dict[str, int]:
+    """
+    Cria um banco novo em `caminho` com os volumes informados.
+
+    :param volumes: Ver `calcular_volumes()`.
+    :param substituir: Se False, um arquivo já existente em `caminho` não é tocado.
+    :return: A quantidade de registros por tabela.
+    :raises FileExistsError: Se o arquivo existe e `substituir` é False.
+    """
+    if os.path.exists(caminho) and not substituir:
+        raise FileExistsError(f"O arquivo '{caminho}' já existe.")
+    pasta = os.path.dirname(os.path.abspath(caminho))
+    os.makedirs(pasta, exist_ok=True)
+    temporario = caminho + ".gerando"
+    for sufixo in ("", "-journal", "-wal", "-shm"):
+        if os.path.exists(temporario + sufixo):
+            os.remove(temporario + sufixo)
+
+    gerador = GeradorOficina(volumes, semente, data_final)
+    inicio = time.perf_counter()
+    conn = sqlite3.connect(temporario)
+    try:
+        # Arquivo novo e descartável em caso de falha: sem journal e sem fsync.
+        for pragma in ("journal_mode = OFF", "synchronous = OFF", "locking_mode = EXCLUSIVE",
+                       "cache_size = -262144", "temp_store = MEMORY"):
+            conn.execute(f"PRAGMA {pragma}")
+        cursor = conn.cursor()
+        for sql in CREATE_TABLES_SQL:
+            cursor.execute(sql)
+
+        logger.info("Gerando cadastros (usuários, mecânicos, clientes e carros)...")
+        cursor.execute("INSERT INTO estabelecimentos (nome, endereco, telefone, responsavel, cpf_cnpj, logo_path, "
+                       "chave_pix) VALUES (?, ?, ?, ?, ?, ?, ?)", gerador.estabelecimento())
+        cursor.executemany("INSERT INTO usuarios (nome, senha, perfil, id_estabelecimento) VALUES (?, ?, ?, ?)",
+                           gerador.usuarios())
+        cursor.executemany("INSERT INTO mecanicos (nome, cpf, endereco, telefone, especialidade) VALUES (?, ?, ?, ?, ?)",
+                           gerador.mecanicos())
+        cursor.executemany("INSERT INTO clientes (nome, telefone, endereco, email) VALUES (?, ?, ?, ?)",
+                           gerador.clientes())
+        cursor.executemany("INSERT INTO carros (modelo, ano, cor, placa, cliente_id) VALUES (?, ?, ?, ?, ?)",
+                           gerador.carros())
+        cursor.executemany("INSERT INTO servicos (nome, descricao, valor) VALUES (?, ?, ?)", gerador.servicos())
+
+        logger.info(f"Gerando o histórico de {volumes['ordens']} OS em {volumes['anos']} ano(s)...")
+        gerador.precificar_pecas()
+        lotes = _Lotes(cursor, _INSERTS_HISTORICO)
+        gerador.historico(lotes)
+        lotes.descarregar()
+        # As peças entram depois do histórico, já com o saldo final.
+        cursor.executemany(
+            "INSERT INTO pecas (nome, referencia, fabricante, descricao, preco_compra, preco_venda, "
+            "quantidade_em_estoque) VALUES (?, ?, ?, ?, ?, ?, ?)", gerador.pecas())
+        conn.commit()
+        logger.info(f"Dados inseridos em {time.perf_counter() - inicio:.1f} s. Criando índices...")
+
+        # Índices das migrações antes do FTS: o repovoamento de clientes_fts
+        # busca as placas de cada cliente pelo índice de carros.cliente_id.
+        aplicar_migracoes(conn)
+        criar_indices_busca(cursor)
+        # Os kits dependem da coluna 'quantidade' (migração 7).
+        cursor.executemany("INSERT INTO servicos_pecas (servico_id, peca_id, quantidade) VALUES (?, ?, ?)",
+                           gerador.kits())
+        conn.commit()
+        cursor.execute("ANALYZE")
+        # O modo WAL fica gravado no arquivo, como nos bancos criados pela aplicação.
+        conn.execute("PRAGMA locking_mode = NORMAL")
+        conn.execute("PRAGMA journal_mode = WAL")
+        registros = contar_registros(conn)
+    except BaseException:
+        conn.close()
+        os.remove(temporario)
+        raise
+    conn.close()
+
+    for sufixo in ("-wal", "-shm"):
+        if os.path.exists(caminho + sufixo):
+            os.remove(caminho + sufixo)
+    os.replace(temporario, caminho)
+    logger.info(f"Banco '{caminho}' gerado em {time.perf_counter() - inicio:.1f} s: {registros}")
+    return registros
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera um banco da oficina com dados sintéticos.")
+    parser.add_argument("--clientes", type=int, default=10_000, help="Quantidade de clientes (padrão: 10000).")
+    parser.add_argument("--pecas", type=int, help="Itens do catálogo (padrão: metade dos clientes).")
+    parser.add_argument("--ordens", type=int, help="Ordens de serviço (padrão: 3 por cliente).")
+    parser.add_argument("--anos", type=int, default=3, help="Anos de histórico (padrão: 3).")
+    parser.add_argument("--ate", type=date.fromisoformat, default=DATA_FINAL_PADRAO,
+                        help=f"Último dia do histórico, AAAA-MM-DD (padrão: {DATA_FINAL_PADRAO}).")
+    parser.add_argument("--semente", type=int, default=SEMENTE_PADRAO)
+    parser.add_argument("--arquivo", default=os.path.join("data", "carga.db"),
+                        help="Banco a ser criado (padrão: data/carga.db).")
+    parser.add_argument("--substituir", action="store_true", help="Sobrescreve o arquivo, se já existir.")
+    argumentos = parser.parse_args()
+
+    volumes = calcular_volumes(argumentos.clientes, argumentos.pecas, argumentos.ordens, argumentos.anos)
+    try:
+        gerar_banco(argumentos.arquivo, volumes, argumentos.semente, argumentos.ate, argumentos.substituir)
+    except FileExistsError as e:
+        print(f"{e} Use --substituir para sobrescrevê-lo.", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,43 +8,25 @@
 #   - Integração do módulo de estilos. Os temas claro e escuro agora são
 #     carregados a partir de `src/styles/style.py` para uma UI consistente.
 #   - Corrigida a aplicação de `extended_colors` para o tema.
+#   - Rotas resolvidas pelo `RegistroRotas` (ver `src/views/registro_rotas.py`):
+#     as telas são importadas na primeira navegação, e não na inicialização.
+#     A tabela de rotas é global; o cache de Views é criado por sessão em `main`.
 # =================================================================================
 import flet as ft
-import threading
 import logging
-import re
+import atexit
+from functools import partial
 
 # --- IMPORTAÇÃO DOS TEMAS E CORES PERSONALIZADAS ---
 from src.styles.style import AppThemes, success_color_scheme
 
-# Importações das View Factories
-from src.views.login_view import LoginViewFactory
-from src.views.dashboard_view import DashboardViewFactory
-from src.views.register_view import RegisterViewFactory
-from src.views.onboarding_view import OnboardingViewFactory
-from src.views.cadastro_cliente_view import CadastroClienteViewFactory
-from src.views.onboarding_cliente_view import OnboardingClienteViewFactory
-from src.views.gerir_clientes_view import GerirClientesViewFactory
-from src.views.editar_cliente_view import EditarClienteViewFactory
-from src.views.gerir_carros_view import GerirCarrosViewFactory
-from src.views.cadastro_carro_view import CadastroCarroViewFactory
-from src.views.editar_carro_view import EditarCarroViewFactory
-from src.views.gerir_pecas_view import GerirPecasViewFactory
-from src.views.cadastro_peca_view import CadastroPecaViewFactory
-from src.views.editar_peca_view import EditarPecaViewFactory
-from src.views.gerir_mecanicos_view import GerirMecanicosViewFactory
-from src.views.cadastro_mecanico_view import CadastroMecanicoViewFactory
-from src.views.editar_mecanico_view import EditarMecanicoViewFactory
-from src.views.gerir_servicos_view import GerirServicosViewFactory
-from src.views.cadastro_servico_view import CadastroServicoViewFactory
-from src.views.editar_servico_view import EditarServicoViewFactory
-from src.views.minha_conta_view import MinhaContaViewFactory
-from src.views.dados_oficina_view import DadosOficinaViewFactory
-from src.views.entrada_pecas_view import EntradaPecasViewFactory
+# Registro de rotas: as telas só são importadas na primeira navegação.
+from src.views.registro_rotas import RegistroRotas
 
 # Importações de Serviços e Banco de Dados
-from src.services.task_queue_service import processar_fila_db
+from src.services.task_queue_service import iniciar_servico_tarefas, encerrar_servico_tarefas
 from src.database.database import initialize_database as inicializar_banco_de_dados
+from src.database.database import fechar_conexoes
 from src.database import queries
 from utils import criar_pastas
 
@@ -67,6 +49,62 @@ def PlaceholderViewFactory(page: ft.Page, title: str) -> ft.View:
     )
 
 
+# --- TABELA DE ROTAS ---
+# "modulo:Factory" é importado sob demanda. `manter_em_cache` reaproveita a
+# View nas visitas seguintes da mesma sessão (as listas recarregam os dados ao
+# serem montadas).
+rotas = RegistroRotas()
+rotas.registrar("/login", "src.views.login_view:LoginViewFactory")
+rotas.registrar("/register", "src.views.register_view:RegisterViewFactory")
+rotas.registrar("/onboarding", "src.views.onboarding_view:OnboardingViewFactory")
+rotas.registrar("/dashboard", "src.views.dashboard_view:DashboardViewFactory", manter_em_cache=True)
+
+# --- Rotas de Cadastro ---
+rotas.registrar("/gerir_clientes", "src.views.gerir_clientes_view:GerirClientesViewFactory", manter_em_cache=True)
+rotas.registrar("/cadastro_cliente", "src.views.cadastro_cliente_view:CadastroClienteViewFactory")
+rotas.registrar("/editar_cliente/<cliente_id>", "src.views.editar_cliente_view:EditarClienteViewFactory")
+
+# --- ROTAS DE CARRO ---
+rotas.registrar("/gerir_carros", "src.views.gerir_carros_view:GerirCarrosViewFactory", manter_em_cache=True)
+rotas.registrar("/cadastro_carro", "src.views.cadastro_carro_view:CadastroCarroViewFactory")
+rotas.registrar("/editar_carro/<carro_id>", "src.views.editar_carro_view:EditarCarroViewFactory")
+
+# -- ROTAS DE PEÇAS ---
+rotas.registrar("/gerir_pecas", "src.views.gerir_pecas_view:GerirPecasViewFactory", manter_em_cache=True)
+rotas.registrar("/cadastro_peca", "src.views.cadastro_peca_view:CadastroPecaViewFactory")
+rotas.registrar("/editar_peca/<peca_id>", "src.views.editar_peca_view:EditarPecaViewFactory")
+
+# --- ROTAS DE MECÂNICOS ---
+rotas.registrar("/gerir_mecanicos", "src.views.gerir_mecanicos_view:GerirMecanicosViewFactory", manter_em_cache=True)
+rotas.registrar("/cadastro_mecanico", "src.views.cadastro_mecanico_view:CadastroMecanicoViewFactory")
+rotas.registrar("/editar_mecanico/<mecanico_id>", "src.views.editar_mecanico_view:EditarMecanicoViewFactory")
+
+# --- ROTAS DE SERVIÇOS ---
+rotas.registrar("/gerir_servicos", "src.views.gerir_servicos_view:GerirServicosViewFactory", manter_em_cache=True)
+rotas.registrar("/cadastro_servico", "src.views.cadastro_servico_view:CadastroServicoViewFactory")
+rotas.registrar("/editar_servico/<servico_id>", "src.views.editar_servico_view:EditarServicoViewFactory")
+
+# --- Rotas de Ordem de Serviços ---
+rotas.registrar("/nova_os", partial(PlaceholderViewFactory, title="Nova Ordem de Serviço"))
+rotas.registrar("/novo_orcamento", partial(PlaceholderViewFactory, title="Novo Orçamento"))
+rotas.registrar("/venda_pecas", partial(PlaceholderViewFactory, title="Venda de Peças"))
+
+# --- Rotas de Consultas e Relatórios ---
+rotas.registrar("/entrada_pecas", "src.views.entrada_pecas_view:EntradaPecasViewFactory")
+rotas.registrar("/kardex", "src.views.kardex_view:KardexViewFactory")
+rotas.registrar("/perfil_consultas", "src.views.perfil_consultas_view:PerfilConsultasViewFactory")
+rotas.registrar("/estoque", partial(PlaceholderViewFactory, title="Estoque"))
+rotas.registrar("/relatorios", partial(PlaceholderViewFactory, title="Relatórios"))
+
+# --- Rotas Administrativas ---
+rotas.registrar("/minha_conta", "src.views.minha_conta_view:MinhaContaViewFactory")
+# rotas.registrar("/usuarios", partial(PlaceholderViewFactory, title="Gerenciar Usuários"))
+rotas.registrar("/dados_oficina", "src.views.dados_oficina_view:DadosOficinaViewFactory")
+
+# Rotas que encerram a sessão: as Views em cache pertencem ao usuário anterior.
+ROTAS_SEM_SESSAO = {"/login", "/register"}
+
+
 def main(page: ft.Page):
     """
     Função principal que inicializa e configura a aplicação Flet.
@@ -90,117 +128,31 @@ def main(page: ft.Page):
     # --- INICIALIZAÇÃO DE SERVIÇOS DE FUNDO ---
     logging.info("Iniciando serviços de fundo...")
     inicializar_banco_de_dados()
-    thread_db = threading.Thread(
-        target=processar_fila_db, args=(page,), daemon=True)
-    thread_db.start()
+    # Garante que as conexões do pool sejam fechadas ao encerrar o processo.
+    atexit.register(fechar_conexoes)
+    # Grava os logs de auditoria que ainda estão no buffer (antes de fechar o pool).
+    atexit.register(queries.gravador_auditoria.encerrar)
+    # Workers das tarefas de banco (1 escritor + leitores). O atexit executa em
+    # ordem inversa: a fila é drenada antes de o pool ser fechado.
+    iniciar_servico_tarefas(page)
+    atexit.register(encerrar_servico_tarefas)
     criar_pastas(".")
 
     # --- GERENCIADOR DE ROTAS ---
+    # Views em cache DESTA sessão: elas guardam a `page` e os ViewModels do
+    # usuário atual e não podem ser entregues a outra janela/sessão web.
+    views_em_cache = {}
+
     def route_change(route):
         logging.info(f"Navegando para a rota: {page.route}")
-        edit_cliente_route = re.match(r"/editar_cliente/(\d+)", page.route)
-        edit_carro_route = re.match(r"/editar_carro/(\d+)", page.route)
-        edit_peca_route = re.match(r"/editar_peca/(\d+)", page.route)
-        edit_mecanico_route = re.match(r"/editar_mecanico/(\d+)", page.route)
-        edit_servico_route = re.match(r"/editar_servico/(\d+)", page.route)
-        page.views.clear()
-
-        # Mapeamento de rotas para as View Factories
-        if page.route == "/login":
-            page.views.append(LoginViewFactory(page))
-        elif page.route == "/register":
-            page.views.append(RegisterViewFactory(page))
-        elif page.route == "/onboarding":
-            page.views.append(OnboardingViewFactory(page))
-        elif page.route == "/dashboard":
-            page.views.append(DashboardViewFactory(page))
-
-        # --- Rotas de Cadastro ---
-        elif page.route == "/gerir_clientes":
-            page.views.append(GerirClientesViewFactory(page))
-        elif page.route == "/cadastro_cliente":
-            page.views.append(CadastroClienteViewFactory(page))
-        elif edit_cliente_route:
-            cliente_id = int(edit_cliente_route.group(1))
-            page.views.append(EditarClienteViewFactory(
-                page, cliente_id=cliente_id))
-
-        # --- ROTAS DE CARRO ---
-        # gerir Carros
-        elif page.route == "/gerir_carros":
-            page.views.append(GerirCarrosViewFactory(page))
-        # Cadastro Carro
-        elif page.route == "/cadastro_carro":
-            page.views.append(CadastroCarroViewFactory(page))
-        # Editar Carro
-        elif edit_carro_route:
-            carro_id = int(edit_carro_route.group(1))
-            page.views.append(EditarCarroViewFactory(page, carro_id=carro_id))
-
-        # --- Rotas de Peças, Serviços e Mecânicos ---
-
-        # -- ROTAS DE PEÇAS ---
-        elif page.route == "/gerir_pecas":
-            page.views.append(GerirPecasViewFactory(page))
-        elif page.route == "/cadastro_peca":
-            page.views.append(CadastroPecaViewFactory(page))
-
-        elif edit_peca_route:  # -> Rota ativada
-            peca_id = int(edit_peca_route.group(1))
-            page.views.append(EditarPecaViewFactory(page, peca_id=peca_id))
-
-        # --- NOVAS ROTAS DE MECÂNICOS ---
-        elif page.route == "/gerir_mecanicos":
-            page.views.append(GerirMecanicosViewFactory(page))
-        elif page.route == "/cadastro_mecanico":
-            page.views.append(CadastroMecanicoViewFactory(page))
-        elif edit_mecanico_route:
-            mecanico_id = int(edit_mecanico_route.group(1))
-            page.views.append(EditarMecanicoViewFactory(
-                page, mecanico_id=mecanico_id))
-
-        # --- NOVAS ROTAS DE SERVIÇOS ---
-        elif page.route == "/gerir_servicos":
-            page.views.append(GerirServicosViewFactory(page))
-        elif page.route == "/cadastro_servico":
-            page.views.append(CadastroServicoViewFactory(page))
-        elif edit_servico_route:
-            servico_id = int(edit_servico_route.group(1))
-            page.views.append(EditarServicoViewFactory(page, servico_id=servico_id))
-
-        # --- Rotas de Ordem de Serviços ---
-        elif page.route == "/nova_os":
-            page.views.append(PlaceholderViewFactory(
-                page, "Nova Ordem de Serviço"))
-        elif page.route == "/novo_orcamento":
-            page.views.append(PlaceholderViewFactory(page, "Novo Orçamento"))
-        elif page.route == "/venda_pecas":
-            page.views.append(PlaceholderViewFactory(page, "Venda de Peças"))
-
-        # --- Rotas de Consultas e Relatórios ---
-        elif page.route == "/entrada_pecas":
-            # --- ROTA ATIVADA ---
-            page.views.append(EntradaPecasViewFactory(page))
-        elif page.route == "/estoque":
-            page.views.append(PlaceholderViewFactory(page, "Estoque"))
-        elif page.route == "/relatorios":
-            page.views.append(PlaceholderViewFactory(page, "Relatórios"))
-
-        # --- Rotas Administrativas ---
-        elif page.route == "/minha_conta":
-            page.views.append(MinhaContaViewFactory(page))
-        #elif page.route == "/usuarios":
-            #page.views.append(PlaceholderViewFactory(
-                #page, "Gerenciar Usuários"))
-        elif page.route == "/dados_oficina":
-            # --- ROTA ATIVADA ---
-            # Substitui o placeholder pela factory real
-            page.views.append(DadosOficinaViewFactory(page))
-
-        else:
+        if page.route in ROTAS_SEM_SESSAO:
+            views_em_cache.clear()
+        view = rotas.construir(page, page.route, views_em_cache)
+        if view is None:
             # Rota de fallback caso nenhuma corresponda
-            page.views.append(DashboardViewFactory(page))
-
+            view = rotas.construir(page, "/dashboard", views_em_cache)
+        page.views.clear()
+        page.views.append(view)
         page.update()
 
     page.on_route_change = route_change
@@ -208,6 +160,8 @@ def main(page: ft.Page):
     # --- LÓGICA DE ROTA INICIAL ---
     if queries.verificar_existencia_usuario():
         page.go("/login")
+        # O dashboard é importado enquanto o usuário digita a senha.
+        rotas.precarregar("/dashboard")
     else:
         page.go("/register")
 
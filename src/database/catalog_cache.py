@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+# =================================================================================
+# MÓDULO DO CACHE DE CATÁLOGO (catalog_cache.py)
+#
+# OBJETIVO: Manter em memória, para todo o processo, os catálogos lidos com
+#           frequência pelos formulários (peças e serviços), evitando reler e
+#           remontar a tabela inteira a cada abertura de tela.
+#
+# COMO FUNCIONA:
+#   - Cada cache guarda um "retrato" imutável do catálogo: a lista completa,
+#     um dicionário por id e a lista apenas dos itens ativos.
+#   - Cada escrita no catálogo chama `invalidar()`, que incrementa a versão do
+#     cache. Um retrato só é usado se foi montado na versão atual.
+#   - Se uma escrita acontecer enquanto o retrato está sendo lido do banco, o
+#     retrato fica com a versão antiga e é descartado na próxima leitura.
+# =================================================================================
+
+# --- IMPORTAÇÕES DE BIBLIOTECAS ---
+import logging
+import threading
+from types import MappingProxyType
+from typing import Any, Callable, Iterable, Mapping, Optional, Tuple
+
+# --- CONFIGURAÇÃO DO LOGGER ---
+logger = logging.getLogger(__name__)
+
+
+class RetratoCatalogo:
+    """
+    Conteúdo do catálogo numa determinada versão. Somente leitura.
+
+    - `todos`: todos os itens, na ordem em que foram lidos.
+    - `por_id`: dicionário id -> item.
+    - `ativos`: apenas os itens com `ativo` verdadeiro, na mesma ordem.
+    """
+
+    def __init__(self, versao: int, itens: Iterable[Any]):
+        self.versao = versao
+        self.todos: Tuple[Any, ...] = tuple(itens)
+        self.por_id: Mapping[int, Any] = MappingProxyType(
+            {item.id: item for item in self.todos})
+        self.ativos: Tuple[Any, ...] = tuple(
+            item for item in self.todos if item.ativo)
+
+
+class CacheCatalogo:
+    """
+    Cache versionado de um catálogo, com contadores de acertos e falhas.
+
+    :param nome: Nome do catálogo, usado nos logs e nas estatísticas.
+    """
+
+    def __init__(self, nome: str):
+        self.nome = nome
+        self._lock = threading.Lock()
+        self._versao = 0
+        self._retrato: Optional[RetratoCatalogo] = None
+        # --- Contadores expostos por `estatisticas()` ---
+        self._acertos = 0
+        self._falhas = 0
+        self._invalidacoes = 0
+
+    def obter(self, carregar: Callable[[], Iterable[Any]]) -> RetratoCatalogo:
+        """
+        Retorna o retrato atual, lendo o catálogo com `carregar` se necessário.
+
+        A leitura acontece fora do lock. Se `carregar` lançar uma exceção, nada
+        é guardado e a exceção chega ao chamador.
+        """
+        with self._lock:
+            retrato = self._retrato
+            if retrato is not None and retrato.versao == self._versao:
+                self._acertos += 1
+                return retrato
+            self._falhas += 1
+            versao = self._versao
+
+        retrato = RetratoCatalogo(versao, carregar())
+        with self._lock:
+            # Só substitui se nenhuma leitura mais nova já foi guardada.
+            if self._retrato is None or self._retrato.versao <= versao:
+                self._retrato = retrato
+        logger.debug(
+            f"Cache '{self.nome}' recarregado: {len(retrato.todos)} itens (versão {versao}).")
+        return retrato
+
+    def invalidar(self):
+        """Marca o retrato atual como desatualizado. Chamar após cada escrita confirmada."""
+        with self._lock:
+            self._versao += 1
+            self._invalidacoes += 1
+        logger.debug(f"Cache '{self.nome}' invalidado (versão {self._versao}).")
+
+    def estatisticas(self) -> dict:
+        """Retorna um retrato dos contadores do cache."""
+        with self._lock:
+            total = self._acertos + self._falhas
+            return {
+                "versao": self._versao,
+                "itens": len(self._retrato.todos) if self._retrato else 0,
+                "acertos": self._acertos,
+                "falhas": self._falhas,
+                "invalidacoes": self._invalidacoes,
+                "taxa_acerto": self._acertos / total if total else 0.0,
+            }
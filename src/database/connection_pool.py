@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+
+# =================================================================================
+# MÓDULO DO POOL DE CONEXÕES (connection_pool.py)
+#
+# OBJETIVO: Manter um conjunto pequeno de conexões SQLite de vida longa,
+#           reaproveitadas entre as chamadas do módulo de queries.
+#
+# MOTIVAÇÃO:
+#   - Antes, cada query abria uma conexão nova (makedirs + connect + PRAGMA) e
+#     o padrão `with get_db_connection() as conn` apenas fazia commit, sem
+#     nunca fechar a conexão. Cada busca deixava um handle de arquivo aberto.
+#   - Agora as conexões são criadas uma única vez, emprestadas sob demanda e
+#     devolvidas ao pool no fim do bloco `with` ou na chamada de `close()`.
+# =================================================================================
+
+# --- IMPORTAÇÕES DE BIBLIOTECAS ---
+import logging
+import sqlite3
+import threading
+import time
+from typing import Callable
+
+# --- CONFIGURAÇÃO DO LOGGER ---
+logger = logging.getLogger(__name__)
+
+
+class ConexaoPool:
+    """
+    Invólucro de uma conexão emprestada pelo pool.
+
+    Delega todos os atributos para a `sqlite3.Connection` real e mantém a
+    mesma semântica de uso do restante do projeto:
+    - `with conexao:` faz commit (ou rollback em caso de erro) e devolve a
+      conexão ao pool ao final do bloco.
+    - `conexao.close()` devolve a conexão ao pool em vez de fechá-la.
+    Se o invólucro for descartado sem ser devolvido, o pool contabiliza um
+    vazamento e recupera a conexão.
+    """
+
+    def __init__(self, pool: "PoolConexoes", conn: sqlite3.Connection):
+        self._pool = pool
+        self._conn: sqlite3.Connection | None = conn
+
+    def __getattr__(self, nome: str):
+        # Só é chamado para atributos que não existem no invólucro.
+        conn = self.__dict__.get("_conn")
+        if conn is None:
+            raise sqlite3.ProgrammingError(
+                "A conexão já foi devolvida ao pool.")
+        return getattr(conn, nome)
+
+    def __enter__(self) -> "ConexaoPool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        try:
+            if self._conn is not None:
+                # Mesmo comportamento do context manager da sqlite3.Connection.
+                if exc_type is None:
+                    self._conn.commit()
+                else:
+                    self._conn.rollback()
+        finally:
+            self.close()
+        return False
+
+    def close(self):
+        """Devolve a conexão ao pool. Chamadas repetidas são ignoradas."""
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            self._pool._devolver(conn)
+
+    def __del__(self):
+        conn = self.__dict__.get("_conn")
+        if conn is not None:
+            self._conn = None
+            self._pool._devolver(conn, vazou=True)
+
+
+class PoolConexoes:
+    """
+    Pool de conexões SQLite com tamanho máximo configurável.
+
+    As conexões são criadas sob demanda até `tamanho` e reutilizadas em ordem
+    LIFO (a mais recente primeiro, que tende a ter o cache mais "quente").
+    Quando todas estão emprestadas, o chamador espera até `timeout` segundos.
+    """
+
+    def __init__(self, fabrica: Callable[[], sqlite3.Connection], tamanho: int = 5, timeout: float = 10.0):
+        """
+        :param fabrica: Função que cria e configura uma nova conexão física.
+        :param tamanho: Número máximo de conexões abertas simultaneamente.
+        :param timeout: Tempo máximo (em segundos) de espera por uma conexão livre.
+        """
+        if tamanho < 1:
+            raise ValueError("O tamanho do pool deve ser de pelo menos 1 conexão.")
+        self._fabrica = fabrica
+        self.tamanho = tamanho
+        self.timeout = timeout
+        # RLock: a devolução pode ocorrer dentro de um __del__ disparado pelo
+        # coletor de lixo na mesma thread que já segura o lock.
+        self._condicao = threading.Condition(threading.RLock())
+        self._livres: list[sqlite3.Connection] = []
+        self._total_abertas = 0
+        self._fechado = False
+        # --- Contadores expostos por `estatisticas()` ---
+        self._checkouts = 0
+        self._esperas = 0
+        self._timeouts = 0
+        self._vazamentos = 0
+        self._criadas = 0
+
+    def obter(self) -> ConexaoPool:
+        """
+        Empresta uma conexão do pool.
+
+        :return: Um `ConexaoPool` pronto para uso.
+        :raises sqlite3.OperationalError: Se o pool estiver fechado ou se nenhuma
+                                          conexão ficar livre dentro do timeout.
+        """
+        with self._condicao:
+            if self._fechado:
+                raise sqlite3.OperationalError("O pool de conexões está fechado.")
+
+            if not self._livres and self._total_abertas >= self.tamanho:
+                self._esperas += 1
+                logger.debug("Pool de conexões esgotado; aguardando devolução.")
+                limite = time.monotonic() + self.timeout
+                while not self._livres and self._total_abertas >= self.tamanho and not self._fechado:
+                    restante = limite - time.monotonic()
+                    if restante <= 0:
+                        self._timeouts += 1
+                        raise sqlite3.OperationalError(
+                            f"Nenhuma conexão livre no pool após {self.timeout}s.")
+                    self._condicao.wait(restante)
+                if self._fechado:
+                    raise sqlite3.OperationalError("O pool de conexões está fechado.")
+
+            if self._livres:
+                conn = self._livres.pop()
+            else:
+                # Reserva a vaga antes de criar a conexão fora do lock.
+                self._total_abertas += 1
+                conn = None
+            self._checkouts += 1
+
+        if conn is None:
+            try:
+                conn = self._fabrica()
+            except Exception:
+                with self._condicao:
+                    self._total_abertas -= 1
+                    self._condicao.notify()
+                raise
+            with self._condicao:
+                self._criadas += 1
+            logger.debug("Nova conexão física adicionada ao pool.")
+        return ConexaoPool(self, conn)
+
+    def _devolver(self, conn: sqlite3.Connection, vazou: bool = False):
+        """Recoloca uma conexão na lista de livres (ou a fecha se o pool acabou)."""
+        if vazou:
+            logger.warning(
+                "Conexão descartada sem ser devolvida ao pool (vazamento recuperado).")
+        try:
+            # Nunca devolve ao pool uma conexão com transação pendente.
+            if conn.in_transaction:
+                conn.rollback()
+            saudavel = True
+        except sqlite3.Error:
+            saudavel = False
+
+        with self._condicao:
+            if vazou:
+                self._vazamentos += 1
+            if self._fechado or not saudavel:
+                self._total_abertas -= 1
+                conn.close()
+            else:
+                self._livres.append(conn)
+            self._condicao.notify()
+
+    def fechar(self):
+        """Fecha todas as conexões livres e impede novos empréstimos."""
+        with self._condicao:
+            self._fechado = True
+            livres, self._livres = self._livres, []
+            self._total_abertas -= len(livres)
+            emprestadas = self._total_abertas
+            self._condicao.notify_all()
+        for conn in livres:
+            conn.close()
+        if emprestadas:
+            logger.warning(
+                f"Pool fechado com {emprestadas} conexão(ões) ainda emprestada(s); serão fechadas na devolução.")
+        logger.info(f"Pool de conexões fechado ({len(livres)} conexão(ões) encerrada(s)).")
+
+    def estatisticas(self) -> dict:
+        """Retorna um retrato dos contadores do pool."""
+        with self._condicao:
+            return {
+                "tamanho": self.tamanho,
+                "abertas": self._total_abertas,
+                "livres": len(self._livres),
+                "emprestadas": self._total_abertas - len(self._livres),
+                "criadas": self._criadas,
+                "checkouts": self._checkouts,
+                "esperas": self._esperas,
+                "timeouts": self._timeouts,
+                "vazamentos": self._vazamentos,
+            }
@@ -9,6 +9,16 @@
 # VERSÃO ATUAL: Integra a lógica de conexão aprimorada fornecida, incluindo a
 #              ativação de chaves estrangeiras (foreign keys) para maior
 #              integridade dos dados.
+#
+# ATUALIZAÇÃO:
+#   - `get_db_connection()` agora empresta conexões de um pool de vida longa
+#     (ver `connection_pool.py`) em vez de abrir uma conexão nova a cada query.
+#   - Perfis de PRAGMA ("duravel" e "rapido") com journal WAL, aplicados a
+#     cada nova conexão e verificados na inicialização.
+#   - Criação dos índices de busca FTS5 (ver `search_index.py`).
+#   - Migrações versionadas aplicadas na inicialização (ver `migrations.py`).
+#   - As conexões são `ConexaoPerfilada`: com o perfilador ligado, cada
+#     comando tem o tempo e as linhas medidos (ver `perfilador.py`).
 # =================================================================================
 
 # --- IMPORTAÇÕES DE BIBLIOTECAS ---
@@ -25,8 +35,20 @@ import logging
 # principalmente para manipular caminhos de arquivos de forma segura.
 import os
 
-# Importa a biblioteca 'queue' para criar a fila de tarefas assíncronas.
-import queue
+
+# Importa a biblioteca 'threading' para proteger a criação preguiçosa do pool.
+import threading
+
+# --- IMPORTAÇÕES DO PROJETO ---
+
+# Pool de conexões de vida longa, reaproveitadas entre as queries.
+from src.database.connection_pool import PoolConexoes, ConexaoPool
+# Tabelas FTS5 (busca textual) e triggers de sincronização.
+from src.database.search_index import criar_indices_busca
+# Migrações versionadas do esquema (índices e alterações futuras).
+from src.database.migrations import aplicar_migracoes
+# Conexão que permite medir os comandos SQL quando o perfilador está ligado.
+from src.database.perfilador import ConexaoPerfilada
 
 # --- CONFIGURAÇÃO GLOBAL E INICIALIZAÇÃO DO LOGGER ---
 
@@ -49,60 +71,148 @@ DB_FOLDER = "./data"
 DB_FILE = "database.db"
 # Junta a pasta e o nome do arquivo para criar um caminho completo e seguro
 # que funciona em qualquer sistema operacional (Windows, Linux, macOS).
-NOME_BANCO_DE_DADOS = os.path.join(DB_FOLDER, DB_FILE)
-
-# Cria uma fila global que será usada para processar operações de banco de dados
-# de forma assíncrona (em uma thread separada), evitando que a interface do usuário trave.
-fila_db = queue.Queue()
-
-# --- FUNÇÃO DE CONEXÃO AO BANCO DE DADOS ---
+# A variável de ambiente OFICINA_DB_ARQUIVO aponta para outro arquivo (ex.: os
+# bancos sintéticos dos benchmarks), sem tocar no banco da oficina.
+NOME_BANCO_DE_DADOS = os.environ.get("OFICINA_DB_ARQUIVO", os.path.join(DB_FOLDER, DB_FILE))
+
+# Número máximo de conexões abertas ao mesmo tempo pelo pool.
+# Pode ser ajustado pela variável de ambiente OFICINA_DB_POOL_TAMANHO.
+TAMANHO_POOL_CONEXOES = int(os.environ.get("OFICINA_DB_POOL_TAMANHO", "5"))
+# Tempo máximo (em segundos) que uma query espera por uma conexão livre.
+TIMEOUT_POOL_CONEXOES = float(os.environ.get("OFICINA_DB_POOL_TIMEOUT", "10"))
+
+# --- PERFIS DE PRAGMA ---
+
+# Conjuntos de PRAGMAs aplicados ao banco. Ambos usam o journal WAL, que
+# permite que as telas leiam enquanto a thread da fila grava uma OS.
+# - "duravel": synchronous=FULL, cada commit é sincronizado no disco.
+# - "rapido":  synchronous=NORMAL, seguro contra corrupção em WAL, mas pode
+#              perder os últimos commits numa queda de energia. Usa mais
+#              cache e leitura via mmap.
+# Valores: cache_size negativo = tamanho em KiB; temp_store 2 = MEMORY;
+# busy_timeout em milissegundos.
+PERFIS_PRAGMA = {
+    "duravel": {
+        "journal_mode": "wal",
+        "synchronous": 2,
+        "cache_size": -16000,
+        "mmap_size": 0,
+        "temp_store": 2,
+        "busy_timeout": 10000,
+    },
+    "rapido": {
+        "journal_mode": "wal",
+        "synchronous": 1,
+        "cache_size": -64000,
+        "mmap_size": 268435456,
+        "temp_store": 2,
+        "busy_timeout": 5000,
+    },
+}
+# Perfil em uso. Pode ser escolhido pela variável de ambiente OFICINA_DB_PERFIL.
+PERFIL_PRAGMA = os.environ.get("OFICINA_DB_PERFIL", "rapido")
+
+# Instância única do pool, criada na primeira solicitação de conexão.
+_pool: PoolConexoes | None = None
+_pool_lock = threading.Lock()
+
+# --- FUNÇÕES DE CONEXÃO AO BANCO DE DADOS ---
+
+
+def _criar_conexao_fisica() -> sqlite3.Connection:
+    """
+    Abre e configura uma nova conexão física com o arquivo do banco.
 
+    É chamada pelo pool apenas quando ele precisa de uma conexão nova; a
+    configuração abaixo, portanto, é feita uma única vez por conexão.
+    """
+    # Tenta conectar ao arquivo do banco de dados.
+    # Se o arquivo não existir, o SQLite o criará automaticamente.
+    # `check_same_thread=False` permite que a conexão seja emprestada a threads
+    # diferentes ao longo do tempo (nunca a duas ao mesmo tempo).
+    conn = sqlite3.connect(NOME_BANCO_DE_DADOS, check_same_thread=False, factory=ConexaoPerfilada)
+    logger.debug(
+        "Conexão física com o arquivo do banco de dados estabelecida.")
+
+    # Configura a conexão para que as linhas retornadas se comportem como dicionários.
+    # Isso permite acessar colunas pelo nome (ex: row['nome']) em vez de índice (ex: row[1]),
+    # tornando o código muito mais legível e menos propenso a erros.
+    conn.row_factory = sqlite3.Row
+
+    # Habilita a imposição de chaves estrangeiras (FOREIGN KEY).
+    # Este comando é CRUCIAL para a integridade dos dados. Ele garante que você
+    # não possa, por exemplo, criar uma 'ordem_servico' para um 'cliente_id' que não existe.
+    conn.execute("PRAGMA foreign_keys = ON;")
+
+    # Aplica os PRAGMAs de conexão do perfil ativo (o journal_mode é
+    # persistente no arquivo e é aplicado em `initialize_database`).
+    for nome, valor in _perfil_ativo().items():
+        if nome != "journal_mode":
+            conn.execute(f"PRAGMA {nome} = {valor};")
+    logger.info(
+        f"Nova conexão com o banco de dados '{NOME_BANCO_DE_DADOS}' aberta para o pool.")
+    return conn
+
+
+def _perfil_ativo() -> dict:
+    """Retorna os PRAGMAs do perfil configurado, recorrendo a 'rapido' se o nome for inválido."""
+    perfil = PERFIS_PRAGMA.get(PERFIL_PRAGMA)
+    if perfil is None:
+        logger.warning(
+            f"Perfil de PRAGMA '{PERFIL_PRAGMA}' desconhecido. Usando 'rapido'.")
+        perfil = PERFIS_PRAGMA["rapido"]
+    return perfil
+
+
+def verificar_pragmas(conn) -> dict:
+    """
+    Lê de volta os PRAGMAs da conexão e compara com o perfil ativo.
 
-def get_db_connection() -> sqlite3.Connection | None:
+    :param conn: Conexão a ser verificada.
+    :return: Dicionário {pragma: (esperado, atual)} apenas com as divergências.
+    """
+    divergencias = {}
+    for nome, esperado in _perfil_ativo().items():
+        atual = conn.execute(f"PRAGMA {nome};").fetchone()[0]
+        if str(atual).lower() != str(esperado).lower():
+            divergencias[nome] = (esperado, atual)
+    return divergencias
+
+
+def _obter_pool() -> PoolConexoes:
+    """Retorna o pool global, criando-o (e o diretório do banco) na primeira chamada."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # Garante que o diretório onde o banco de dados será salvo exista.
+                # Feito uma única vez, e não mais a cada conexão.
+                os.makedirs(os.path.dirname(NOME_BANCO_DE_DADOS), exist_ok=True)
+                _pool = PoolConexoes(
+                    _criar_conexao_fisica,
+                    tamanho=TAMANHO_POOL_CONEXOES,
+                    timeout=TIMEOUT_POOL_CONEXOES,
+                )
+                logger.info(
+                    f"Pool de conexões criado (tamanho máximo: {TAMANHO_POOL_CONEXOES}).")
+    return _pool
+
+
+def get_db_connection() -> ConexaoPool | None:
     """
-    Cria e retorna um objeto de conexão com o banco de dados SQLite.
+    Empresta uma conexão do pool de conexões do banco de dados SQLite.
 
     Esta é a função central e única para obter uma conexão com o banco.
-    Ela encapsula toda a lógica de criação de diretório, conexão e configuração.
+    A conexão devolvida se comporta como uma `sqlite3.Connection`:
+    - `with get_db_connection() as conn:` faz commit ao final do bloco e
+      devolve a conexão ao pool.
+    - `conn.close()` devolve a conexão ao pool (não fecha o arquivo).
 
-    :return: Um objeto de conexão (sqlite3.Connection) em caso de sucesso,
+    :return: Uma conexão emprestada (ConexaoPool) em caso de sucesso,
              ou None em caso de falha.
     """
-    # Log para registrar o início da tentativa de conexão.
-    logger.debug(
-        f"Tentando estabelecer conexão com o banco de dados em: {NOME_BANCO_DE_DADOS}"
-    )
     try:
-        # Garante que o diretório onde o banco de dados será salvo exista.
-        # os.path.dirname(NOME_BANCO_DE_DADOS) -> obtém o nome do diretório ('./data')
-        # os.makedirs(..., exist_ok=True) -> cria o diretório se ele não existir.
-        os.makedirs(os.path.dirname(NOME_BANCO_DE_DADOS), exist_ok=True)
-        logger.debug(f"Diretório '{DB_FOLDER}' verificado/criado com sucesso.")
-
-        # Tenta conectar ao arquivo do banco de dados.
-        # Se o arquivo não existir, o SQLite o criará automaticamente.
-        conn = sqlite3.connect(NOME_BANCO_DE_DADOS)
-        logger.debug(
-            "Conexão física com o arquivo do banco de dados estabelecida.")
-
-        # Configura a conexão para que as linhas retornadas se comportem como dicionários.
-        # Isso permite acessar colunas pelo nome (ex: row['nome']) em vez de índice (ex: row[1]),
-        # tornando o código muito mais legível e menos propenso a erros.
-        conn.row_factory = sqlite3.Row
-        logger.debug("Row factory da conexão configurada para sqlite3.Row.")
-
-        # Habilita a imposição de chaves estrangeiras (FOREIGN KEY).
-        # Este comando é CRUCIAL para a integridade dos dados. Ele garante que você
-        # não possa, por exemplo, criar uma 'ordem_servico' para um 'cliente_id' que não existe.
-        conn.execute("PRAGMA foreign_keys = ON;")
-        logger.debug("PRAGMA foreign_keys foi ativado para esta conexão.")
-
-        # Log de sucesso final.
-        logger.info(
-            f"Conexão com o banco de dados '{NOME_BANCO_DE_DADOS}' pronta para uso."
-        )
-        # Retorna o objeto de conexão configurado.
-        return conn
+        return _obter_pool().obter()
 
     # Captura qualquer exceção que possa ocorrer durante a conexão.
     except sqlite3.Error as e:
@@ -114,6 +224,47 @@ def get_db_connection() -> sqlite3.Connection | None:
         return None
 
 
+def configurar_pool_conexoes(tamanho: int | None = None, timeout: float | None = None):
+    """
+    Ajusta o tamanho e o timeout do pool.
+
+    Deve ser chamada antes da primeira conexão; depois disso, fecha o pool
+    atual para que o próximo seja criado com os novos valores.
+    """
+    global _pool, TAMANHO_POOL_CONEXOES, TIMEOUT_POOL_CONEXOES
+    with _pool_lock:
+        if tamanho is not None:
+            TAMANHO_POOL_CONEXOES = tamanho
+        if timeout is not None:
+            TIMEOUT_POOL_CONEXOES = timeout
+        pool_antigo, _pool = _pool, None
+    if pool_antigo is not None:
+        pool_antigo.fechar()
+
+
+def fechar_conexoes():
+    """Fecha explicitamente todas as conexões do pool (usado no encerramento do app)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.fechar()
+
+
+def obter_estatisticas_conexoes() -> dict:
+    """Retorna os contadores do pool (checkouts, esperas, vazamentos, etc.)."""
+    pool = _pool
+    return pool.estatisticas() if pool is not None else {}
+
+
+def banco_ocupado(erro: Exception) -> bool:
+    """Indica se o erro é transitório (banco ocupado/travado por outra conexão)."""
+    if not isinstance(erro, sqlite3.OperationalError):
+        return False
+    mensagem = str(erro).lower()
+    return "locked" in mensagem or "busy" in mensagem
+
+
 # --- DEFINIÇÃO DA ESTRUTURA (SCHEMA) DO BANCO DE DADOS ---
 
 # Lista contendo todos os comandos SQL para criar as tabelas da aplicação.
@@ -293,11 +444,27 @@ def initialize_database():
         return
 
     try:
+        # O modo WAL fica gravado no próprio arquivo do banco; basta aplicá-lo
+        # uma vez para que todas as conexões seguintes o utilizem.
+        modo = conn.execute(
+            f"PRAGMA journal_mode = {_perfil_ativo()['journal_mode']};").fetchone()[0]
+        logger.info(
+            f"Perfil de PRAGMA '{PERFIL_PRAGMA}' aplicado (journal_mode={modo}).")
+        divergencias = verificar_pragmas(conn)
+        if divergencias:
+            logger.warning(
+                f"PRAGMAs divergentes do perfil '{PERFIL_PRAGMA}': {divergencias}")
+
         cursor = conn.cursor()
         for table_sql in CREATE_TABLES_SQL:
             cursor.execute(table_sql)
+        # Cria (ou repovoa) os índices de busca textual das telas de gestão.
+        criar_indices_busca(cursor)
         conn.commit()
         logger.info("Esquema do banco de dados verificado/criado com sucesso.")
+
+        # Aplica as migrações pendentes (índices e mudanças de esquema posteriores).
+        aplicar_migracoes(conn)
     except sqlite3.Error as e:
         logger.error(
             f"Ocorreu um erro ao criar as tabelas: {e}", exc_info=True)
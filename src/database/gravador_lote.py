@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+
+# =================================================================================
+# MÓDULO DO GRAVADOR EM LOTE (gravador_lote.py)
+#
+# OBJETIVO: Gravar registros de alto volume que não fazem parte de uma
+#           transação de negócio (ex.: logs de auditoria) sem um commit — e um
+#           fsync — por registro.
+#
+# COMO FUNCIONA:
+#   - `adicionar()` só coloca a linha num buffer em memória e retorna.
+#   - Uma thread de fundo descarrega o buffer com `executemany` numa única
+#     transação quando ele atinge `max_linhas` ou a cada `intervalo` segundos.
+#   - `encerrar()` para a thread e descarrega o que restou de forma síncrona
+#     (registrado no atexit do main.py, antes de o pool ser fechado).
+#   - Se o banco estiver ocupado/travado, o lote volta para o início do buffer
+#     e é tentado de novo com espera crescente, até MAX_TENTATIVAS_OCUPADO
+#     vezes seguidas; depois disso é descartado.
+#   - Qualquer outro erro (ex.: chave estrangeira inválida) faz o lote ser
+#     regravado linha a linha: as linhas válidas são gravadas e as que falham
+#     são registradas no log e descartadas, sem travar as demais.
+#
+# ATENÇÃO: as linhas ainda no buffer (no máximo `intervalo` segundos de eventos)
+#          se perdem se o processo for morto sem passar pelo atexit. Não use
+#          para dados que precisam ser gravados junto com uma escrita de
+#          negócio (ex.: movimentacao_pecas), que devem ficar na mesma transação.
+# =================================================================================
+
+# --- IMPORTAÇÕES DE BIBLIOTECAS ---
+import logging
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Deque, Optional, Sequence
+
+# --- IMPORTAÇÕES DO PROJETO ---
+from src.database.database import banco_ocupado, get_db_connection
+
+# --- CONFIGURAÇÃO DO LOGGER ---
+logger = logging.getLogger(__name__)
+
+MAX_LINHAS_PADRAO = 200
+INTERVALO_PADRAO = 0.05
+# Tentativas seguidas com o banco ocupado antes de descartar o lote.
+MAX_TENTATIVAS_OCUPADO = 8
+# Espera máxima (em segundos) entre duas tentativas com o banco ocupado.
+ESPERA_MAXIMA_OCUPADO = 5.0
+
+
+class GravadorEmLote:
+    """
+    Buffer de linhas gravadas com group commit.
+
+    :param nome: Nome do gravador, usado nos logs e na thread.
+    :param sql_insert: Comando INSERT com parâmetros '?' (uma linha = uma tupla).
+    :param max_linhas: Quantidade de linhas que dispara uma descarga imediata.
+    :param intervalo: Tempo máximo (em segundos) que uma linha espera no buffer.
+    """
+
+    def __init__(self, nome: str, sql_insert: str, max_linhas: int = MAX_LINHAS_PADRAO, intervalo: float = INTERVALO_PADRAO):
+        self.nome = nome
+        self.sql_insert = sql_insert
+        self.max_linhas = max_linhas
+        self.intervalo = intervalo
+        self._buffer: Deque[Sequence] = deque()
+        self._lock = threading.Lock()
+        # Garante que duas descargas (thread e encerramento) não se intercalem.
+        self._lock_descarga = threading.Lock()
+        self._cheio = threading.Event()
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # --- Contadores expostos por `estatisticas()` ---
+        self._gravadas = 0
+        self._descargas = 0
+        self._falhas = 0
+        self._descartadas = 0
+        # Tentativas seguidas com o banco ocupado e instante da próxima.
+        self._tentativas_ocupado = 0
+        self._proxima_tentativa = 0.0
+
+    @property
+    def pendentes(self) -> int:
+        """Quantidade de linhas aguardando gravação."""
+        with self._lock:
+            return len(self._buffer)
+
+    def adicionar(self, linha: Sequence):
+        """Coloca a linha no buffer. A thread de fundo é iniciada na primeira chamada."""
+        with self._lock:
+            self._buffer.append(linha)
+            cheio = len(self._buffer) >= self.max_linhas
+            if self._thread is None and not self._parar.is_set():
+                self._thread = threading.Thread(
+                    target=self._trabalhar, name=f"gravador-{self.nome}", daemon=True)
+                self._thread.start()
+        if cheio:
+            self._cheio.set()
+
+    def descarregar(self) -> int:
+        """Grava agora todas as linhas do buffer. Retorna quantas foram gravadas."""
+        with self._lock_descarga:
+            with self._lock:
+                linhas = list(self._buffer)
+                self._buffer.clear()
+            if not linhas:
+                return 0
+            try:
+                try:
+                    with get_db_connection() as conn:
+                        conn.executemany(self.sql_insert, linhas)
+                    gravadas = len(linhas)
+                except sqlite3.Error as e:
+                    if banco_ocupado(e):
+                        raise
+                    logger.warning(
+                        f"Gravador '{self.nome}': lote de {len(linhas)} linha(s) rejeitado ({e}); gravando linha a linha.")
+                    gravadas = self._gravar_linha_a_linha(linhas)
+            except sqlite3.Error as e:
+                self._adiar(linhas, e)
+                return 0
+            with self._lock:
+                self._gravadas += gravadas
+                self._descargas += 1
+                self._tentativas_ocupado = 0
+            logger.debug(f"Gravador '{self.nome}': {gravadas} linha(s) gravada(s) em um commit.")
+            return gravadas
+
+    def _gravar_linha_a_linha(self, linhas: list) -> int:
+        """
+        Grava cada linha separadamente na mesma transação. No SQLite, um erro
+        de restrição desfaz só o comando que falhou; as demais linhas seguem.
+        Erros de banco ocupado são propagados para que o lote inteiro seja adiado.
+        """
+        gravadas = 0
+        with get_db_connection() as conn:
+            for linha in linhas:
+                try:
+                    conn.execute(self.sql_insert, linha)
+                    gravadas += 1
+                except sqlite3.Error as e:
+                    if banco_ocupado(e):
+                        raise
+                    logger.error(f"Gravador '{self.nome}': linha descartada {tuple(linha)!r}: {e}")
+                    with self._lock:
+                        self._descartadas += 1
+        return gravadas
+
+    def _adiar(self, linhas: list, erro: Exception):
+        """Devolve o lote ao buffer com espera crescente, ou o descarta após MAX_TENTATIVAS_OCUPADO."""
+        with self._lock:
+            self._falhas += 1
+            self._tentativas_ocupado += 1
+            tentativas = self._tentativas_ocupado
+            if tentativas > MAX_TENTATIVAS_OCUPADO:
+                self._descartadas += len(linhas)
+                self._tentativas_ocupado = 0
+            else:
+                self._buffer.extendleft(reversed(linhas))
+                espera = min(ESPERA_MAXIMA_OCUPADO, self.intervalo * (2 ** tentativas))
+                self._proxima_tentativa = time.monotonic() + espera
+        if tentativas > MAX_TENTATIVAS_OCUPADO:
+            logger.error(
+                f"Gravador '{self.nome}': banco ocupado em {MAX_TENTATIVAS_OCUPADO} tentativas seguidas; "
+                f"{len(linhas)} linha(s) descartada(s): {erro}")
+        else:
+            logger.warning(
+                f"Gravador '{self.nome}': banco ocupado ({erro}); {len(linhas)} linha(s) serão tentadas "
+                f"de novo em {espera:.2f}s (tentativa {tentativas}).")
+
+    def encerrar(self, timeout: float = 5.0):
+        """Para a thread de fundo e grava o que restou no buffer (chamada síncrona)."""
+        self._parar.set()
+        self._cheio.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.descarregar()
+        if self.pendentes:
+            logger.warning(
+                f"Gravador '{self.nome}' encerrado com {self.pendentes} linha(s) não gravada(s).")
+
+    def estatisticas(self) -> dict:
+        """Retorna a profundidade do buffer e os contadores de gravação."""
+        with self._lock:
+            return {
+                "pendentes": len(self._buffer),
+                "gravadas": self._gravadas,
+                "descargas": self._descargas,
+                "falhas": self._falhas,
+                "descartadas": self._descartadas,
+            }
+
+    def _trabalhar(self):
+        while not self._parar.is_set():
+            self._cheio.wait(self.intervalo)
+            self._cheio.clear()
+            # Com o banco ocupado, espera o fim do intervalo de nova tentativa.
+            if time.monotonic() < self._proxima_tentativa:
+                continue
+            self.descarregar()
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+# =================================================================================
+# MÓDULO DE CHAVES DE IDEMPOTÊNCIA (idempotencia.py)
+#
+# OBJETIVO: Impedir que a mesma operação de escrita seja aplicada duas vezes
+#           (duplo clique, repetição da fila, reprocessamento da outbox).
+#
+# COMO FUNCIONA:
+#   - A interface gera uma chave (`nova_chave()`) por operação e a envia junto
+#     com os dados da tarefa. Repetições da mesma operação usam a mesma chave.
+#   - Dentro da transação de negócio, a query chama `obter_resultado()`. Se a
+#     chave já existe, a operação já foi aplicada e o resultado original é
+#     devolvido, sem gravar nada de novo.
+#   - Caso contrário, a query grava os dados e chama `registrar_resultado()`
+#     antes do commit. A chave é a PRIMARY KEY da tabela, então duas
+#     transações com a mesma chave nunca são confirmadas juntas.
+# =================================================================================
+
+# --- IMPORTAÇÕES DE BIBLIOTECAS ---
+import logging
+import sqlite3
+import uuid
+from datetime import datetime
+from typing import Optional
+
+# --- CONFIGURAÇÃO DO LOGGER ---
+logger = logging.getLogger(__name__)
+
+
+def nova_chave() -> str:
+    """Gera uma chave de idempotência nova para uma operação."""
+    return uuid.uuid4().hex
+
+
+def obter_resultado(cursor: sqlite3.Cursor, chave: Optional[str]) -> Optional[str]:
+    """
+    Retorna o resultado gravado para a chave, ou None se a operação ainda não
+    foi aplicada (ou se não há chave).
+    """
+    if not chave:
+        return None
+    linha = cursor.execute(
+        "SELECT resultado FROM chaves_idempotencia WHERE chave = ?", (chave,)).fetchone()
+    return linha[0] if linha else None
+
+
+def registrar_resultado(cursor: sqlite3.Cursor, chave: Optional[str], operacao: str, resultado: str):
+    """
+    Grava a chave com o resultado da operação, dentro da transação da query.
+
+    :raises sqlite3.IntegrityError: Se outra transação já gravou a mesma chave.
+    """
+    if not chave:
+        return
+    cursor.execute(
+        "INSERT INTO chaves_idempotencia (chave, operacao, resultado, criada_em) VALUES (?, ?, ?, ?)",
+        (chave, operacao, resultado, datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+    )
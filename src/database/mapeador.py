@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+# =================================================================================
+# MÓDULO DO MAPEADOR DE LINHAS (mapeador.py)
+#
+# OBJETIVO: Converter linhas do banco em objetos dos modelos sem passar por um
+#           dicionário por linha (`Modelo(**row)`), o que pesa ao carregar
+#           catálogos grandes.
+#
+# COMO FUNCIONA:
+#   - A ordem das colunas do cursor (`cursor.description`) é comparada UMA VEZ
+#     com os parâmetros do construtor do modelo. O resultado é um "montador"
+#     que pega os valores pela posição e chama o construtor com argumentos
+#     posicionais.
+#   - Montadores ficam em cache por (modelo, colunas): a mesma consulta
+#     executada de novo não refaz a comparação.
+#   - Colunas que não são parâmetros do construtor (ex.: aliases de um JOIN)
+#     são ignoradas. Funciona tanto com tuplas quanto com sqlite3.Row; para o
+#     menor custo, use `cursor.row_factory = None` antes do execute.
+# =================================================================================
+
+# --- IMPORTAÇÕES DE BIBLIOTECAS ---
+import inspect
+import sqlite3
+from functools import lru_cache
+from operator import itemgetter
+from typing import Callable, List, Optional, Sequence, Tuple, Type, TypeVar
+
+T = TypeVar("T")
+
+
+@lru_cache(maxsize=None)
+def _parametros_construtor(modelo: type) -> Tuple[Tuple[str, bool], ...]:
+    """Retorna (nome, obrigatório) de cada parâmetro do __init__ do modelo, em ordem."""
+    assinatura = inspect.signature(modelo.__init__)
+    return tuple(
+        (nome, parametro.default is inspect.Parameter.empty)
+        for nome, parametro in list(assinatura.parameters.items())[1:]
+    )
+
+
+@lru_cache(maxsize=256)
+def _montador(modelo: type, colunas: Tuple[str, ...]) -> Callable[[Sequence], object]:
+    posicoes = {nome: indice for indice, nome in enumerate(colunas)}
+    nomes: List[str] = []
+    indices: List[int] = []
+    lacuna = faltando_no_meio = False
+    for nome, obrigatorio in _parametros_construtor(modelo):
+        if nome in posicoes:
+            faltando_no_meio = faltando_no_meio or lacuna
+            nomes.append(nome)
+            indices.append(posicoes[nome])
+        elif obrigatorio:
+            raise ValueError(
+                f"A consulta não retornou a coluna '{nome}', exigida por {modelo.__name__}.")
+        else:
+            # Opcional ausente: o construtor usa o valor padrão.
+            lacuna = True
+
+    if not faltando_no_meio and indices == list(range(len(colunas))):
+        # Colunas na mesma ordem do construtor, sem lacunas: a linha é usada como está.
+        return lambda linha: modelo(*linha)
+    pegar = itemgetter(*indices) if len(indices) > 1 else (lambda linha: (linha[indices[0]],))
+    if not faltando_no_meio:
+        return lambda linha: modelo(*pegar(linha))
+    # Algum parâmetro opcional ficou de fora antes de outro presente:
+    # os valores precisam ir por nome.
+    return lambda linha: modelo(**dict(zip(nomes, pegar(linha))))
+
+
+def criar_mapeador(cursor: sqlite3.Cursor, modelo: Type[T]) -> Callable[[Sequence], T]:
+    """
+    Retorna a função que monta um `modelo` a partir de uma linha do `cursor`,
+    com a ordem das colunas já resolvida. Chame depois do execute.
+
+    :raises ValueError: Se faltar uma coluna obrigatória para o construtor.
+    """
+    return _montador(modelo, tuple(coluna[0] for coluna in cursor.description))
+
+
+def mapear_linhas(cursor: sqlite3.Cursor, modelo: Type[T], linhas: Optional[Sequence[Sequence]] = None) -> List[T]:
+    """
+    Monta um `modelo` para cada linha. Sem `linhas`, consome o restante do cursor.
+    """
+    if linhas is None:
+        linhas = cursor.fetchall()
+    if not linhas:
+        return []
+    montar = criar_mapeador(cursor, modelo)
+    return list(map(montar, linhas))
+
+
+def mapear_linha(cursor: sqlite3.Cursor, modelo: Type[T], linha: Optional[Sequence]) -> Optional[T]:
+    """Monta um único `modelo` (ou None, se a linha for None)."""
+    return criar_mapeador(cursor, modelo)(linha) if linha is not None else None
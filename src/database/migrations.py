@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+
+# =================================================================================
+# MÓDULO DE MIGRAÇÕES DO ESQUEMA (migrations.py)
+#
+# OBJETIVO: Aplicar, em ordem e uma única vez, as alterações de esquema feitas
+#           depois da criação inicial das tabelas (`CREATE_TABLES_SQL`).
+#
+# COMO FUNCIONA:
+#   - A tabela `schema_version` registra cada versão já aplicada.
+#   - Na inicialização, `aplicar_migracoes()` executa apenas as migrações com
+#     versão maior que a última registrada, cada uma em sua própria transação.
+#   - Para adicionar uma mudança de esquema, acrescente uma nova entrada ao
+#     final de `MIGRACOES` com o próximo número de versão. Nunca altere uma
+#     migração que já foi distribuída.
+# =================================================================================
+
+# --- IMPORTAÇÕES DE BIBLIOTECAS ---
+import logging
+import sqlite3
+from datetime import datetime
+from typing import Callable, List, Tuple, Union
+
+# --- CONFIGURAÇÃO DO LOGGER ---
+logger = logging.getLogger(__name__)
+
+# Um passo de migração é um comando SQL ou uma função que recebe o cursor
+# (útil para migrações de dados que precisam de lógica em Python).
+PassoMigracao = Union[str, Callable[[sqlite3.Cursor], None]]
+
+CREATE_SCHEMA_VERSION_SQL = """
+    CREATE TABLE IF NOT EXISTS schema_version (
+        versao INTEGER PRIMARY KEY,
+        descricao TEXT NOT NULL,
+        aplicada_em TEXT NOT NULL
+    );
+"""
+
+# --- LISTA DE MIGRAÇÕES ---
+# Cada item: (versão, descrição, [passos]). As versões devem ser crescentes.
+MIGRACOES: List[Tuple[int, str, List[PassoMigracao]]] = [
+    (1, "Índices para chaves estrangeiras e filtros mais usados", [
+        # Carros de um cliente (tela de OS e triggers de busca).
+        "CREATE INDEX IF NOT EXISTS idx_carros_cliente_id ON carros (cliente_id)",
+        # Relatório de OS por cliente e período.
+        "CREATE INDEX IF NOT EXISTS idx_ordem_servico_cliente_data ON ordem_servico (cliente_id, data_criacao)",
+        "CREATE INDEX IF NOT EXISTS idx_ordem_servico_carro_id ON ordem_servico (carro_id)",
+        "CREATE INDEX IF NOT EXISTS idx_ordem_servico_data_criacao ON ordem_servico (data_criacao)",
+        # Saldo de estoque: índice de cobertura, o SUM é resolvido sem ler a tabela.
+        "CREATE INDEX IF NOT EXISTS idx_movimentacao_pecas_peca ON movimentacao_pecas (peca_id, tipo_movimentacao, quantidade)",
+        "CREATE INDEX IF NOT EXISTS idx_movimentacao_pecas_ordem_servico_id ON movimentacao_pecas (ordem_servico_id)",
+        "CREATE INDEX IF NOT EXISTS idx_pecas_ordem_servico_os_id ON PecasOrdemServico (ordem_servico_id)",
+        # Exclusão em cascata a partir de 'pecas' sem varrer a tabela de junção.
+        "CREATE INDEX IF NOT EXISTS idx_servicos_pecas_peca_id ON servicos_pecas (peca_id)",
+        # Listas filtradas por 'ativo' e ordenadas por nome.
+        "CREATE INDEX IF NOT EXISTS idx_clientes_ativo_nome ON clientes (ativo, nome)",
+        "CREATE INDEX IF NOT EXISTS idx_carros_ativo ON carros (ativo)",
+        "CREATE INDEX IF NOT EXISTS idx_pecas_ativo_nome ON pecas (ativo, nome)",
+        "CREATE INDEX IF NOT EXISTS idx_mecanicos_ativo_nome ON mecanicos (ativo, nome)",
+        "CREATE INDEX IF NOT EXISTS idx_servicos_ativo_nome ON servicos (ativo, nome)",
+    ]),
+    (2, "Índices por nome para a paginação por keyset (nome, id)", [
+        # clientes e servicos já têm índice em 'nome' pelo UNIQUE.
+        "CREATE INDEX IF NOT EXISTS idx_pecas_nome ON pecas (nome)",
+        "CREATE INDEX IF NOT EXISTS idx_mecanicos_nome ON mecanicos (nome)",
+    ]),
+    (3, "Outbox persistente para as tarefas de escrita da fila", [
+        """
+        CREATE TABLE IF NOT EXISTS outbox_tarefas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nome TEXT NOT NULL,
+            dados TEXT NOT NULL,
+            prioridade INTEGER NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pendente',
+            tentativas INTEGER NOT NULL DEFAULT 0,
+            erro TEXT,
+            criada_em TEXT NOT NULL,
+            concluida_em TEXT
+        )
+        """,
+        # Reprocessamento na inicialização e limpeza das concluídas.
+        "CREATE INDEX IF NOT EXISTS idx_outbox_tarefas_status ON outbox_tarefas (status, id)",
+    ]),
+    (4, "Chaves de idempotência das operações de escrita", [
+        # A chave é a PRIMARY KEY: duas gravações da mesma operação não coexistem.
+        """
+        CREATE TABLE IF NOT EXISTS chaves_idempotencia (
+            chave TEXT PRIMARY KEY,
+            operacao TEXT NOT NULL,
+            resultado TEXT NOT NULL,
+            criada_em TEXT NOT NULL
+        ) WITHOUT ROWID
+        """,
+    ]),
+    (5, "Saldo de estoque materializado e snapshots periódicos", [
+        # Totais por peça, mantidos pelos triggers abaixo na mesma transação
+        # que grava a movimentação.
+        """
+        CREATE TABLE IF NOT EXISTS saldo_estoque (
+            peca_id INTEGER PRIMARY KEY REFERENCES pecas(id) ON DELETE CASCADE,
+            total_entradas INTEGER NOT NULL DEFAULT 0,
+            total_saidas INTEGER NOT NULL DEFAULT 0
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS movimentacao_pecas_saldo_ai AFTER INSERT ON movimentacao_pecas BEGIN
+            INSERT INTO saldo_estoque (peca_id, total_entradas, total_saidas)
+            VALUES (
+                new.peca_id,
+                CASE WHEN new.tipo_movimentacao = 'entrada' THEN new.quantidade ELSE 0 END,
+                CASE WHEN new.tipo_movimentacao = 'saida' THEN new.quantidade ELSE 0 END
+            )
+            ON CONFLICT (peca_id) DO UPDATE SET
+                total_entradas = total_entradas + excluded.total_entradas,
+                total_saidas = total_saidas + excluded.total_saidas;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS movimentacao_pecas_saldo_ad AFTER DELETE ON movimentacao_pecas BEGIN
+            UPDATE saldo_estoque SET
+                total_entradas = total_entradas - CASE WHEN old.tipo_movimentacao = 'entrada' THEN old.quantidade ELSE 0 END,
+                total_saidas = total_saidas - CASE WHEN old.tipo_movimentacao = 'saida' THEN old.quantidade ELSE 0 END
+            WHERE peca_id = old.peca_id;
+        END
+        """,
+        # Carga inicial a partir do histórico existente.
+        """
+        INSERT OR REPLACE INTO saldo_estoque (peca_id, total_entradas, total_saidas)
+        SELECT
+            peca_id,
+            SUM(CASE WHEN tipo_movimentacao = 'entrada' THEN quantidade ELSE 0 END),
+            SUM(CASE WHEN tipo_movimentacao = 'saida' THEN quantidade ELSE 0 END)
+        FROM movimentacao_pecas
+        GROUP BY peca_id
+        """,
+        # Cada snapshot guarda os totais até a movimentação `ultimo_movimento_id`.
+        """
+        CREATE TABLE IF NOT EXISTS snapshots_estoque (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            data_corte TEXT NOT NULL,
+            ultimo_movimento_id INTEGER NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_snapshots_estoque_data ON snapshots_estoque (data_corte)",
+        """
+        CREATE TABLE IF NOT EXISTS snapshot_saldo_estoque (
+            snapshot_id INTEGER NOT NULL REFERENCES snapshots_estoque(id) ON DELETE CASCADE,
+            peca_id INTEGER NOT NULL,
+            total_entradas INTEGER NOT NULL,
+            total_saidas INTEGER NOT NULL,
+            PRIMARY KEY (snapshot_id, peca_id)
+        ) WITHOUT ROWID
+        """,
+    ]),
+    (6, "Índice do kardex: movimentações de uma peça em ordem cronológica", [
+        "CREATE INDEX IF NOT EXISTS idx_movimentacao_pecas_peca_data ON movimentacao_pecas (peca_id, data_movimentacao, id)",
+    ]),
+    (7, "Quantidade de cada peça no kit do serviço", [
+        "ALTER TABLE servicos_pecas ADD COLUMN quantidade INTEGER NOT NULL DEFAULT 1 CHECK (quantidade > 0)",
+    ]),
+    (8, "Índices de cobertura para as listagens (projeções *Resumo)", [
+        # Começam em (nome, id), a chave da paginação, e trazem as demais
+        # colunas da lista: a página é lida só do índice.
+        "CREATE INDEX IF NOT EXISTS idx_pecas_resumo ON pecas (nome, id, referencia, preco_venda, quantidade_em_estoque, ativo)",
+        "CREATE INDEX IF NOT EXISTS idx_clientes_resumo ON clientes (nome, id, telefone, ativo)",
+        "CREATE INDEX IF NOT EXISTS idx_mecanicos_resumo ON mecanicos (nome, id, especialidade, ativo)",
+        "CREATE INDEX IF NOT EXISTS idx_servicos_resumo ON servicos (nome, id, valor, ativo)",
+        # Os índices só por nome da migração 2 ficam redundantes.
+        "DROP INDEX IF EXISTS idx_pecas_nome",
+        "DROP INDEX IF EXISTS idx_mecanicos_nome",
+    ]),
+]
+
+
+def obter_versao_esquema(cursor: sqlite3.Cursor) -> int:
+    """Retorna a maior versão de migração já aplicada (0 se nenhuma)."""
+    cursor.execute(CREATE_SCHEMA_VERSION_SQL)
+    versao = cursor.execute(
+        "SELECT MAX(versao) FROM schema_version").fetchone()[0]
+    return versao or 0
+
+
+def aplicar_migracoes(conn: sqlite3.Connection) -> int:
+    """
+    Aplica as migrações pendentes, cada uma numa transação própria.
+
+    Se uma migração falhar, ela é revertida e as seguintes não são executadas;
+    a próxima inicialização tentará novamente a partir do mesmo ponto.
+
+    :param conn: Conexão com o banco (sem transação aberta).
+    :return: A versão do esquema após a execução.
+    """
+    cursor = conn.cursor()
+    versao_atual = obter_versao_esquema(cursor)
+    conn.commit()
+
+    pendentes = [m for m in MIGRACOES if m[0] > versao_atual]
+    if not pendentes:
+        logger.info(f"Esquema do banco já está na versão {versao_atual}.")
+        return versao_atual
+
+    for versao, descricao, passos in pendentes:
+        logger.info(f"Aplicando migração {versao}: {descricao}")
+        try:
+            # BEGIN explícito: o módulo sqlite3 não abre transação sozinho
+            # antes de comandos DDL como CREATE INDEX.
+            cursor.execute("BEGIN")
+            for passo in passos:
+                if callable(passo):
+                    passo(cursor)
+                else:
+                    cursor.execute(passo)
+            cursor.execute(
+                "INSERT INTO schema_version (versao, descricao, aplicada_em) VALUES (?, ?, ?)",
+                (versao, descricao, datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+            )
+            conn.commit()
+            versao_atual = versao
+        except sqlite3.Error as e:
+            logger.error(
+                f"Falha ao aplicar a migração {versao}. Transação revertida: {e}", exc_info=True)
+            conn.rollback()
+            raise
+
+    # Atualiza as estatísticas do planejador para os novos índices.
+    cursor.execute("PRAGMA optimize")
+    logger.info(f"Esquema do banco atualizado para a versão {versao_atual}.")
+    return versao_atual
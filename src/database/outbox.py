@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+
+# =================================================================================
+# MÓDULO DA OUTBOX DE TAREFAS (outbox.py)
+#
+# OBJETIVO: Gravar em disco as tarefas de escrita antes de colocá-las na fila em
+#           memória, para que uma OS enviada não se perca se o processo cair
+#           antes de o worker processá-la.
+#
+# COMO FUNCIONA:
+#   1. `registrar()` insere a tarefa na tabela `outbox_tarefas` como 'pendente'.
+#      Chamadas simultâneas são agrupadas num único commit ("group commit"):
+#      a primeira thread a chegar grava, numa só transação, todos os registros
+#      que chegaram enquanto ela esperava.
+#   2. A query de negócio chama `marcar_concluida(cursor, outbox_id)` ANTES do
+#      seu commit. Assim, a gravação e a baixa na outbox acontecem na mesma
+#      transação: ou as duas ficam no banco, ou nenhuma.
+#   3. Na inicialização, as tarefas ainda 'pendentes' são reenviadas à fila.
+# =================================================================================
+
+# --- IMPORTAÇÕES DE BIBLIOTECAS ---
+import json
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, List, Optional
+
+# --- IMPORTAÇÕES DO PROJETO ---
+from src.database.database import get_db_connection
+
+# --- CONFIGURAÇÃO DO LOGGER ---
+logger = logging.getLogger(__name__)
+
+STATUS_PENDENTE = "pendente"
+STATUS_CONCLUIDA = "concluida"
+STATUS_FALHA = "falha"
+
+# Tempo (em segundos) que a thread que fará o commit espera por outras
+# chamadas concorrentes antes de gravar o grupo.
+JANELA_GROUP_COMMIT = 0.002
+
+
+class _PedidoOutbox:
+    """Um registro aguardando o commit do grupo."""
+
+    def __init__(self, nome: str, dados_json: str, prioridade: int):
+        self.nome = nome
+        self.dados_json = dados_json
+        self.prioridade = prioridade
+        self.id: Optional[int] = None
+        self.erro: Optional[Exception] = None
+        self.gravado = threading.Event()
+
+
+class OutboxTarefas:
+    """
+    Outbox persistente com group commit.
+
+    :param janela: Tempo de espera por chamadas concorrentes antes do commit.
+    """
+
+    def __init__(self, janela: float = JANELA_GROUP_COMMIT):
+        self.janela = janela
+        self._lock = threading.Lock()
+        self._fila: List[_PedidoOutbox] = []
+        self._gravando = False
+        # --- Contadores expostos por `estatisticas()` ---
+        self._registros = 0
+        self._commits = 0
+
+    def registrar(self, nome: str, dados: Any, prioridade: int) -> int:
+        """
+        Grava a tarefa como 'pendente' e só retorna depois do commit.
+
+        :return: O id da tarefa na outbox.
+        :raises sqlite3.Error: Se a gravação do grupo falhar.
+        """
+        pedido = _PedidoOutbox(nome, json.dumps(dados), prioridade)
+        with self._lock:
+            self._fila.append(pedido)
+            lider = not self._gravando
+            self._gravando = True
+
+        if lider:
+            # Dá uma chance às outras threads de entrarem no mesmo commit.
+            time.sleep(self.janela)
+            while True:
+                with self._lock:
+                    grupo, self._fila = self._fila, []
+                    if not grupo:
+                        self._gravando = False
+                        break
+                self._gravar_grupo(grupo)
+        else:
+            pedido.gravado.wait()
+
+        if pedido.erro is not None:
+            raise pedido.erro
+        return pedido.id
+
+    def _gravar_grupo(self, grupo: List[_PedidoOutbox]):
+        agora = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        try:
+            with get_db_connection() as conn:
+                cursor = conn.cursor()
+                for pedido in grupo:
+                    cursor.execute(
+                        "INSERT INTO outbox_tarefas (nome, dados, prioridade, status, criada_em) VALUES (?, ?, ?, ?, ?)",
+                        (pedido.nome, pedido.dados_json, pedido.prioridade, STATUS_PENDENTE, agora),
+                    )
+                    pedido.id = cursor.lastrowid
+            with self._lock:
+                self._registros += len(grupo)
+                self._commits += 1
+            logger.debug(f"Outbox: {len(grupo)} tarefa(s) gravada(s) em um commit.")
+        except sqlite3.Error as e:
+            logger.error(f"Erro ao gravar tarefas na outbox: {e}", exc_info=True)
+            for pedido in grupo:
+                pedido.id = None
+                pedido.erro = e
+        finally:
+            for pedido in grupo:
+                pedido.gravado.set()
+
+    def estatisticas(self) -> dict:
+        """Retorna quantos registros foram gravados e em quantos commits."""
+        with self._lock:
+            return {"registros": self._registros, "commits": self._commits}
+
+
+def marcar_concluida(cursor: sqlite3.Cursor, outbox_id: Optional[int]):
+    """
+    Dá baixa na tarefa dentro da transação da query de negócio.
+    Não faz nada se a tarefa não veio da outbox (`outbox_id` None).
+    """
+    if outbox_id is None:
+        return
+    cursor.execute(
+        "UPDATE outbox_tarefas SET status = ?, concluida_em = ? WHERE id = ?",
+        (STATUS_CONCLUIDA, datetime.now().strftime("%Y-%m-%d %H:%M:%S"), outbox_id),
+    )
+
+
+def marcar_falha(outbox_id: int, erro: str):
+    """Marca a tarefa como 'falha' para que ela não seja reprocessada a cada inicialização."""
+    try:
+        with get_db_connection() as conn:
+            conn.execute(
+                "UPDATE outbox_tarefas SET status = ?, tentativas = tentativas + 1, erro = ? WHERE id = ? AND status = ?",
+                (STATUS_FALHA, erro, outbox_id, STATUS_PENDENTE),
+            )
+    except sqlite3.Error as e:
+        logger.error(
+            f"Erro ao marcar a tarefa {outbox_id} da outbox como falha: {e}", exc_info=True)
+
+
+def obter_pendentes() -> List[dict]:
+    """Retorna as tarefas ainda pendentes, na ordem em que foram gravadas."""
+    try:
+        with get_db_connection() as conn:
+            linhas = conn.execute(
+                "SELECT id, nome, dados, prioridade FROM outbox_tarefas WHERE status = ? ORDER BY id",
+                (STATUS_PENDENTE,),
+            ).fetchall()
+            return [
+                {"id": linha["id"], "nome": linha["nome"],
+                 "dados": json.loads(linha["dados"]), "prioridade": linha["prioridade"]}
+                for linha in linhas
+            ]
+    except sqlite3.Error as e:
+        logger.error(f"Erro ao ler as tarefas pendentes da outbox: {e}", exc_info=True)
+        return []
+
+
+def limpar_concluidas(dias: int = 30) -> int:
+    """Remove as tarefas concluídas há mais de `dias` dias. Retorna quantas foram removidas."""
+    limite = (datetime.now() - timedelta(days=dias)).strftime("%Y-%m-%d %H:%M:%S")
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.execute(
+                "DELETE FROM outbox_tarefas WHERE status = ? AND concluida_em < ?",
+                (STATUS_CONCLUIDA, limite),
+            )
+            return cursor.rowcount
+    except sqlite3.Error as e:
+        logger.error(f"Erro ao limpar a outbox: {e}", exc_info=True)
+        return 0
+
+
+# Instância única usada pelo serviço de tarefas.
+outbox_tarefas = OutboxTarefas()
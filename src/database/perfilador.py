@@ -0,0 +1,347 @@
+# -*- coding: utf-8 -*-
+
+# =================================================================================
+# MÓDULO DO PERFILADOR DE CONSULTAS (perfilador.py)
+#
+# OBJETIVO: Medir, por comando SQL, o tempo gasto e as linhas retornadas, para
+#           que o trabalho em índices e queries seja guiado por dados.
+#
+# COMO FUNCIONA:
+#   - Toda conexão física do pool é uma `ConexaoPerfilada` (ver database.py).
+#     Com o perfilador desligado, ela entrega cursores comuns: o custo é só o
+#     de uma chamada de método a mais por cursor.
+#   - Ligado, os cursores são `CursorPerfilado`: o tempo do execute e de cada
+#     fetch é somado até o resultado ser esgotado (ou o cursor reutilizado ou
+#     fechado). Só então o comando é contabilizado.
+#   - As estatísticas são agrupadas pelo texto do SQL (espaços normalizados):
+#     execuções, tempo total e máximo, linhas e um histograma de latência.
+#   - Comandos acima do limiar entram no log de consultas lentas com o
+#     EXPLAIN QUERY PLAN (executado na mesma conexão, com os mesmos
+#     parâmetros) e a função que os chamou. No `executemany`, o plano é obtido
+#     com o primeiro conjunto de parâmetros (o SQL é o mesmo para todos).
+#
+# CONFIGURAÇÃO:
+#   - OFICINA_DB_PERFILADOR=1 liga o perfilador desde a inicialização. Ele
+#     também pode ser ligado e desligado pela tela "Perfil de Consultas".
+#   - OFICINA_DB_LENTA_MS define o limiar de consulta lenta (padrão: 100 ms).
+# =================================================================================
+
+# --- IMPORTAÇÕES DE BIBLIOTECAS ---
+import itertools
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+
+# --- CONFIGURAÇÃO DO LOGGER ---
+logger = logging.getLogger(__name__)
+
+PERFILADOR_ATIVO = os.environ.get("OFICINA_DB_PERFILADOR", "0") == "1"
+LIMIAR_LENTA_MS = float(os.environ.get("OFICINA_DB_LENTA_MS", "100"))
+
+# Limites superiores (em ms) das faixas do histograma; a última faixa é "acima".
+FAIXAS_HISTOGRAMA_MS = (1, 5, 10, 50, 100, 500, 1000)
+# Quantidade de consultas lentas mantidas em memória (as mais antigas saem).
+MAX_CONSULTAS_LENTAS = 200
+# Quantos chamadores distintos são guardados por comando.
+MAX_CHAMADORES = 5
+
+# Plano registrado quando o EXPLAIN de um `executemany` não retorna nada.
+PLANO_EXECUTEMANY_INDISPONIVEL = ["sem plano (executemany)"]
+
+# Módulos ignorados ao procurar a função que executou o comando.
+_MODULOS_INTERNOS = frozenset({__name__, "src.database.connection_pool"})
+
+
+def _normalizar_sql(sql: str) -> str:
+    return " ".join(sql.split())
+
+
+def _chamador() -> str:
+    """Retorna as duas funções mais próximas fora da camada de conexão (ex.: 'a.f <- a.g')."""
+    quadro = sys._getframe(2)
+    nomes: List[str] = []
+    while quadro is not None and len(nomes) < 2:
+        modulo = quadro.f_globals.get("__name__", "?")
+        if modulo not in _MODULOS_INTERNOS:
+            nomes.append(f"{modulo}.{quadro.f_code.co_name}:{quadro.f_lineno}")
+        quadro = quadro.f_back
+    return " <- ".join(nomes) or "?"
+
+
+class _EstatisticaComando:
+    """Acumulado de um comando SQL."""
+
+    __slots__ = ("execucoes", "total_ms", "maximo_ms", "linhas", "histograma", "chamadores")
+
+    def __init__(self):
+        self.execucoes = 0
+        self.total_ms = 0.0
+        self.maximo_ms = 0.0
+        self.linhas = 0
+        self.histograma = [0] * (len(FAIXAS_HISTOGRAMA_MS) + 1)
+        self.chamadores: Dict[str, int] = {}
+
+
+class PerfiladorConsultas:
+    """
+    Coleta as medições dos cursores perfilados.
+
+    :param ativo: Se o perfilador começa ligado.
+    :param limiar_lenta_ms: Duração a partir da qual um comando é "lento".
+    """
+
+    def __init__(self, ativo: bool = PERFILADOR_ATIVO, limiar_lenta_ms: float = LIMIAR_LENTA_MS):
+        self.ativo = ativo
+        self.limiar_lenta_ms = limiar_lenta_ms
+        self._lock = threading.Lock()
+        self._comandos: Dict[str, _EstatisticaComando] = {}
+        self._lentas: Deque[dict] = deque(maxlen=MAX_CONSULTAS_LENTAS)
+        self._inicio = datetime.now()
+
+    def ativar(self, limiar_lenta_ms: Optional[float] = None):
+        """Liga o perfilador (vale para os próximos cursores de todas as conexões)."""
+        if limiar_lenta_ms is not None:
+            self.limiar_lenta_ms = limiar_lenta_ms
+        self.ativo = True
+        logger.info(f"Perfilador de consultas ligado (limiar de lentidão: {self.limiar_lenta_ms} ms).")
+
+    def desativar(self):
+        """Desliga o perfilador. Os dados coletados são mantidos."""
+        self.ativo = False
+        logger.info("Perfilador de consultas desligado.")
+
+    def limpar(self):
+        """Descarta todas as medições."""
+        with self._lock:
+            self._comandos.clear()
+            self._lentas.clear()
+            self._inicio = datetime.now()
+
+    def registrar(self, sql: str, duracao_ms: float, linhas: int, chamador: str, plano: Optional[List[str]] = None):
+        """Contabiliza uma execução. `plano` só é informado para comandos lentos."""
+        chave = _normalizar_sql(sql)
+        faixa = len(FAIXAS_HISTOGRAMA_MS)
+        for indice, limite in enumerate(FAIXAS_HISTOGRAMA_MS):
+            if duracao_ms <= limite:
+                faixa = indice
+                break
+        with self._lock:
+            estatistica = self._comandos.get(chave)
+            if estatistica is None:
+                estatistica = self._comandos[chave] = _EstatisticaComando()
+            estatistica.execucoes += 1
+            estatistica.total_ms += duracao_ms
+            estatistica.maximo_ms = max(estatistica.maximo_ms, duracao_ms)
+            estatistica.linhas += linhas
+            estatistica.histograma[faixa] += 1
+            if chamador in estatistica.chamadores or len(estatistica.chamadores) < MAX_CHAMADORES:
+                estatistica.chamadores[chamador] = estatistica.chamadores.get(chamador, 0) + 1
+            if duracao_ms >= self.limiar_lenta_ms:
+                self._lentas.append({
+                    "data_hora": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    "sql": chave,
+                    "duracao_ms": round(duracao_ms, 3),
+                    "linhas": linhas,
+                    "chamador": chamador,
+                    "plano": plano or [],
+                })
+        if duracao_ms >= self.limiar_lenta_ms:
+            logger.warning(
+                f"Consulta lenta ({duracao_ms:.1f} ms, {linhas} linha(s)) em {chamador}: {chave}\n"
+                f"  Plano: {' | '.join(plano) if plano else 'indisponível'}")
+
+    def consultas(self) -> List[Dict[str, Any]]:
+        """Retorna as estatísticas por comando, do maior para o menor tempo total."""
+        rotulos = [f"<={limite}ms" for limite in FAIXAS_HISTOGRAMA_MS] + [f">{FAIXAS_HISTOGRAMA_MS[-1]}ms"]
+        with self._lock:
+            itens = list(self._comandos.items())
+            resultado = [
+                {
+                    "sql": sql,
+                    "execucoes": e.execucoes,
+                    "total_ms": round(e.total_ms, 3),
+                    "media_ms": round(e.total_ms / e.execucoes, 3),
+                    "maximo_ms": round(e.maximo_ms, 3),
+                    "linhas": e.linhas,
+                    "histograma": dict(zip(rotulos, e.histograma)),
+                    "chamadores": dict(e.chamadores),
+                }
+                for sql, e in itens
+            ]
+        resultado.sort(key=lambda item: item["total_ms"], reverse=True)
+        return resultado
+
+    def consultas_lentas(self) -> List[dict]:
+        """Retorna o log de consultas lentas, da mais recente para a mais antiga."""
+        with self._lock:
+            return list(reversed(self._lentas))
+
+    def exportar(self) -> dict:
+        """Retorna todas as medições num dicionário serializável em JSON."""
+        return {
+            "gerado_em": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "coletado_desde": self._inicio.strftime("%Y-%m-%d %H:%M:%S"),
+            "ativo": self.ativo,
+            "limiar_lenta_ms": self.limiar_lenta_ms,
+            "consultas": self.consultas(),
+            "consultas_lentas": self.consultas_lentas(),
+        }
+
+    def exportar_json(self, caminho: Optional[str] = None) -> str:
+        """
+        Serializa as medições em JSON. Com `caminho`, grava também no arquivo.
+
+        :return: O texto JSON gerado.
+        """
+        texto = json.dumps(self.exportar(), ensure_ascii=False, indent=2)
+        if caminho:
+            pasta = os.path.dirname(caminho)
+            if pasta:
+                os.makedirs(pasta, exist_ok=True)
+            with open(caminho, "w", encoding="utf-8") as arquivo:
+                arquivo.write(texto)
+            logger.info(f"Perfil de consultas exportado para '{caminho}'.")
+        return texto
+
+
+# Instância única, consultada por todas as conexões.
+perfilador_consultas = PerfiladorConsultas()
+
+
+class CursorPerfilado(sqlite3.Cursor):
+    """
+    Cursor que mede o tempo de execução e de leitura de cada comando.
+    A medição é encerrada quando o resultado se esgota, quando o cursor executa
+    outro comando ou quando é fechado.
+    """
+
+    _medicao: Optional[list] = None  # [sql, parametros, segundos, linhas, chamador]
+
+    def execute(self, sql, parametros=()):
+        self._encerrar_medicao()
+        chamador = _chamador()
+        inicio = time.perf_counter()
+        super().execute(sql, parametros)
+        self._medicao = [sql, parametros, time.perf_counter() - inicio, 0, chamador]
+        if self.description is None:
+            # Comando sem resultado (INSERT, UPDATE, DDL...): conta as linhas afetadas.
+            self._medicao[3] = max(self.rowcount, 0)
+            self._encerrar_medicao()
+        return self
+
+    def executemany(self, sql, sequencia_parametros):
+        self._encerrar_medicao()
+        chamador = _chamador()
+        # Guarda o primeiro conjunto de parâmetros para o EXPLAIN sem consumir
+        # a sequência (ela pode ser um gerador).
+        sequencia_parametros = iter(sequencia_parametros)
+        primeiros = next(sequencia_parametros, None)
+        if primeiros is not None:
+            sequencia_parametros = itertools.chain((primeiros,), sequencia_parametros)
+        inicio = time.perf_counter()
+        super().executemany(sql, sequencia_parametros)
+        duracao_ms = (time.perf_counter() - inicio) * 1000
+        plano = None
+        if duracao_ms >= perfilador_consultas.limiar_lenta_ms:
+            if primeiros is not None:
+                plano = self._explicar(sql, primeiros)
+            plano = plano or list(PLANO_EXECUTEMANY_INDISPONIVEL)
+        perfilador_consultas.registrar(sql, duracao_ms, max(self.rowcount, 0), chamador, plano)
+        return self
+
+    def fetchone(self):
+        inicio = time.perf_counter()
+        linha = super().fetchone()
+        self._acumular(inicio, 0 if linha is None else 1, esgotou=linha is None)
+        return linha
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        inicio = time.perf_counter()
+        linhas = super().fetchmany(size)
+        self._acumular(inicio, len(linhas), esgotou=len(linhas) < size)
+        return linhas
+
+    def fetchall(self):
+        inicio = time.perf_counter()
+        linhas = super().fetchall()
+        self._acumular(inicio, len(linhas), esgotou=True)
+        return linhas
+
+    def __next__(self):
+        inicio = time.perf_counter()
+        try:
+            linha = super().__next__()
+        except StopIteration:
+            self._acumular(inicio, 0, esgotou=True)
+            raise
+        self._acumular(inicio, 1, esgotou=False)
+        return linha
+
+    def close(self):
+        self._encerrar_medicao()
+        super().close()
+
+    def __del__(self):
+        # Cursores de uma linha só (`execute(...).fetchone()`) são descartados
+        # sem esgotar o resultado. Aqui a conexão pode já estar com outra
+        # thread, então o plano não é consultado.
+        self._encerrar_medicao(explicar=False)
+
+    def _acumular(self, inicio: float, linhas: int, esgotou: bool):
+        medicao = self._medicao
+        if medicao is not None:
+            medicao[2] += time.perf_counter() - inicio
+            medicao[3] += linhas
+            if esgotou:
+                self._encerrar_medicao()
+
+    def _encerrar_medicao(self, explicar: bool = True):
+        medicao, self._medicao = self._medicao, None
+        if medicao is None:
+            return
+        sql, parametros, segundos, linhas, chamador = medicao
+        duracao_ms = segundos * 1000
+        plano = None
+        if explicar and duracao_ms >= perfilador_consultas.limiar_lenta_ms:
+            plano = self._explicar(sql, parametros)
+        perfilador_consultas.registrar(sql, duracao_ms, linhas, chamador, plano)
+
+    def _explicar(self, sql: str, parametros) -> Optional[List[str]]:
+        """Executa o EXPLAIN QUERY PLAN do comando num cursor comum da mesma conexão."""
+        try:
+            cursor = sqlite3.Connection.cursor(self.connection)
+            try:
+                return [linha[3] for linha in cursor.execute(f"EXPLAIN QUERY PLAN {sql}", parametros)]
+            finally:
+                cursor.close()
+        except sqlite3.Error as e:
+            logger.debug(f"Não foi possível obter o plano da consulta: {e}")
+            return None
+
+
+class ConexaoPerfilada(sqlite3.Connection):
+    """
+    Conexão que entrega `CursorPerfilado` enquanto o perfilador estiver ligado.
+    Usada como `factory` do `sqlite3.connect` em todas as conexões do pool.
+    """
+
+    def cursor(self, factory=None):
+        if factory is None:
+            factory = CursorPerfilado if perfilador_consultas.ativo else sqlite3.Cursor
+        return super().cursor(factory)
+
+    # Os atalhos da conexão criam o cursor internamente sem passar pelo
+    # execute sobrescrito; por isso são redirecionados para `cursor()`.
+    def execute(self, sql, parametros=()):
+        return self.cursor().execute(sql, parametros)
+
+    def executemany(self, sql, sequencia_parametros):
+        return self.cursor().executemany(sql, sequencia_parametros)
@@ -11,27 +11,137 @@
 #   - A função `buscar_clientes_por_termo` foi modificada para retornar
 #     TODOS os clientes (ativos e inativos) que correspondem ao termo,
 #     incluindo a coluna 'ativo' no resultado.
+#   - As funções `buscar_*_por_termo` agora usam os índices FTS5 (busca por
+#     prefixo, sem acentos e ordenada por relevância) em vez de LIKE '%termo%'.
+#   - As mesmas funções aceitam `limite` e `apos` para paginação por keyset
+#     em (nome, id), usada pelas telas de gestão (gerir_*).
+#   - Os catálogos de peças e serviços ficam em cache (ver catalog_cache.py).
+#     Toda função que altera esses catálogos invalida o cache após o commit.
 # =================================================================================
 
 # --- IMPORTAÇÕES DE BIBLIOTECAS ---
+import json
 import logging
 import sqlite3
-from datetime import datetime
-from typing import List, Optional, Dict, Any
+from datetime import datetime, timedelta
+from typing import List, Optional, Dict, Any, Tuple, Union
 
 # --- IMPORTAÇÕES DO PROJETO ---
 
 # Importa a função de conexão do nosso módulo de banco de dados.
-from src.database.database import get_db_connection
+from src.database.database import banco_ocupado, get_db_connection
+# Utilitários da busca textual (FTS5) usados pelas funções `buscar_*_por_termo`.
+from src.database.search_index import fts_disponivel, montar_expressao_fts
+# Cache em memória dos catálogos de peças e serviços.
+from src.database.catalog_cache import CacheCatalogo, RetratoCatalogo
+from src.database.gravador_lote import GravadorEmLote
+from src.database.outbox import marcar_concluida as marcar_outbox_concluida
+from src.database import idempotencia
+from src.database.mapeador import criar_mapeador, mapear_linhas
 
 # Importa as classes de modelo para que as funções possam retornar objetos
 # fortemente tipados (ex: uma lista de Clientes), o que melhora a clareza
 # e a segurança do código nos ViewModels.
 from src.models.models import Usuario, Cliente, Carro, Peca, Estabelecimento, Mecanico, Servico
+from src.models.models import PecaResumo, ClienteResumo, MecanicoResumo, ServicoResumo
 
 # --- CONFIGURAÇÃO DO LOGGER ---
 logger = logging.getLogger("DB_QUERIES")
 
+# Quantidade de registros por página nas telas de gestão (gerir_*).
+TAMANHO_PAGINA_PADRAO = 50
+
+# Colunas lidas pelas listagens (projeções *Resumo). Cada lista é coberta por
+# um índice que começa em (nome, id), então a página sai do índice sem
+# consultar a tabela (ver migração 8).
+_COLUNAS_PECA_RESUMO = "p.id, p.nome, p.referencia, p.preco_venda, p.quantidade_em_estoque, p.ativo"
+_COLUNAS_CLIENTE_RESUMO = "c.id, c.nome, c.telefone, c.ativo"
+_COLUNAS_MECANICO_RESUMO = "m.id, m.nome, m.especialidade, m.ativo"
+_COLUNAS_SERVICO_RESUMO = "s.id, s.nome, s.valor, s.ativo"
+
+# Caches dos catálogos, compartilhados por todo o processo.
+cache_pecas = CacheCatalogo("pecas")
+cache_servicos = CacheCatalogo("servicos")
+
+# Logs de auditoria são gravados em lote (um commit para vários eventos).
+gravador_auditoria = GravadorEmLote(
+    "auditoria",
+    "INSERT INTO auditoria_logs (usuario_id, acao, detalhes, data_hora) VALUES (?, ?, ?, ?)",
+)
+
+# =================================================================================
+# UTILITÁRIO DE BUSCA E PAGINAÇÃO
+# =================================================================================
+
+
+def _executar_busca(
+    cursor: sqlite3.Cursor,
+    select_sql: str,
+    coluna_id: str,
+    coluna_nome: str,
+    ordem_padrao: str,
+    tabela_fts: str,
+    colunas_like: List[str],
+    termo: str,
+    limite: Optional[int] = None,
+    apos: Optional[Tuple[str, int]] = None,
+) -> List[sqlite3.Row]:
+    """
+    Monta e executa a query de busca comum a todas as telas de gestão.
+
+    - Termo vazio: lista todos os registros.
+    - Com FTS5: filtra pelo índice `tabela_fts` (prefixo, sem acentos).
+    - Sem FTS5: recorre ao LIKE '%termo%' em `colunas_like`.
+
+    Sem `limite`, os resultados de uma busca vêm ordenados por relevância.
+    Com `limite`, a ordem passa a ser (nome, id) e `apos` recebe a chave
+    (nome, id) do último registro da página anterior (paginação por keyset),
+    o que mantém o custo de cada página constante, independente da posição.
+
+    :param select_sql: "SELECT ... FROM ... [JOIN ...]" sem WHERE nem ORDER BY.
+    :param coluna_id: Coluna de id da entidade (ex.: 'p.id').
+    :param coluna_nome: Coluna usada como primeira chave da paginação.
+    :param ordem_padrao: ORDER BY usado quando não há paginação.
+    """
+    condicoes: List[str] = []
+    parametros: List[Any] = []
+    ordem = ordem_padrao
+
+    expressao = montar_expressao_fts(termo)
+    if expressao is not None:
+        if fts_disponivel() and limite is None:
+            # JOIN com o índice para poder ordenar pela relevância (bm25).
+            select_sql += f" JOIN {tabela_fts} f ON f.rowid = {coluna_id}"
+            condicoes.append(f"{tabela_fts} MATCH ?")
+            parametros.append(expressao)
+            ordem = f"f.rank, {ordem_padrao}"
+        elif fts_disponivel():
+            condicoes.append(
+                f"{coluna_id} IN (SELECT rowid FROM {tabela_fts} WHERE {tabela_fts} MATCH ?)")
+            parametros.append(expressao)
+        else:
+            like_termo = f"%{termo}%"
+            condicoes.append(
+                "(" + " OR ".join(f"{coluna} LIKE ?" for coluna in colunas_like) + ")")
+            parametros.extend([like_termo] * len(colunas_like))
+
+    if limite is not None:
+        if apos is not None:
+            condicoes.append(f"({coluna_nome}, {coluna_id}) > (?, ?)")
+            parametros.extend(apos)
+        ordem = f"{coluna_nome}, {coluna_id}"
+
+    sql = select_sql
+    if condicoes:
+        sql += " WHERE " + " AND ".join(condicoes)
+    sql += f" ORDER BY {ordem}"
+    if limite is not None:
+        sql += " LIMIT ?"
+        parametros.append(limite)
+
+    cursor.execute(sql, parametros)
+    return cursor.fetchall()
+
 # =================================================================================
 # QUERIES DE USUÁRIO E ONBOARDING
 # =================================================================================
@@ -107,18 +217,15 @@ def atualizar_senha_usuario(usuario_id: int, nova_senha_hash: str) -> bool:
 
 
 def registrar_log_auditoria(usuario_id: int, acao: str, detalhes: str = ""):
-    """Registra um evento de auditoria no banco de dados."""
+    """
+    Registra um evento de auditoria no banco de dados.
+    O evento entra no buffer do `gravador_auditoria` e é gravado junto com os
+    demais em poucos milissegundos; a chamada não espera o commit.
+    """
     logger.info(
         f"Registrando log de auditoria para o usuário ID {usuario_id}. Ação: {acao}")
-    sql = "INSERT INTO auditoria_logs (usuario_id, acao, detalhes, data_hora) VALUES (?, ?, ?, ?)"
-    try:
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            data_hora_atual = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            cursor.execute(sql, (usuario_id, acao, detalhes, data_hora_atual))
-            conn.commit()
-    except sqlite3.Error as e:
-        logger.error(f"Erro ao registrar log de auditoria: {e}", exc_info=True)
+    data_hora_atual = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    gravador_auditoria.adicionar((usuario_id, acao, detalhes, data_hora_atual))
 
 
 def has_establishment(user_id: int) -> bool:
@@ -302,20 +409,25 @@ def criar_mecanico(nome: str, cpf: str, endereco: str, telefone: str, especialid
         raise
 
 
-def buscar_mecanicos_por_termo(termo: str) -> List[Mecanico]:
-    # (Esta função não precisa de alteração, pois busca em todas as colunas de texto relevantes)
+def buscar_mecanicos_por_termo(termo: str, limite: Optional[int] = None, apos: Optional[Tuple[str, int]] = None) -> List[MecanicoResumo]:
+    """
+    Busca mecânicos (ativos e inativos) por nome, CPF ou especialidade.
+    :param limite: Tamanho da página (None = todos os resultados).
+    :param apos: Chave (nome, id) do último mecânico da página anterior.
+    """
     logger.debug(f"Executando busca de mecânicos pelo termo: '{termo}'")
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
-            query = """
-                SELECT * FROM mecanicos
-                WHERE nome LIKE ? OR cpf LIKE ? OR especialidade LIKE ?
-                ORDER BY nome
-            """
-            like_termo = f"%{termo}%"
-            cursor.execute(query, (like_termo, like_termo, like_termo))
-            return [Mecanico(**row) for row in cursor.fetchall()]
+            linhas = _executar_busca(
+                cursor,
+                select_sql=f"SELECT {_COLUNAS_MECANICO_RESUMO} FROM mecanicos m",
+                coluna_id="m.id", coluna_nome="m.nome", ordem_padrao="m.nome",
+                tabela_fts="mecanicos_fts",
+                colunas_like=["m.nome", "m.cpf", "m.especialidade"],
+                termo=termo, limite=limite, apos=apos,
+            )
+            return mapear_linhas(cursor, MecanicoResumo, linhas)
     except sqlite3.Error as e:
         logger.error(f"Erro ao buscar mecânicos por termo: {e}", exc_info=True)
         return []
@@ -424,16 +536,16 @@ def verificar_existencia_cliente() -> bool:
         return True
 
 
-def obter_clientes() -> List[Cliente]:
-    """Retorna uma lista de todos os clientes (ativos e inativos)."""
+def obter_clientes() -> List[ClienteResumo]:
+    """Retorna o resumo de todos os clientes (ativos e inativos), para os seletores."""
     logger.debug("Executando query para obter todos os clientes.")
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
             # --- QUERY ATUALIZADA ---
             # Remove o filtro 'WHERE ativo = 1' para buscar todos.
-            cursor.execute("SELECT * FROM clientes ORDER BY nome")
-            return [Cliente(**row) for row in cursor.fetchall()]
+            cursor.execute(f"SELECT {_COLUNAS_CLIENTE_RESUMO} FROM clientes c ORDER BY c.nome")
+            return mapear_linhas(cursor, ClienteResumo)
     except sqlite3.Error as e:
         logger.error(f"Erro ao obter clientes: {e}", exc_info=True)
         return []
@@ -456,23 +568,30 @@ def obter_cliente_por_id(cliente_id: int) -> Cliente | None:
         return None
 
 
-def buscar_clientes_por_termo(termo: str) -> List[Cliente]:
-    """Busca clientes (ativos e inativos) no banco de dados por nome, telefone ou placa do carro."""
+def buscar_clientes_por_termo(termo: str, limite: Optional[int] = None, apos: Optional[Tuple[str, int]] = None) -> List[ClienteResumo]:
+    """
+    Busca clientes (ativos e inativos) no banco de dados por nome, telefone ou placa do carro.
+    :param limite: Tamanho da página (None = todos os resultados).
+    :param apos: Chave (nome, id) do último cliente da página anterior.
+    """
     logger.debug(f"Executando busca de clientes pelo termo: '{termo}'")
     try:
         with get_db_connection() as conn:
+            # O índice 'clientes_fts' já contém as placas dos carros de cada
+            # cliente, dispensando o JOIN com 'carros' e o DISTINCT.
             cursor = conn.cursor()
-            # --- QUERY ATUALIZADA ---
-            # Remove a condição 'AND c.ativo = 1' para incluir clientes inativos na busca.
-            # Adiciona a coluna 'c.ativo' ao SELECT para que a View possa usá-la.
-            query = """
-                SELECT DISTINCT c.id, c.nome, c.telefone, c.endereco, c.email, c.ativo
-                FROM clientes c LEFT JOIN carros car ON c.id = car.cliente_id
-                WHERE (c.nome LIKE ? OR c.telefone LIKE ? OR car.placa LIKE ?)
-            """
-            like_termo = f"%{termo}%"
-            cursor.execute(query, (like_termo, like_termo, like_termo))
-            return [Cliente(**row) for row in cursor.fetchall()]
+            linhas = _executar_busca(
+                cursor,
+                select_sql=f"SELECT {_COLUNAS_CLIENTE_RESUMO} FROM clientes c",
+                coluna_id="c.id", coluna_nome="c.nome", ordem_padrao="c.nome",
+                tabela_fts="clientes_fts",
+                colunas_like=[
+                    "c.nome", "c.telefone",
+                    "(SELECT group_concat(car.placa, ' ') FROM carros car WHERE car.cliente_id = c.id)",
+                ],
+                termo=termo, limite=limite, apos=apos,
+            )
+            return mapear_linhas(cursor, ClienteResumo, linhas)
     except sqlite3.Error as e:
         logger.error(f"Erro ao buscar clientes por termo: {e}", exc_info=True)
         return []
@@ -593,28 +712,33 @@ def obter_carro_por_id(carro_id: int) -> dict | None:
         return None
 
 
-def buscar_carros_por_termo(termo: str) -> List[dict]:
+def buscar_carros_por_termo(termo: str, limite: Optional[int] = None, apos: Optional[Tuple[str, int]] = None) -> List[dict]:
     """
     Busca carros (ativos e inativos) por modelo, placa ou nome do proprietário.
     Retorna uma lista de dicionários com os dados do carro e do cliente.
+    :param limite: Tamanho da página (None = todos os resultados).
+    :param apos: Chave (nome_cliente, id) do último carro da página anterior.
     """
     logger.debug(f"Executando busca de carros pelo termo: '{termo}'")
     try:
         with get_db_connection() as conn:
-            cursor = conn.cursor()
-            query = """
-                SELECT
-                    car.id, car.modelo, car.placa, car.ativo,
-                    cli.nome as nome_cliente
-                FROM carros car
-                JOIN clientes cli ON car.cliente_id = cli.id
-                WHERE car.modelo LIKE ? OR car.placa LIKE ? OR cli.nome LIKE ?
-                ORDER BY cli.nome, car.modelo
-            """
-            like_termo = f"%{termo}%"
-            cursor.execute(query, (like_termo, like_termo, like_termo))
+            linhas = _executar_busca(
+                conn.cursor(),
+                select_sql="""
+                    SELECT
+                        car.id, car.modelo, car.placa, car.ativo,
+                        cli.nome as nome_cliente
+                    FROM carros car
+                    JOIN clientes cli ON car.cliente_id = cli.id
+                """,
+                coluna_id="car.id", coluna_nome="cli.nome",
+                ordem_padrao="cli.nome, car.modelo",
+                tabela_fts="carros_fts",
+                colunas_like=["car.modelo", "car.placa", "cli.nome"],
+                termo=termo, limite=limite, apos=apos,
+            )
             # Retorna uma lista de dicionários para facilitar a manipulação na View/ViewModel
-            return [dict(row) for row in cursor.fetchall()]
+            return [dict(row) for row in linhas]
     except sqlite3.Error as e:
         logger.error(f"Erro ao buscar carros por termo: {e}", exc_info=True)
         return []
@@ -682,21 +806,40 @@ def ativar_carro_por_id(carro_id: int) -> bool:
 # QUERIES DE PEÇAS E ESTOQUE
 # =================================================================================
 
-# --- FUNÇÃO ATUALIZADA ---
+def _ler_catalogo_pecas() -> List[PecaResumo]:
+    """Lê o resumo de todas as peças (usado apenas para recarregar o cache)."""
+    logger.debug("Executando query para obter todas as peças.")
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        # Tuplas em vez de sqlite3.Row: o mapeador monta os objetos por posição.
+        cursor.row_factory = None
+        cursor.execute(f"SELECT {_COLUNAS_PECA_RESUMO} FROM pecas p ORDER BY p.nome")
+        return mapear_linhas(cursor, PecaResumo)
 
 
-def obter_pecas() -> List[Peca]:
-    """Retorna uma lista de todas as peças (ativas e inativas)."""
-    logger.debug("Executando query para obter todas as peças.")
+def obter_catalogo_pecas() -> RetratoCatalogo | None:
+    """
+    Retorna o catálogo de peças em cache (resumos, sem as colunas de texto
+    longo), com as visões `todos`, `por_id` e `ativos`. Os objetos são
+    compartilhados: não devem ser alterados. Para editar, use `obter_peca_por_id`.
+    """
     try:
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            # A query agora também busca peças inativas, ordenando por nome.
-            cursor.execute("SELECT * FROM pecas ORDER BY nome")
-            return [Peca(**row) for row in cursor.fetchall()]
+        return cache_pecas.obter(_ler_catalogo_pecas)
     except sqlite3.Error as e:
         logger.error(f"Erro ao obter peças: {e}", exc_info=True)
-        return []
+        return None
+
+
+def obter_pecas() -> List[PecaResumo]:
+    """Retorna uma lista de todas as peças (ativas e inativas), ordenadas por nome."""
+    catalogo = obter_catalogo_pecas()
+    return list(catalogo.todos) if catalogo else []
+
+
+def obter_pecas_ativas() -> List[PecaResumo]:
+    """Retorna apenas as peças ativas, ordenadas por nome."""
+    catalogo = obter_catalogo_pecas()
+    return list(catalogo.ativos) if catalogo else []
 
 # --- NOVAS FUNÇÕES ---
 
@@ -724,6 +867,7 @@ def criar_peca(dados: dict) -> Peca | None:
             ))
             novo_id = cursor.lastrowid
             conn.commit()
+            cache_pecas.invalidar()
             logger.info(
                 f"Peça '{dados.get('nome')}' criada com sucesso com o ID: {novo_id}.")
             # Retorna uma instância do modelo Peca com os dados inseridos
@@ -735,22 +879,25 @@ def criar_peca(dados: dict) -> Peca | None:
         raise
 
 
-def buscar_pecas_por_termo(termo: str) -> List[Peca]:
+def buscar_pecas_por_termo(termo: str, limite: Optional[int] = None, apos: Optional[Tuple[str, int]] = None) -> List[PecaResumo]:
     """
     Busca peças (ativas e inativas) no banco de dados por nome, referência ou fabricante.
+    :param limite: Tamanho da página (None = todos os resultados).
+    :param apos: Chave (nome, id) da última peça da página anterior.
     """
     logger.debug(f"Executando busca de peças pelo termo: '{termo}'")
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
-            query = """
-                SELECT * FROM pecas
-                WHERE nome LIKE ? OR referencia LIKE ? OR fabricante LIKE ?
-                ORDER BY nome
-            """
-            like_termo = f"%{termo}%"
-            cursor.execute(query, (like_termo, like_termo, like_termo))
-            return [Peca(**row) for row in cursor.fetchall()]
+            linhas = _executar_busca(
+                cursor,
+                select_sql=f"SELECT {_COLUNAS_PECA_RESUMO} FROM pecas p",
+                coluna_id="p.id", coluna_nome="p.nome", ordem_padrao="p.nome",
+                tabela_fts="pecas_fts",
+                colunas_like=["p.nome", "p.referencia", "p.fabricante"],
+                termo=termo, limite=limite, apos=apos,
+            )
+            return mapear_linhas(cursor, PecaResumo, linhas)
     except sqlite3.Error as e:
         logger.error(f"Erro ao buscar peças por termo: {e}", exc_info=True)
         return []
@@ -791,6 +938,7 @@ def atualizar_peca(peca_id: int, novos_dados: dict) -> bool:
                 novos_dados['quantidade_em_estoque'], peca_id
             ))
             conn.commit()
+            cache_pecas.invalidar()
             return cursor.rowcount > 0
     except sqlite3.Error as e:
         logger.error(
@@ -807,6 +955,7 @@ def desativar_peca_por_id(peca_id: int) -> bool:
             cursor.execute(
                 "UPDATE pecas SET ativo = 0 WHERE id = ?", (peca_id,))
             conn.commit()
+            cache_pecas.invalidar()
             return cursor.rowcount > 0
     except sqlite3.Error as e:
         logger.error(
@@ -823,6 +972,7 @@ def ativar_peca_por_id(peca_id: int) -> bool:
             cursor.execute(
                 "UPDATE pecas SET ativo = 1 WHERE id = ?", (peca_id,))
             conn.commit()
+            cache_pecas.invalidar()
             return cursor.rowcount > 0
     except sqlite3.Error as e:
         logger.error(f"Erro ao ativar peça ID {peca_id}: {e}", exc_info=True)
@@ -900,6 +1050,7 @@ def registrar_entrada_estoque(peca_id: int, quantidade: int, valor_custo: Option
         
         # 3. Confirma a transação
         conn.commit()
+        cache_pecas.invalidar()
         logger.info(f"Transação de entrada de estoque para Peca ID: {peca_id} concluída com sucesso.")
         return True
         
@@ -920,9 +1071,61 @@ def registrar_entrada_estoque(peca_id: int, quantidade: int, valor_custo: Option
 # =================================================================================
 
 
-def criar_servico(nome: str, descricao: str, valor: float, pecas_ids: list) -> Servico | None:
+def _ler_catalogo_servicos() -> List[Servico]:
+    """Lê todos os serviços do banco (usado apenas para recarregar o cache)."""
+    logger.debug("Executando query para obter todos os serviços.")
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        # Tuplas em vez de sqlite3.Row: o mapeador monta os objetos por posição.
+        cursor.row_factory = None
+        cursor.execute("SELECT * FROM servicos ORDER BY nome")
+        return mapear_linhas(cursor, Servico)
+
+
+def obter_catalogo_servicos() -> RetratoCatalogo | None:
+    """
+    Retorna o catálogo de serviços em cache (sem as peças associadas), com as
+    visões `todos`, `por_id` e `ativos`. Os objetos não devem ser alterados.
+    """
+    try:
+        return cache_servicos.obter(_ler_catalogo_servicos)
+    except sqlite3.Error as e:
+        logger.error(f"Erro ao obter serviços: {e}", exc_info=True)
+        return None
+
+
+def obter_servicos_ativos() -> List[Servico]:
+    """Retorna apenas os serviços ativos, ordenados por nome."""
+    catalogo = obter_catalogo_servicos()
+    return list(catalogo.ativos) if catalogo else []
+
+
+def obter_estatisticas_cache_catalogo() -> Dict[str, dict]:
+    """Retorna os contadores de acertos/falhas dos caches de peças e serviços."""
+    return {
+        "pecas": cache_pecas.estatisticas(),
+        "servicos": cache_servicos.estatisticas(),
+    }
+
+
+def _normalizar_kit(pecas: Union[List[int], Dict[int, int]], atual: Optional[Dict[int, int]] = None) -> Dict[int, int]:
+    """
+    Converte as peças de um kit em {peca_id: quantidade}.
+
+    :param pecas: Lista de IDs ou dicionário {peca_id: quantidade}.
+    :param atual: Kit gravado. Com uma lista de IDs, as peças que já estão no
+                  kit mantêm a quantidade gravada e as novas entram com 1.
+    """
+    if isinstance(pecas, dict):
+        return {int(peca_id): int(qtd) for peca_id, qtd in pecas.items()}
+    atual = atual or {}
+    return {int(peca_id): atual.get(int(peca_id), 1) for peca_id in pecas or []}
+
+
+def criar_servico(nome: str, descricao: str, valor: float, pecas_ids: Union[List[int], Dict[int, int]]) -> Servico | None:
     """
     Insere um novo serviço e suas peças associadas em uma única transação.
+    :param pecas_ids: Lista de IDs (quantidade 1) ou dicionário {peca_id: quantidade}.
     """
     logger.info(f"Iniciando transação para criar o serviço: {nome}")
     conn = get_db_connection()
@@ -940,13 +1143,14 @@ def criar_servico(nome: str, descricao: str, valor: float, pecas_ids: list) -> S
 
         # 2. Se houver peças selecionadas, insere na tabela de junção
         if pecas_ids:
-            sql_pecas = "INSERT INTO servicos_pecas (servico_id, peca_id) VALUES (?, ?)"
-            dados_juncao = [(novo_id, peca_id) for peca_id in pecas_ids]
+            sql_pecas = "INSERT INTO servicos_pecas (servico_id, peca_id, quantidade) VALUES (?, ?, ?)"
+            dados_juncao = [(novo_id, peca_id, qtd) for peca_id, qtd in _normalizar_kit(pecas_ids).items()]
             cursor.executemany(sql_pecas, dados_juncao)
             logger.debug(
                 f"Associadas {len(dados_juncao)} peças ao serviço ID: {novo_id}.")
 
         conn.commit()
+        cache_servicos.invalidar()
         logger.info(
             f"Serviço '{nome}' e suas associações de peças criados com sucesso.")
         return Servico(id=novo_id, nome=nome, descricao=descricao, valor=valor, ativo=True)
@@ -961,21 +1165,100 @@ def criar_servico(nome: str, descricao: str, valor: float, pecas_ids: list) -> S
             conn.close()
 
 
-def buscar_servicos_por_termo(termo: str) -> List[Servico]:
-    """Busca serviços (ativos e inativos) por nome ou descrição."""
+def buscar_servicos_por_termo(termo: str, limite: Optional[int] = None, apos: Optional[Tuple[str, int]] = None) -> List[ServicoResumo]:
+    """
+    Busca serviços (ativos e inativos) por nome ou descrição.
+    :param limite: Tamanho da página (None = todos os resultados).
+    :param apos: Chave (nome, id) do último serviço da página anterior.
+    """
     logger.debug(f"Executando busca de serviços pelo termo: '{termo}'")
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
-            query = "SELECT * FROM servicos WHERE nome LIKE ? OR descricao LIKE ? ORDER BY nome"
-            like_termo = f"%{termo}%"
-            cursor.execute(query, (like_termo, like_termo))
-            return [Servico(**row) for row in cursor.fetchall()]
+            linhas = _executar_busca(
+                cursor,
+                select_sql=f"SELECT {_COLUNAS_SERVICO_RESUMO} FROM servicos s",
+                coluna_id="s.id", coluna_nome="s.nome", ordem_padrao="s.nome",
+                tabela_fts="servicos_fts",
+                colunas_like=["s.nome", "s.descricao"],
+                termo=termo, limite=limite, apos=apos,
+            )
+            return mapear_linhas(cursor, ServicoResumo, linhas)
     except sqlite3.Error as e:
         logger.error(f"Erro ao buscar serviços por termo: {e}", exc_info=True)
         return []
 
 
+def _preencher_kits(cursor: sqlite3.Cursor, servicos: List[Servico]):
+    """
+    Preenche `pecas` e `quantidades_pecas` de todos os serviços com uma única
+    consulta (JOIN filtrado pelos IDs via json_each), agrupando em Python.
+    Uma peça presente em vários kits gera um único objeto Peca.
+    """
+    por_id = {servico.id: servico for servico in servicos}
+    for servico in servicos:
+        servico.pecas = []
+        servico.quantidades_pecas = {}
+    if not por_id:
+        return
+    cursor.execute(
+        """
+        SELECT sp.servico_id, sp.quantidade AS quantidade_kit, p.*
+        FROM servicos_pecas sp
+        JOIN pecas p ON p.id = sp.peca_id
+        WHERE sp.servico_id IN (SELECT value FROM json_each(?))
+        ORDER BY sp.servico_id, p.nome
+        """,
+        (json.dumps(list(por_id)),),
+    )
+    # As colunas extras (servico_id, quantidade_kit) são ignoradas pelo mapeador.
+    montar_peca = criar_mapeador(cursor, Peca)
+    pecas: Dict[int, Peca] = {}
+    for row in cursor:
+        servico = por_id[row["servico_id"]]
+        peca = pecas.get(row["id"])
+        if peca is None:
+            peca = pecas[row["id"]] = montar_peca(row)
+        servico.pecas.append(peca)
+        servico.quantidades_pecas[peca.id] = row["quantidade_kit"]
+
+
+def carregar_kits_servicos(servicos: List[Servico]) -> List[Servico]:
+    """
+    Carrega as peças do kit de vários serviços de uma vez (uma consulta no
+    total, em vez de uma por serviço). Altera e retorna a própria lista.
+    """
+    try:
+        with get_db_connection() as conn:
+            _preencher_kits(conn.cursor(), servicos)
+    except sqlite3.Error as e:
+        logger.error(f"Erro ao carregar os kits de {len(servicos)} serviço(s): {e}", exc_info=True)
+    return servicos
+
+
+def obter_servicos_com_pecas(servico_ids: List[int]) -> List[Servico]:
+    """
+    Busca os serviços informados já com as peças dos kits, em duas consultas
+    independentemente da quantidade de serviços. A ordem é a de `servico_ids`.
+    """
+    if not servico_ids:
+        return []
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            linhas = cursor.execute(
+                "SELECT * FROM servicos WHERE id IN (SELECT value FROM json_each(?))",
+                (json.dumps([int(servico_id) for servico_id in servico_ids]),),
+            ).fetchall()
+            por_id = {servico.id: servico for servico in mapear_linhas(cursor, Servico, linhas)}
+            servicos = [por_id[int(servico_id)] for servico_id in dict.fromkeys(servico_ids) if int(servico_id) in por_id]
+            _preencher_kits(cursor, servicos)
+            return servicos
+    except sqlite3.Error as e:
+        logger.error(f"Erro ao obter serviços com peças: {e}", exc_info=True)
+        return []
+
+
 def obter_servico_por_id(servico_id: int) -> Servico | None:
     """Busca um único serviço pelo seu ID, incluindo as peças associadas."""
     logger.debug(f"Buscando serviço completo pelo ID: {servico_id}")
@@ -991,14 +1274,8 @@ def obter_servico_por_id(servico_id: int) -> Servico | None:
 
             servico = Servico(**result_servico)
 
-            # Busca as peças associadas
-            sql_pecas = """
-                SELECT p.* FROM pecas p
-                JOIN servicos_pecas sp ON p.id = sp.peca_id
-                WHERE sp.servico_id = ?
-            """
-            result_pecas = cursor.execute(sql_pecas, (servico_id,)).fetchall()
-            servico.pecas = [Peca(**row) for row in result_pecas]
+            # Busca as peças associadas e a quantidade de cada uma no kit
+            _preencher_kits(cursor, [servico])
 
             return servico
     except Exception as e:
@@ -1007,13 +1284,24 @@ def obter_servico_por_id(servico_id: int) -> Servico | None:
         return None
 
 
-def atualizar_servico(servico_id: int, nome: str, descricao: str, valor: float, pecas_ids: list) -> bool:
-    """Atualiza os dados de um serviço e suas peças associadas em uma transação."""
+def atualizar_servico(servico_id: int, nome: str, descricao: str, valor: float, pecas_ids: Union[List[int], Dict[int, int]]) -> Dict[str, List[int]] | None:
+    """
+    Atualiza os dados de um serviço e suas peças associadas em uma transação.
+
+    O kit gravado é comparado com o novo, e só as diferenças são aplicadas
+    (inserções, remoções e mudanças de quantidade, cada grupo num único
+    `executemany`). As associações que não mudaram não são tocadas.
+
+    :param pecas_ids: Lista de IDs ou dicionário {peca_id: quantidade}. Com uma
+                      lista, as peças que continuam no kit mantêm a quantidade.
+    :return: {'inseridas', 'removidas', 'alteradas'} com os IDs das peças
+             afetadas, ou None se não foi possível obter uma conexão.
+    """
     logger.info(
         f"Iniciando transação para atualizar o serviço ID: {servico_id}")
     conn = get_db_connection()
     if not conn:
-        return False
+        return None
 
     try:
         cursor = conn.cursor()
@@ -1024,24 +1312,36 @@ def atualizar_servico(servico_id: int, nome: str, descricao: str, valor: float,
         )
         logger.debug(f"Tabela 'servicos' para o ID {servico_id} atualizada.")
 
-        # 2. Remove todas as associações de peças existentes para este serviço
-        cursor.execute(
-            "DELETE FROM servicos_pecas WHERE servico_id = ?", (servico_id,))
-        logger.debug(
-            f"Associações de peças antigas para o serviço ID {servico_id} removidas.")
-
-        # 3. Se houver novas peças selecionadas, insere as novas associações
-        if pecas_ids:
-            sql_pecas = "INSERT INTO servicos_pecas (servico_id, peca_id) VALUES (?, ?)"
-            dados_juncao = [(servico_id, peca_id) for peca_id in pecas_ids]
-            cursor.executemany(sql_pecas, dados_juncao)
-            logger.debug(
-                f"{len(dados_juncao)} novas associações de peças inseridas para o serviço ID: {servico_id}.")
+        # 2. Compara o kit gravado com o novo
+        atual = {
+            linha["peca_id"]: linha["quantidade"] for linha in cursor.execute(
+                "SELECT peca_id, quantidade FROM servicos_pecas WHERE servico_id = ?", (servico_id,))
+        }
+        novo = _normalizar_kit(pecas_ids, atual)
+        inseridas = [peca_id for peca_id in novo if peca_id not in atual]
+        removidas = [peca_id for peca_id in atual if peca_id not in novo]
+        alteradas = [peca_id for peca_id in novo if peca_id in atual and novo[peca_id] != atual[peca_id]]
+
+        # 3. Aplica só as diferenças
+        if removidas:
+            cursor.executemany(
+                "DELETE FROM servicos_pecas WHERE servico_id = ? AND peca_id = ?",
+                [(servico_id, peca_id) for peca_id in removidas])
+        if inseridas:
+            cursor.executemany(
+                "INSERT INTO servicos_pecas (servico_id, peca_id, quantidade) VALUES (?, ?, ?)",
+                [(servico_id, peca_id, novo[peca_id]) for peca_id in inseridas])
+        if alteradas:
+            cursor.executemany(
+                "UPDATE servicos_pecas SET quantidade = ? WHERE servico_id = ? AND peca_id = ?",
+                [(novo[peca_id], servico_id, peca_id) for peca_id in alteradas])
 
         conn.commit()
+        cache_servicos.invalidar()
         logger.info(
-            f"Serviço ID {servico_id} e suas associações atualizados com sucesso.")
-        return True
+            f"Serviço ID {servico_id} atualizado. Peças: {len(inseridas)} inserida(s), "
+            f"{len(removidas)} removida(s), {len(alteradas)} alterada(s).")
+        return {"inseridas": inseridas, "removidas": removidas, "alteradas": alteradas}
     except sqlite3.Error as e:
         logger.error(
             f"Erro ao atualizar serviço ID {servico_id}. Transação revertida.", exc_info=True)
@@ -1061,6 +1361,7 @@ def desativar_servico_por_id(servico_id: int) -> bool:
             cursor.execute(
                 "UPDATE servicos SET ativo = 0 WHERE id = ?", (servico_id,))
             conn.commit()
+            cache_servicos.invalidar()
             return cursor.rowcount > 0
     except sqlite3.Error as e:
         logger.error(
@@ -1077,6 +1378,7 @@ def ativar_servico_por_id(servico_id: int) -> bool:
             cursor.execute(
                 "UPDATE servicos SET ativo = 1 WHERE id = ?", (servico_id,))
             conn.commit()
+            cache_servicos.invalidar()
             return cursor.rowcount > 0
     except sqlite3.Error as e:
         logger.error(
@@ -1088,44 +1390,125 @@ def ativar_servico_por_id(servico_id: int) -> bool:
 # =================================================================================
 
 
-def inserir_ordem_servico(cliente_id: int, carro_id: int, pecas_quantidades: dict, valor_total: float, mao_de_obra: float) -> int | None:
+def _calcular_faltas_estoque(cursor: sqlite3.Cursor, pecas_quantidades: Dict[int, int]) -> List[Dict[str, Any]]:
+    """
+    Retorna as peças cujo estoque não cobre a quantidade pedida:
+    [{'peca_id', 'nome', 'solicitada', 'disponivel'}, ...].
+    """
+    cursor.execute(
+        "SELECT id, nome, quantidade_em_estoque FROM pecas WHERE id IN (SELECT value FROM json_each(?))",
+        (json.dumps(list(pecas_quantidades)),),
+    )
+    estoque = {linha["id"]: (linha["nome"], linha["quantidade_em_estoque"]) for linha in cursor.fetchall()}
+    faltas = []
+    for peca_id, solicitada in pecas_quantidades.items():
+        nome, disponivel = estoque.get(peca_id, (None, 0))
+        if disponivel < solicitada:
+            faltas.append({"peca_id": peca_id, "nome": nome,
+                           "solicitada": solicitada, "disponivel": disponivel})
+    return faltas
+
+
+def inserir_ordem_servico(cliente_id: int, carro_id: int, pecas_quantidades: dict, valor_total: float, mao_de_obra: float, outbox_id: Optional[int] = None, chave_idempotencia: Optional[str] = None) -> Dict[str, Any]:
     """
     Insere uma nova ordem de serviço e suas peças associadas no banco de dados.
     Esta função executa como uma transação: ou tudo é salvo, ou nada é.
+
+    Na mesma transação, o estoque das peças é baixado e uma movimentação de
+    'saida' é registrada por peça. A baixa confia na restrição
+    CHECK (quantidade_em_estoque >= 0) da tabela 'pecas': se algum saldo
+    ficaria negativo, a transação inteira é desfeita e as faltas são
+    retornadas. Como o UPDATE lê e grava o saldo sob o bloqueio de escrita,
+    duas OS simultâneas nunca vendem a mesma unidade.
+
+    :param outbox_id: Opcional. Tarefa da outbox que originou a OS; é marcada
+                      como concluída na mesma transação.
+    :param chave_idempotencia: Opcional. Se uma OS já foi criada com esta chave,
+                               nada é gravado e o ID da OS original é retornado.
+    :return: {'os_id': int | None, 'faltas': [...]} — 'faltas' lista as peças
+             sem estoque suficiente (ver `_calcular_faltas_estoque`).
+    :raises sqlite3.OperationalError: Se o banco estiver ocupado/travado (erro
+             transitório): a transação é desfeita e quem chamou pode repetir.
     """
     logger.info(
         f"Iniciando transação para inserir nova Ordem de Serviço para o cliente {cliente_id}.")
+    pecas_quantidades = {int(peca_id): int(qtd) for peca_id, qtd in pecas_quantidades.items()}
+    if any(qtd <= 0 for qtd in pecas_quantidades.values()):
+        logger.error(f"Quantidade inválida nas peças da OS: {pecas_quantidades}.")
+        return {"os_id": None, "faltas": []}
+
     conn = get_db_connection()
     if not conn:
-        return None
+        return {"os_id": None, "faltas": []}
     try:
         cursor = conn.cursor()
+        # Repetição de uma OS já gravada (duplo clique, reprocessamento da fila).
+        os_existente = idempotencia.obter_resultado(cursor, chave_idempotencia)
+        if os_existente is not None:
+            marcar_outbox_concluida(cursor, outbox_id)
+            conn.commit()
+            logger.info(
+                f"OS com a chave '{chave_idempotencia}' já existe (ID {os_existente}); nada foi gravado.")
+            return {"os_id": int(os_existente), "faltas": []}
+
+        data_hora_atual = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         cursor.execute(
             "INSERT INTO ordem_servico (cliente_id, carro_id, data_criacao, valor_total, mao_de_obra) VALUES (?, ?, ?, ?, ?)",
-            (cliente_id, carro_id, datetime.now().strftime(
-                "%Y-%m-%d %H:%M:%S"), valor_total, mao_de_obra),
+            (cliente_id, carro_id, data_hora_atual, valor_total, mao_de_obra),
         )
         ordem_servico_id = cursor.lastrowid
         logger.debug(
             f"Ordem de Serviço principal criada com ID: {ordem_servico_id}.")
 
-        for peca_id, quantidade in pecas_quantidades.items():
-            cursor.execute(
-                "INSERT INTO PecasOrdemServico (ordem_servico_id, peca_id, quantidade) VALUES (?, ?, ?)",
-                (ordem_servico_id, peca_id, quantidade),
-            )
-            logger.debug(
-                f"Associada Peça ID {peca_id} (Qtd: {quantidade}) à OS ID {ordem_servico_id}.")
+        cursor.executemany(
+            "INSERT INTO PecasOrdemServico (ordem_servico_id, peca_id, quantidade) VALUES (?, ?, ?)",
+            [(ordem_servico_id, peca_id, qtd) for peca_id, qtd in pecas_quantidades.items()],
+        )
+        # Baixa do estoque: o CHECK da tabela rejeita saldo negativo.
+        cursor.executemany(
+            "UPDATE pecas SET quantidade_em_estoque = quantidade_em_estoque - ? WHERE id = ?",
+            [(qtd, peca_id) for peca_id, qtd in pecas_quantidades.items()],
+        )
+        cursor.executemany(
+            """
+            INSERT INTO movimentacao_pecas
+                (peca_id, data_movimentacao, tipo_movimentacao, quantidade, descricao, ordem_servico_id)
+            VALUES (?, ?, 'saida', ?, ?, ?)
+            """,
+            [(peca_id, data_hora_atual, qtd, f"OS #{ordem_servico_id}", ordem_servico_id)
+             for peca_id, qtd in pecas_quantidades.items()],
+        )
 
+        idempotencia.registrar_resultado(
+            cursor, chave_idempotencia, "criar_ordem_servico", str(ordem_servico_id))
+        marcar_outbox_concluida(cursor, outbox_id)
         conn.commit()
+        cache_pecas.invalidar()
         logger.info(
-            f"Ordem de serviço {ordem_servico_id} e suas peças inseridas com sucesso!")
-        return ordem_servico_id
+            f"Ordem de serviço {ordem_servico_id} inserida com {len(pecas_quantidades)} peça(s) baixada(s) do estoque.")
+        return {"os_id": ordem_servico_id, "faltas": []}
 
-    except sqlite3.Error as e:
+    except sqlite3.IntegrityError as e:
+        conn.rollback()
+        if "CHECK" in str(e):
+            faltas = _calcular_faltas_estoque(conn.cursor(), pecas_quantidades)
+            logger.warning(f"OS não criada: estoque insuficiente para {len(faltas)} peça(s): {faltas}")
+            return {"os_id": None, "faltas": faltas}
+        # Outra transação gravou a mesma chave entre a verificação e o commit.
+        os_existente = idempotencia.obter_resultado(conn.cursor(), chave_idempotencia)
+        if os_existente is not None:
+            logger.info(
+                f"OS com a chave '{chave_idempotencia}' gravada por outra transação (ID {os_existente}).")
+            return {"os_id": int(os_existente), "faltas": []}
         logger.error(f"Erro ao inserir ordem de serviço: {e}", exc_info=True)
+        return {"os_id": None, "faltas": []}
+    except sqlite3.Error as e:
         conn.rollback()
-        return None
+        if banco_ocupado(e):
+            logger.warning(f"Banco ocupado ao inserir ordem de serviço: {e}")
+            raise
+        logger.error(f"Erro ao inserir ordem de serviço: {e}", exc_info=True)
+        return {"os_id": None, "faltas": []}
     finally:
         if conn:
             conn.close()
@@ -1158,59 +1541,383 @@ def inserir_movimentacao_peca(
         quantidade, valor_custo, descricao, ordem_servico_id
     ))
 
-def registrar_entrada_estoque_lote(lote_itens: List[Dict[str, Any]]) -> bool:
+def _validar_lote_entrada(cursor: sqlite3.Cursor, lote_itens: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Dict[int, int]]:
+    """
+    Valida todas as linhas do lote antes de qualquer escrita.
+
+    :return: (resultado por linha, soma das quantidades por peca_id).
+             Cada resultado tem 'linha' (1, 2, ...), 'peca_id', 'quantidade',
+             'ok' e 'erro' (None quando a linha é válida).
+    """
+    ids_informados = {item.get('peca_id') for item in lote_itens}
+    # Uma única consulta para todo o lote (json_each evita o limite de parâmetros do IN).
+    ids_existentes = {
+        linha[0] for linha in cursor.execute(
+            "SELECT id FROM pecas WHERE id IN (SELECT value FROM json_each(?))",
+            (json.dumps([i for i in ids_informados if type(i) is int]),),
+        )
+    }
+
+    resultados: List[Dict[str, Any]] = []
+    deltas: Dict[int, int] = {}
+    for numero, item in enumerate(lote_itens, start=1):
+        peca_id = item.get('peca_id')
+        quantidade = item.get('quantidade')
+        erro = None
+        # `type(...) is int` recusa bool: True passaria por isinstance como 1.
+        if type(quantidade) is not int or quantidade <= 0:
+            erro = f"Quantidade inválida ({quantidade})."
+        elif type(peca_id) is not int or peca_id not in ids_existentes:
+            erro = f"Peça ID {peca_id} não encontrada."
+        else:
+            # Linhas repetidas da mesma peça viram um único UPDATE.
+            deltas[peca_id] = deltas.get(peca_id, 0) + quantidade
+        resultados.append({"linha": numero, "peca_id": peca_id, "quantidade": quantidade,
+                           "ok": erro is None, "erro": erro})
+    return resultados, deltas
+
+
+def registrar_entrada_estoque_lote(lote_itens: List[Dict[str, Any]], chave_idempotencia: Optional[str] = None) -> Dict[str, Any]:
     """
     Registra uma entrada de MÚLTIPLAS peças no estoque de forma transacional.
+
+    Todas as linhas são validadas antes da escrita; se alguma for inválida,
+    nada é gravado. O estoque é atualizado com um UPDATE por peça (linhas
+    repetidas da mesma peça são somadas) e as movimentações são inseridas com
+    um único `executemany`, uma por linha do lote.
+
     :param lote_itens: Uma lista de dicionários, onde cada dict contém:
                        {'peca_id', 'quantidade', 'valor_custo', 'descricao'}
+    :param chave_idempotencia: Opcional. Se um lote já foi registrado com esta
+                               chave, o estoque não é alterado de novo.
+    :return: {'sucesso': bool, 'linhas': [resultado por linha]} — ver
+             `_validar_lote_entrada`. Em erro de banco, 'linhas' fica vazia.
+    :raises sqlite3.OperationalError: Se o banco estiver ocupado/travado (erro
+             transitório): a transação é desfeita e quem chamou pode repetir.
     """
     if not lote_itens:
         logger.warning("Tentativa de registrar um lote de entrada vazio.")
-        return False
-        
+        return {"sucesso": False, "linhas": []}
+
     logger.info(f"Iniciando transação de entrada de estoque para LOTE de {len(lote_itens)} itens.")
-    
+
     conn = get_db_connection()
     if not conn:
         logger.error("Falha ao obter conexão com o banco para registrar lote.")
-        return False
-    
+        return {"sucesso": False, "linhas": []}
+
     try:
         cursor = conn.cursor()
-        
-        # Itera sobre cada item no lote
-        for item in lote_itens:
-            peca_id = item['peca_id']
-            quantidade = item['quantidade']
-            
-            # Validação dentro do loop (mas antes da execução)
-            if quantidade <= 0:
-                # Se qualquer item for inválido, reverte a transação inteira
-                raise ValueError(f"Quantidade inválida ({quantidade}) para a peça ID {peca_id}.")
-
-            # 1. Atualiza o estoque na tabela 'pecas'
-            atualizar_estoque_peca(peca_id, quantidade, cursor)
-            
-            # 2. Registra a movimentação de 'entrada'
-            inserir_movimentacao_peca(
-                peca_id=peca_id,
-                tipo_movimentacao='entrada',
-                quantidade=quantidade,
-                cursor=cursor,
-                valor_custo=item.get('valor_custo'), # Usa .get() para campos opcionais
-                descricao=item.get('descricao')
-            )
-            
-        # 3. Confirma a transação (somente se TODOS os itens do loop derem certo)
+
+        # Lote já registrado (repetição da mesma operação): não soma de novo.
+        if idempotencia.obter_resultado(cursor, chave_idempotencia) is not None:
+            logger.info(f"Lote com a chave '{chave_idempotencia}' já foi registrado; nada foi gravado.")
+            return {"sucesso": True, "linhas": []}
+
+        # 1. Valida o lote inteiro antes de escrever.
+        linhas, deltas = _validar_lote_entrada(cursor, lote_itens)
+        invalidas = [linha for linha in linhas if not linha["ok"]]
+        if invalidas:
+            logger.warning(
+                f"Lote de entrada rejeitado: {len(invalidas)} de {len(linhas)} linha(s) inválida(s).")
+            return {"sucesso": False, "linhas": linhas}
+
+        # 2. Atualiza o estoque: um UPDATE por peça distinta.
+        cursor.executemany(
+            "UPDATE pecas SET quantidade_em_estoque = quantidade_em_estoque + ? WHERE id = ?",
+            [(quantidade, peca_id) for peca_id, quantidade in deltas.items()],
+        )
+
+        # 3. Registra as movimentações de 'entrada', uma por linha do lote.
+        data_hora_atual = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        cursor.executemany(
+            """
+            INSERT INTO movimentacao_pecas
+                (peca_id, data_movimentacao, tipo_movimentacao, quantidade, valor_custo, descricao)
+            VALUES (?, ?, 'entrada', ?, ?, ?)
+            """,
+            [(item['peca_id'], data_hora_atual, item['quantidade'],
+              item.get('valor_custo'), item.get('descricao')) for item in lote_itens],
+        )
+
+        # 4. Confirma a transação (somente se TODAS as linhas forem válidas)
+        idempotencia.registrar_resultado(
+            cursor, chave_idempotencia, "registrar_entrada_estoque_lote", str(len(lote_itens)))
         conn.commit()
-        logger.info(f"Transação de entrada de lote concluída com sucesso.")
-        return True
-        
-    except (sqlite3.Error, ValueError) as e:
-        # Em caso de qualquer erro, desfaz toda a operação
+        cache_pecas.invalidar()
+        logger.info(
+            f"Entrada de lote concluída: {len(lote_itens)} linha(s), {len(deltas)} peça(s) atualizada(s).")
+        return {"sucesso": True, "linhas": linhas}
+
+    except sqlite3.IntegrityError as e:
+        conn.rollback()
+        # Outra transação registrou o mesmo lote entre a verificação e o commit.
+        if idempotencia.obter_resultado(conn.cursor(), chave_idempotencia) is not None:
+            logger.info(f"Lote com a chave '{chave_idempotencia}' registrado por outra transação.")
+            return {"sucesso": True, "linhas": []}
         logger.error(f"Erro na transação de entrada de lote: {e}", exc_info=True)
+        return {"sucesso": False, "linhas": []}
+    except sqlite3.Error as e:
+        # Em caso de qualquer erro, desfaz toda a operação
         conn.rollback()
-        return False
+        if banco_ocupado(e):
+            logger.warning(f"Banco ocupado na transação de entrada de lote: {e}")
+            raise
+        logger.error(f"Erro na transação de entrada de lote: {e}", exc_info=True)
+        return {"sucesso": False, "linhas": []}
     finally:
         if conn:
-            conn.close()
\ No newline at end of file
+            conn.close()
+
+# =================================================================================
+# QUERIES DE SALDO DE ESTOQUE (MATERIALIZADO E HISTÓRICO)
+# =================================================================================
+
+# Intervalo mínimo entre dois snapshots automáticos do saldo de estoque.
+INTERVALO_SNAPSHOT_ESTOQUE_DIAS = 1
+
+_SQL_SALDO_POR_PECA = """
+    SELECT
+        p.id, p.nome, p.referencia,
+        {entradas} AS total_entradas,
+        {saidas} AS total_saidas
+    FROM pecas p
+    {juncoes}
+    ORDER BY p.nome, p.id
+"""
+
+
+def _linhas_saldo(cursor: sqlite3.Cursor) -> List[Dict[str, Any]]:
+    return [
+        {"peca_id": linha["id"], "nome": linha["nome"], "referencia": linha["referencia"],
+         "total_entradas": linha["total_entradas"], "total_saidas": linha["total_saidas"],
+         "saldo": linha["total_entradas"] - linha["total_saidas"]}
+        for linha in cursor.fetchall()
+    ]
+
+
+def obter_saldo_estoque() -> List[Dict[str, Any]]:
+    """
+    Retorna o saldo atual de cada peça a partir da tabela `saldo_estoque`,
+    mantida pelos triggers de `movimentacao_pecas`. O custo depende só do
+    número de peças, não do tamanho do histórico de movimentações.
+    """
+    sql = _SQL_SALDO_POR_PECA.format(
+        entradas="COALESCE(s.total_entradas, 0)",
+        saidas="COALESCE(s.total_saidas, 0)",
+        juncoes="LEFT JOIN saldo_estoque s ON s.peca_id = p.id",
+    )
+    try:
+        with get_db_connection() as conn:
+            return _linhas_saldo(conn.execute(sql))
+    except sqlite3.Error as e:
+        logger.error(f"Erro ao obter o saldo de estoque: {e}", exc_info=True)
+        return []
+
+
+def obter_saldo_estoque_em(data: str) -> List[Dict[str, Any]]:
+    """
+    Retorna o saldo de cada peça numa data passada: parte do snapshot mais
+    recente até essa data e soma apenas as movimentações posteriores a ele.
+
+    :param data: 'AAAA-MM-DD' (considera o dia inteiro) ou 'AAAA-MM-DD HH:MM:SS'.
+    """
+    if len(data) == 10:
+        data = f"{data} 23:59:59"
+    sql = """
+        WITH snap AS (
+            SELECT id, ultimo_movimento_id FROM snapshots_estoque
+            WHERE data_corte <= :data
+            ORDER BY data_corte DESC, id DESC LIMIT 1
+        ),
+        delta AS (
+            SELECT
+                peca_id,
+                SUM(CASE WHEN tipo_movimentacao = 'entrada' THEN quantidade ELSE 0 END) AS entradas,
+                SUM(CASE WHEN tipo_movimentacao = 'saida' THEN quantidade ELSE 0 END) AS saidas
+            FROM movimentacao_pecas
+            WHERE id > COALESCE((SELECT ultimo_movimento_id FROM snap), 0)
+              AND data_movimentacao <= :data
+            GROUP BY peca_id
+        )
+    """ + _SQL_SALDO_POR_PECA.format(
+        entradas="COALESCE(s.total_entradas, 0) + COALESCE(d.entradas, 0)",
+        saidas="COALESCE(s.total_saidas, 0) + COALESCE(d.saidas, 0)",
+        juncoes="""
+            LEFT JOIN snapshot_saldo_estoque s
+                ON s.peca_id = p.id AND s.snapshot_id = (SELECT id FROM snap)
+            LEFT JOIN delta d ON d.peca_id = p.id
+        """,
+    )
+    try:
+        with get_db_connection() as conn:
+            return _linhas_saldo(conn.execute(sql, {"data": data}))
+    except sqlite3.Error as e:
+        logger.error(f"Erro ao obter o saldo de estoque em {data}: {e}", exc_info=True)
+        return []
+
+
+def criar_snapshot_estoque(forcar: bool = False) -> Optional[int]:
+    """
+    Copia o saldo materializado atual para um novo snapshot.
+
+    A cópia é feita sob o bloqueio de escrita (BEGIN IMMEDIATE): o snapshot
+    contém exatamente as movimentações até `ultimo_movimento_id`.
+
+    :param forcar: Se False, não cria o snapshot quando o último tem menos de
+                   `INTERVALO_SNAPSHOT_ESTOQUE_DIAS` dias.
+    :return: O ID do snapshot criado, ou None.
+    """
+    conn = get_db_connection()
+    if not conn:
+        return None
+    try:
+        cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        agora = datetime.now()
+        if not forcar:
+            ultimo = cursor.execute("SELECT MAX(data_corte) FROM snapshots_estoque").fetchone()[0]
+            if ultimo and agora - datetime.strptime(ultimo, "%Y-%m-%d %H:%M:%S") < timedelta(days=INTERVALO_SNAPSHOT_ESTOQUE_DIAS):
+                conn.rollback()
+                return None
+        cursor.execute(
+            "INSERT INTO snapshots_estoque (data_corte, ultimo_movimento_id) "
+            "SELECT ?, COALESCE(MAX(id), 0) FROM movimentacao_pecas",
+            (agora.strftime("%Y-%m-%d %H:%M:%S"),),
+        )
+        snapshot_id = cursor.lastrowid
+        cursor.execute(
+            "INSERT INTO snapshot_saldo_estoque (snapshot_id, peca_id, total_entradas, total_saidas) "
+            "SELECT ?, peca_id, total_entradas, total_saidas FROM saldo_estoque",
+            (snapshot_id,),
+        )
+        conn.commit()
+        logger.info(f"Snapshot de estoque {snapshot_id} criado ({cursor.rowcount} peça(s)).")
+        return snapshot_id
+    except sqlite3.Error as e:
+        logger.error(f"Erro ao criar snapshot de estoque: {e}", exc_info=True)
+        conn.rollback()
+        return None
+    finally:
+        conn.close()
+
+
+# =================================================================================
+# QUERIES DO KARDEX (HISTÓRICO DE MOVIMENTAÇÕES COM SALDO ACUMULADO)
+# =================================================================================
+
+
+def _normalizar_periodo(data_inicio: Optional[str], data_fim: Optional[str]) -> Tuple[str, str]:
+    """Converte 'AAAA-MM-DD' nos limites do dia; None vira um limite aberto."""
+    inicio = data_inicio or ""
+    fim = data_fim or "9999-12-31 23:59:59"
+    if len(inicio) == 10:
+        inicio = f"{inicio} 00:00:00"
+    if len(fim) == 10:
+        fim = f"{fim} 23:59:59"
+    return inicio, fim
+
+
+def obter_saldo_peca_antes(peca_id: int, data: Optional[str]) -> int:
+    """
+    Retorna o saldo (entradas - saídas) da peça antes da data informada.
+
+    Parte do snapshot mais recente anterior à data e soma só as movimentações
+    da peça feitas depois dele (índice por peca_id, data_movimentacao).
+
+    :param data: 'AAAA-MM-DD' ou 'AAAA-MM-DD HH:MM:SS'. None retorna 0.
+    """
+    if not data:
+        return 0
+    data, _ = _normalizar_periodo(data, None)
+    try:
+        with get_db_connection() as conn:
+            snapshot = conn.execute(
+                """
+                SELECT s.ultimo_movimento_id,
+                       COALESCE(ss.total_entradas - ss.total_saidas, 0) AS saldo
+                FROM snapshots_estoque s
+                LEFT JOIN snapshot_saldo_estoque ss
+                    ON ss.snapshot_id = s.id AND ss.peca_id = ?
+                WHERE s.data_corte < ?
+                ORDER BY s.data_corte DESC, s.id DESC LIMIT 1
+                """,
+                (peca_id, data),
+            ).fetchone()
+            ultimo_movimento_id, saldo = (snapshot[0], snapshot[1]) if snapshot else (0, 0)
+            delta = conn.execute(
+                """
+                SELECT COALESCE(SUM(CASE WHEN tipo_movimentacao = 'entrada' THEN quantidade ELSE -quantidade END), 0)
+                FROM movimentacao_pecas
+                WHERE peca_id = ? AND data_movimentacao < ? AND id > ?
+                """,
+                (peca_id, data, ultimo_movimento_id),
+            ).fetchone()[0]
+            return saldo + delta
+    except sqlite3.Error as e:
+        logger.error(
+            f"Erro ao calcular o saldo da peça ID {peca_id} antes de {data}: {e}", exc_info=True)
+        return 0
+
+
+def obter_kardex_peca(
+    peca_id: int,
+    data_inicio: Optional[str] = None,
+    data_fim: Optional[str] = None,
+    limite: int = TAMANHO_PAGINA_PADRAO,
+    apos: Optional[Tuple[str, int, int]] = None,
+    saldo_inicial: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Retorna uma página do kardex da peça: as movimentações em ordem
+    cronológica, cada uma com o saldo acumulado após ela.
+
+    O saldo é calculado por uma função de janela (SUM ... OVER) somente sobre
+    as linhas da página, a partir do saldo anterior a ela; o histórico
+    anterior nunca é relido.
+
+    :param data_inicio: Opcional. 'AAAA-MM-DD' (inclusive).
+    :param data_fim: Opcional. 'AAAA-MM-DD' (inclusive).
+    :param apos: Cursor (data_movimentacao, id, saldo) da última linha da
+                 página anterior; None para a primeira página.
+    :param saldo_inicial: Saldo antes da primeira página. Se None, é
+                          calculado com `obter_saldo_peca_antes`.
+    :return: Lista de dicts com as colunas da movimentação, 'entrada',
+             'saida' e 'saldo'.
+    """
+    inicio, fim = _normalizar_periodo(data_inicio, data_fim)
+    if apos is not None:
+        data_apos, id_apos, saldo_base = apos
+    else:
+        data_apos, id_apos = "", 0
+        saldo_base = saldo_inicial if saldo_inicial is not None else obter_saldo_peca_antes(peca_id, data_inicio)
+
+    sql = """
+        SELECT
+            id, data_movimentacao, tipo_movimentacao, quantidade,
+            valor_custo, descricao, ordem_servico_id,
+            :saldo_base + SUM(
+                CASE WHEN tipo_movimentacao = 'entrada' THEN quantidade ELSE -quantidade END
+            ) OVER (ORDER BY data_movimentacao, id ROWS UNBOUNDED PRECEDING) AS saldo
+        FROM movimentacao_pecas
+        WHERE peca_id = :peca_id
+          AND data_movimentacao BETWEEN :inicio AND :fim
+          AND (data_movimentacao, id) > (:data_apos, :id_apos)
+        ORDER BY data_movimentacao, id
+        LIMIT :limite
+    """
+    try:
+        with get_db_connection() as conn:
+            linhas = conn.execute(sql, {
+                "saldo_base": saldo_base, "peca_id": peca_id, "inicio": inicio, "fim": fim,
+                "data_apos": data_apos, "id_apos": id_apos, "limite": limite,
+            }).fetchall()
+            return [
+                {**dict(linha),
+                 "entrada": linha["quantidade"] if linha["tipo_movimentacao"] == "entrada" else 0,
+                 "saida": linha["quantidade"] if linha["tipo_movimentacao"] == "saida" else 0}
+                for linha in linhas
+            ]
+    except sqlite3.Error as e:
+        logger.error(f"Erro ao obter o kardex da peça ID {peca_id}: {e}", exc_info=True)
+        return []
@@ -0,0 +1,312 @@
+# -*- coding: utf-8 -*-
+
+# =================================================================================
+# MÓDULO DE ÍNDICES DE BUSCA TEXTUAL (search_index.py)
+#
+# OBJETIVO: Manter tabelas FTS5 "sombra" para as telas de busca (clientes,
+#           carros, peças, mecânicos e serviços), sincronizadas por triggers.
+#
+# DETALHES:
+#   - Cada tabela FTS usa o `rowid` igual ao `id` da entidade, o que permite
+#     um JOIN direto com a tabela principal.
+#   - O tokenizador `unicode61 remove_diacritics 2` ignora acentos, então
+#     "joao" encontra "João" e "acucar" encontra "Açúcar".
+#   - Cada palavra digitada vira uma busca por prefixo ("fil" -> "filtro").
+#   - Se o SQLite não tiver o módulo FTS5 compilado (ou não aceitar as opções
+#     acima, ex.: `remove_diacritics 2` antes do 3.27), as queries continuam
+#     funcionando com o `LIKE` antigo (ver `fts_disponivel()`).
+#   - A versão das tabelas/triggers abaixo fica gravada em
+#     `indices_busca_versao`. Os índices só são recriados e repovoados quando
+#     `VERSAO_INDICES_BUSCA` muda (ou no primeiro uso); as inicializações
+#     seguintes não leem as tabelas. Ao alterar `CREATE_FTS_SQL` ou
+#     `_REPOVOAMENTO_FTS`, incremente `VERSAO_INDICES_BUSCA`.
+# =================================================================================
+
+# --- IMPORTAÇÕES DE BIBLIOTECAS ---
+import logging
+import re
+import sqlite3
+from datetime import datetime
+
+# --- CONFIGURAÇÃO DO LOGGER ---
+logger = logging.getLogger(__name__)
+
+# Opções comuns a todas as tabelas FTS: ignora acentos e mantém índices de
+# prefixo de 2 e 3 caracteres para acelerar as buscas mais curtas.
+_OPCOES_FTS = "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'"
+
+# Versão das definições de `CREATE_FTS_SQL` e `_REPOVOAMENTO_FTS`.
+VERSAO_INDICES_BUSCA = 1
+
+# Guarda a versão dos índices de busca presentes no banco (uma única linha).
+CREATE_VERSAO_INDICES_SQL = """
+    CREATE TABLE IF NOT EXISTS indices_busca_versao (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        versao INTEGER NOT NULL,
+        atualizada_em TEXT NOT NULL
+    );
+"""
+
+# Indica se o módulo FTS5 está disponível neste SQLite. Definido em
+# `criar_indices_busca()` durante a inicialização do banco.
+_fts_disponivel = False
+
+# --- DEFINIÇÃO DAS TABELAS E TRIGGERS ---
+
+CREATE_FTS_SQL = [
+    # --- CLIENTES: nome, telefone e as placas de todos os seus carros ---
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS clientes_fts
+    USING fts5(nome, telefone, placas, {_OPCOES_FTS});
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS clientes_fts_ai AFTER INSERT ON clientes BEGIN
+        INSERT INTO clientes_fts (rowid, nome, telefone, placas)
+        VALUES (new.id, new.nome, new.telefone, NULL);
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS clientes_fts_au AFTER UPDATE OF nome, telefone ON clientes BEGIN
+        UPDATE clientes_fts SET nome = new.nome, telefone = new.telefone
+        WHERE rowid = new.id;
+        UPDATE carros_fts SET nome_cliente = new.nome
+        WHERE rowid IN (SELECT id FROM carros WHERE cliente_id = new.id);
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS clientes_fts_ad AFTER DELETE ON clientes BEGIN
+        DELETE FROM clientes_fts WHERE rowid = old.id;
+    END;
+    """,
+
+    # --- CARROS: modelo, placa e nome do proprietário ---
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS carros_fts
+    USING fts5(modelo, placa, nome_cliente, {_OPCOES_FTS});
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS carros_fts_ai AFTER INSERT ON carros BEGIN
+        INSERT INTO carros_fts (rowid, modelo, placa, nome_cliente)
+        VALUES (new.id, new.modelo, new.placa,
+                (SELECT nome FROM clientes WHERE id = new.cliente_id));
+        UPDATE clientes_fts
+        SET placas = (SELECT group_concat(placa, ' ') FROM carros WHERE cliente_id = new.cliente_id)
+        WHERE rowid = new.cliente_id;
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS carros_fts_au AFTER UPDATE OF modelo, placa, cliente_id ON carros BEGIN
+        UPDATE carros_fts
+        SET modelo = new.modelo, placa = new.placa,
+            nome_cliente = (SELECT nome FROM clientes WHERE id = new.cliente_id)
+        WHERE rowid = new.id;
+        UPDATE clientes_fts
+        SET placas = (SELECT group_concat(placa, ' ') FROM carros WHERE cliente_id = old.cliente_id)
+        WHERE rowid = old.cliente_id;
+        UPDATE clientes_fts
+        SET placas = (SELECT group_concat(placa, ' ') FROM carros WHERE cliente_id = new.cliente_id)
+        WHERE rowid = new.cliente_id;
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS carros_fts_ad AFTER DELETE ON carros BEGIN
+        DELETE FROM carros_fts WHERE rowid = old.id;
+        UPDATE clientes_fts
+        SET placas = (SELECT group_concat(placa, ' ') FROM carros WHERE cliente_id = old.cliente_id)
+        WHERE rowid = old.cliente_id;
+    END;
+    """,
+
+    # --- PEÇAS: nome, referência e fabricante ---
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS pecas_fts
+    USING fts5(nome, referencia, fabricante, {_OPCOES_FTS});
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS pecas_fts_ai AFTER INSERT ON pecas BEGIN
+        INSERT INTO pecas_fts (rowid, nome, referencia, fabricante)
+        VALUES (new.id, new.nome, new.referencia, new.fabricante);
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS pecas_fts_au AFTER UPDATE OF nome, referencia, fabricante ON pecas BEGIN
+        UPDATE pecas_fts
+        SET nome = new.nome, referencia = new.referencia, fabricante = new.fabricante
+        WHERE rowid = new.id;
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS pecas_fts_ad AFTER DELETE ON pecas BEGIN
+        DELETE FROM pecas_fts WHERE rowid = old.id;
+    END;
+    """,
+
+    # --- MECÂNICOS: nome, CPF e especialidade ---
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS mecanicos_fts
+    USING fts5(nome, cpf, especialidade, {_OPCOES_FTS});
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS mecanicos_fts_ai AFTER INSERT ON mecanicos BEGIN
+        INSERT INTO mecanicos_fts (rowid, nome, cpf, especialidade)
+        VALUES (new.id, new.nome, new.cpf, new.especialidade);
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS mecanicos_fts_au AFTER UPDATE OF nome, cpf, especialidade ON mecanicos BEGIN
+        UPDATE mecanicos_fts
+        SET nome = new.nome, cpf = new.cpf, especialidade = new.especialidade
+        WHERE rowid = new.id;
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS mecanicos_fts_ad AFTER DELETE ON mecanicos BEGIN
+        DELETE FROM mecanicos_fts WHERE rowid = old.id;
+    END;
+    """,
+
+    # --- SERVIÇOS: nome e descrição ---
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS servicos_fts
+    USING fts5(nome, descricao, {_OPCOES_FTS});
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS servicos_fts_ai AFTER INSERT ON servicos BEGIN
+        INSERT INTO servicos_fts (rowid, nome, descricao)
+        VALUES (new.id, new.nome, new.descricao);
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS servicos_fts_au AFTER UPDATE OF nome, descricao ON servicos BEGIN
+        UPDATE servicos_fts SET nome = new.nome, descricao = new.descricao
+        WHERE rowid = new.id;
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS servicos_fts_ad AFTER DELETE ON servicos BEGIN
+        DELETE FROM servicos_fts WHERE rowid = old.id;
+    END;
+    """,
+]
+
+# Triggers de `CREATE_FTS_SQL`, removidos antes de recriar os índices.
+_TRIGGERS_FTS = re.findall(r"CREATE TRIGGER IF NOT EXISTS (\w+)", "".join(CREATE_FTS_SQL))
+
+# Para cada índice: (tabela principal, SQL que repopula o índice a partir dela).
+# Usado ao criar os índices num banco que já tem dados e a cada mudança de
+# `VERSAO_INDICES_BUSCA`.
+_REPOVOAMENTO_FTS = {
+    "clientes_fts": ("clientes", """
+        INSERT INTO clientes_fts (rowid, nome, telefone, placas)
+        SELECT c.id, c.nome, c.telefone,
+               (SELECT group_concat(car.placa, ' ') FROM carros car WHERE car.cliente_id = c.id)
+        FROM clientes c
+    """),
+    "carros_fts": ("carros", """
+        INSERT INTO carros_fts (rowid, modelo, placa, nome_cliente)
+        SELECT car.id, car.modelo, car.placa, cli.nome
+        FROM carros car LEFT JOIN clientes cli ON cli.id = car.cliente_id
+    """),
+    "pecas_fts": ("pecas", """
+        INSERT INTO pecas_fts (rowid, nome, referencia, fabricante)
+        SELECT id, nome, referencia, fabricante FROM pecas
+    """),
+    "mecanicos_fts": ("mecanicos", """
+        INSERT INTO mecanicos_fts (rowid, nome, cpf, especialidade)
+        SELECT id, nome, cpf, especialidade FROM mecanicos
+    """),
+    "servicos_fts": ("servicos", """
+        INSERT INTO servicos_fts (rowid, nome, descricao)
+        SELECT id, nome, descricao FROM servicos
+    """),
+}
+
+
+def criar_indices_busca(cursor: sqlite3.Cursor) -> bool:
+    """
+    Cria as tabelas FTS5 e seus triggers. Se a versão gravada no banco for
+    diferente de `VERSAO_INDICES_BUSCA`, recria os índices e os repovoa a
+    partir das tabelas principais; caso contrário, nada é lido.
+    Recebe um cursor para operar dentro da transação de inicialização.
+
+    :return: True se o FTS5 está disponível e os índices estão prontos.
+    """
+    global _fts_disponivel
+    cursor.execute(CREATE_VERSAO_INDICES_SQL)
+    if not _sondar_fts5(cursor):
+        # Triggers gravados por um SQLite com FTS5 fariam falhar toda escrita
+        # nas tabelas principais. Sem a versão gravada, os índices são
+        # recriados quando o FTS5 voltar a estar disponível.
+        for trigger in _TRIGGERS_FTS:
+            cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        cursor.execute("DELETE FROM indices_busca_versao")
+        _fts_disponivel = False
+        return False
+
+    linha = cursor.execute("SELECT versao FROM indices_busca_versao WHERE id = 1").fetchone()
+    versao_gravada = linha[0] if linha else None
+    reconstruir = versao_gravada != VERSAO_INDICES_BUSCA
+    if reconstruir:
+        _remover_indices_busca(cursor)
+    for sql in CREATE_FTS_SQL:
+        cursor.execute(sql)
+
+    if reconstruir:
+        logger.info(
+            f"Recriando os índices de busca (versão {versao_gravada} -> {VERSAO_INDICES_BUSCA}).")
+        for tabela_fts, (tabela, sql_repovoar) in _REPOVOAMENTO_FTS.items():
+            logger.debug(f"Repovoando o índice de busca '{tabela_fts}' a partir de '{tabela}'.")
+            cursor.execute(sql_repovoar)
+        cursor.execute(
+            "INSERT OR REPLACE INTO indices_busca_versao (id, versao, atualizada_em) VALUES (1, ?, ?)",
+            (VERSAO_INDICES_BUSCA, datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+        )
+
+    _fts_disponivel = True
+    return True
+
+
+def _sondar_fts5(cursor: sqlite3.Cursor) -> bool:
+    """
+    Cria e remove uma tabela FTS5 temporária com as mesmas opções dos índices.
+    Qualquer erro indica que este SQLite não atende (sem o módulo FTS5, ou sem
+    `remove_diacritics 2`, que exige o SQLite 3.27+).
+    """
+    try:
+        cursor.execute(f"CREATE VIRTUAL TABLE temp.sonda_fts USING fts5(a, {_OPCOES_FTS})")
+        cursor.execute("DROP TABLE temp.sonda_fts")
+    except sqlite3.OperationalError as e:
+        logger.warning(
+            f"FTS5 indisponível neste SQLite ({e}). As buscas usarão LIKE.")
+        return False
+    return True
+
+
+def _remover_indices_busca(cursor: sqlite3.Cursor):
+    """Remove os triggers e as tabelas FTS (de qualquer versão anterior)."""
+    for trigger in _TRIGGERS_FTS:
+        cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    for tabela_fts in _REPOVOAMENTO_FTS:
+        cursor.execute(f"DROP TABLE IF EXISTS {tabela_fts}")
+
+
+def fts_disponivel() -> bool:
+    """Informa se as buscas podem usar os índices FTS5."""
+    return _fts_disponivel
+
+
+def montar_expressao_fts(termo: str) -> str | None:
+    """
+    Converte o texto digitado pelo usuário numa expressão MATCH do FTS5.
+
+    Cada palavra vira um prefixo entre aspas (o que neutraliza operadores
+    do FTS5 digitados por acidente) e todas precisam estar presentes.
+    Ex.: 'filtro óleo' -> '"filtro"* "óleo"*'
+
+    :return: A expressão, ou None se o termo não tiver nenhuma palavra
+             (nesse caso a busca deve listar todos os registros).
+    """
+    palavras = re.findall(r"\w+", termo or "")
+    if not palavras:
+        return None
+    return " ".join(f'"{palavra}"*' for palavra in palavras)
@@ -11,13 +11,22 @@
 #     seu construtor (`__init__`). Isso alinha o modelo de dados com a
 #     estrutura da tabela `usuarios` no banco de dados, resolvendo o
 #     `TypeError`.
+#
+# MEMÓRIA:
+#   - Os modelos declaram `__slots__`: sem o `__dict__` por instância, cada
+#     objeto ocupa bem menos memória, o que conta nos catálogos em cache
+#     (milhares de peças). Atributos fora dos slots não podem ser criados.
+#   - A ordem dos parâmetros de cada `__init__` é usada pelo mapeador de
+#     linhas (src/database/mapeador.py) para montar os objetos por posição.
 # =================================================================================
-from typing import Optional, List
+from typing import Dict, Optional, List
 
 
 class Estabelecimento:
     """Representa um estabelecimento (oficina) no sistema."""
 
+    __slots__ = ("id", "nome", "endereco", "telefone", "responsavel", "cpf_cnpj", "logo_path", "chave_pix")
+
     def __init__(self, id: int, nome: str,
                  endereco: Optional[str] = None,
                  telefone: Optional[str] = None,
@@ -37,6 +46,9 @@ class Estabelecimento:
 
 class Usuario:
     """Representa um usuário do sistema."""
+
+    __slots__ = ("id", "nome", "senha", "perfil", "id_estabelecimento")
+
     # --- CONSTRUTOR CORRIGIDO ---
     # Adicionado `id_estabelecimento: Optional[int]` para corresponder à tabela.
 
@@ -51,6 +63,9 @@ class Usuario:
 
 class Mecanico:
     """Representa um mecânico ou profissional da oficina."""
+
+    __slots__ = ("id", "nome", "cpf", "endereco", "telefone", "especialidade", "ativo")
+
     # O construtor agora inclui os campos 'endereco' e 'telefone'
 
     def __init__(self, id: int, nome: str, cpf: str, endereco: Optional[str], telefone: Optional[str], especialidade: Optional[str], ativo: bool = True):
@@ -66,6 +81,8 @@ class Mecanico:
 class Cliente:
     """Representa um cliente da oficina."""
 
+    __slots__ = ("id", "nome", "telefone", "endereco", "email", "ativo")
+
     # --- CONSTRUTOR ATUALIZADO ---
     # Adicionado o atributo `ativo`, que será usado para exclusão lógica.
     def __init__(self, id: int, nome: str, telefone: str, endereco: str, email: str, ativo: bool = True):
@@ -86,6 +103,8 @@ class Cliente:
 class Carro:
     """Representa um veículo pertencente a um cliente."""
 
+    __slots__ = ("id", "modelo", "ano", "cor", "placa", "cliente_id", "ativo")
+
     def __init__(
         self,
         id: int,
@@ -108,6 +127,9 @@ class Carro:
 class Peca:
     """Representa uma peça ou item de estoque."""
 
+    __slots__ = ("id", "nome", "referencia", "fabricante", "descricao", "preco_compra",
+                 "preco_venda", "quantidade_em_estoque", "ativo")
+
     def __init__(
         self,
         id: int,
@@ -135,19 +157,26 @@ class Peca:
 class Servico:
     """Representa um serviço ou um 'kit' de serviço prestado pela oficina."""
 
+    __slots__ = ("id", "nome", "descricao", "valor", "ativo", "pecas", "quantidades_pecas")
+
     def __init__(self, id: int, nome: str, descricao: Optional[str], valor: float, ativo: bool = True):
         self.id: int = id
         self.nome: str = nome
         self.descricao: Optional[str] = descricao
         self.valor: float = valor
         self.ativo: bool = ativo
-        # Este atributo será populado sob demanda pelas queries, não corresponde a uma coluna.
+        # Estes atributos serão populados sob demanda pelas queries, não correspondem a colunas.
         self.pecas: List[Peca] = []
+        # Quantidade de cada peça no kit: {peca_id: quantidade}.
+        self.quantidades_pecas: Dict[int, int] = {}
 
 
 class MovimentacaoPeca:
     """Representa um registro de movimentação de estoque."""
 
+    __slots__ = ("id", "peca_id", "data_movimentacao", "tipo_movimentacao", "quantidade",
+                 "ordem_servico_id", "valor_custo", "descricao")
+
     def __init__(self, id: int, peca_id: int, data_movimentacao: str,
                  tipo_movimentacao: str, quantidade: int,
                  ordem_servico_id: Optional[int] = None,
@@ -161,3 +190,62 @@ class MovimentacaoPeca:
         self.ordem_servico_id: Optional[int] = ordem_servico_id
         self.valor_custo: Optional[float] = valor_custo
         self.descricao: Optional[str] = descricao
+
+
+# =================================================================================
+# RESUMOS PARA LISTAGENS
+#
+# Projeções com apenas as colunas exibidas nas listas, buscas e seletores.
+# As queries de listagem leem só essas colunas (cobertas por índice) em vez
+# de `SELECT *`. As telas de edição continuam usando os modelos completos.
+# =================================================================================
+
+class PecaResumo:
+    """Dados de uma peça exibidos nas listas e seletores."""
+
+    __slots__ = ("id", "nome", "referencia", "preco_venda", "quantidade_em_estoque", "ativo")
+
+    def __init__(self, id: int, nome: str, referencia: str, preco_venda: float,
+                 quantidade_em_estoque: int, ativo: bool = True):
+        self.id: int = id
+        self.nome: str = nome
+        self.referencia: str = referencia
+        self.preco_venda: float = preco_venda
+        self.quantidade_em_estoque: int = quantidade_em_estoque
+        self.ativo: bool = ativo
+
+
+class ClienteResumo:
+    """Dados de um cliente exibidos nas listas e seletores."""
+
+    __slots__ = ("id", "nome", "telefone", "ativo")
+
+    def __init__(self, id: int, nome: str, telefone: str, ativo: bool = True):
+        self.id: int = id
+        self.nome: str = nome
+        self.telefone: str = telefone
+        self.ativo: bool = ativo
+
+
+class MecanicoResumo:
+    """Dados de um mecânico exibidos na lista de gerenciamento."""
+
+    __slots__ = ("id", "nome", "especialidade", "ativo")
+
+    def __init__(self, id: int, nome: str, especialidade: Optional[str], ativo: bool = True):
+        self.id: int = id
+        self.nome: str = nome
+        self.especialidade: Optional[str] = especialidade
+        self.ativo: bool = ativo
+
+
+class ServicoResumo:
+    """Dados de um serviço exibidos na lista de gerenciamento (sem o kit)."""
+
+    __slots__ = ("id", "nome", "valor", "ativo")
+
+    def __init__(self, id: int, nome: str, valor: float, ativo: bool = True):
+        self.id: int = id
+        self.nome: str = nome
+        self.valor: float = valor
+        self.ativo: bool = ativo
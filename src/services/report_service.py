@@ -1,7 +1,7 @@
 from fpdf import FPDF
 import os
 import flet as ft
-from src.database.database import criar_conexao_banco_de_dados, banco_de_dados, nome_banco_de_dados
+from src.database.database import get_db_connection
 import sqlite3
 from datetime import datetime
 from flet import SnackBar, AlertDialog, Text, Column, Dropdown, ElevatedButton, TextField
@@ -12,24 +12,7 @@ data_hora_criacao = datetime.now().strftime("%d_%m_%Y_%H_%M_%S")
 def gerar_relatorio_os(conexao, page):
     """Gera relatório em PDF com Data da OS, Cliente, Carro e Valor Total."""
     try:
-        cursor = conexao.cursor()
-
-        cursor.execute(
-            """
-            SELECT 
-                os.data_criacao,       -- Data da OS
-                c.nome AS nome_cliente,  -- Nome do Cliente
-                car.modelo || ' - ' || car.placa AS carro, -- Carro (Modelo - Placa)
-                os.valor_total         -- Valor Total da OS
-            FROM 
-                ordem_servico os
-            JOIN 
-                clientes c ON os.cliente_id = c.id
-            JOIN 
-                carros car ON os.carro_id = car.id
-        """
-        )
-        os_data = cursor.fetchall()
+        os_data = carregar_dados_relatorio_os(conexao)
 
         headers = [
             "Data da OS",
@@ -106,7 +89,11 @@ def gerar_relatorio_estoque(conexao, page):
 
 
 def carregar_dados_saldo_estoque(conexao):
-    """Carrega os dados de movimentação de peças do banco de dados."""
+    """
+    Carrega os totais de entradas e saídas de cada peça.
+    Lê a tabela materializada `saldo_estoque` (mantida por triggers), em vez de
+    somar todo o histórico de `movimentacao_pecas` a cada relatório.
+    """
     cursor = conexao.cursor()
     cursor.execute(
         """
@@ -114,20 +101,65 @@ def carregar_dados_saldo_estoque(conexao):
             p.id,
             p.nome, 
             p.referencia,
-            COALESCE(SUM(CASE WHEN mp.tipo_movimentacao = 'entrada' THEN mp.quantidade ELSE 0 END), 0) AS total_entradas,
-            COALESCE(SUM(CASE WHEN mp.tipo_movimentacao = 'saida' THEN mp.quantidade ELSE 0 END), 0) AS total_saídas
+            COALESCE(s.total_entradas, 0) AS total_entradas,
+            COALESCE(s.total_saidas, 0) AS total_saídas
         FROM 
             pecas p
         LEFT JOIN 
-            movimentacao_pecas mp ON p.id = mp.peca_id
-        GROUP BY
-            p.id, p.nome, p.referencia; 
+            saldo_estoque s ON s.peca_id = p.id
+        ORDER BY
+            p.nome, p.id;
         """
     )
     movimentacoes = cursor.fetchall()
     return movimentacoes
 
 
+def carregar_dados_relatorio_os(conexao):
+    """Carrega Data, Cliente, Carro (Modelo - Placa) e Valor Total de todas as OSs."""
+    cursor = conexao.cursor()
+    cursor.execute(
+        """
+        SELECT 
+            os.data_criacao,       -- Data da OS
+            c.nome AS nome_cliente,  -- Nome do Cliente
+            car.modelo || ' - ' || car.placa AS carro, -- Carro (Modelo - Placa)
+            os.valor_total         -- Valor Total da OS
+        FROM 
+            ordem_servico os
+        JOIN 
+            clientes c ON os.cliente_id = c.id
+        JOIN 
+            carros car ON os.carro_id = car.id
+    """
+    )
+    return cursor.fetchall()
+
+
+def carregar_dados_os_por_cliente(conexao, cliente_id, data_inicio, data_fim):
+    """Carrega as OSs de um cliente criadas entre `data_inicio` e `data_fim`."""
+    cursor = conexao.cursor()
+    cursor.execute(
+        """
+        SELECT 
+            os.data_criacao,
+            c.nome AS nome_cliente,
+            car.modelo || ' - ' || car.placa AS carro,
+            os.valor_total
+        FROM 
+            ordem_servico os
+        JOIN 
+            clientes c ON os.cliente_id = c.id
+        JOIN 
+            carros car ON os.carro_id = car.id
+        WHERE 
+            os.cliente_id = ? AND os.data_criacao BETWEEN ? AND ?
+    """,
+        (cliente_id, data_inicio, data_fim),
+    )
+    return cursor.fetchall()
+
+
 def mostrar_erro(page, mensagem):
     """Exibe uma snackbar de erro."""
     page.snack_bar = ft.SnackBar(ft.Text(mensagem), bgcolor="red")
@@ -159,7 +191,7 @@ def abrir_modal_os_por_cliente(page, clientes):
             datetime.strptime(data_inicio, "%Y-%m-%d")  # Valida formato da data
             datetime.strptime(data_fim, "%Y-%m-%d")  # Valida formato da data
 
-            with criar_conexao_banco_de_dados(nome_banco_de_dados) as conexao:
+            with get_db_connection() as conexao:
                 relatorio_os_por_cliente_data(conexao, page, cliente_id, data_inicio, data_fim)
 
             dlg.open = False
@@ -198,26 +230,7 @@ def abrir_modal_os_por_cliente(page, clientes):
 def relatorio_os_por_cliente_data(conexao, page, cliente_id, data_inicio, data_fim):
     """Gera o relatório de OSs por cliente e data em PDF."""
     try:
-        cursor = conexao.cursor()
-        cursor.execute(
-            """
-            SELECT 
-                os.data_criacao,
-                c.nome AS nome_cliente,
-                car.modelo || ' - ' || car.placa AS carro,
-                os.valor_total
-            FROM 
-                ordem_servico os
-            JOIN 
-                clientes c ON os.cliente_id = c.id
-            JOIN 
-                carros car ON os.carro_id = car.id
-            WHERE 
-                os.cliente_id = ? AND os.data_criacao BETWEEN ? AND ?
-        """,
-            (cliente_id, data_inicio, data_fim),
-        )
-        os_data = cursor.fetchall()
+        os_data = carregar_dados_os_por_cliente(conexao, cliente_id, data_inicio, data_fim)
 
         if not os_data:
             mostrar_erro(page, "Nenhuma OS encontrada para o período.")
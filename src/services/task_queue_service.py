@@ -3,59 +3,344 @@
 # =================================================================================
 # MÓDULO DE SERVIÇO DA FILA DE TAREFAS (task_queue_service.py)
 #
-# OBJETIVO: Isolar a lógica da thread que processa operações de banco de dados
-#           de forma assíncrona.
+# OBJETIVO: Executar operações de banco de dados em threads de fundo, para que
+#           os eventos da interface (Flet) não fiquem bloqueados.
 #
-# CORREÇÃO (BUG FIX):
-#   - Garantido que a 'fila_db' seja importada de sua fonte original,
-#     'src.database.database', para que este serviço possa consumir as tarefas.
+# ATUALIZAÇÃO:
+#   - A thread única com a cadeia de `if operacao == ...` foi substituída pelo
+#     `ServicoTarefas`:
+#       * as tarefas são registradas por nome (`@servico_tarefas.tarefa(...)`);
+#       * um único worker de ESCRITA executa as tarefas que alteram o banco, na
+#         ordem de prioridade (o SQLite aceita um escritor por vez);
+#       * um grupo de workers de LEITURA executa consultas em paralelo;
+#       * cada envio retorna um `Future` e aceita um callback `ao_concluir`;
+#       * erros de banco ocupado/travado (SQLITE_BUSY) são repetidos com espera
+#         crescente;
+#       * no encerramento, as tarefas já enfileiradas são concluídas antes de as
+#         threads pararem.
+#   - A antiga `fila_db` deixou de existir: use `servico_tarefas.enviar(...)`.
+#   - Tarefas registradas com `duravel=True` são gravadas na outbox
+#     (`src/database/outbox.py`) antes de entrarem na fila em memória. A função
+#     da tarefa recebe `outbox_id` e dá baixa na outbox na mesma transação da
+#     escrita de negócio. Ao iniciar, o serviço reenfileira as pendentes.
+#   - As tarefas de escrita levam uma `chave_idempotencia` nos dados: repetir a
+#     mesma tarefa (duplo clique, reprocessamento) retorna o resultado original
+#     em vez de gravar de novo (ver `src/database/idempotencia.py`).
 # =================================================================================
 import flet as ft
 import sqlite3
 import queue
 import logging
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-# --- IMPORT CORRIGIDO ---
-# Importa a função de conexão e a fila de tarefas do módulo de database.
-from src.database.database import get_db_connection, NOME_BANCO_DE_DADOS, fila_db
 # Importa o módulo de queries para executar as operações de escrita.
 from src.database import queries
+from src.database import outbox
+from src.database.outbox import outbox_tarefas
+from src.database.database import banco_ocupado
 
-def processar_fila_db(page: ft.Page):
+logger = logging.getLogger(__name__)
+
+# --- TIPOS DE TAREFA ---
+ESCRITA = "escrita"
+LEITURA = "leitura"
+
+# --- PRIORIDADES (menor valor = executa primeiro) ---
+PRIORIDADE_ALTA = 0
+PRIORIDADE_NORMAL = 5
+PRIORIDADE_BAIXA = 9
+# Prioridade do sinal de parada: sempre depois de todas as tarefas pendentes.
+_PRIORIDADE_PARADA = 99
+
+# Quantidade de workers de leitura. Pode ser ajustada pela variável de ambiente
+# OFICINA_TAREFAS_LEITORES.
+QUANTIDADE_LEITORES = int(os.environ.get("OFICINA_TAREFAS_LEITORES", "2"))
+
+
+class ServicoTarefas:
     """
-    Função executada numa thread para processar operações de banco de dados.
-    Ela fica em um loop infinito, aguardando por tarefas na 'fila_db'.
+    Fila de tarefas com prioridades, um escritor e vários leitores.
+
+    :param leitores: Número de workers para tarefas de leitura.
+    :param max_tentativas: Tentativas por tarefa quando o banco está ocupado.
+    :param espera_inicial: Espera (em segundos) antes da 1ª repetição; dobra a cada nova tentativa.
     """
-    logging.info("Thread de processamento do DB iniciada.")
-    
-    while True:
-        try:
-            # Tenta pegar uma tarefa da fila. Fica bloqueada por até 1 segundo.
-            # Se não houver tarefa, uma exceção 'queue.Empty' é lançada.
-            operacao, dados = fila_db.get(timeout=1.0)
-            logging.info(f"Processando operação da fila: {operacao}")
-
-            # --- LÓGICA DE PROCESSAMENTO DAS TAREFAS ---
-            if operacao == "criar_ordem_servico":
-                # Desempacota os dados recebidos.
-                os_id = queries.inserir_ordem_servico(
-                    cliente_id=dados["cliente_id"],
-                    carro_id=dados["carro_id"],
-                    pecas_quantidades=dados["pecas_quantidades"],
-                    valor_total=dados["valor_total"],
-                    mao_de_obra=dados["mao_de_obra"]
-                )
-                if os_id:
-                    # Envia uma mensagem para a UI via PubSub para notificar o sucesso.
-                    page.pubsub.send_all({"topic": "os_criada", "mensagem": f"OS #{os_id} criada com sucesso!"})
+
+    def __init__(self, leitores: int = QUANTIDADE_LEITORES, max_tentativas: int = 3, espera_inicial: float = 0.1):
+        self.leitores = max(1, leitores)
+        self.max_tentativas = max_tentativas
+        self.espera_inicial = espera_inicial
+        self._tarefas: Dict[str, Tuple[Callable[..., Any], str, bool]] = {}
+        self._filas = {ESCRITA: queue.PriorityQueue(),
+                       LEITURA: queue.PriorityQueue()}
+        # Desempate para tarefas de mesma prioridade: ordem de chegada.
+        self._sequencia = itertools.count()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._aceitando = False
+        self.page: Optional[ft.Page] = None
+        # --- Contadores expostos por `estatisticas()` ---
+        self._concluidas = 0
+        self._falhas = 0
+        self._repeticoes = 0
+
+    # --- REGISTRO DE TAREFAS ---
+
+    def registrar(self, nome: str, funcao: Callable[..., Any], tipo: str = ESCRITA, duravel: bool = False):
+        """
+        Associa um nome de tarefa à função que a executa (recebe `dados`).
+
+        :param duravel: Se True, a tarefa é gravada na outbox antes de ser
+                        enfileirada, e a função também recebe `outbox_id`
+                        para dar baixa na mesma transação da sua escrita.
+                        Os `dados` devem ser serializáveis em JSON.
+        """
+        if tipo not in self._filas:
+            raise ValueError(f"Tipo de tarefa inválido: '{tipo}'.")
+        if duravel and tipo != ESCRITA:
+            raise ValueError("Apenas tarefas de escrita podem ser duráveis.")
+        self._tarefas[nome] = (funcao, tipo, duravel)
+
+    def tarefa(self, nome: str, tipo: str = ESCRITA, duravel: bool = False):
+        """Decorador equivalente a `registrar(nome, funcao, tipo, duravel)`."""
+        def decorador(funcao):
+            self.registrar(nome, funcao, tipo, duravel)
+            return funcao
+        return decorador
+
+    # --- CICLO DE VIDA ---
+
+    def iniciar(self, page: Optional[ft.Page] = None):
+        """Inicia o worker de escrita e os workers de leitura."""
+        with self._lock:
+            if self._aceitando:
+                return
+            self.page = page
+            self._aceitando = True
+            self._threads = [threading.Thread(
+                target=self._trabalhar, args=(ESCRITA,), name="tarefas-escrita", daemon=True)]
+            self._threads += [
+                threading.Thread(target=self._trabalhar, args=(LEITURA,),
+                                 name=f"tarefas-leitura-{i + 1}", daemon=True)
+                for i in range(self.leitores)
+            ]
+        for thread in self._threads:
+            thread.start()
+        logger.info(
+            f"Serviço de tarefas iniciado (1 escritor, {self.leitores} leitor(es)).")
+        self._reprocessar_outbox()
+
+    def _reprocessar_outbox(self):
+        """Reenfileira as tarefas que ficaram pendentes na outbox (ex.: o app fechou antes de processá-las)."""
+        outbox.limpar_concluidas()
+        pendentes = outbox.obter_pendentes()
+        for registro in pendentes:
+            nome = registro["nome"]
+            if nome not in self._tarefas:
+                logger.error(f"Tarefa '{nome}' da outbox (ID {registro['id']}) não está registrada.")
+                outbox.marcar_falha(registro["id"], "Tarefa não registrada.")
+                continue
+            self._enfileirar(nome, registro["dados"], registro["prioridade"], Future(), registro["id"])
+        if pendentes:
+            logger.warning(f"{len(pendentes)} tarefa(s) pendente(s) da outbox reenfileirada(s).")
+
+    def encerrar(self, timeout: float = 10.0):
+        """
+        Para de aceitar tarefas, conclui as que já estão na fila e encerra as threads.
+        :param timeout: Tempo máximo total de espera pelas threads.
+        """
+        with self._lock:
+            if not self._aceitando:
+                return
+            self._aceitando = False
+            threads = self._threads
+        # Um sinal de parada por worker, atrás de todas as tarefas pendentes.
+        self._filas[ESCRITA].put((_PRIORIDADE_PARADA, next(self._sequencia), None))
+        for _ in range(self.leitores):
+            self._filas[LEITURA].put((_PRIORIDADE_PARADA, next(self._sequencia), None))
+
+        limite = time.monotonic() + timeout
+        for thread in threads:
+            thread.join(max(0.0, limite - time.monotonic()))
+        pendentes = sum(thread.is_alive() for thread in threads)
+        if pendentes:
+            logger.warning(
+                f"Serviço de tarefas encerrado com {pendentes} thread(s) ainda em execução.")
+        else:
+            logger.info("Serviço de tarefas encerrado; fila drenada.")
+
+    # --- ENVIO ---
+
+    def enviar(self, nome: str, dados: Any = None, prioridade: int = PRIORIDADE_NORMAL,
+               ao_concluir: Optional[Callable[[Future], None]] = None) -> Future:
+        """
+        Enfileira uma tarefa registrada.
+
+        :param ao_concluir: Opcional. Chamado (na thread do worker) com o `Future`
+                            já concluído; use `futuro.result()` ou `futuro.exception()`.
+        :return: Um `Future` com o valor retornado pela tarefa.
+        :raises KeyError: Se a tarefa não estiver registrada.
+        :raises RuntimeError: Se o serviço não estiver aceitando tarefas.
+        """
+        if nome not in self._tarefas:
+            raise KeyError(f"Tarefa não registrada: '{nome}'.")
+        if not self._aceitando:
+            raise RuntimeError("O serviço de tarefas não está em execução.")
+        _, _, duravel = self._tarefas[nome]
+        # Grava na outbox (e espera o commit) antes de enfileirar.
+        outbox_id = outbox_tarefas.registrar(nome, dados, prioridade) if duravel else None
+        futuro: Future = Future()
+        if ao_concluir:
+            futuro.add_done_callback(ao_concluir)
+        self._enfileirar(nome, dados, prioridade, futuro, outbox_id)
+        return futuro
+
+    def _enfileirar(self, nome: str, dados: Any, prioridade: int, futuro: Future, outbox_id: Optional[int]):
+        funcao, tipo, _ = self._tarefas[nome]
+        with self._lock:
+            if not self._aceitando:
+                # Se já foi gravada na outbox, será reprocessada na próxima inicialização.
+                raise RuntimeError("O serviço de tarefas não está em execução.")
+            self._filas[tipo].put(
+                (prioridade, next(self._sequencia), (nome, funcao, dados, futuro, outbox_id)))
+        logger.debug(f"Tarefa '{nome}' enfileirada ({tipo}, prioridade {prioridade}).")
+
+    def notificar(self, topico: str, mensagem: str):
+        """Envia uma mensagem via PubSub para a interface, se houver uma página."""
+        if self.page is not None:
+            self.page.pubsub.send_all({"topic": topico, "mensagem": mensagem})
+
+    def estatisticas(self) -> dict:
+        """Retorna o tamanho das filas e os contadores do serviço."""
+        return {
+            "pendentes_escrita": self._filas[ESCRITA].qsize(),
+            "pendentes_leitura": self._filas[LEITURA].qsize(),
+            "concluidas": self._concluidas,
+            "falhas": self._falhas,
+            "repeticoes": self._repeticoes,
+            "outbox": outbox_tarefas.estatisticas(),
+        }
+
+    # --- WORKERS ---
+
+    def _trabalhar(self, tipo: str):
+        fila = self._filas[tipo]
+        while True:
+            _, _, item = fila.get()
+            try:
+                if item is None:
+                    return
+                self._executar(*item)
+            finally:
+                fila.task_done()
+
+    def _executar(self, nome: str, funcao: Callable[..., Any], dados: Any, futuro: Future, outbox_id: Optional[int]):
+        if not futuro.set_running_or_notify_cancel():
+            return
+        logger.info(f"Processando tarefa da fila: {nome}")
+        tentativa = 1
+        while True:
+            try:
+                if outbox_id is None:
+                    resultado = funcao(dados)
                 else:
-                    page.pubsub.send_all({"topic": "erro_os", "mensagem": "Falha ao criar a OS."})
-            
-            # Adicionar aqui a lógica para outras operações, como "cadastrar_carro", etc.
-
-        except queue.Empty:
-            # Se a fila estiver vazia, simplesmente continua o loop.
-            continue
-        except Exception as e:
-            # Captura qualquer outro erro inesperado para não quebrar a thread.
-            logging.error(f"Erro inesperado na thread do banco de dados: {e}", exc_info=True)
\ No newline at end of file
+                    resultado = funcao(dados, outbox_id=outbox_id)
+            except Exception as e:
+                if banco_ocupado(e) and tentativa < self.max_tentativas:
+                    espera = self.espera_inicial * (2 ** (tentativa - 1))
+                    logger.warning(
+                        f"Banco ocupado na tarefa '{nome}' (tentativa {tentativa}); repetindo em {espera:.2f}s.")
+                    with self._lock:
+                        self._repeticoes += 1
+                    tentativa += 1
+                    time.sleep(espera)
+                    continue
+                logger.error(f"Erro na tarefa '{nome}': {e}", exc_info=True)
+                with self._lock:
+                    self._falhas += 1
+                if outbox_id is not None:
+                    if banco_ocupado(e):
+                        # Erro transitório: a tarefa continua pendente na outbox
+                        # e é reprocessada na próxima inicialização.
+                        logger.warning(f"Tarefa '{nome}' (outbox {outbox_id}) mantida pendente na outbox.")
+                    else:
+                        outbox.marcar_falha(outbox_id, str(e))
+                futuro.set_exception(e)
+                return
+            if outbox_id is not None and not resultado:
+                # A escrita foi recusada por um erro permanente (ex.: estoque
+                # insuficiente) e a query retornou None/False: a tarefa não deve
+                # ser repetida a cada inicialização. Banco ocupado chega aqui
+                # como exceção e é repetido acima.
+                outbox.marcar_falha(outbox_id, "A tarefa não foi concluída.")
+            with self._lock:
+                self._concluidas += 1
+            futuro.set_result(resultado)
+            return
+
+
+# Instância única usada pela aplicação.
+servico_tarefas = ServicoTarefas()
+
+
+# =================================================================================
+# TAREFAS REGISTRADAS
+# =================================================================================
+
+@servico_tarefas.tarefa("criar_ordem_servico", duravel=True)
+def _criar_ordem_servico(dados: dict, outbox_id: Optional[int] = None) -> int | None:
+    """Insere a OS (dando baixa na outbox na mesma transação) e notifica a interface via PubSub."""
+    resultado = queries.inserir_ordem_servico(
+        cliente_id=dados["cliente_id"],
+        carro_id=dados["carro_id"],
+        # No JSON da outbox as chaves do dicionário viram texto; a query as converte.
+        pecas_quantidades=dados["pecas_quantidades"],
+        valor_total=dados["valor_total"],
+        mao_de_obra=dados["mao_de_obra"],
+        outbox_id=outbox_id,
+        chave_idempotencia=dados.get("chave_idempotencia"),
+    )
+    os_id = resultado["os_id"]
+    if os_id:
+        servico_tarefas.notificar("os_criada", f"OS #{os_id} criada com sucesso!")
+    elif resultado["faltas"]:
+        detalhes = "; ".join(
+            f"{falta['nome'] or 'Peça ID ' + str(falta['peca_id'])}: pedido {falta['solicitada']}, disponível {falta['disponivel']}"
+            for falta in resultado["faltas"])
+        servico_tarefas.notificar("erro_os", f"Estoque insuficiente. {detalhes}")
+    else:
+        servico_tarefas.notificar("erro_os", "Falha ao criar a OS.")
+    return os_id
+
+
+@servico_tarefas.tarefa("registrar_entrada_estoque_lote")
+def _registrar_entrada_estoque_lote(dados: dict) -> dict:
+    return queries.registrar_entrada_estoque_lote(
+        dados["itens"], chave_idempotencia=dados.get("chave_idempotencia"))
+
+
+@servico_tarefas.tarefa("criar_snapshot_estoque")
+def _criar_snapshot_estoque(_dados=None) -> int | None:
+    return queries.criar_snapshot_estoque()
+
+
+@servico_tarefas.tarefa("obter_pecas_ativas", tipo=LEITURA)
+def _obter_pecas_ativas(_dados=None) -> list:
+    return queries.obter_pecas_ativas()
+
+
+def iniciar_servico_tarefas(page: ft.Page):
+    """Inicia os workers do serviço de tarefas para a página da aplicação."""
+    servico_tarefas.iniciar(page)
+    # Snapshot periódico do saldo de estoque (só é criado se o último estiver vencido).
+    servico_tarefas.enviar("criar_snapshot_estoque", prioridade=PRIORIDADE_BAIXA)
+
+
+def encerrar_servico_tarefas():
+    """Conclui as tarefas pendentes e encerra os workers (usado no atexit)."""
+    servico_tarefas.encerrar()
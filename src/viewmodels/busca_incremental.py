@@ -0,0 +1,150 @@
+# =================================================================================
+# MÓDULO DA BUSCA INCREMENTAL (busca_incremental.py)
+#
+# OBJETIVO: Permitir a busca "enquanto digita" nos ViewModels sem travar a
+#           interface e sem executar uma consulta a cada tecla.
+#
+# COMO FUNCIONA:
+#   - Cada tecla reagenda a busca (debounce): ela só roda depois de
+#     `atraso` segundos sem digitação.
+#   - A consulta é executada na thread do temporizador, fora da thread da UI.
+#   - Cada agendamento recebe um número de geração. Se o usuário digitar de
+#     novo enquanto uma consulta está rodando, o resultado dela é descartado
+#     ao terminar, e só a consulta mais recente chega à View.
+#   - `executar` não deve alterar estado compartilhado: quem precisa guardar
+#     algo do resultado (ex.: o cursor do PaginadorBusca) passa `confirmar`,
+#     chamado sob o lock apenas quando a geração da busca ainda é a atual.
+#   - A verificação da geração, o `confirmar` e a entrega à View acontecem
+#     juntos sob o lock de entrega (`entrega`). `cancelar()` também o toma, e
+#     quem exibe uma busca imediata deve segurá-lo até atualizar a View: assim
+#     um resultado antigo nunca sobrescreve um mais novo já exibido.
+#   - O tempo de cada consulta é registrado no log e em `ultima_duracao_ms`.
+# =================================================================================
+import logging
+import threading
+import time
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Tempo padrão (em segundos) de espera após a última tecla.
+ATRASO_PADRAO = 0.3
+
+
+class BuscaIncremental:
+    """
+    Agenda buscas com debounce e entrega apenas o resultado da mais recente.
+
+    :param executar: Função que recebe o termo e retorna os resultados (roda fora da UI).
+    :param ao_concluir: Recebe (termo, resultados) da busca mais recente.
+    :param atraso: Segundos sem digitação antes de executar a busca.
+    :param ao_falhar: Opcional. Recebe a exceção se a busca mais recente falhar.
+    :param confirmar: Opcional. Recebe o retorno de `executar` da busca mais
+                      recente (sob o lock) e retorna o que será entregue a
+                      `ao_concluir`. Buscas substituídas nunca chegam a ele.
+    """
+
+    def __init__(
+        self,
+        executar: Callable[[str], Any],
+        ao_concluir: Callable[[str, Any], None],
+        atraso: float = ATRASO_PADRAO,
+        ao_falhar: Optional[Callable[[Exception], None]] = None,
+        confirmar: Optional[Callable[[Any], Any]] = None,
+    ):
+        self._executar = executar
+        self._ao_concluir = ao_concluir
+        self._ao_falhar = ao_falhar
+        self._confirmar = confirmar
+        self.atraso = atraso
+        self._lock = threading.Lock()
+        # Reentrante: quem segura `entrega` pode chamar `cancelar()`.
+        self._entrega = threading.RLock()
+        self._temporizador: Optional[threading.Timer] = None
+        self._geracao = 0
+        # Termo da última busca entregue, para não repetir a mesma consulta.
+        self._ultimo_termo: Optional[str] = None
+        # --- Métricas ---
+        self.ultima_duracao_ms: Optional[float] = None
+        self.executadas = 0
+        self.descartadas = 0
+
+    @property
+    def entrega(self) -> threading.RLock:
+        """
+        Lock de entrega à View. Segure-o durante uma busca imediata (cancelar,
+        consultar e exibir) para que nenhuma busca em segundo plano seja
+        exibida no meio.
+        """
+        return self._entrega
+
+    def agendar(self, termo: str):
+        """Agenda a busca do termo, cancelando a que ainda estava aguardando."""
+        termo = (termo or "").strip()
+        with self._lock:
+            self._cancelar_temporizador()
+            self._geracao += 1
+            if termo == self._ultimo_termo:
+                # Ex.: digitou e apagou um caractere. A lista já está correta.
+                return
+            geracao = self._geracao
+            self._temporizador = threading.Timer(
+                self.atraso, self._rodar, args=(geracao, termo))
+            self._temporizador.daemon = True
+            self._temporizador.start()
+
+    def cancelar(self, termo_exibido: Optional[str] = None):
+        """
+        Cancela a busca pendente e descarta a que estiver em andamento.
+        Usado quando a tela faz uma busca imediata (ex.: Enter no campo).
+
+        :param termo_exibido: Termo cujos resultados a tela passa a exibir.
+        """
+        # Espera a entrega em andamento: a tela exibe o novo termo depois dela.
+        with self._entrega, self._lock:
+            self._cancelar_temporizador()
+            self._geracao += 1
+            self._ultimo_termo = termo_exibido.strip() if termo_exibido is not None else None
+
+    def _cancelar_temporizador(self):
+        if self._temporizador is not None:
+            self._temporizador.cancel()
+            self._temporizador = None
+
+    def _eh_atual(self, geracao: int) -> bool:
+        with self._lock:
+            return geracao == self._geracao
+
+    def _rodar(self, geracao: int, termo: str):
+        if not self._eh_atual(geracao):
+            return
+        inicio = time.perf_counter()
+        try:
+            resultados = self._executar(termo)
+        except Exception as e:
+            logger.error(
+                f"Erro na busca incremental pelo termo '{termo}': {e}", exc_info=True)
+            if self._ao_falhar:
+                with self._entrega:
+                    if self._eh_atual(geracao):
+                        self._ao_falhar(e)
+            return
+        duracao_ms = (time.perf_counter() - inicio) * 1000
+
+        with self._entrega:
+            with self._lock:
+                self.executadas += 1
+                self.ultima_duracao_ms = duracao_ms
+                if geracao != self._geracao:
+                    self.descartadas += 1
+                    logger.debug(
+                        f"Busca por '{termo}' descartada: substituída por outra ({duracao_ms:.1f} ms).")
+                    return
+                self._ultimo_termo = termo
+                if self._confirmar is not None:
+                    resultados = self._confirmar(resultados)
+
+            # Ainda sob o lock de entrega: uma busca mais nova (ou uma busca
+            # imediata) só chega à View depois desta.
+            logger.info(f"Busca incremental por '{termo}' levou {duracao_ms:.1f} ms.")
+            self._ao_concluir(termo, resultados)
@@ -10,7 +10,7 @@ import logging
 import sqlite3
 from src.database import queries
 from typing import List
-from src.models.models import Cliente
+from src.models.models import ClienteResumo
 
 # Configura o logger para este módulo.
 logger = logging.getLogger(__name__)
@@ -24,7 +24,7 @@ class CadastroCarroViewModel:
         self.page = page
         self._view: 'CadastroCarroView' | None = None
         # Cache para a lista de clientes para evitar múltiplas buscas no DB.
-        self.lista_clientes: List[Cliente] = []
+        self.lista_clientes: List[ClienteResumo] = []
         logger.debug("CadastroCarroViewModel inicializado.")
 
     def vincular_view(self, view: 'CadastroCarroView'):
@@ -8,7 +8,8 @@ import flet as ft
 import logging
 import sqlite3
 from src.database import queries
-from src.models.models import Peca
+from src.models.models import PecaResumo
+from src.viewmodels.busca_incremental import BuscaIncremental
 from typing import List
 
 logger = logging.getLogger(__name__)
@@ -19,7 +20,10 @@ class CadastroServicoViewModel:
         self.page = page
         self._view: 'CadastroServicoView' | None = None
         # Estado: Armazena a lista completa de peças para a busca
-        self._todas_as_pecas: List[Peca] = []
+        self._todas_as_pecas: List[PecaResumo] = []
+        # O filtro roda com debounce, fora da thread da UI.
+        self._busca_incremental = BuscaIncremental(
+            self._filtrar_em_memoria, self._exibir_pecas_filtradas)
         logger.debug("CadastroServicoViewModel inicializado.")
 
     def vincular_view(self, view: 'CadastroServicoView'):
@@ -32,8 +36,7 @@ class CadastroServicoViewModel:
         logger.info("ViewModel: Carregando lista de peças para o formulário.")
         try:
             # Armazena a lista completa de peças no ViewModel
-            self._todas_as_pecas = [
-                p for p in queries.obter_pecas() if p.ativo]
+            self._todas_as_pecas = queries.obter_pecas_ativas()
             # Manda a lista completa para a View popular os checkboxes
             self._view.popular_lista_pecas(self._todas_as_pecas)
         except Exception as e:
@@ -42,24 +45,29 @@ class CadastroServicoViewModel:
                 "Erro Crítico", "Não foi possível carregar a lista de peças.")
 
     def filtrar_pecas(self, termo_busca: str):
-        """Filtra a lista de peças com base no termo de busca e comanda a View."""
+        """Agenda o filtro da lista de peças; só o do termo mais recente chega à View."""
         if not self._view:
             return
+        self._busca_incremental.agendar(termo_busca)
+
+    def _filtrar_em_memoria(self, termo_busca: str) -> List[PecaResumo]:
+        """Filtra a lista de peças carregada com base no termo de busca."""
         termo = termo_busca.lower().strip()
         if not termo:
             # Se a busca estiver vazia, exibe todas as peças
-            pecas_filtradas = self._todas_as_pecas
-        else:
-            # Filtra a lista em memória
-            pecas_filtradas = [
-                peca for peca in self._todas_as_pecas
-                if termo in peca.nome.lower() or termo in peca.referencia.lower()
-            ]
+            return self._todas_as_pecas
+        # Filtra a lista em memória
+        return [
+            peca for peca in self._todas_as_pecas
+            if termo in peca.nome.lower() or termo in peca.referencia.lower()
+        ]
 
+    def _exibir_pecas_filtradas(self, termo: str, pecas_filtradas: List[PecaResumo]):
         logger.debug(
             f"Filtrando peças com o termo '{termo}'. {len(pecas_filtradas)} resultados.")
-        # Comanda a View para atualizar a lista de checkboxes visível
-        self._view.atualizar_lista_filtrada_pecas(pecas_filtradas)
+        if self._view:
+            # Comanda a View para atualizar a lista de checkboxes visível
+            self._view.atualizar_lista_filtrada_pecas(pecas_filtradas)
 
     def salvar_servico(self):
         """Pega dados da View, valida, e comanda a criação do novo serviço."""
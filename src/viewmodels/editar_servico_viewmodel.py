@@ -30,7 +30,7 @@ class EditarServicoViewModel:
             logger.info(
                 f"ViewModel: buscando dados para o serviço ID {self.servico_id}")
             servico = queries.obter_servico_por_id(self.servico_id)
-            todas_as_pecas = [p for p in queries.obter_pecas() if p.ativo]
+            todas_as_pecas = queries.obter_pecas_ativas()
 
             if servico:
                 self._view.popular_lista_pecas(todas_as_pecas)
@@ -67,7 +67,7 @@ class EditarServicoViewModel:
 
             logger.info(
                 f"ViewModel: salvando alterações para o serviço ID {self.servico_id}")
-            sucesso = queries.atualizar_servico(
+            alteracoes = queries.atualizar_servico(
                 self.servico_id,
                 nome,
                 dados.get("descricao", "").strip(),
@@ -76,7 +76,8 @@ class EditarServicoViewModel:
             )
             def acao_navegacao(): return self.page.go("/gerir_servicos")
 
-            if sucesso:
+            if alteracoes is not None:
+                logger.info(f"ViewModel: peças do serviço ID {self.servico_id} alteradas: {alteracoes}")
                 self._view.mostrar_dialogo_feedback(
                     "Sucesso!", "Serviço atualizado com sucesso!", acao_navegacao)
             else:
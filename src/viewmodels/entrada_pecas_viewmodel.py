@@ -8,7 +8,11 @@
 import flet as ft
 import logging
 from src.database import queries
-from src.models.models import Peca
+from src.database.idempotencia import nova_chave
+from src.models.models import PecaResumo
+from src.services.task_queue_service import servico_tarefas
+from src.viewmodels.selecao_pecas import SelecaoPecas
+from concurrent.futures import Future
 from typing import List, Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
@@ -21,21 +25,33 @@ class EntradaPecasViewModel:
         self.page = page
         self._view: 'EntradaPecasView' | None = None
         # Cache de peças carregadas do banco
-        self.pecas_disponiveis: List[Peca] = []
-        # Estado: Lista de itens que o usuário adicionou ao lote
-        self.lote_para_entrada: List[Dict[str, Any]] = []
+        self.pecas_disponiveis: List[PecaResumo] = []
+        self._pecas_por_id: Dict[int, PecaResumo] = {}
+        # Estado: Itens que o usuário adicionou ao lote, indexados por peca_id.
+        # O valor de custo informado é o total da linha (ver rótulo do campo).
+        self.lote_para_entrada = SelecaoPecas(
+            campo_valor="valor_custo", valor_por_unidade=False)
+        # Evita enviar o mesmo lote duas vezes enquanto o anterior é gravado.
+        self._registrando = False
+        # Chave de idempotência do lote atual: uma repetição do envio não soma
+        # o estoque duas vezes. Renovada quando o lote é registrado ou descartado.
+        self._chave_lote = nova_chave()
         logger.debug("EntradaPecasViewModel inicializado.")
 
     def vincular_view(self, view: 'EntradaPecasView'):
         self._view = view
 
     def carregar_pecas_ativas(self):
-        """Busca a lista de peças ativas e comanda a View para popular o dropdown."""
+        """Busca a lista de peças ativas (num worker de leitura) e comanda a View para popular o dropdown."""
         if not self._view: return
         logger.info("ViewModel: Carregando lista de peças ativas para o dropdown.")
+        servico_tarefas.enviar("obter_pecas_ativas", ao_concluir=self._ao_carregar_pecas)
+
+    def _ao_carregar_pecas(self, futuro: Future):
         try:
-            self.pecas_disponiveis = [p for p in queries.obter_pecas() if p.ativo]
-            self._view.popular_dropdown_pecas(self.pecas_disponiveis)
+            self.pecas_disponiveis = futuro.result()
+            self._pecas_por_id = {p.id: p for p in self.pecas_disponiveis}
+            if self._view: self._view.popular_dropdown_pecas(self.pecas_disponiveis)
         except Exception as e:
             logger.error(f"Erro ao carregar peças: {e}", exc_info=True)
             if self._view: self._view.mostrar_dialogo_feedback("Erro Crítico", "Não foi possível carregar a lista de peças.")
@@ -58,65 +74,80 @@ class EntradaPecasViewModel:
             return
         
         # Pega o nome da peça para exibição (do cache)
-        peca_selecionada = next((p for p in self.pecas_disponiveis if p.id == peca_id), None)
+        peca_selecionada = self._pecas_por_id.get(peca_id)
         if not peca_selecionada:
             self._view.mostrar_feedback_snackbar("Peça não encontrada.", False)
             return
 
-        # 3. Adiciona ao estado (lote)
-        item_para_lote = {
-            "peca_id": peca_id,
-            "nome_peca": peca_selecionada.nome,
-            "quantidade": quantidade,
-            "valor_custo": dados_item.get("valor_custo"),
-            "descricao": dados_item.get("descricao", "").strip()
-        }
-        self.lote_para_entrada.append(item_para_lote)
-        
-        # 4. Comanda a View
-        logger.info(f"Item adicionado ao lote: {item_para_lote['nome_peca']} (Qtd: {quantidade})")
-        self._view.atualizar_lista_lote(self.lote_para_entrada)
+        # 3. Adiciona ao estado (lote). Se a peça já estiver no lote, a
+        #    quantidade e o custo são somados na mesma linha.
+        item_para_lote, novo = self.lote_para_entrada.adicionar(
+            peca_id, quantidade, dados_item.get("valor_custo"),
+            nome_peca=peca_selecionada.nome,
+            descricao=(dados_item.get("descricao") or "").strip()
+        )
+
+        # 4. Comanda a View (só a linha incluída ou alterada é redesenhada)
+        logger.info(f"Item {'adicionado ao' if novo else 'somado no'} lote: {item_para_lote['nome_peca']} (Qtd: {quantidade})")
+        self._view.exibir_item_lote(item_para_lote)
         self._view.limpar_formulario_item() # Limpa os campos para a próxima adição
 
     def remover_item_do_lote(self, item_para_remover: Dict[str, Any]):
         """Remove um item do lote antes de salvar."""
         if not self._view: return
         
-        self.lote_para_entrada.remove(item_para_remover)
+        if self.lote_para_entrada.remover(item_para_remover["peca_id"]) is None:
+            return
         logger.info(f"Item removido do lote: {item_para_remover['nome_peca']}")
-        self._view.atualizar_lista_lote(self.lote_para_entrada)
+        self._view.remover_item_lote(item_para_remover["peca_id"])
 
     def registrar_lote_entrada(self):
-        """Envia o lote completo para a camada de dados."""
+        """Envia o lote completo para o worker de escrita do banco."""
         if not self._view: return
 
         # Validação do lote
         if not self.lote_para_entrada:
             self._view.mostrar_dialogo_feedback("Lote Vazio", "Adicione pelo menos uma peça à lista antes de salvar.")
             return
+        if self._registrando:
+            return
 
         logger.info(f"ViewModel: Tentando registrar lote com {len(self.lote_para_entrada)} itens.")
-        
+        self._registrando = True
+        # A query transacional de lote roda fora da thread da interface.
+        servico_tarefas.enviar(
+            "registrar_entrada_estoque_lote",
+            {"itens": self.lote_para_entrada.itens(), "chave_idempotencia": self._chave_lote},
+            ao_concluir=self._ao_registrar_lote)
+
+    def _ao_registrar_lote(self, futuro: Future):
+        self._registrando = False
+        if not self._view: return
         try:
-            # Chama a query transacional de lote
-            sucesso = queries.registrar_entrada_estoque_lote(self.lote_para_entrada)
+            resultado = futuro.result()
 
-            if sucesso:
+            if resultado["sucesso"]:
                 logger.info("Lote de entrada registrado com sucesso.")
-                self.lote_para_entrada.clear() # Limpa o estado
+                self.lote_para_entrada.limpar() # Limpa o estado
+                self._chave_lote = nova_chave()
                 # Prepara callback para limpar o formulário e a lista
-                acao_pos_dialogo = lambda: (self._view.limpar_formulario_item(), self._view.atualizar_lista_lote(self.lote_para_entrada))
+                acao_pos_dialogo = lambda: (self._view.limpar_formulario_item(), self._view.atualizar_lista_lote(self.lote_para_entrada.itens()))
                 self._view.mostrar_dialogo_feedback("Sucesso!", "Lote de entrada registrado com sucesso!", acao_pos_dialogo)
+            elif any(not linha["ok"] for linha in resultado["linhas"]):
+                # Lote rejeitado na validação: mostra as linhas com problema.
+                erros = [f"Linha {linha['linha']}: {linha['erro']}" for linha in resultado["linhas"] if not linha["ok"]]
+                logger.warning(f"ViewModel: Lote rejeitado com {len(erros)} linha(s) inválida(s).")
+                self._view.mostrar_dialogo_feedback("Lote Inválido", "\n".join(erros[:10]))
             else:
-                logger.error("ViewModel: A query 'registrar_entrada_estoque_lote' retornou False.")
+                logger.error("ViewModel: A query 'registrar_entrada_estoque_lote' não registrou o lote.")
                 self._view.mostrar_dialogo_feedback("Erro no Banco", "Não foi possível registrar o lote no banco de dados.")
 
         except Exception as e:
             logger.error(f"Erro inesperado ao registrar lote: {e}", exc_info=True)
-            if self._view:
-                self._view.mostrar_dialogo_feedback("Erro Crítico", f"Ocorreu uma falha inesperada:\n{e}")
+            self._view.mostrar_dialogo_feedback("Erro Crítico", f"Ocorreu uma falha inesperada:\n{e}")
 
     def cancelar(self, e):
         """Navega de volta para o dashboard."""
-        self.lote_para_entrada.clear() # Limpa o estado
+        self.lote_para_entrada.limpar() # Limpa o estado
+        self._chave_lote = nova_chave()
         self.page.go("/dashboard")
\ No newline at end of file
@@ -7,6 +7,8 @@
 import flet as ft
 import logging
 from src.database import queries
+from src.viewmodels.busca_incremental import BuscaIncremental
+from src.viewmodels.paginador_busca import PaginadorBusca
 from typing import List
 
 # Configura o logger para este módulo.
@@ -23,6 +25,15 @@ class GerirCarrosViewModel:
         self._view: 'GerirCarrosView' | None = None
         # Armazena o ID do carro que está sofrendo uma ação (ativar/desativar).
         self._carro_para_acao_id: int | None = None
+        # Carrega a lista em páginas, ordenadas por (proprietário, id).
+        self._paginador = PaginadorBusca(
+            queries.buscar_carros_por_termo, lambda c: (c['nome_cliente'], c['id']))
+        # Busca enquanto o usuário digita (com debounce, fora da thread da UI).
+        # A consulta não mexe no paginador; o cursor só é adotado se ela
+        # ainda for a busca mais recente.
+        self._busca_incremental = BuscaIncremental(
+            self._paginador.consultar_primeira_pagina, self._exibir_busca_incremental,
+            confirmar=self._paginador.aplicar)
         logger.debug("GerirCarrosViewModel inicializado.")
 
     def vincular_view(self, view: 'GerirCarrosView'):
@@ -43,10 +54,30 @@ class GerirCarrosViewModel:
         """
         if not self._view: return
         logger.info(f"ViewModel: pesquisando por carros com o termo '{termo}'")
-        # 1. INTERAÇÃO COM A CAMADA DE DADOS (QUERIES).
-        carros_encontrados = queries.buscar_carros_por_termo(termo)
-        # 2. COMANDA A VIEW para atualizar a lista de resultados.
-        self._view.atualizar_lista_resultados(carros_encontrados)
+        # A busca imediata (Enter ou carga inicial) substitui a que estava agendada.
+        # Com a entrega travada, nenhuma busca em segundo plano chega à View no meio.
+        with self._busca_incremental.entrega:
+            self._busca_incremental.cancelar(termo)
+            # 1. INTERAÇÃO COM A CAMADA DE DADOS (QUERIES).
+            carros_encontrados = self._paginador.primeira_pagina(termo)
+            # 2. COMANDA A VIEW para atualizar a lista de resultados.
+            self._view.atualizar_lista_resultados(carros_encontrados)
+
+    def pesquisar_enquanto_digita(self, termo: str):
+        """Agenda a busca do termo digitado; só o resultado da mais recente chega à View."""
+        self._busca_incremental.agendar(termo)
+
+    def _exibir_busca_incremental(self, termo: str, carros: list):
+        if self._view:
+            self._view.atualizar_lista_resultados(carros)
+
+    def carregar_proxima_pagina(self):
+        """Busca a próxima página do termo atual e comanda a View para anexá-la à lista."""
+        if not self._view: return
+        carros = self._paginador.proxima_pagina()
+        if carros:
+            logger.debug(f"ViewModel: anexando {len(carros)} carros à lista.")
+            self._view.anexar_resultados(carros)
 
     def editar_carro(self, carro_id: int):
         """Navega para a tela de edição do carro selecionado."""
@@ -72,7 +103,7 @@ class GerirCarrosViewModel:
                 self._view.fechar_dialogo()
                 if sucesso:
                     self._view.mostrar_feedback("Carro desativado com sucesso!", True)
-                    self.carregar_carros_iniciais() # Recarrega a lista
+                    self._view.atualizar_status_item(self._carro_para_acao_id, False)
                 else:
                     self._view.mostrar_feedback("Erro ao desativar o carro.", False)
         except Exception as e:
@@ -100,7 +131,7 @@ class GerirCarrosViewModel:
                 self._view.fechar_dialogo()
                 if sucesso:
                     self._view.mostrar_feedback("Carro reativado com sucesso!", True)
-                    self.carregar_carros_iniciais() # Recarrega a lista
+                    self._view.atualizar_status_item(self._carro_para_acao_id, True)
                 else:
                     self._view.mostrar_feedback("Erro ao reativar o carro.", False)
         except Exception as e:
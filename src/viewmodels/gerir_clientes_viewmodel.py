@@ -10,6 +10,8 @@
 import flet as ft
 import logging
 from src.database import queries
+from src.viewmodels.busca_incremental import BuscaIncremental
+from src.viewmodels.paginador_busca import PaginadorBusca
 
 # Configura o logger para este módulo.
 logger = logging.getLogger(__name__)
@@ -26,6 +28,15 @@ class GerirClientesViewModel:
         self._view: 'GerirClientesView' | None = None
         # Armazena o ID do cliente sendo manipulado para qualquer ação (ativar/desativar).
         self._cliente_para_acao_id: int | None = None
+        # Carrega a lista em páginas, ordenadas por (nome, id).
+        self._paginador = PaginadorBusca(
+            queries.buscar_clientes_por_termo, lambda c: (c.nome, c.id))
+        # Busca enquanto o usuário digita (com debounce, fora da thread da UI).
+        # A consulta não mexe no paginador; o cursor só é adotado se ela
+        # ainda for a busca mais recente.
+        self._busca_incremental = BuscaIncremental(
+            self._paginador.consultar_primeira_pagina, self._exibir_busca_incremental,
+            confirmar=self._paginador.aplicar)
 
     def vincular_view(self, view: 'GerirClientesView'):
         """Estabelece a conexão de duas vias entre o ViewModel e a View."""
@@ -40,9 +51,28 @@ class GerirClientesViewModel:
         """Busca clientes no banco e comanda a View para exibir os resultados."""
         logger.info(
             f"ViewModel: pesquisando por clientes com o termo '{termo}'")
-        clientes_encontrados = queries.buscar_clientes_por_termo(termo)
+        # A busca imediata (Enter ou carga inicial) substitui a que estava agendada.
+        # Com a entrega travada, nenhuma busca em segundo plano chega à View no meio.
+        with self._busca_incremental.entrega:
+            self._busca_incremental.cancelar(termo)
+            clientes_encontrados = self._paginador.primeira_pagina(termo)
+            if self._view:
+                self._view.atualizar_lista_resultados(clientes_encontrados)
+
+    def pesquisar_enquanto_digita(self, termo: str):
+        """Agenda a busca do termo digitado; só o resultado da mais recente chega à View."""
+        self._busca_incremental.agendar(termo)
+
+    def _exibir_busca_incremental(self, termo: str, clientes: list):
         if self._view:
-            self._view.atualizar_lista_resultados(clientes_encontrados)
+            self._view.atualizar_lista_resultados(clientes)
+
+    def carregar_proxima_pagina(self):
+        """Busca a próxima página do termo atual e comanda a View para anexá-la à lista."""
+        clientes = self._paginador.proxima_pagina()
+        if clientes and self._view:
+            logger.debug(f"ViewModel: anexando {len(clientes)} clientes à lista.")
+            self._view.anexar_resultados(clientes)
 
     def editar_cliente(self, cliente_id: int):
         """Navega para a tela de edição do cliente selecionado."""
@@ -77,8 +107,7 @@ class GerirClientesViewModel:
                 if sucesso:
                     self._view.mostrar_feedback(
                         "Cliente desativado com sucesso!", True)
-                    # Recarrega a lista para mostrar o status atualizado
-                    self.carregar_clientes_iniciais()
+                    self._view.atualizar_status_item(self._cliente_para_acao_id, False)
                 else:
                     self._view.mostrar_feedback(
                         "Erro ao desativar o cliente.", False)
@@ -121,8 +150,7 @@ class GerirClientesViewModel:
                 if sucesso:
                     self._view.mostrar_feedback(
                         "Cliente reativado com sucesso!", True)
-                    # Recarrega a lista para mostrar o status atualizado
-                    self.carregar_clientes_iniciais()
+                    self._view.atualizar_status_item(self._cliente_para_acao_id, True)
                 else:
                     self._view.mostrar_feedback(
                         "Erro ao reativar o cliente.", False)
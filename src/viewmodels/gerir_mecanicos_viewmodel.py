@@ -6,6 +6,8 @@
 import flet as ft
 import logging
 from src.database import queries
+from src.viewmodels.busca_incremental import BuscaIncremental
+from src.viewmodels.paginador_busca import PaginadorBusca
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +17,15 @@ class GerirMecanicosViewModel:
         self.page = page
         self._view: 'GerirMecanicosView' | None = None
         self._mecanico_para_acao_id: int | None = None
+        # Carrega a lista em páginas, ordenadas por (nome, id).
+        self._paginador = PaginadorBusca(
+            queries.buscar_mecanicos_por_termo, lambda m: (m.nome, m.id))
+        # Busca enquanto o usuário digita (com debounce, fora da thread da UI).
+        # A consulta não mexe no paginador; o cursor só é adotado se ela
+        # ainda for a busca mais recente.
+        self._busca_incremental = BuscaIncremental(
+            self._paginador.consultar_primeira_pagina, self._exibir_busca_incremental,
+            confirmar=self._paginador.aplicar)
         logger.debug("GerirMecanicosViewModel inicializado.")
 
     def vincular_view(self, view: 'GerirMecanicosView'):
@@ -31,8 +42,29 @@ class GerirMecanicosViewModel:
             return
         logger.info(
             f"ViewModel: pesquisando por mecânicos com o termo '{termo}'")
-        mecanicos_encontrados = queries.buscar_mecanicos_por_termo(termo)
-        self._view.atualizar_lista_resultados(mecanicos_encontrados)
+        # A busca imediata (Enter ou carga inicial) substitui a que estava agendada.
+        # Com a entrega travada, nenhuma busca em segundo plano chega à View no meio.
+        with self._busca_incremental.entrega:
+            self._busca_incremental.cancelar(termo)
+            mecanicos_encontrados = self._paginador.primeira_pagina(termo)
+            self._view.atualizar_lista_resultados(mecanicos_encontrados)
+
+    def pesquisar_enquanto_digita(self, termo: str):
+        """Agenda a busca do termo digitado; só o resultado da mais recente chega à View."""
+        self._busca_incremental.agendar(termo)
+
+    def _exibir_busca_incremental(self, termo: str, mecanicos: list):
+        if self._view:
+            self._view.atualizar_lista_resultados(mecanicos)
+
+    def carregar_proxima_pagina(self):
+        if not self._view:
+            return
+        mecanicos = self._paginador.proxima_pagina()
+        if mecanicos:
+            logger.debug(
+                f"ViewModel: anexando {len(mecanicos)} mecânicos à lista.")
+            self._view.anexar_resultados(mecanicos)
 
     def editar_mecanico(self, mecanico_id: int):
         logger.info(
@@ -58,7 +90,7 @@ class GerirMecanicosViewModel:
                 if sucesso:
                     self._view.mostrar_feedback(
                         "Mecânico desativado com sucesso!", True)
-                    self.carregar_mecanicos_iniciais()
+                    self._view.atualizar_status_item(self._mecanico_para_acao_id, False)
                 else:
                     self._view.mostrar_feedback(
                         "Erro ao desativar o mecânico.", False)
@@ -84,7 +116,7 @@ class GerirMecanicosViewModel:
                 if sucesso:
                     self._view.mostrar_feedback(
                         "Mecânico reativado com sucesso!", True)
-                    self.carregar_mecanicos_iniciais()
+                    self._view.atualizar_status_item(self._mecanico_para_acao_id, True)
                 else:
                     self._view.mostrar_feedback(
                         "Erro ao reativar o mecânico.", False)
@@ -7,6 +7,8 @@
 import flet as ft
 import logging
 from src.database import queries
+from src.viewmodels.busca_incremental import BuscaIncremental
+from src.viewmodels.paginador_busca import PaginadorBusca
 
 # Configura o logger para este módulo.
 logger = logging.getLogger(__name__)
@@ -21,6 +23,15 @@ class GerirPecasViewModel:
         self.page = page
         self._view: 'GerirPecasView' | None = None
         self._peca_para_acao_id: int | None = None
+        # Carrega a lista em páginas, ordenadas por (nome, id).
+        self._paginador = PaginadorBusca(
+            queries.buscar_pecas_por_termo, lambda p: (p.nome, p.id))
+        # Busca enquanto o usuário digita (com debounce, fora da thread da UI).
+        # A consulta não mexe no paginador; o cursor só é adotado se ela
+        # ainda for a busca mais recente.
+        self._busca_incremental = BuscaIncremental(
+            self._paginador.consultar_primeira_pagina, self._exibir_busca_incremental,
+            confirmar=self._paginador.aplicar)
         logger.debug("GerirPecasViewModel inicializado.")
 
     def vincular_view(self, view: 'GerirPecasView'):
@@ -38,8 +49,29 @@ class GerirPecasViewModel:
         if not self._view:
             return
         logger.info(f"ViewModel: pesquisando por peças com o termo '{termo}'")
-        pecas_encontradas = queries.buscar_pecas_por_termo(termo)
-        self._view.atualizar_lista_resultados(pecas_encontradas)
+        # A busca imediata (Enter ou carga inicial) substitui a que estava agendada.
+        # Com a entrega travada, nenhuma busca em segundo plano chega à View no meio.
+        with self._busca_incremental.entrega:
+            self._busca_incremental.cancelar(termo)
+            pecas_encontradas = self._paginador.primeira_pagina(termo)
+            self._view.atualizar_lista_resultados(pecas_encontradas)
+
+    def pesquisar_enquanto_digita(self, termo: str):
+        """Agenda a busca do termo digitado; só o resultado da mais recente chega à View."""
+        self._busca_incremental.agendar(termo)
+
+    def _exibir_busca_incremental(self, termo: str, pecas: list):
+        if self._view:
+            self._view.atualizar_lista_resultados(pecas)
+
+    def carregar_proxima_pagina(self):
+        """Busca a próxima página do termo atual e comanda a View para anexá-la à lista."""
+        if not self._view:
+            return
+        pecas = self._paginador.proxima_pagina()
+        if pecas:
+            logger.debug(f"ViewModel: anexando {len(pecas)} peças à lista.")
+            self._view.anexar_resultados(pecas)
 
     def editar_peca(self, peca_id: int):
         """Navega para a tela de edição da peça selecionada."""
@@ -69,7 +101,7 @@ class GerirPecasViewModel:
                 if sucesso:
                     self._view.mostrar_feedback(
                         "Peça desativada com sucesso!", True)
-                    self.carregar_pecas_iniciais()
+                    self._view.atualizar_status_item(self._peca_para_acao_id, False)
                 else:
                     self._view.mostrar_feedback(
                         "Erro ao desativar a peça.", False)
@@ -98,7 +130,7 @@ class GerirPecasViewModel:
                 if sucesso:
                     self._view.mostrar_feedback(
                         "Peça reativada com sucesso!", True)
-                    self.carregar_pecas_iniciais()
+                    self._view.atualizar_status_item(self._peca_para_acao_id, True)
                 else:
                     self._view.mostrar_feedback(
                         "Erro ao reativar a peça.", False)
@@ -4,6 +4,8 @@
 import flet as ft
 import logging
 from src.database import queries
+from src.viewmodels.busca_incremental import BuscaIncremental
+from src.viewmodels.paginador_busca import PaginadorBusca
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +14,14 @@ class GerirServicosViewModel:
         self.page = page
         self._view: 'GerirServicosView' | None = None
         self._servico_para_acao_id: int | None = None
+        self._paginador = PaginadorBusca(
+            queries.buscar_servicos_por_termo, lambda s: (s.nome, s.id))
+        # Busca enquanto o usuário digita (com debounce, fora da thread da UI).
+        # A consulta não mexe no paginador; o cursor só é adotado se ela
+        # ainda for a busca mais recente.
+        self._busca_incremental = BuscaIncremental(
+            self._paginador.consultar_primeira_pagina, self._exibir_busca_incremental,
+            confirmar=self._paginador.aplicar)
         logger.debug("GerirServicosViewModel inicializado.")
 
     def vincular_view(self, view: 'GerirServicosView'):
@@ -22,8 +32,26 @@ class GerirServicosViewModel:
 
     def pesquisar_servico(self, termo: str):
         if not self._view: return
-        servicos_encontrados = queries.buscar_servicos_por_termo(termo)
-        self._view.atualizar_lista_resultados(servicos_encontrados)
+        # A busca imediata (Enter ou carga inicial) substitui a que estava agendada.
+        # Com a entrega travada, nenhuma busca em segundo plano chega à View no meio.
+        with self._busca_incremental.entrega:
+            self._busca_incremental.cancelar(termo)
+            servicos_encontrados = self._paginador.primeira_pagina(termo)
+            self._view.atualizar_lista_resultados(servicos_encontrados)
+
+    def pesquisar_enquanto_digita(self, termo: str):
+        """Agenda a busca do termo digitado; só o resultado da mais recente chega à View."""
+        self._busca_incremental.agendar(termo)
+
+    def _exibir_busca_incremental(self, termo: str, servicos: list):
+        if self._view:
+            self._view.atualizar_lista_resultados(servicos)
+
+    def carregar_proxima_pagina(self):
+        if not self._view: return
+        servicos = self._paginador.proxima_pagina()
+        if servicos:
+            self._view.anexar_resultados(servicos)
 
     def editar_servico(self, servico_id: int):
         self.page.go(f"/editar_servico/{servico_id}")
@@ -41,7 +69,7 @@ class GerirServicosViewModel:
                 self._view.fechar_dialogo()
                 if sucesso:
                     self._view.mostrar_feedback("Serviço desativado com sucesso!", True)
-                    self.carregar_servicos_iniciais()
+                    self._view.atualizar_status_item(self._servico_para_acao_id, False)
                 else:
                     self._view.mostrar_feedback("Erro ao desativar o serviço.", False)
         finally:
@@ -60,7 +88,7 @@ class GerirServicosViewModel:
                 self._view.fechar_dialogo()
                 if sucesso:
                     self._view.mostrar_feedback("Serviço reativado com sucesso!", True)
-                    self.carregar_servicos_iniciais()
+                    self._view.atualizar_status_item(self._servico_para_acao_id, True)
                 else:
                     self._view.mostrar_feedback("Erro ao reativar o serviço.", False)
         finally:
@@ -72,7 +100,7 @@ class GerirServicosViewModel:
                 self._view.fechar_dialogo()
                 if sucesso:
                     self._view.mostrar_feedback("Serviço reativado com sucesso!", True)
-                    self.carregar_servicos_iniciais()
+                    self._view.atualizar_status_item(self._servico_para_acao_id, True)
                 else:
                     self._view.mostrar_feedback("Erro ao reativar o serviço.", False)
         finally:
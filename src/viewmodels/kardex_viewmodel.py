@@ -0,0 +1,89 @@
+# =================================================================================
+# MÓDULO DO VIEWMODEL DO KARDEX (kardex_viewmodel.py)
+#
+# OBJETIVO: Conter a lógica da tela de Kardex: histórico de movimentações de
+#           uma peça, com saldo acumulado, filtrado por período e carregado
+#           página a página.
+# =================================================================================
+import flet as ft
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from src.database import queries
+from src.models.models import PecaResumo
+from src.viewmodels.paginador_busca import PaginadorBusca
+
+logger = logging.getLogger(__name__)
+
+
+def _buscar_pagina_kardex(filtro: Dict[str, Any], limite: int, apos=None) -> List[Dict[str, Any]]:
+    """Adapta `queries.obter_kardex_peca` à assinatura usada pelo PaginadorBusca."""
+    return queries.obter_kardex_peca(
+        filtro["peca_id"], filtro["data_inicio"], filtro["data_fim"],
+        limite=limite, apos=apos, saldo_inicial=filtro["saldo_anterior"])
+
+
+class KardexViewModel:
+    """
+    O ViewModel para a KardexView.
+    """
+
+    def __init__(self, page: ft.Page):
+        self.page = page
+        self._view: 'KardexView' | None = None
+        self.pecas: List[PecaResumo] = []
+        # Cursor de cada página: (data_movimentacao, id, saldo) da última linha.
+        self._paginador = PaginadorBusca(
+            _buscar_pagina_kardex, lambda m: (m["data_movimentacao"], m["id"], m["saldo"]))
+        # Nenhuma página é buscada pela rolagem antes da primeira consulta.
+        self._consultado = False
+        logger.debug("KardexViewModel inicializado.")
+
+    def vincular_view(self, view: 'KardexView'):
+        """Estabelece a conexão de duas vias entre o ViewModel e a View."""
+        self._view = view
+
+    def carregar_pecas(self):
+        """Carrega as peças (do cache de catálogo) para o seletor da tela."""
+        self.pecas = queries.obter_pecas()
+        if self._view:
+            self._view.popular_dropdown_pecas(self.pecas)
+
+    def consultar(self, peca_id: Optional[int], data_inicio: str, data_fim: str):
+        """Valida os filtros e exibe a primeira página do kardex da peça."""
+        if not self._view:
+            return
+        if not peca_id:
+            self._view.mostrar_feedback("Selecione uma peça.", False)
+            return
+        data_inicio, data_fim = (data_inicio or "").strip(), (data_fim or "").strip()
+        try:
+            for data in (data_inicio, data_fim):
+                if data:
+                    datetime.strptime(data, "%Y-%m-%d")
+        except ValueError:
+            self._view.mostrar_feedback("Formato de data inválido. Use AAAA-MM-DD.", False)
+            return
+        if data_inicio and data_fim and data_inicio > data_fim:
+            self._view.mostrar_feedback("A data inicial deve ser anterior à data final.", False)
+            return
+
+        peca_id = int(peca_id)
+        # O saldo de abertura vem do snapshot mais próximo + movimentações posteriores.
+        saldo_anterior = queries.obter_saldo_peca_antes(peca_id, data_inicio or None)
+        filtro = {"peca_id": peca_id, "data_inicio": data_inicio or None,
+                  "data_fim": data_fim or None, "saldo_anterior": saldo_anterior}
+        logger.info(f"ViewModel: Consultando kardex da peça ID {peca_id} ({data_inicio or '...'} a {data_fim or '...'}).")
+        movimentacoes = self._paginador.primeira_pagina(filtro)
+        self._consultado = True
+        self._view.exibir_kardex(saldo_anterior, movimentacoes)
+
+    def carregar_proxima_pagina(self):
+        """Busca a próxima página do kardex e comanda a View para anexá-la."""
+        if not self._view or not self._consultado:
+            return
+        movimentacoes = self._paginador.proxima_pagina()
+        if movimentacoes:
+            logger.debug(f"ViewModel: anexando {len(movimentacoes)} movimentações ao kardex.")
+            self._view.anexar_movimentacoes(movimentacoes)
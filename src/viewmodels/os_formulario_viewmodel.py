@@ -9,13 +9,23 @@
 #   - Corrigido o caminho de importação da 'fila_db'. A fila é definida em
 #     'database.py' e deve ser importada diretamente de lá, que é sua
 #     "fonte da verdade".
+# ATUALIZAÇÃO:
+#   - A OS é enviada ao `servico_tarefas` (a antiga 'fila_db' foi removida).
+#   - O envio só é confirmado ao usuário depois que a OS foi gravada na outbox
+#     (tabela `outbox_tarefas`); se o app fechar antes de processá-la, ela é
+#     reprocessada na próxima inicialização.
+#   - Cada abertura do formulário gera uma chave de idempotência: enviar a
+#     mesma OS de novo (ex.: duplo clique) não cria uma OS duplicada.
 # =================================================================================
 import flet as ft
 import logging
-from typing import List
-from src.models.models import Cliente, Carro, Peca
-from src.database.database import fila_db
+import sqlite3
+from typing import Dict, List
+from src.models.models import ClienteResumo, Carro, PecaResumo
+from src.services.task_queue_service import servico_tarefas
 from src.database import queries
+from src.database.idempotencia import nova_chave
+from src.viewmodels.selecao_pecas import SelecaoPecas
 
 
 
@@ -29,9 +39,13 @@ class OrdemServicoFormularioViewModel:
         self._view: 'OrdemServicoFormularioView' | None = None
 
         # --- Estado do Componente ---
-        self.pecas_selecionadas: List[dict] = []
-        self.lista_clientes: List[Cliente] = []
-        self.lista_pecas: List[Peca] = []
+        # Peças da OS indexadas por peca_id, com o total mantido a cada operação.
+        self.pecas_selecionadas = SelecaoPecas(campo_valor="valor_unitario")
+        self.lista_clientes: List[ClienteResumo] = []
+        self.lista_pecas: List[PecaResumo] = []
+        self._pecas_por_id: Dict[int, PecaResumo] = {}
+        # Identifica a OS sendo preenchida; repetições do envio usam a mesma chave.
+        self._chave_os = nova_chave()
 
     def vincular_view(self, view: 'OrdemServicoFormularioView'):
         """Estabelece a conexão de duas vias entre o ViewModel e a View."""
@@ -43,6 +57,10 @@ class OrdemServicoFormularioViewModel:
         # O ViewModel usa sua própria conexão para operações de leitura síncronas.
         self.lista_clientes = queries.obter_clientes()
         self.lista_pecas = queries.obter_pecas()
+        self._pecas_por_id = {p.id: p for p in self.lista_pecas}
+        # O formulário é limpo a cada abertura; a seleção também.
+        self.pecas_selecionadas.limpar()
+        self._chave_os = nova_chave()
         if self._view:
             self._view.popular_dropdowns_iniciais(self.lista_clientes, self.lista_pecas)
 
@@ -56,26 +74,31 @@ class OrdemServicoFormularioViewModel:
             self._view.popular_dropdown_carros(carros)
 
     def adicionar_peca_a_lista(self, peca_id: int, quantidade: int):
-        """Valida e adiciona uma peça à lista da OS."""
-        peca_obj = next((p for p in self.lista_pecas if p.id == int(peca_id)), None)
+        """Valida e adiciona uma peça à lista da OS (somando se ela já estiver na lista)."""
+        peca_obj = self._pecas_por_id.get(int(peca_id))
         if peca_obj and quantidade > 0:
-            self.pecas_selecionadas.append({
-                "peca_obj": peca_obj,
-                "quantidade": quantidade,
-                "valor_unitario": peca_obj.preco_venda,
-                "valor_total": peca_obj.preco_venda * quantidade
-            })
-            logging.info(f"ViewModel-OS: Peça '{peca_obj.nome}' adicionada.")
-            self._atualizar_view()
+            item, novo = self.pecas_selecionadas.adicionar(
+                peca_obj.id, quantidade, peca_obj.preco_venda, peca_obj=peca_obj)
+            logging.info(f"ViewModel-OS: Peça '{peca_obj.nome}' {'adicionada' if novo else 'somada'}.")
+            if self._view:
+                self._view.exibir_peca_selecionada(item)
+                self._view.atualizar_valor_total(self.pecas_selecionadas.total_valor)
         elif self._view:
             self._view.mostrar_feedback("Seleção de peça ou quantidade inválida.", False)
 
-    def remover_peca_da_lista(self, index: int):
+    def remover_peca_da_lista(self, peca_id: int):
         """Remove uma peça da lista da OS."""
-        if 0 <= index < len(self.pecas_selecionadas):
-            peca_removida = self.pecas_selecionadas.pop(index)
+        peca_removida = self.pecas_selecionadas.remover(peca_id)
+        if peca_removida:
             logging.info(f"ViewModel-OS: Peça '{peca_removida['peca_obj'].nome}' removida.")
-            self._atualizar_view()
+            if self._view:
+                self._view.remover_peca_selecionada(peca_id)
+                self._view.atualizar_valor_total(self.pecas_selecionadas.total_valor)
+
+    def recalcular_valor_total(self):
+        """Atualiza o valor total exibido (ex.: após alterar a mão de obra)."""
+        if self._view:
+            self._view.atualizar_valor_total(self.pecas_selecionadas.total_valor)
 
     def processar_criacao_os(self, cliente_id: int, carro_id: int, mao_de_obra_str: str):
         """Valida os dados finais e envia a OS para a fila de processamento."""
@@ -88,19 +111,25 @@ class OrdemServicoFormularioViewModel:
         except (ValueError, TypeError):
             mao_de_obra = 0.0
 
-        total_pecas = sum(item['valor_total'] for item in self.pecas_selecionadas)
+        total_pecas = self.pecas_selecionadas.total_valor
         dados_os = {
             "cliente_id": int(cliente_id),
             "carro_id": int(carro_id),
-            "pecas_quantidades": {item['peca_obj'].id: item['quantidade'] for item in self.pecas_selecionadas},
+            "pecas_quantidades": {item['peca_id']: item['quantidade'] for item in self.pecas_selecionadas},
             "valor_total": total_pecas + mao_de_obra,
             "mao_de_obra": mao_de_obra,
+            "chave_idempotencia": self._chave_os,
         }
 
         logging.info("ViewModel-OS: OS validada. Enviando para processamento na fila do DB...")
-        # Adiciona a tarefa de 'criar_ordem_servico' na fila para ser processada pela thread.
-        fila_db.put(("criar_ordem_servico", dados_os))
-        
+        # Grava a tarefa 'criar_ordem_servico' na outbox e a enfileira para o worker de escrita.
+        try:
+            servico_tarefas.enviar("criar_ordem_servico", dados_os)
+        except (sqlite3.Error, RuntimeError) as e:
+            logging.error(f"ViewModel-OS: Falha ao enviar a OS: {e}", exc_info=True)
+            if self._view: self._view.mostrar_feedback("Não foi possível enviar a Ordem de Serviço. Tente novamente.", False)
+            return
+
         if self._view:
             self._view.fechar_modal()
             self._view.mostrar_feedback("Ordem de Serviço enviada para criação!", True)
@@ -108,5 +137,5 @@ class OrdemServicoFormularioViewModel:
     def _atualizar_view(self):
         """Comanda a View para se redesenhar com os dados atualizados."""
         if self._view:
-            self._view.atualizar_visualizacao_pecas(self.pecas_selecionadas)
-            self._view.atualizar_valor_total(self.pecas_selecionadas)
\ No newline at end of file
+            self._view.atualizar_visualizacao_pecas(self.pecas_selecionadas.itens())
+            self._view.atualizar_valor_total(self.pecas_selecionadas.total_valor)
\ No newline at end of file
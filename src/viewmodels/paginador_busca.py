@@ -0,0 +1,107 @@
+# =================================================================================
+# MÓDULO DO PAGINADOR DE BUSCA (paginador_busca.py)
+#
+# OBJETIVO: Guardar o estado da paginação por keyset usado pelos ViewModels
+#           das telas de gestão (gerir_*): termo atual, chave da última linha
+#           carregada e se ainda há páginas a buscar.
+#
+# BUSCA EM SEGUNDO PLANO: `consultar_primeira_pagina()` só consulta o banco e
+# devolve a página com o estado que ela produziria, sem alterar o paginador.
+# `aplicar()` adota esse estado. Assim a busca incremental só altera o
+# paginador se a sua consulta ainda for a mais recente (ver BuscaIncremental).
+# =================================================================================
+import logging
+import threading
+from typing import Any, Callable, List, NamedTuple, Optional, Tuple
+
+from src.database import queries
+
+logger = logging.getLogger(__name__)
+
+
+class EstadoPaginacao(NamedTuple):
+    """Termo, cursor e fim da paginação após carregar uma página."""
+    termo: str
+    apos: Optional[Tuple[str, int]]
+    esgotado: bool
+
+
+class PaginadorBusca:
+    """
+    Carrega os resultados de uma função `queries.buscar_*_por_termo` página a página.
+
+    :param funcao_busca: Função com a assinatura (termo, limite=..., apos=...).
+    :param chave_cursor: Extrai de um item a chave (nome, id) usada como cursor.
+    :param tamanho_pagina: Quantidade de itens por página.
+    """
+
+    def __init__(
+        self,
+        funcao_busca: Callable[..., List[Any]],
+        chave_cursor: Callable[[Any], Tuple[str, int]],
+        tamanho_pagina: int = queries.TAMANHO_PAGINA_PADRAO,
+    ):
+        self._funcao_busca = funcao_busca
+        self._chave_cursor = chave_cursor
+        self.tamanho_pagina = tamanho_pagina
+        self._termo = ""
+        self._apos: Optional[Tuple[str, int]] = None
+        self.esgotado = False
+        # Evita que eventos de rolagem seguidos busquem a mesma página duas vezes.
+        self._lock = threading.Lock()
+
+    def primeira_pagina(self, termo: str) -> List[Any]:
+        """Reinicia a paginação com um novo termo e retorna a primeira página."""
+        with self._lock:
+            return self._adotar(self.consultar_primeira_pagina(termo))
+
+    def consultar_primeira_pagina(self, termo: str) -> Tuple[List[Any], EstadoPaginacao]:
+        """
+        Consulta a primeira página do termo sem alterar o paginador.
+
+        :return: (itens, estado) — passe a tupla para `aplicar()` para adotá-la.
+        """
+        itens = self._funcao_busca(termo, limite=self.tamanho_pagina, apos=None)
+        estado = EstadoPaginacao(
+            termo,
+            self._chave_cursor(itens[-1]) if itens else None,
+            len(itens) < self.tamanho_pagina,
+        )
+        return itens, estado
+
+    def aplicar(self, pagina: Tuple[List[Any], EstadoPaginacao]) -> List[Any]:
+        """Adota a página de `consultar_primeira_pagina()` e retorna os seus itens."""
+        with self._lock:
+            return self._adotar(pagina)
+
+    def _adotar(self, pagina: Tuple[List[Any], EstadoPaginacao]) -> List[Any]:
+        itens, estado = pagina
+        self._termo, self._apos, self.esgotado = estado
+        logger.debug(
+            f"Paginador: {len(itens)} itens carregados para '{self._termo}' (esgotado={self.esgotado}).")
+        return itens
+
+    def proxima_pagina(self) -> List[Any]:
+        """
+        Retorna a próxima página do termo atual.
+        Retorna uma lista vazia se não houver mais páginas ou se outra
+        página já estiver sendo carregada.
+        """
+        if self.esgotado or not self._lock.acquire(blocking=False):
+            return []
+        try:
+            if self.esgotado:
+                return []
+            return self._buscar()
+        finally:
+            self._lock.release()
+
+    def _buscar(self) -> List[Any]:
+        itens = self._funcao_busca(
+            self._termo, limite=self.tamanho_pagina, apos=self._apos)
+        self.esgotado = len(itens) < self.tamanho_pagina
+        if itens:
+            self._apos = self._chave_cursor(itens[-1])
+        logger.debug(
+            f"Paginador: {len(itens)} itens carregados para '{self._termo}' (esgotado={self.esgotado}).")
+        return itens
@@ -0,0 +1,81 @@
+# =================================================================================
+# MÓDULO DO VIEWMODEL DO PERFIL DE CONSULTAS (perfil_consultas_viewmodel.py)
+#
+# OBJETIVO: Conter a lógica da tela administrativa que liga/desliga o
+#           perfilador de consultas, exibe as estatísticas por comando SQL e
+#           as consultas lentas, e exporta tudo em JSON.
+# =================================================================================
+import flet as ft
+import logging
+import os
+from datetime import datetime
+
+from src.database.perfilador import perfilador_consultas
+
+logger = logging.getLogger(__name__)
+
+# Pasta onde os arquivos exportados são gravados.
+PASTA_EXPORTACAO = "./data"
+# Quantos comandos (os de maior tempo total) aparecem na tela.
+MAX_COMANDOS_EXIBIDOS = 50
+
+
+class PerfilConsultasViewModel:
+    """
+    O ViewModel para a PerfilConsultasView.
+    """
+
+    def __init__(self, page: ft.Page):
+        self.page = page
+        self._view: 'PerfilConsultasView' | None = None
+        logger.debug("PerfilConsultasViewModel inicializado.")
+
+    def vincular_view(self, view: 'PerfilConsultasView'):
+        """Estabelece a conexão de duas vias entre o ViewModel e a View."""
+        self._view = view
+
+    def atualizar(self):
+        """Lê as medições atuais do perfilador e comanda a View para exibi-las."""
+        if not self._view:
+            return
+        self._view.exibir_estado(perfilador_consultas.ativo, perfilador_consultas.limiar_lenta_ms)
+        self._view.exibir_consultas(
+            perfilador_consultas.consultas()[:MAX_COMANDOS_EXIBIDOS],
+            perfilador_consultas.consultas_lentas())
+
+    def alternar(self, ativo: bool, limiar_ms: str):
+        """Liga (com o limiar informado) ou desliga o perfilador."""
+        if not self._view:
+            return
+        if ativo:
+            try:
+                limiar = float((limiar_ms or "").replace(",", "."))
+                if limiar < 0:
+                    raise ValueError
+            except ValueError:
+                self._view.mostrar_feedback("Limiar inválido. Informe um número de milissegundos.", False)
+                self._view.exibir_estado(perfilador_consultas.ativo, perfilador_consultas.limiar_lenta_ms)
+                return
+            perfilador_consultas.ativar(limiar)
+        else:
+            perfilador_consultas.desativar()
+        self.atualizar()
+
+    def limpar(self):
+        """Descarta as medições coletadas até agora."""
+        perfilador_consultas.limpar()
+        logger.info("ViewModel: medições do perfilador descartadas.")
+        self.atualizar()
+
+    def exportar(self):
+        """Grava as medições num arquivo JSON na pasta de dados."""
+        if not self._view:
+            return
+        nome_arquivo = f"perfil_consultas_{datetime.now():%Y%m%d_%H%M%S}.json"
+        caminho = os.path.join(PASTA_EXPORTACAO, nome_arquivo)
+        try:
+            perfilador_consultas.exportar_json(caminho)
+            self._view.mostrar_feedback(f"Perfil exportado para {caminho}", True)
+        except OSError as e:
+            logger.error(f"Erro ao exportar o perfil de consultas: {e}", exc_info=True)
+            self._view.mostrar_feedback("Erro ao exportar o perfil de consultas.", False)
@@ -0,0 +1,112 @@
+# =================================================================================
+# MÓDULO DO MODELO DE SELEÇÃO DE PEÇAS (selecao_pecas.py)
+#
+# OBJETIVO: Guardar as peças escolhidas em um formulário (itens da OS, lote de
+#           entrada de estoque), indexadas por `peca_id`.
+#
+# DETALHES:
+#   - Adicionar uma peça que já está na seleção soma a quantidade na linha
+#     existente em vez de criar uma linha duplicada.
+#   - Busca, inclusão e remoção são O(1) (dicionário que mantém a ordem de
+#     inclusão), e os totais são atualizados a cada operação, sem somar a
+#     lista inteira de novo.
+# =================================================================================
+import logging
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SelecaoPecas:
+    """
+    Seleção de peças indexada por `peca_id`.
+
+    Cada item é um dicionário com pelo menos 'peca_id', 'quantidade',
+    o campo de valor (`campo_valor`) e 'valor_total'.
+
+    :param campo_valor: Nome do campo com o valor informado para o item
+                        (ex.: 'valor_unitario' na OS, 'valor_custo' na entrada).
+    :param valor_por_unidade: True se o valor é unitário (total = valor x
+                              quantidade); False se já é o total da linha
+                              (na soma de linhas, os valores são somados).
+    """
+
+    def __init__(self, campo_valor: str = "valor_unitario", valor_por_unidade: bool = True):
+        self.campo_valor = campo_valor
+        self.valor_por_unidade = valor_por_unidade
+        self._itens: Dict[int, Dict[str, Any]] = {}
+        self.total_quantidade = 0
+        self.total_valor = 0.0
+
+    def __len__(self) -> int:
+        return len(self._itens)
+
+    def __contains__(self, peca_id: int) -> bool:
+        return peca_id in self._itens
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self._itens.values())
+
+    def itens(self) -> List[Dict[str, Any]]:
+        """Retorna os itens na ordem em que foram incluídos."""
+        return list(self._itens.values())
+
+    def obter(self, peca_id: int) -> Optional[Dict[str, Any]]:
+        return self._itens.get(peca_id)
+
+    def adicionar(self, peca_id: int, quantidade: int, valor: Optional[float], **dados) -> Tuple[Dict[str, Any], bool]:
+        """
+        Inclui a peça ou soma a quantidade à linha já existente.
+
+        Na soma, um valor unitário informado substitui o anterior, e um valor
+        total é somado ao anterior. Os demais campos substituem os anteriores
+        quando não estão vazios.
+
+        :return: (item, True se uma nova linha foi criada).
+        """
+        if quantidade <= 0:
+            raise ValueError(
+                f"Quantidade inválida ({quantidade}) para a peça ID {peca_id}.")
+
+        item = self._itens.get(peca_id)
+        novo = item is None
+        if novo:
+            item = {"peca_id": peca_id, **dados, "quantidade": 0,
+                    self.campo_valor: None, "valor_total": 0.0}
+            self._itens[peca_id] = item
+        else:
+            item.update({chave: v for chave, v in dados.items() if v})
+
+        # Retira a contribuição antiga da linha e soma a nova.
+        self.total_valor -= item["valor_total"]
+        item["quantidade"] += quantidade
+        if self.valor_por_unidade:
+            if valor is not None:
+                item[self.campo_valor] = valor
+            item["valor_total"] = (item[self.campo_valor] or 0.0) * item["quantidade"]
+        else:
+            if valor is not None:
+                item[self.campo_valor] = (item[self.campo_valor] or 0.0) + valor
+            item["valor_total"] = item[self.campo_valor] or 0.0
+
+        self.total_quantidade += quantidade
+        self.total_valor += item["valor_total"]
+        logger.debug(
+            f"Seleção: peça ID {peca_id} {'incluída' if novo else 'somada'} (Qtd: {item['quantidade']}).")
+        return item, novo
+
+    def remover(self, peca_id: int) -> Optional[Dict[str, Any]]:
+        """Remove a linha da peça. Retorna o item removido ou None."""
+        item = self._itens.pop(peca_id, None)
+        if item is not None:
+            self.total_quantidade -= item["quantidade"]
+            self.total_valor -= item["valor_total"]
+            if not self._itens:
+                # Zera explicitamente para não acumular erro de ponto flutuante.
+                self.total_valor = 0.0
+        return item
+
+    def limpar(self):
+        self._itens.clear()
+        self.total_quantidade = 0
+        self.total_valor = 0.0
@@ -7,7 +7,7 @@
 import flet as ft
 from src.viewmodels.cadastro_carro_viewmodel import CadastroCarroViewModel
 from src.styles.style import AppDimensions, AppFonts
-from src.models.models import Cliente
+from src.models.models import ClienteResumo
 from typing import List, Callable, Optional
 from threading import Timer
 import logging
@@ -70,7 +70,7 @@ class CadastroCarroView(ft.Column):
             "cor": self._cor_field.value,
         }
 
-    def popular_dropdown_clientes(self, clientes: List[Cliente]):
+    def popular_dropdown_clientes(self, clientes: List[ClienteResumo]):
         """Preenche o dropdown com a lista de clientes."""
         logger.debug(f"View: Populando dropdown com {len(clientes)} clientes.")
         self._cliente_dropdown.options = [
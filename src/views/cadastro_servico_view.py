@@ -7,7 +7,7 @@
 import flet as ft
 from src.viewmodels.cadastro_servico_viewmodel import CadastroServicoViewModel
 from src.styles.style import AppDimensions, AppFonts
-from src.models.models import Peca
+from src.models.models import PecaResumo
 from typing import Callable, Optional, List
 from threading import Timer
 import logging
@@ -85,7 +85,7 @@ class CadastroServicoView(ft.Column):
     def did_mount(self):
         self.view_model.carregar_pecas_iniciais()
 
-    def popular_lista_pecas(self, pecas: List[Peca]):
+    def popular_lista_pecas(self, pecas: List[PecaResumo]):
         """Cria a lista completa de checkboxes uma única vez."""
         self._todos_os_checkboxes.clear()
         if pecas:
@@ -97,7 +97,7 @@ class CadastroServicoView(ft.Column):
         # Exibe a lista completa inicialmente
         self.atualizar_lista_filtrada_pecas(pecas)
 
-    def atualizar_lista_filtrada_pecas(self, pecas_filtradas: List[Peca]):
+    def atualizar_lista_filtrada_pecas(self, pecas_filtradas: List[PecaResumo]):
         """Atualiza a ListView com os checkboxes que correspondem ao filtro."""
         self._lista_pecas_checkboxes.controls.clear()
         ids_filtrados = {peca.id for peca in pecas_filtradas}
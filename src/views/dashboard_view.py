@@ -58,6 +58,8 @@ class DashboardView(ft.Column):
                 conteudo=[
                     self._criar_sub_item(
                         "Entrada de Produto", ft.Icons.INPUT_OUTLINED, "/entrada_pecas"),
+                    self._criar_sub_item(
+                        "Kardex de Peças", ft.Icons.RECEIPT_OUTLINED, "/kardex"),
                     self._criar_sub_item(
                         "Cadastro de Produto", ft.Icons.INVENTORY_2_OUTLINED, "/gerir_pecas"),
                     self._criar_sub_item(
@@ -72,6 +74,8 @@ class DashboardView(ft.Column):
                         "Dados da Oficina", ft.Icons.STORE_OUTLINED, "/dados_oficina"),
                     self._criar_sub_item(
                         "Relatórios", ft.Icons.ASSESSMENT_OUTLINED, "/relatorios"),
+                    self._criar_sub_item(
+                        "Perfil de Consultas", ft.Icons.SPEED_OUTLINED, "/perfil_consultas"),
                 ]
             ),
         ]
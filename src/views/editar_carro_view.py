@@ -7,7 +7,7 @@
 import flet as ft
 import logging
 from src.viewmodels.editar_carro_viewmodel import EditarCarroViewModel
-from src.models.models import Cliente
+from src.models.models import ClienteResumo
 from src.styles.style import AppDimensions, AppFonts
 from threading import Timer
 from typing import Callable, Optional, List
@@ -68,7 +68,7 @@ class EditarCarroView(ft.Column):
         self._cor_field.value = carro['cor'] or ""
         self.update()
 
-    def popular_dropdown_clientes(self, clientes: List[Cliente]):
+    def popular_dropdown_clientes(self, clientes: List[ClienteResumo]):
         """Preenche o dropdown com a lista de clientes."""
         logger.debug(f"View: Populando dropdown com {len(clientes)} clientes.")
         self._cliente_dropdown.options = [
@@ -4,7 +4,7 @@
 import flet as ft
 import logging
 from src.viewmodels.editar_servico_viewmodel import EditarServicoViewModel
-from src.models.models import Servico, Peca
+from src.models.models import Servico, PecaResumo
 from src.styles.style import AppDimensions, AppFonts
 from threading import Timer
 from typing import Callable, Optional, List
@@ -57,7 +57,7 @@ class EditarServicoView(ft.Column):
     def did_mount(self):
         self.view_model.carregar_dados_iniciais()
 
-    def popular_lista_pecas(self, pecas: List[Peca]):
+    def popular_lista_pecas(self, pecas: List[PecaResumo]):
         """Cria a lista completa de checkboxes uma única vez."""
         self._todos_os_checkboxes.clear()
         if pecas:
@@ -8,7 +8,7 @@
 import flet as ft
 import logging
 from src.viewmodels.entrada_pecas_viewmodel import EntradaPecasViewModel
-from src.models.models import Peca
+from src.models.models import PecaResumo
 from src.styles.style import AppDimensions, AppFonts
 from typing import Callable, Optional, List, Dict, Any
 from threading import Timer
@@ -70,6 +70,9 @@ class EntradaPecasView(ft.Column):
 
         # --- Componente da Lista (Lote) ---
         self._lote_list_view = ft.ListView(expand=True, spacing=5, padding=10)
+        # Linha exibida para cada peça do lote, para redesenhar só a que mudou.
+        self._linhas_lote: Dict[int, ft.ListTile] = {}
+        self._aviso_lote_vazio = ft.Text("Nenhum item adicionado ao lote.")
 
         # --- Botões de Ação Principais ---
         self._registrar_lote_button = ft.ElevatedButton(
@@ -123,7 +126,7 @@ class EntradaPecasView(ft.Column):
         logger.debug("View 'Entrada de Peças' montada. Carregando peças...")
         self.view_model.carregar_pecas_ativas()
 
-    def popular_dropdown_pecas(self, pecas: List[Peca]):
+    def popular_dropdown_pecas(self, pecas: List[PecaResumo]):
         """Preenche o dropdown com a lista de peças ativas."""
         self._peca_dropdown.options = [
             ft.dropdown.Option(
@@ -167,31 +170,63 @@ class EntradaPecasView(ft.Column):
         self.update()
 
     def atualizar_lista_lote(self, lote: List[Dict[str, Any]]):
-        """Atualiza o ListView com os itens do lote."""
+        """Redesenha o ListView inteiro com os itens do lote."""
         self._lote_list_view.controls.clear()
+        self._linhas_lote.clear()
         if not lote:
-            self._lote_list_view.controls.append(
-                ft.Text("Nenhum item adicionado ao lote."))
+            self._lote_list_view.controls.append(self._aviso_lote_vazio)
         else:
             for item in lote:
-                self._lote_list_view.controls.append(
-                    ft.ListTile(
-                        title=ft.Text(
-                            f"{item['nome_peca']} (Qtd: {item['quantidade']})"),
-                        subtitle=ft.Text(
-                            f"Custo: R$ {item['valor_custo'] or 0.0:.2f} - Desc: {item['descricao'] or 'N/A'}"),
-                        trailing=ft.IconButton(
-                            icon=ft.Icons.DELETE_OUTLINE,
-                            icon_color=ft.Colors.RED_400,
-                            tooltip="Remover item do lote",
-                            data=item,  # Armazena o dict do item no botão
-                            on_click=lambda e: self.view_model.remover_item_do_lote(
-                                e.control.data)
-                        )
-                    )
-                )
+                linha = self._criar_linha_lote(item)
+                self._linhas_lote[item['peca_id']] = linha
+                self._lote_list_view.controls.append(linha)
         self.update()
 
+    def exibir_item_lote(self, item: Dict[str, Any]):
+        """Inclui a linha do item no lote ou atualiza a linha já existente."""
+        linha = self._linhas_lote.get(item['peca_id'])
+        if linha is not None:
+            linha.title.value, linha.subtitle.value = self._textos_item_lote(item)
+            linha.update()
+            return
+        if self._aviso_lote_vazio in self._lote_list_view.controls:
+            self._lote_list_view.controls.remove(self._aviso_lote_vazio)
+        linha = self._criar_linha_lote(item)
+        self._linhas_lote[item['peca_id']] = linha
+        self._lote_list_view.controls.append(linha)
+        self._lote_list_view.update()
+
+    def remover_item_lote(self, peca_id: int):
+        """Remove do ListView apenas a linha da peça informada."""
+        linha = self._linhas_lote.pop(peca_id, None)
+        if linha is None:
+            return
+        self._lote_list_view.controls.remove(linha)
+        if not self._linhas_lote:
+            self._lote_list_view.controls.append(self._aviso_lote_vazio)
+        self._lote_list_view.update()
+
+    def _textos_item_lote(self, item: Dict[str, Any]):
+        return (
+            f"{item['nome_peca']} (Qtd: {item['quantidade']})",
+            f"Custo: R$ {item['valor_custo'] or 0.0:.2f} - Desc: {item['descricao'] or 'N/A'}",
+        )
+
+    def _criar_linha_lote(self, item: Dict[str, Any]) -> ft.ListTile:
+        titulo, subtitulo = self._textos_item_lote(item)
+        return ft.ListTile(
+            title=ft.Text(titulo),
+            subtitle=ft.Text(subtitulo),
+            trailing=ft.IconButton(
+                icon=ft.Icons.DELETE_OUTLINE,
+                icon_color=ft.Colors.RED_400,
+                tooltip="Remover item do lote",
+                data=item,  # Armazena o dict do item no botão
+                on_click=lambda e: self.view_model.remover_item_do_lote(
+                    e.control.data)
+            )
+        )
+
     # --- Métodos de Diálogo (Padrão com Overlay) ---
     def _fechar_dialogo_e_agir(self, e):
         self.fechar_dialogo()
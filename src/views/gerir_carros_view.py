@@ -8,6 +8,7 @@ import flet as ft
 from src.viewmodels.gerir_carros_viewmodel import GerirCarrosViewModel
 from typing import List
 from src.styles.style import AppDimensions, AppFonts
+from src.views.lista_virtualizada import AcoesLinha, ConteudoLinha, ListaVirtualizada
 import logging
 
 # Configura o logger para este módulo.
@@ -31,11 +32,24 @@ class GerirCarrosView(ft.Column):
             label="Pesquisar por Modelo, Placa ou Proprietário",
             on_submit=lambda e: self.view_model.pesquisar_carro(
                 self._campo_pesquisa.value),
+            on_change=lambda e: self.view_model.pesquisar_enquanto_digita(
+                e.control.value),
             prefix_icon=ft.Icons.SEARCH,
             border_radius=ft.border_radius.all(AppDimensions.BORDER_RADIUS)
         )
-        self._resultados_pesquisa_listview = ft.ListView(
-            expand=True, spacing=10)
+        # A lista é carregada em páginas: ao rolar perto do fim, a próxima é anexada.
+        # As linhas são reaproveitadas entre buscas (ver lista_virtualizada.py).
+        self._resultados_pesquisa_listview = ListaVirtualizada(
+            descrever=self._descrever_item,
+            chave=lambda c: c['id'],
+            acoes=AcoesLinha(
+                icone_reativar=ft.Icons.RESTORE_FROM_TRASH_OUTLINED, tooltip_reativar="Reativar Carro",
+                icone_desativar=ft.Icons.DELETE_FOREVER_OUTLINED, tooltip_desativar="Desativar Carro"),
+            ao_clicar=lambda c: self.view_model.editar_carro(c['id']),
+            ao_acionar=self._ao_acionar_item,
+            texto_vazio="Nenhum carro encontrado.",
+            expand=True, spacing=10,
+            on_scroll_interval=100, on_scroll=self._ao_rolar_lista)
 
         # Diálogo de Confirmação genérico, será adicionado à overlay.
         self._confirm_dialog = ft.AlertDialog(
@@ -65,60 +79,38 @@ class GerirCarrosView(ft.Column):
     def atualizar_lista_resultados(self, carros: List[dict]):
         """Atualiza a ListView com os resultados da busca."""
         logger.debug(f"View: Atualizando a lista com {len(carros)} carros.")
-        self._resultados_pesquisa_listview.controls.clear()
-
-        if not carros:
-            self._resultados_pesquisa_listview.controls.append(
-                ft.Text("Nenhum carro encontrado."))
+        self._resultados_pesquisa_listview.definir_itens(carros)
+
+    def anexar_resultados(self, carros: List[dict]):
+        """Acrescenta ao fim da lista a próxima página de resultados."""
+        self._resultados_pesquisa_listview.anexar_itens(carros)
+
+    def atualizar_status_item(self, carro_id: int, ativo: bool):
+        """Redesenha só a linha do registro após ativá-lo ou desativá-lo (mantém filtro e rolagem)."""
+        carro = self._resultados_pesquisa_listview.obter_item(carro_id)
+        if carro is not None:
+            carro['ativo'] = ativo
+            self._resultados_pesquisa_listview.atualizar_item(carro)
+
+    def _ao_rolar_lista(self, e: ft.OnScrollEvent):
+        """Pede a próxima página quando a rolagem chega perto do fim da lista."""
+        if e.pixels >= e.max_scroll_extent - 200:
+            self.view_model.carregar_proxima_pagina()
+
+    def _descrever_item(self, carro: dict) -> ConteudoLinha:
+        """Define o texto e o estado exibidos na linha de um registro."""
+        return ConteudoLinha(
+            titulo=f"{carro['modelo']} - {carro['placa']}",
+            subtitulo=f"Proprietário: {carro['nome_cliente']}",
+            ativo=bool(carro['ativo']))
+
+    def _ao_acionar_item(self, carro: dict):
+        """Botão da linha: desativa registros ativos e reativa os inativos."""
+        descricao = f"{carro['modelo']} - {carro['placa']}"
+        if carro['ativo']:
+            self.view_model.solicitar_desativacao(carro['id'], descricao)
         else:
-            for carro in carros:
-                # Lógica para exibir o ícone de ativar ou desativar
-                if not carro['ativo']:
-                    action_icon = ft.IconButton(
-                        icon=ft.Icons.RESTORE_FROM_TRASH_OUTLINED,  # Ícone para reativar
-                        tooltip="Reativar Carro",
-                        on_click=lambda e, c=carro: self.view_model.solicitar_ativacao(
-                            c['id'], f"{c['modelo']} - {c['placa']}"),
-                        icon_color=ft.Colors.GREEN_400,
-                    )
-                else:
-                    action_icon = ft.IconButton(
-                        # Usando o ícone de deletar para desativar
-                        icon=ft.Icons.DELETE_FOREVER_OUTLINED,
-                        tooltip="Desativar Carro",
-                        on_click=lambda e, c=carro: self.view_model.solicitar_desativacao(
-                            c['id'], f"{c['modelo']} - {c['placa']}"),
-                        icon_color=ft.Colors.RED_400,
-                    )
-
-                list_item = ft.Container(
-                    on_click=lambda _, c=carro: self.view_model.editar_carro(
-                        c['id']),
-                    border_radius=ft.border_radius.all(
-                        AppDimensions.BORDER_RADIUS),
-                    ink=True,
-                    padding=ft.padding.symmetric(vertical=8, horizontal=12),
-                    # Diferenciação visual para inativos
-                    opacity=1.0 if carro['ativo'] else 0.5,
-                    content=ft.Row(
-                        alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
-                        controls=[
-                            ft.Column(
-                                expand=True, spacing=2,
-                                controls=[
-                                    ft.Text(
-                                        f"{carro['modelo']} - {carro['placa']}", size=AppFonts.BODY_LARGE),
-                                    ft.Text(
-                                        f"Proprietário: {carro['nome_cliente']}", size=AppFonts.BODY_SMALL, color=ft.Colors.ON_SURFACE_VARIANT),
-                                ]
-                            ),
-                            ft.Row(spacing=0, controls=[
-                                   action_icon, ft.Icon(ft.Icons.CHEVRON_RIGHT)])
-                        ]
-                    )
-                )
-                self._resultados_pesquisa_listview.controls.append(list_item)
-        self.update()
+            self.view_model.solicitar_ativacao(carro['id'], descricao)
 
     # --- Métodos de Gerenciamento de Diálogos ---
 
@@ -9,10 +9,11 @@
 # =================================================================================
 import flet as ft
 from src.viewmodels.gerir_clientes_viewmodel import GerirClientesViewModel
-from src.models.models import Cliente
+from src.models.models import ClienteResumo
 from typing import List
 # Importa as classes de estilo para fontes e dimensões.
 from src.styles.style import AppDimensions, AppFonts
+from src.views.lista_virtualizada import AcoesLinha, ConteudoLinha, ListaVirtualizada
 import logging
 
 
@@ -33,11 +34,24 @@ class GerirClientesView(ft.Column):
             label="Pesquisar por Nome, Telefone ou Placa do Carro",
             on_submit=lambda e: self.view_model.pesquisar_cliente(
                 self._campo_pesquisa.value),
+            on_change=lambda e: self.view_model.pesquisar_enquanto_digita(
+                e.control.value),
             prefix_icon=ft.Icons.SEARCH,
             border_radius=ft.border_radius.all(AppDimensions.BORDER_RADIUS)
         )
-        self._resultados_pesquisa_listview = ft.ListView(
-            expand=True, spacing=10)
+        # A lista é carregada em páginas: ao rolar perto do fim, a próxima é anexada.
+        # As linhas são reaproveitadas entre buscas (ver lista_virtualizada.py).
+        self._resultados_pesquisa_listview = ListaVirtualizada(
+            descrever=self._descrever_item,
+            chave=lambda c: c.id,
+            acoes=AcoesLinha(
+                icone_reativar=ft.Icons.PERSON_ADD, tooltip_reativar="Reativar Cliente",
+                icone_desativar=ft.Icons.PERSON_OFF, tooltip_desativar="Desativar Cliente"),
+            ao_clicar=lambda c: self.view_model.editar_cliente(c.id),
+            ao_acionar=self._ao_acionar_item,
+            texto_vazio="Nenhum cliente encontrado.",
+            expand=True, spacing=10,
+            on_scroll_interval=100, on_scroll=self._ao_rolar_lista)
 
         # Diálogo de Confirmação genérico.
         self._confirm_dialog = ft.AlertDialog(
@@ -62,64 +76,39 @@ class GerirClientesView(ft.Column):
         logging.info("GerirClientesView foi montada. Carregando clientes...")
         self.view_model.carregar_clientes_iniciais()
 
-    def atualizar_lista_resultados(self, clientes: List[Cliente]):
+    def atualizar_lista_resultados(self, clientes: List[ClienteResumo]):
         """Atualiza a ListView com os resultados da busca fornecidos pelo ViewModel."""
-        self._resultados_pesquisa_listview.controls.clear()
-
-        if not clientes:
-            self._resultados_pesquisa_listview.controls.append(
-                ft.Text("Nenhum cliente encontrado."))
+        self._resultados_pesquisa_listview.definir_itens(clientes)
+
+    def anexar_resultados(self, clientes: List[ClienteResumo]):
+        """Acrescenta ao fim da lista a próxima página de resultados."""
+        self._resultados_pesquisa_listview.anexar_itens(clientes)
+
+    def atualizar_status_item(self, cliente_id: int, ativo: bool):
+        """Redesenha só a linha do registro após ativá-lo ou desativá-lo (mantém filtro e rolagem)."""
+        cliente = self._resultados_pesquisa_listview.obter_item(cliente_id)
+        if cliente is not None:
+            cliente.ativo = ativo
+            self._resultados_pesquisa_listview.atualizar_item(cliente)
+
+    def _ao_rolar_lista(self, e: ft.OnScrollEvent):
+        """Pede a próxima página quando a rolagem chega perto do fim da lista."""
+        if e.pixels >= e.max_scroll_extent - 200:
+            self.view_model.carregar_proxima_pagina()
+
+    def _descrever_item(self, cliente: ClienteResumo) -> ConteudoLinha:
+        """Define o texto e o estado exibidos na linha de um registro."""
+        return ConteudoLinha(
+            titulo=cliente.nome,
+            subtitulo=f"Telefone: {cliente.telefone}",
+            ativo=bool(cliente.ativo))
+
+    def _ao_acionar_item(self, cliente: ClienteResumo):
+        """Botão da linha: desativa registros ativos e reativa os inativos."""
+        if cliente.ativo:
+            self.view_model.solicitar_desativacao(cliente.id, cliente.nome)
         else:
-            for cliente in clientes:
-                # --- LÓGICA DE EXIBIÇÃO CONDICIONAL ---
-                
-                # Se o cliente estiver inativo, o ícone de ação será para reativar.
-                if not cliente.ativo:
-                    action_icon = ft.IconButton(
-                        icon=ft.Icons.PERSON_ADD,
-                        tooltip="Reativar Cliente",
-                        on_click=lambda e, c=cliente: self.view_model.solicitar_ativacao(c.id, c.nome),
-                        icon_color=ft.Colors.GREEN_400,
-                    )
-                # Se estiver ativo, o ícone será para desativar.
-                else:
-                    action_icon = ft.IconButton(
-                        icon=ft.Icons.PERSON_OFF,
-                        tooltip="Desativar Cliente",
-                        on_click=lambda e, c=cliente: self.view_model.solicitar_desativacao(c.id, c.nome),
-                        icon_color=ft.Colors.RED_400,
-                    )
-
-                list_item = ft.Container(
-                    on_click=lambda _, c=cliente: self.view_model.editar_cliente(c.id),
-                    border_radius=ft.border_radius.all(AppDimensions.BORDER_RADIUS),
-                    ink=True,
-                    padding=ft.padding.symmetric(vertical=8, horizontal=12),
-                    # Clientes inativos terão uma opacidade menor para diferenciação visual.
-                    opacity=1.0 if cliente.ativo else 0.5,
-                    content=ft.Row(
-                        alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
-                        controls=[
-                            ft.Column(
-                                expand=True,
-                                spacing=2,
-                                controls=[
-                                    ft.Text(cliente.nome, size=AppFonts.BODY_LARGE),
-                                    ft.Text(f"Telefone: {cliente.telefone}", size=AppFonts.BODY_SMALL, color=ft.Colors.ON_SURFACE_VARIANT),
-                                ]
-                            ),
-                            ft.Row(
-                                spacing=0,
-                                controls=[
-                                    action_icon, # Ícone de ação (ativar/desativar)
-                                    ft.Icon(ft.Icons.CHEVRON_RIGHT),
-                                ]
-                            )
-                        ]
-                    )
-                )
-                self._resultados_pesquisa_listview.controls.append(list_item)
-        self.update()
+            self.view_model.solicitar_ativacao(cliente.id, cliente.nome)
 
     # --- MÉTODOS DA VIEW ---
 
@@ -5,9 +5,10 @@
 # =================================================================================
 import flet as ft
 from src.viewmodels.gerir_mecanicos_viewmodel import GerirMecanicosViewModel
-from src.models.models import Mecanico
+from src.models.models import MecanicoResumo
 from typing import List
 from src.styles.style import AppDimensions, AppFonts
+from src.views.lista_virtualizada import AcoesLinha, ConteudoLinha, ListaVirtualizada
 import logging
 
 logger = logging.getLogger(__name__)
@@ -25,11 +26,24 @@ class GerirMecanicosView(ft.Column):
             label="Pesquisar por Nome, CPF ou Especialidade",
             on_submit=lambda e: self.view_model.pesquisar_mecanico(
                 self._campo_pesquisa.value),
+            on_change=lambda e: self.view_model.pesquisar_enquanto_digita(
+                e.control.value),
             prefix_icon=ft.Icons.SEARCH,
             border_radius=ft.border_radius.all(AppDimensions.BORDER_RADIUS)
         )
-        self._resultados_pesquisa_listview = ft.ListView(
-            expand=True, spacing=10)
+        # A lista é carregada em páginas: ao rolar perto do fim, a próxima é anexada.
+        # As linhas são reaproveitadas entre buscas (ver lista_virtualizada.py).
+        self._resultados_pesquisa_listview = ListaVirtualizada(
+            descrever=self._descrever_item,
+            chave=lambda m: m.id,
+            acoes=AcoesLinha(
+                icone_reativar=ft.Icons.PERSON_ADD, tooltip_reativar="Reativar Mecânico",
+                icone_desativar=ft.Icons.PERSON_OFF, tooltip_desativar="Desativar Mecânico"),
+            ao_clicar=lambda m: self.view_model.editar_mecanico(m.id),
+            ao_acionar=self._ao_acionar_item,
+            texto_vazio="Nenhum mecânico encontrado.",
+            expand=True, spacing=10,
+            on_scroll_interval=100, on_scroll=self._ao_rolar_lista)
         self._confirm_dialog = ft.AlertDialog(
             modal=True, title=ft.Text("Confirmar Ação"), content=ft.Text(),
             actions=[ft.TextButton(
@@ -45,53 +59,40 @@ class GerirMecanicosView(ft.Column):
         logger.info("GerirMecanicosView foi montada. Carregando mecânicos...")
         self.view_model.carregar_mecanicos_iniciais()
 
-    def atualizar_lista_resultados(self, mecanicos: List[Mecanico]):
+    def atualizar_lista_resultados(self, mecanicos: List[MecanicoResumo]):
         logger.debug(
             f"View: Atualizando a lista com {len(mecanicos)} mecânicos.")
-        self._resultados_pesquisa_listview.controls.clear()
-        if not mecanicos:
-            self._resultados_pesquisa_listview.controls.append(
-                ft.Text("Nenhum mecânico encontrado."))
+        self._resultados_pesquisa_listview.definir_itens(mecanicos)
+
+    def anexar_resultados(self, mecanicos: List[MecanicoResumo]):
+        """Acrescenta ao fim da lista a próxima página de resultados."""
+        self._resultados_pesquisa_listview.anexar_itens(mecanicos)
+
+    def atualizar_status_item(self, mecanico_id: int, ativo: bool):
+        """Redesenha só a linha do registro após ativá-lo ou desativá-lo (mantém filtro e rolagem)."""
+        mecanico = self._resultados_pesquisa_listview.obter_item(mecanico_id)
+        if mecanico is not None:
+            mecanico.ativo = ativo
+            self._resultados_pesquisa_listview.atualizar_item(mecanico)
+
+    def _ao_rolar_lista(self, e: ft.OnScrollEvent):
+        """Pede a próxima página quando a rolagem chega perto do fim da lista."""
+        if e.pixels >= e.max_scroll_extent - 200:
+            self.view_model.carregar_proxima_pagina()
+
+    def _descrever_item(self, mecanico: MecanicoResumo) -> ConteudoLinha:
+        """Define o texto e o estado exibidos na linha de um registro."""
+        return ConteudoLinha(
+            titulo=mecanico.nome,
+            subtitulo=f"Especialidade: {mecanico.especialidade or 'N/A'}",
+            ativo=bool(mecanico.ativo))
+
+    def _ao_acionar_item(self, mecanico: MecanicoResumo):
+        """Botão da linha: desativa registros ativos e reativa os inativos."""
+        if mecanico.ativo:
+            self.view_model.solicitar_desativacao(mecanico.id, mecanico.nome)
         else:
-            for mecanico in mecanicos:
-                action_icon = (
-                    ft.IconButton(
-                        icon=ft.Icons.PERSON_ADD, tooltip="Reativar Mecânico",
-                        on_click=lambda e, m=mecanico: self.view_model.solicitar_ativacao(
-                            m.id, m.nome),
-                        icon_color=ft.Colors.GREEN_400,
-                    ) if not mecanico.ativo else ft.IconButton(
-                        icon=ft.Icons.PERSON_OFF, tooltip="Desativar Mecânico",
-                        on_click=lambda e, m=mecanico: self.view_model.solicitar_desativacao(
-                            m.id, m.nome),
-                        icon_color=ft.Colors.RED_400,
-                    )
-                )
-                list_item = ft.Container(
-                    on_click=lambda _, m=mecanico: self.view_model.editar_mecanico(
-                        m.id),
-                    border_radius=ft.border_radius.all(AppDimensions.BORDER_RADIUS), ink=True,
-                    padding=ft.padding.symmetric(vertical=8, horizontal=12),
-                    opacity=1.0 if mecanico.ativo else 0.5,
-                    content=ft.Row(
-                        alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
-                        controls=[
-                            ft.Column(
-                                expand=True, spacing=2,
-                                controls=[
-                                    ft.Text(mecanico.nome,
-                                            size=AppFonts.BODY_LARGE),
-                                    ft.Text(f"Especialidade: {mecanico.especialidade or 'N/A'}",
-                                            size=AppFonts.BODY_SMALL, color=ft.Colors.ON_SURFACE_VARIANT),
-                                ]
-                            ),
-                            ft.Row(spacing=0, controls=[
-                                   action_icon, ft.Icon(ft.Icons.CHEVRON_RIGHT)])
-                        ]
-                    )
-                )
-                self._resultados_pesquisa_listview.controls.append(list_item)
-        self.update()
+            self.view_model.solicitar_ativacao(mecanico.id, mecanico.nome)
 
     def mostrar_dialogo_confirmacao(self, mecanico_nome: str, is_activating: bool):
         if self._confirm_dialog not in self.page.overlay:
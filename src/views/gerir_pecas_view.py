@@ -5,9 +5,10 @@
 # =================================================================================
 import flet as ft
 from src.viewmodels.gerir_pecas_viewmodel import GerirPecasViewModel
-from src.models.models import Peca
+from src.models.models import PecaResumo
 from typing import List
 from src.styles.style import AppDimensions, AppFonts
+from src.views.lista_virtualizada import AcoesLinha, ConteudoLinha, ListaVirtualizada
 import logging
 
 logger = logging.getLogger(__name__)
@@ -29,11 +30,24 @@ class GerirPecasView(ft.Column):
             label="Pesquisar por Nome, Referência ou Fabricante",
             on_submit=lambda e: self.view_model.pesquisar_peca(
                 self._campo_pesquisa.value),
+            on_change=lambda e: self.view_model.pesquisar_enquanto_digita(
+                e.control.value),
             prefix_icon=ft.Icons.SEARCH,
             border_radius=ft.border_radius.all(AppDimensions.BORDER_RADIUS)
         )
-        self._resultados_pesquisa_listview = ft.ListView(
-            expand=True, spacing=10)
+        # A lista é carregada em páginas: ao rolar perto do fim, a próxima é anexada.
+        # As linhas são reaproveitadas entre buscas (ver lista_virtualizada.py).
+        self._resultados_pesquisa_listview = ListaVirtualizada(
+            descrever=self._descrever_item,
+            chave=lambda p: p.id,
+            acoes=AcoesLinha(
+                icone_reativar=ft.Icons.RESTORE_FROM_TRASH, tooltip_reativar="Reativar Peça",
+                icone_desativar=ft.Icons.DELETE_FOREVER, tooltip_desativar="Desativar Peça"),
+            ao_clicar=lambda p: self.view_model.editar_peca(p.id),
+            ao_acionar=self._ao_acionar_item,
+            texto_vazio="Nenhuma peça encontrada.",
+            expand=True, spacing=10,
+            on_scroll_interval=100, on_scroll=self._ao_rolar_lista)
 
         self._confirm_dialog = ft.AlertDialog(
             modal=True, title=ft.Text("Confirmar Ação"), content=ft.Text(),
@@ -53,56 +67,40 @@ class GerirPecasView(ft.Column):
         logger.info("GerirPecasView foi montada. Carregando peças...")
         self.view_model.carregar_pecas_iniciais()
 
-    def atualizar_lista_resultados(self, pecas: List[Peca]):
+    def atualizar_lista_resultados(self, pecas: List[PecaResumo]):
         """Atualiza a ListView com os resultados da busca."""
         logger.debug(f"View: Atualizando a lista com {len(pecas)} peças.")
-        self._resultados_pesquisa_listview.controls.clear()
-
-        if not pecas:
-            self._resultados_pesquisa_listview.controls.append(
-                ft.Text("Nenhuma peça encontrada."))
+        self._resultados_pesquisa_listview.definir_itens(pecas)
+
+    def anexar_resultados(self, pecas: List[PecaResumo]):
+        """Acrescenta ao fim da lista a próxima página de resultados."""
+        self._resultados_pesquisa_listview.anexar_itens(pecas)
+
+    def atualizar_status_item(self, peca_id: int, ativo: bool):
+        """Redesenha só a linha do registro após ativá-lo ou desativá-lo (mantém filtro e rolagem)."""
+        peca = self._resultados_pesquisa_listview.obter_item(peca_id)
+        if peca is not None:
+            peca.ativo = ativo
+            self._resultados_pesquisa_listview.atualizar_item(peca)
+
+    def _ao_rolar_lista(self, e: ft.OnScrollEvent):
+        """Pede a próxima página quando a rolagem chega perto do fim da lista."""
+        if e.pixels >= e.max_scroll_extent - 200:
+            self.view_model.carregar_proxima_pagina()
+
+    def _descrever_item(self, peca: PecaResumo) -> ConteudoLinha:
+        """Define o texto e o estado exibidos na linha de um registro."""
+        return ConteudoLinha(
+            titulo=f"{peca.nome} (Ref: {peca.referencia})",
+            subtitulo=f"Estoque: {peca.quantidade_em_estoque} | Venda: R$ {peca.preco_venda:.2f}",
+            ativo=bool(peca.ativo))
+
+    def _ao_acionar_item(self, peca: PecaResumo):
+        """Botão da linha: desativa registros ativos e reativa os inativos."""
+        if peca.ativo:
+            self.view_model.solicitar_desativacao(peca.id, peca.nome)
         else:
-            for peca in pecas:
-                action_icon = (
-                    ft.IconButton(
-                        icon=ft.Icons.RESTORE_FROM_TRASH, tooltip="Reativar Peça",
-                        on_click=lambda e, p=peca: self.view_model.solicitar_ativacao(
-                            p.id, p.nome),
-                        icon_color=ft.Colors.GREEN_400,
-                    ) if not peca.ativo else ft.IconButton(
-                        icon=ft.Icons.DELETE_FOREVER, tooltip="Desativar Peça",
-                        on_click=lambda e, p=peca: self.view_model.solicitar_desativacao(
-                            p.id, p.nome),
-                        icon_color=ft.Colors.RED_400,
-                    )
-                )
-
-                list_item = ft.Container(
-                    on_click=lambda _, p=peca: self.view_model.editar_peca(
-                        p.id),
-                    border_radius=ft.border_radius.all(
-                        AppDimensions.BORDER_RADIUS),
-                    ink=True, padding=ft.padding.symmetric(vertical=8, horizontal=12),
-                    opacity=1.0 if peca.ativo else 0.5,
-                    content=ft.Row(
-                        alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
-                        controls=[
-                            ft.Column(
-                                expand=True, spacing=2,
-                                controls=[
-                                    ft.Text(
-                                        f"{peca.nome} (Ref: {peca.referencia})", size=AppFonts.BODY_LARGE),
-                                    ft.Text(f"Estoque: {peca.quantidade_em_estoque} | Venda: R$ {peca.preco_venda:.2f}",
-                                            size=AppFonts.BODY_SMALL, color=ft.Colors.ON_SURFACE_VARIANT),
-                                ]
-                            ),
-                            ft.Row(spacing=0, controls=[
-                                   action_icon, ft.Icon(ft.Icons.CHEVRON_RIGHT)])
-                        ]
-                    )
-                )
-                self._resultados_pesquisa_listview.controls.append(list_item)
-        self.update()
+            self.view_model.solicitar_ativacao(peca.id, peca.nome)
 
     def mostrar_dialogo_confirmacao(self, peca_info: str, is_activating: bool):
         """Exibe um diálogo de confirmação usando a overlay."""
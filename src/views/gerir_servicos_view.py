@@ -5,9 +5,10 @@ from typing import List
 import logging
 import flet as ft
 from src.viewmodels.gerir_servicos_viewmodel import GerirServicosViewModel
-from src.models.models import Servico
+from src.models.models import ServicoResumo
 
 from src.styles.style import AppDimensions, AppFonts
+from src.views.lista_virtualizada import AcoesLinha, ConteudoLinha, ListaVirtualizada
 
 
 logger = logging.getLogger(__name__)
@@ -25,11 +26,24 @@ class GerirServicosView(ft.Column):
             label="Pesquisar por Nome ou Descrição",
             on_submit=lambda e: self.view_model.pesquisar_servico(
                 self._campo_pesquisa.value),
+            on_change=lambda e: self.view_model.pesquisar_enquanto_digita(
+                e.control.value),
             prefix_icon=ft.Icons.SEARCH,
             border_radius=ft.border_radius.all(AppDimensions.BORDER_RADIUS)
         )
-        self._resultados_pesquisa_listview = ft.ListView(
-            expand=True, spacing=10)
+        # A lista é carregada em páginas: ao rolar perto do fim, a próxima é anexada.
+        # As linhas são reaproveitadas entre buscas (ver lista_virtualizada.py).
+        self._resultados_pesquisa_listview = ListaVirtualizada(
+            descrever=self._descrever_item,
+            chave=lambda s: s.id,
+            acoes=AcoesLinha(
+                icone_reativar=ft.Icons.RESTORE, tooltip_reativar="Reativar Serviço",
+                icone_desativar=ft.Icons.DELETE_OUTLINE, tooltip_desativar="Desativar Serviço"),
+            ao_clicar=lambda s: self.view_model.editar_servico(s.id),
+            ao_acionar=self._ao_acionar_item,
+            texto_vazio="Nenhum serviço encontrado.",
+            expand=True, spacing=10,
+            on_scroll_interval=100, on_scroll=self._ao_rolar_lista)
         self._confirm_dialog = ft.AlertDialog(
             modal=True, title=ft.Text("Confirmar Ação"), content=ft.Text(),
             actions=[ft.TextButton(
@@ -43,51 +57,38 @@ class GerirServicosView(ft.Column):
     def did_mount(self):
         self.view_model.carregar_servicos_iniciais()
 
-    def atualizar_lista_resultados(self, servicos: List[Servico]):
-        self._resultados_pesquisa_listview.controls.clear()
-        if not servicos:
-            self._resultados_pesquisa_listview.controls.append(
-                ft.Text("Nenhum serviço encontrado."))
+    def atualizar_lista_resultados(self, servicos: List[ServicoResumo]):
+        self._resultados_pesquisa_listview.definir_itens(servicos)
+
+    def anexar_resultados(self, servicos: List[ServicoResumo]):
+        """Acrescenta ao fim da lista a próxima página de resultados."""
+        self._resultados_pesquisa_listview.anexar_itens(servicos)
+
+    def atualizar_status_item(self, servico_id: int, ativo: bool):
+        """Redesenha só a linha do registro após ativá-lo ou desativá-lo (mantém filtro e rolagem)."""
+        servico = self._resultados_pesquisa_listview.obter_item(servico_id)
+        if servico is not None:
+            servico.ativo = ativo
+            self._resultados_pesquisa_listview.atualizar_item(servico)
+
+    def _ao_rolar_lista(self, e: ft.OnScrollEvent):
+        """Pede a próxima página quando a rolagem chega perto do fim da lista."""
+        if e.pixels >= e.max_scroll_extent - 200:
+            self.view_model.carregar_proxima_pagina()
+
+    def _descrever_item(self, servico: ServicoResumo) -> ConteudoLinha:
+        """Define o texto e o estado exibidos na linha de um registro."""
+        return ConteudoLinha(
+            titulo=servico.nome,
+            subtitulo=f"Valor: R$ {servico.valor:.2f}",
+            ativo=bool(servico.ativo))
+
+    def _ao_acionar_item(self, servico: ServicoResumo):
+        """Botão da linha: desativa registros ativos e reativa os inativos."""
+        if servico.ativo:
+            self.view_model.solicitar_desativacao(servico.id, servico.nome)
         else:
-            for servico in servicos:
-                action_icon = (
-                    ft.IconButton(
-                        icon=ft.Icons.RESTORE, tooltip="Reativar Serviço",
-                        on_click=lambda e, s=servico: self.view_model.solicitar_ativacao(
-                            s.id, s.nome),
-                        icon_color=ft.Colors.GREEN_400,
-                    ) if not servico.ativo else ft.IconButton(
-                        icon=ft.Icons.DELETE_OUTLINE, tooltip="Desativar Serviço",
-                        on_click=lambda e, s=servico: self.view_model.solicitar_desativacao(
-                            s.id, s.nome),
-                        icon_color=ft.Colors.RED_400,
-                    )
-                )
-                list_item = ft.Container(
-                    on_click=lambda _, s=servico: self.view_model.editar_servico(
-                        s.id),
-                    border_radius=ft.border_radius.all(AppDimensions.BORDER_RADIUS), ink=True,
-                    padding=ft.padding.symmetric(vertical=8, horizontal=12),
-                    opacity=1.0 if servico.ativo else 0.5,
-                    content=ft.Row(
-                        alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
-                        controls=[
-                            ft.Column(
-                                expand=True, spacing=2,
-                                controls=[
-                                    ft.Text(servico.nome,
-                                            size=AppFonts.BODY_LARGE),
-                                    ft.Text(
-                                        f"Valor: R$ {servico.valor:.2f}", size=AppFonts.BODY_SMALL, color=ft.Colors.ON_SURFACE_VARIANT),
-                                ]
-                            ),
-                            ft.Row(spacing=0, controls=[
-                                   action_icon, ft.Icon(ft.Icons.CHEVRON_RIGHT)])
-                        ]
-                    )
-                )
-                self._resultados_pesquisa_listview.controls.append(list_item)
-        self.update()
+            self.view_model.solicitar_ativacao(servico.id, servico.nome)
 
     def mostrar_dialogo_confirmacao(self, servico_nome: str, is_activating: bool):
         if self._confirm_dialog not in self.page.overlay:
@@ -0,0 +1,152 @@
+# =================================================================================
+# MÓDULO DA VIEW DO KARDEX (kardex_view.py)
+#
+# OBJETIVO: Exibir o histórico de movimentações de uma peça (kardex), com o
+#           saldo acumulado em cada linha. As linhas são carregadas em páginas
+#           conforme o usuário rola a lista.
+# =================================================================================
+import flet as ft
+import logging
+from typing import Any, Dict, List
+
+from src.models.models import PecaResumo
+from src.styles.style import AppDimensions, AppFonts
+from src.viewmodels.kardex_viewmodel import KardexViewModel
+
+logger = logging.getLogger(__name__)
+
+
+class KardexView(ft.Column):
+    """
+    A View da tela de Kardex de peças.
+    """
+
+    def __init__(self, page: ft.Page):
+        super().__init__()
+        self.page = page
+        self.view_model = KardexViewModel(page)
+        self.view_model.vincular_view(self)
+        self.on_mount = self.did_mount
+
+        # --- Layout ---
+        self.alignment = ft.MainAxisAlignment.START
+        self.horizontal_alignment = ft.CrossAxisAlignment.CENTER
+        self.spacing = 15
+        self.expand = True
+
+        # --- Filtros ---
+        self._peca_dropdown = ft.Dropdown(
+            label="Selecione a Peça*",
+            width=AppDimensions.FIELD_WIDTH,
+            border_radius=AppDimensions.BORDER_RADIUS,
+        )
+        self._data_inicio_field = ft.TextField(
+            label="Data Início (AAAA-MM-DD)",
+            width=200,
+            border_radius=AppDimensions.BORDER_RADIUS,
+        )
+        self._data_fim_field = ft.TextField(
+            label="Data Fim (AAAA-MM-DD)",
+            width=200,
+            border_radius=AppDimensions.BORDER_RADIUS,
+        )
+        self._consultar_button = ft.ElevatedButton(
+            "Consultar",
+            icon=ft.Icons.SEARCH,
+            on_click=lambda _: self.view_model.consultar(
+                self._peca_dropdown.value, self._data_inicio_field.value, self._data_fim_field.value),
+        )
+
+        # --- Resultado ---
+        self._saldo_anterior_text = ft.Text(size=AppFonts.BODY_MEDIUM)
+        self._lista_movimentacoes = ft.ListView(
+            expand=True, spacing=5, padding=10,
+            on_scroll_interval=100, on_scroll=self._ao_rolar_lista)
+        self._aviso_vazio = ft.Text("Nenhuma movimentação no período.")
+
+        # --- Estrutura da View ---
+        self.controls = [
+            ft.Text("Kardex de Peças", size=AppFonts.TITLE_MEDIUM, weight=ft.FontWeight.BOLD),
+            ft.Row(
+                [self._peca_dropdown, self._data_inicio_field, self._data_fim_field, self._consultar_button],
+                alignment=ft.MainAxisAlignment.CENTER, wrap=True, spacing=10,
+            ),
+            ft.Divider(),
+            self._saldo_anterior_text,
+            ft.Container(
+                content=self._lista_movimentacoes,
+                border=ft.border.all(1, ft.Colors.OUTLINE),
+                border_radius=ft.border_radius.all(AppDimensions.BORDER_RADIUS),
+                padding=5,
+                expand=True,
+            ),
+        ]
+
+    def did_mount(self):
+        logger.debug("View 'Kardex' montada. Carregando peças...")
+        self.view_model.carregar_pecas()
+
+    def _ao_rolar_lista(self, e: ft.OnScrollEvent):
+        """Pede a próxima página quando a rolagem chega perto do fim da lista."""
+        if e.pixels >= e.max_scroll_extent - 200:
+            self.view_model.carregar_proxima_pagina()
+
+    def popular_dropdown_pecas(self, pecas: List[PecaResumo]):
+        """Preenche o seletor com as peças cadastradas."""
+        self._peca_dropdown.options = [
+            ft.dropdown.Option(key=peca.id, text=f"{peca.nome} (Ref: {peca.referencia})")
+            for peca in pecas
+        ]
+        self.update()
+
+    def exibir_kardex(self, saldo_anterior: int, movimentacoes: List[Dict[str, Any]]):
+        """Substitui a lista pelo resultado de uma nova consulta."""
+        self._saldo_anterior_text.value = f"Saldo anterior ao período: {saldo_anterior}"
+        self._lista_movimentacoes.controls = (
+            [self._criar_linha(m) for m in movimentacoes] or [self._aviso_vazio])
+        self.update()
+
+    def anexar_movimentacoes(self, movimentacoes: List[Dict[str, Any]]):
+        """Acrescenta uma nova página ao final da lista."""
+        self._lista_movimentacoes.controls.extend(self._criar_linha(m) for m in movimentacoes)
+        self._lista_movimentacoes.update()
+
+    def _criar_linha(self, movimentacao: Dict[str, Any]) -> ft.ListTile:
+        entrada = movimentacao["tipo_movimentacao"] == "entrada"
+        origem = f"OS #{movimentacao['ordem_servico_id']}" if movimentacao["ordem_servico_id"] else (
+            movimentacao["descricao"] or "N/A")
+        return ft.ListTile(
+            leading=ft.Icon(
+                ft.Icons.ARROW_DOWNWARD if entrada else ft.Icons.ARROW_UPWARD,
+                color=ft.Colors.GREEN_400 if entrada else ft.Colors.RED_400),
+            title=ft.Text(
+                f"{movimentacao['data_movimentacao']} - "
+                f"{'Entrada' if entrada else 'Saída'}: {movimentacao['quantidade']}"),
+            subtitle=ft.Text(origem),
+            trailing=ft.Text(f"Saldo: {movimentacao['saldo']}", weight=ft.FontWeight.BOLD),
+        )
+
+    def mostrar_feedback(self, mensagem: str, sucesso: bool):
+        """Exibe uma SnackBar com a mensagem de validação."""
+        self.page.snack_bar = ft.SnackBar(
+            content=ft.Text(mensagem),
+            bgcolor=self.page.theme.color_scheme.primary if sucesso else self.page.theme.color_scheme.error
+        )
+        self.page.snack_bar.open = True
+        self.page.update()
+
+
+def KardexViewFactory(page: ft.Page) -> ft.View:
+    """Cria a View completa do Kardex para o roteador."""
+    return ft.View(
+        route="/kardex",
+        appbar=ft.AppBar(
+            title=ft.Text("Kardex de Peças"), center_title=True,
+            bgcolor=page.theme.color_scheme.surface,
+            leading=ft.IconButton(icon=ft.Icons.ARROW_BACK_IOS_NEW, on_click=lambda _: page.go(
+                "/dashboard"), tooltip="Voltar ao Dashboard")
+        ),
+        controls=[ft.SafeArea(content=ft.Container(content=KardexView(
+            page), alignment=ft.alignment.center, expand=True, padding=AppDimensions.PAGE_PADDING), expand=True)],
+        padding=0
+    )
@@ -0,0 +1,218 @@
+# =================================================================================
+# MÓDULO DA LISTA DE RESULTADOS REAPROVEITÁVEL (lista_virtualizada.py)
+#
+# OBJETIVO: Componente de lista usado pelas telas de gestão (gerir_*) que
+#           reaproveita os controles das linhas entre uma busca e outra.
+#
+# COMO FUNCIONA:
+#   - Cada linha (`LinhaResultado`) é criada uma única vez e depois apenas tem
+#     suas propriedades (textos, ícone, opacidade) alteradas.
+#   - As linhas em uso ficam associadas à chave do item (id da entidade). Ao
+#     receber uma nova lista, o item que já estava na tela continua na MESMA
+#     linha, só mudando de posição; ela só é preenchida de novo se o conteúdo
+#     exibido mudou. Itens novos ocupam linhas livres. Assim, um item incluído
+#     ou removido no topo não reescreve as linhas seguintes: o Flet envia ao
+#     cliente só a linha nova e a mudança de ordem.
+#   - Linhas que deixam de ser usadas ficam ocultas no fim da lista e voltam a
+#     ser usadas na próxima busca, até o limite de `tamanho_pool`; as
+#     excedentes são descartadas.
+#   - `atualizar_item()` redesenha só a linha de um item (ex.: após ativar ou
+#     desativar o registro), sem refazer a busca nem perder a rolagem.
+# =================================================================================
+import flet as ft
+import logging
+from typing import Any, Callable, Dict, Hashable, List, NamedTuple, Optional
+
+from src.styles.style import AppDimensions, AppFonts
+
+logger = logging.getLogger(__name__)
+
+# Quantidade de linhas ocultas mantidas para reaproveitamento (duas páginas
+# da paginação padrão das buscas).
+TAMANHO_POOL_PADRAO = 100
+
+
+class ConteudoLinha(NamedTuple):
+    """O que uma linha exibe. Também serve de assinatura para detectar mudanças."""
+    titulo: str
+    subtitulo: str
+    ativo: bool
+
+
+class AcoesLinha(NamedTuple):
+    """Ícones e dicas do botão de ação, conforme o item esteja inativo ou ativo."""
+    icone_reativar: str
+    tooltip_reativar: str
+    icone_desativar: str
+    tooltip_desativar: str
+
+
+class LinhaResultado(ft.Container):
+    """
+    Linha da lista: título, subtítulo, botão de ativar/desativar e seta de edição.
+    O item exibido fica em `self.data`, lido pelos eventos no momento do clique.
+    """
+
+    def __init__(self, acoes: AcoesLinha, ao_clicar: Callable[[Any], None], ao_acionar: Callable[[Any], None]):
+        self._acoes = acoes
+        # O que a linha exibe no momento (None enquanto está livre).
+        self.conteudo: Optional[ConteudoLinha] = None
+        self._titulo = ft.Text(size=AppFonts.BODY_LARGE)
+        self._subtitulo = ft.Text(
+            size=AppFonts.BODY_SMALL, color=ft.Colors.ON_SURFACE_VARIANT)
+        self._botao_acao = ft.IconButton(
+            on_click=lambda e: ao_acionar(self.data))
+        super().__init__(
+            on_click=lambda e: ao_clicar(self.data),
+            border_radius=ft.border_radius.all(AppDimensions.BORDER_RADIUS),
+            ink=True,
+            padding=ft.padding.symmetric(vertical=8, horizontal=12),
+            content=ft.Row(
+                alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
+                controls=[
+                    ft.Column(expand=True, spacing=2, controls=[
+                              self._titulo, self._subtitulo]),
+                    ft.Row(spacing=0, controls=[
+                           self._botao_acao, ft.Icon(ft.Icons.CHEVRON_RIGHT)])
+                ]
+            )
+        )
+
+    def preencher(self, item: Any, conteudo: ConteudoLinha):
+        """Altera apenas as propriedades da linha para exibir outro item."""
+        self.data = item
+        self.conteudo = conteudo
+        self.visible = True
+        self._titulo.value = conteudo.titulo
+        self._subtitulo.value = conteudo.subtitulo
+        # Itens inativos ficam com opacidade menor e o botão passa a reativar.
+        self.opacity = 1.0 if conteudo.ativo else 0.5
+        if conteudo.ativo:
+            self._botao_acao.icon = self._acoes.icone_desativar
+            self._botao_acao.tooltip = self._acoes.tooltip_desativar
+            self._botao_acao.icon_color = ft.Colors.RED_400
+        else:
+            self._botao_acao.icon = self._acoes.icone_reativar
+            self._botao_acao.tooltip = self._acoes.tooltip_reativar
+            self._botao_acao.icon_color = ft.Colors.GREEN_400
+
+
+class ListaVirtualizada(ft.ListView):
+    """
+    ListView de resultados que reaproveita as linhas e só altera as que mudaram.
+
+    :param descrever: Converte um item no `ConteudoLinha` exibido.
+    :param chave: Retorna o identificador único do item (normalmente o id).
+    :param acoes: Ícones e dicas do botão de ação.
+    :param ao_clicar: Chamado com o item quando a linha é clicada.
+    :param ao_acionar: Chamado com o item quando o botão de ação é clicado.
+    :param texto_vazio: Mensagem exibida quando não há resultados.
+    :param tamanho_pool: Máximo de linhas mantidas além das visíveis.
+    Os demais argumentos são repassados para `ft.ListView`.
+    """
+
+    def __init__(
+        self,
+        descrever: Callable[[Any], ConteudoLinha],
+        chave: Callable[[Any], Hashable],
+        acoes: AcoesLinha,
+        ao_clicar: Callable[[Any], None],
+        ao_acionar: Callable[[Any], None],
+        texto_vazio: str,
+        tamanho_pool: int = TAMANHO_POOL_PADRAO,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self._descrever = descrever
+        self._chave = chave
+        self._acoes = acoes
+        self._ao_clicar = ao_clicar
+        self._ao_acionar = ao_acionar
+        self._tamanho_pool = tamanho_pool
+        self._aviso_vazio = ft.Text(texto_vazio, visible=False)
+        # Linhas visíveis, na ordem exibida, e a linha de cada chave.
+        self._em_uso: List[LinhaResultado] = []
+        self._linha_por_chave: Dict[Hashable, LinhaResultado] = {}
+        # Linhas ocultas, prontas para reaproveitamento.
+        self._livres: List[LinhaResultado] = []
+        self.controls = [self._aviso_vazio]
+
+    def definir_itens(self, itens: List[Any]):
+        """Substitui o conteúdo da lista, alterando apenas as linhas que mudaram."""
+        anteriores, self._linha_por_chave = self._linha_por_chave, {}
+        self._em_uso = []
+        alteradas = self._exibir_no_fim(itens, anteriores)
+
+        # Linhas de itens que saíram da lista: ocultas e devolvidas ao pool.
+        for linha in anteriores.values():
+            linha.visible = False
+            linha.conteudo = None
+            linha.data = None
+            self._livres.append(linha)
+            alteradas += 1
+        excedentes = len(self._livres) - max(0, self._tamanho_pool - len(itens))
+        if excedentes > 0:
+            del self._livres[-excedentes:]
+
+        self._ordenar_controles()
+        logger.debug(
+            f"Lista: {len(itens)} itens exibidos, {alteradas} linha(s) alterada(s).")
+        self.update()
+
+    def anexar_itens(self, itens: List[Any]):
+        """Acrescenta itens ao fim da lista (próxima página de uma busca)."""
+        if not itens:
+            return
+        self._exibir_no_fim(itens, {})
+        self._ordenar_controles()
+        self.update()
+
+    def obter_item(self, chave: Hashable) -> Optional[Any]:
+        """Retorna o item exibido com esta chave, ou None se não estiver na lista."""
+        linha = self._linha_por_chave.get(chave)
+        return linha.data if linha is not None else None
+
+    def atualizar_item(self, item: Any) -> bool:
+        """
+        Atualiza somente a linha que exibe o item com a mesma chave.
+        :return: False se o item não estiver na lista.
+        """
+        linha = self._linha_por_chave.get(self._chave(item))
+        if linha is None:
+            return False
+        if self._preencher(linha, item):
+            linha.update()
+        return True
+
+    def _exibir_no_fim(self, itens: List[Any], anteriores: Dict[Hashable, LinhaResultado]) -> int:
+        """
+        Acrescenta `itens` às linhas em uso, reaproveitando a linha que já
+        exibia a mesma chave em `anteriores`. Retorna quantas linhas mudaram.
+        """
+        alteradas = 0
+        for item in itens:
+            chave = self._chave(item)
+            linha = anteriores.pop(chave, None)
+            if linha is None:
+                linha = self._livres.pop() if self._livres else LinhaResultado(
+                    self._acoes, self._ao_clicar, self._ao_acionar)
+            if self._preencher(linha, item):
+                alteradas += 1
+            self._linha_por_chave[chave] = linha
+            self._em_uso.append(linha)
+        return alteradas
+
+    def _preencher(self, linha: LinhaResultado, item: Any) -> bool:
+        """Exibe o item na linha; retorna False se o conteúdo já era o mesmo."""
+        conteudo = self._descrever(item)
+        if linha.conteudo == conteudo:
+            # Mesmo conteúdo: só troca a referência usada pelos eventos.
+            linha.data = item
+            return False
+        linha.preencher(item, conteudo)
+        return True
+
+    def _ordenar_controles(self):
+        # As linhas mantêm a identidade; o Flet envia só as novas e a nova ordem.
+        self._aviso_vazio.visible = not self._em_uso
+        self.controls = [self._aviso_vazio, *self._em_uso, *self._livres]
@@ -8,8 +8,8 @@
 # =================================================================================
 import flet as ft
 import logging
-from typing import List
-from src.models.models import Cliente, Carro, Peca
+from typing import Dict, List
+from src.models.models import ClienteResumo, Carro, PecaResumo
 from src.viewmodels.os_formulario_viewmodel import OrdemServicoFormularioViewModel
 # --- Importa os estilos ---
 from src.styles.style import AppFonts, AppDimensions
@@ -39,6 +39,8 @@ class OrdemServicoFormularioView:
         self._adicionar_peca_button = ft.ElevatedButton(
             "Adicionar Peça", icon=ft.Icons.ADD, on_click=self._on_adicionar_peca)
         self._pecas_list_view = ft.ListView(expand=True, spacing=10)
+        # Linha exibida para cada peça da OS, para redesenhar só a que mudou.
+        self._linhas_pecas: Dict[int, ft.Row] = {}
         self._valor_total_text = ft.Text(
             "Valor Total: R$ 0.00", size=AppFonts.BODY_LARGE, weight=ft.FontWeight.BOLD)
 
@@ -88,7 +90,7 @@ class OrdemServicoFormularioView:
         self._dlg.open = False
         self.page.update()
 
-    def popular_dropdowns_iniciais(self, clientes: List[Cliente], pecas: List[Peca]):
+    def popular_dropdowns_iniciais(self, clientes: List[ClienteResumo], pecas: List[PecaResumo]):
         """Preenche os dropdowns de clientes e peças com dados do ViewModel."""
         self._cliente_dropdown.options = [ft.dropdown.Option(
             key=cliente.id, text=cliente.nome) for cliente in clientes]
@@ -105,34 +107,64 @@ class OrdemServicoFormularioView:
         self.page.update()
 
     def atualizar_visualizacao_pecas(self, pecas_selecionadas: List[dict]):
-        """Atualiza a lista de peças adicionadas à OS."""
+        """Redesenha a lista inteira de peças adicionadas à OS."""
         self._pecas_list_view.controls.clear()
-        for index, item in enumerate(pecas_selecionadas):
-            peca = item["peca_obj"]
-            self._pecas_list_view.controls.append(
-                ft.Row(controls=[
-                    ft.Text(
-                        f"{item['quantidade']}x {peca.nome} (R$ {item['valor_unitario']:.2f})", expand=True),
-                    ft.Text(f"Total: R$ {item['valor_total']:.2f}"),
-                    ft.IconButton(
-                        icon=ft.Icons.DELETE_OUTLINE,
-                        tooltip="Remover Peça",
-                        on_click=lambda _, idx=index: self.view_model.remover_peca_da_lista(
-                            idx)
-                    )
-                ])
-            )
+        self._linhas_pecas.clear()
+        for item in pecas_selecionadas:
+            linha = self._criar_linha_peca(item)
+            self._linhas_pecas[item['peca_id']] = linha
+            self._pecas_list_view.controls.append(linha)
         self.page.update()
 
-    def atualizar_valor_total(self, pecas_selecionadas: List[dict]):
-        """Calcula e exibe o valor total da OS."""
-        total_pecas = sum(item['valor_total'] for item in pecas_selecionadas)
+    def exibir_peca_selecionada(self, item: dict):
+        """Inclui a linha da peça na lista ou atualiza a linha já existente."""
+        linha = self._linhas_pecas.get(item['peca_id'])
+        if linha is not None:
+            descricao, total = self._textos_linha_peca(item)
+            linha.controls[0].value = descricao
+            linha.controls[1].value = total
+            linha.update()
+            return
+        linha = self._criar_linha_peca(item)
+        self._linhas_pecas[item['peca_id']] = linha
+        self._pecas_list_view.controls.append(linha)
+        self._pecas_list_view.update()
+
+    def remover_peca_selecionada(self, peca_id: int):
+        """Remove da lista apenas a linha da peça informada."""
+        linha = self._linhas_pecas.pop(peca_id, None)
+        if linha is not None:
+            self._pecas_list_view.controls.remove(linha)
+            self._pecas_list_view.update()
+
+    def _textos_linha_peca(self, item: dict):
+        peca = item["peca_obj"]
+        return (
+            f"{item['quantidade']}x {peca.nome} (R$ {item['valor_unitario']:.2f})",
+            f"Total: R$ {item['valor_total']:.2f}",
+        )
+
+    def _criar_linha_peca(self, item: dict) -> ft.Row:
+        descricao, total = self._textos_linha_peca(item)
+        return ft.Row(controls=[
+            ft.Text(descricao, expand=True),
+            ft.Text(total),
+            ft.IconButton(
+                icon=ft.Icons.DELETE_OUTLINE,
+                tooltip="Remover Peça",
+                on_click=lambda _, pid=item['peca_id']: self.view_model.remover_peca_da_lista(
+                    pid)
+            )
+        ])
+
+    def atualizar_valor_total(self, total_pecas: float):
+        """Exibe o valor total da OS (peças + mão de obra)."""
         try:
             mao_de_obra = float(self._mao_de_obra_field.value or 0)
         except (ValueError, TypeError):
             mao_de_obra = 0.0
         self._valor_total_text.value = f"Valor Total: R$ {total_pecas + mao_de_obra:.2f}"
-        self.page.update()
+        self._valor_total_text.update()
 
     def mostrar_feedback(self, mensagem: str, sucesso: bool):
         """Exibe uma SnackBar para feedback ao usuário."""
@@ -159,7 +191,7 @@ class OrdemServicoFormularioView:
 
     def _on_valor_alterado(self, e):
         """Callback para quando o valor da mão de obra é alterado."""
-        self.view_model._atualizar_view()
+        self.view_model.recalcular_valor_total()
 
     def _on_processar_criacao_os(self, e):
         """Callback para o botão de criar a OS."""
@@ -177,4 +209,5 @@ class OrdemServicoFormularioView:
         self._quantidade_field.value = "1"
         self._mao_de_obra_field.value = "0.0"
         self._pecas_list_view.controls.clear()
+        self._linhas_pecas.clear()
         self._valor_total_text.value = "Valor Total: R$ 0.00"
@@ -0,0 +1,138 @@
+# =================================================================================
+# MÓDULO DA VIEW DO PERFIL DE CONSULTAS (perfil_consultas_view.py)
+#
+# OBJETIVO: Tela administrativa do perfilador de consultas SQL: estatísticas
+#           por comando (tempo, linhas, histograma de latência) e o log de
+#           consultas lentas com o plano de execução.
+# =================================================================================
+import flet as ft
+import logging
+from typing import Any, Dict, List
+
+from src.styles.style import AppDimensions, AppFonts
+from src.viewmodels.perfil_consultas_viewmodel import PerfilConsultasViewModel
+
+logger = logging.getLogger(__name__)
+
+
+class PerfilConsultasView(ft.Column):
+    """
+    A View da tela de Perfil de Consultas.
+    """
+
+    def __init__(self, page: ft.Page):
+        super().__init__()
+        self.page = page
+        self.view_model = PerfilConsultasViewModel(page)
+        self.view_model.vincular_view(self)
+        self.on_mount = self.did_mount
+
+        # --- Layout ---
+        self.alignment = ft.MainAxisAlignment.START
+        self.horizontal_alignment = ft.CrossAxisAlignment.CENTER
+        self.spacing = 15
+        self.expand = True
+
+        # --- Controles ---
+        self._ativo_switch = ft.Switch(
+            label="Perfilador ligado",
+            on_change=lambda e: self.view_model.alternar(e.control.value, self._limiar_field.value),
+        )
+        self._limiar_field = ft.TextField(
+            label="Consulta lenta a partir de (ms)",
+            width=220,
+            border_radius=AppDimensions.BORDER_RADIUS,
+            keyboard_type=ft.KeyboardType.NUMBER,
+        )
+        botoes = [
+            ft.ElevatedButton("Atualizar", icon=ft.Icons.REFRESH, on_click=lambda _: self.view_model.atualizar()),
+            ft.ElevatedButton("Exportar JSON", icon=ft.Icons.DOWNLOAD, on_click=lambda _: self.view_model.exportar()),
+            ft.OutlinedButton("Limpar", icon=ft.Icons.DELETE_SWEEP_OUTLINED, on_click=lambda _: self.view_model.limpar()),
+        ]
+
+        # --- Resultado ---
+        self._lista_comandos = ft.ListView(expand=True, spacing=5, padding=10)
+        self._lista_lentas = ft.ListView(expand=True, spacing=5, padding=10)
+
+        # --- Estrutura da View ---
+        self.controls = [
+            ft.Text("Perfil de Consultas", size=AppFonts.TITLE_MEDIUM, weight=ft.FontWeight.BOLD),
+            ft.Row([self._ativo_switch, self._limiar_field, *botoes],
+                   alignment=ft.MainAxisAlignment.CENTER, wrap=True, spacing=10),
+            ft.Divider(),
+            ft.Tabs(
+                expand=True,
+                tabs=[
+                    ft.Tab(text="Comandos (maior tempo total)", content=self._lista_comandos),
+                    ft.Tab(text="Consultas lentas", content=self._lista_lentas),
+                ],
+            ),
+        ]
+
+    def did_mount(self):
+        logger.debug("View 'Perfil de Consultas' montada. Lendo medições...")
+        self.view_model.atualizar()
+
+    def exibir_estado(self, ativo: bool, limiar_ms: float):
+        """Sincroniza o interruptor e o limiar com o estado do perfilador."""
+        self._ativo_switch.value = ativo
+        self._limiar_field.value = f"{limiar_ms:g}"
+        self.update()
+
+    def exibir_consultas(self, comandos: List[Dict[str, Any]], lentas: List[Dict[str, Any]]):
+        """Substitui as duas listas pelas medições atuais."""
+        self._lista_comandos.controls = (
+            [self._criar_linha_comando(c) for c in comandos]
+            or [ft.Text("Nenhuma medição. Ligue o perfilador e use o sistema.")])
+        self._lista_lentas.controls = (
+            [self._criar_linha_lenta(l) for l in lentas]
+            or [ft.Text("Nenhuma consulta acima do limiar.")])
+        self.update()
+
+    def _criar_linha_comando(self, comando: Dict[str, Any]) -> ft.ListTile:
+        histograma = " | ".join(f"{faixa}: {qtd}" for faixa, qtd in comando["histograma"].items() if qtd)
+        return ft.ListTile(
+            title=ft.Text(comando["sql"], size=AppFonts.BODY_SMALL, max_lines=3,
+                          overflow=ft.TextOverflow.ELLIPSIS, selectable=True),
+            subtitle=ft.Text(
+                f"{comando['execucoes']}x | total {comando['total_ms']:.1f} ms | média {comando['media_ms']:.2f} ms | "
+                f"máx {comando['maximo_ms']:.1f} ms | {comando['linhas']} linha(s)\n{histograma}\n"
+                f"Chamado por: {', '.join(comando['chamadores'])}"),
+        )
+
+    def _criar_linha_lenta(self, consulta: Dict[str, Any]) -> ft.ListTile:
+        return ft.ListTile(
+            leading=ft.Icon(ft.Icons.WARNING_AMBER_OUTLINED, color=ft.Colors.AMBER_400),
+            title=ft.Text(
+                f"{consulta['data_hora']} - {consulta['duracao_ms']:.1f} ms - {consulta['linhas']} linha(s)",
+                weight=ft.FontWeight.BOLD),
+            subtitle=ft.Text(
+                f"{consulta['sql']}\nChamado por: {consulta['chamador']}\n"
+                f"Plano: {' | '.join(consulta['plano']) or 'indisponível'}",
+                selectable=True),
+        )
+
+    def mostrar_feedback(self, mensagem: str, sucesso: bool):
+        """Exibe uma SnackBar com o resultado da ação."""
+        self.page.snack_bar = ft.SnackBar(
+            content=ft.Text(mensagem),
+            bgcolor=self.page.theme.color_scheme.primary if sucesso else self.page.theme.color_scheme.error
+        )
+        self.page.snack_bar.open = True
+        self.page.update()
+
+
+def PerfilConsultasViewFactory(page: ft.Page) -> ft.View:
+    """Cria a View completa do Perfil de Consultas para o roteador."""
+    return ft.View(
+        route="/perfil_consultas",
+        appbar=ft.AppBar(
+            title=ft.Text("Perfil de Consultas"), center_title=True,
+            bgcolor=page.theme.color_scheme.surface,
+            leading=ft.IconButton(icon=ft.Icons.ARROW_BACK_IOS_NEW, on_click=lambda _: page.go(
+                "/dashboard"), tooltip="Voltar ao Dashboard")
+        ),
+        controls=[ft.SafeArea(content=ft.Container(content=PerfilConsultasView(
+            page), alignment=ft.alignment.center, expand=True, padding=AppDimensions.PAGE_PADDING), expand=True)],
+        padding=0
+    )
@@ -0,0 +1,153 @@
+# =================================================================================
+# MÓDULO DO REGISTRO DE ROTAS (registro_rotas.py)
+#
+# OBJETIVO: Resolver a rota da página para a View Factory correspondente sem
+#           importar todas as telas na inicialização.
+#
+# COMO FUNCIONA:
+#   - Cada rota é registrada com o caminho da sua factory em texto
+#     ("src.views.login_view:LoginViewFactory") ou com a própria função. O
+#     módulo da tela (e o do seu ViewModel) só é importado na primeira
+#     navegação para ela.
+#   - Rotas fixas ficam num dicionário. As rotas com parâmetro
+#     ("/editar_cliente/<cliente_id>") são unidas numa única expressão
+#     regular, compilada uma vez: cada navegação faz no máximo um `match`.
+#   - Rotas marcadas com `manter_em_cache` reaproveitam a View já montada na
+#     visita seguinte; os dados são recarregados no `did_mount` de cada tela.
+#   - A tabela de rotas é global (compilada uma vez por processo), mas as
+#     Views guardam a `page` e os ViewModels de uma sessão. Por isso o cache
+#     NÃO fica no registro: cada sessão (cada chamada de `main(page)`) passa o
+#     seu próprio dicionário para `construir()` e o esvazia no logout.
+# =================================================================================
+import flet as ft
+import importlib
+import logging
+import re
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Parâmetro de rota: "<nome>" casa um id numérico e é entregue como int.
+_PARAMETRO = re.compile(r"<(\w+)>")
+
+FabricaView = Callable[..., ft.View]
+
+
+class _Rota:
+    """Uma rota registrada. A factory é importada na primeira chamada de `fabrica()`."""
+
+    __slots__ = ("padrao", "destino", "manter_em_cache", "parametros", "_fabrica")
+
+    def __init__(self, padrao: str, destino: Union[str, FabricaView], manter_em_cache: bool):
+        self.padrao = padrao
+        self.destino = destino
+        self.manter_em_cache = manter_em_cache
+        self.parametros: List[str] = _PARAMETRO.findall(padrao)
+        self._fabrica: Optional[FabricaView] = None if isinstance(destino, str) else destino
+
+    def fabrica(self) -> FabricaView:
+        if self._fabrica is None:
+            modulo, nome = self.destino.split(":")
+            inicio = time.perf_counter()
+            self._fabrica = getattr(importlib.import_module(modulo), nome)
+            logger.debug(f"Tela '{modulo}' importada em {(time.perf_counter() - inicio) * 1000:.1f} ms.")
+        return self._fabrica
+
+
+class RegistroRotas:
+    """
+    Tabela de rotas da aplicação, com importação sob demanda das telas.
+    Pode ser compartilhada entre sessões: não guarda nenhuma View.
+    """
+
+    def __init__(self):
+        self._fixas: Dict[str, _Rota] = {}
+        self._com_parametros: Dict[str, _Rota] = {}
+        self._expressao: Optional[re.Pattern] = None
+
+    def registrar(self, padrao: str, destino: Union[str, FabricaView], manter_em_cache: bool = False):
+        """
+        Registra uma rota.
+
+        :param padrao: A rota, com parâmetros numéricos entre <> (ex.: "/editar_peca/<peca_id>").
+        :param destino: "modulo:Factory" (importado sob demanda) ou a própria factory.
+        :param manter_em_cache: Reaproveita a View montada nas próximas visitas.
+        """
+        rota = _Rota(padrao, destino, manter_em_cache)
+        if rota.parametros:
+            self._com_parametros[f"r{len(self._com_parametros)}"] = rota
+            self._expressao = None
+        else:
+            self._fixas[padrao] = rota
+
+    def _compilar(self) -> re.Pattern:
+        # Cada rota vira um grupo nomeado da alternância; `lastgroup` indica
+        # qual delas casou. Os parâmetros recebem o nome do grupo como prefixo.
+        alternativas = []
+        for grupo, rota in self._com_parametros.items():
+            # split() alterna trechos literais (posições pares) e nomes de parâmetros.
+            partes = _PARAMETRO.split(rota.padrao)
+            corpo = "".join(re.escape(parte) if i % 2 == 0 else f"(?P<{grupo}_{parte}>\\d+)"
+                            for i, parte in enumerate(partes))
+            alternativas.append(f"(?P<{grupo}>{corpo})")
+        return re.compile(f"(?:{'|'.join(alternativas)})$")
+
+    def resolver(self, rota: str) -> Optional[Tuple[_Rota, Dict[str, int]]]:
+        """Retorna a rota registrada e os parâmetros extraídos, ou None se nenhuma casar."""
+        fixa = self._fixas.get(rota)
+        if fixa is not None:
+            return fixa, {}
+        if not self._com_parametros:
+            return None
+        if self._expressao is None:
+            self._expressao = self._compilar()
+        casamento = self._expressao.match(rota)
+        if casamento is None:
+            return None
+        grupo = casamento.lastgroup
+        registrada = self._com_parametros[grupo]
+        return registrada, {nome: int(casamento.group(f"{grupo}_{nome}")) for nome in registrada.parametros}
+
+    def construir(self, page: ft.Page, rota: str, cache: Optional[Dict[str, ft.View]] = None) -> Optional[ft.View]:
+        """
+        Constrói (ou reaproveita do cache) a View da rota.
+
+        :param page: A página da sessão que está navegando.
+        :param rota: A rota solicitada.
+        :param cache: Opcional. Dicionário de Views da MESMA sessão de `page`,
+                      usado para as rotas com `manter_em_cache`.
+        :return: A View, ou None se a rota não existir.
+        """
+        resolvida = self.resolver(rota)
+        if resolvida is None:
+            return None
+        registrada, parametros = resolvida
+        usar_cache = cache is not None and registrada.manter_em_cache
+        if usar_cache:
+            view = cache.get(rota)
+            if view is not None:
+                logger.debug(f"View da rota '{rota}' reaproveitada do cache.")
+                return view
+        view = registrada.fabrica()(page, **parametros)
+        if usar_cache:
+            cache[rota] = view
+        return view
+
+    def precarregar(self, *rotas: str):
+        """
+        Importa, numa thread em segundo plano, as telas das rotas informadas
+        (ex.: o dashboard enquanto o usuário digita a senha no login).
+        """
+        def importar():
+            for rota in rotas:
+                resolvida = self.resolver(rota)
+                if resolvida is None:
+                    continue
+                try:
+                    resolvida[0].fabrica()
+                except Exception as e:
+                    logger.warning(f"Falha ao pré-carregar a tela da rota '{rota}': {e}")
+
+        threading.Thread(target=importar, name="precarregar-telas", daemon=True).start()
@@ -0,0 +1,110 @@
+# =================================================================================
+# TESTES DA BUSCA INCREMENTAL COM PAGINADOR (busca_incremental.py / paginador_busca.py)
+#
+# Executar na raiz do projeto: python -m pytest -q  (ou python -m unittest)
+# =================================================================================
+import threading
+import time
+import unittest
+
+from src.viewmodels.busca_incremental import BuscaIncremental
+from src.viewmodels.paginador_busca import PaginadorBusca
+
+ESPERA_MAXIMA = 5.0
+
+
+class TestBuscaIncrementalComPaginador(unittest.TestCase):
+
+    def setUp(self):
+        self.consultas = []
+        self.lenta_iniciou = threading.Event()
+        self.liberar_lenta = threading.Event()
+        self.paginador = PaginadorBusca(self._buscar, lambda item: item, tamanho_pagina=2)
+        self.entregues = []
+        self.busca = BuscaIncremental(
+            self.paginador.consultar_primeira_pagina,
+            lambda termo, itens: self.entregues.append((termo, itens)),
+            atraso=0,
+            confirmar=self.paginador.aplicar,
+        )
+
+    def _buscar(self, termo, limite, apos=None):
+        self.consultas.append((termo, apos))
+        if termo == "lenta":
+            # Só termina depois que a busca mais recente já foi entregue.
+            self.lenta_iniciou.set()
+            self.liberar_lenta.wait(ESPERA_MAXIMA)
+        return [(f"{termo}-{i}", i) for i in range(1, limite + 1)]
+
+    def _aguardar(self, condicao):
+        limite = time.monotonic() + ESPERA_MAXIMA
+        while not condicao():
+            self.assertLess(time.monotonic(), limite, "A busca não terminou a tempo.")
+            time.sleep(0.01)
+
+    def test_busca_substituida_que_termina_depois_nao_altera_o_paginador(self):
+        self.busca.agendar("lenta")
+        self.assertTrue(self.lenta_iniciou.wait(ESPERA_MAXIMA))
+
+        self.busca.agendar("rapida")
+        self._aguardar(lambda: self.entregues)
+        self.liberar_lenta.set()
+        self._aguardar(lambda: self.busca.executadas == 2)
+
+        self.assertEqual(self.entregues, [("rapida", [("rapida-1", 1), ("rapida-2", 2)])])
+        self.assertEqual(self.busca.descartadas, 1)
+
+        # A próxima página continua do cursor da busca entregue, não da descartada.
+        self.paginador.proxima_pagina()
+        self.assertEqual(self.consultas[-1], ("rapida", ("rapida-2", 2)))
+
+    def test_consultar_primeira_pagina_nao_altera_o_estado(self):
+        self.paginador.primeira_pagina("atual")
+        itens, estado = self.paginador.consultar_primeira_pagina("outra")
+
+        self.assertEqual(estado.termo, "outra")
+        self.paginador.proxima_pagina()
+        self.assertEqual(self.consultas[-1], ("atual", ("atual-2", 2)))
+
+        self.assertEqual(self.paginador.aplicar((itens, estado)), itens)
+        self.paginador.proxima_pagina()
+        self.assertEqual(self.consultas[-1], ("outra", ("outra-2", 2)))
+
+
+class TestEntregaDaBuscaIncremental(unittest.TestCase):
+
+    def test_busca_imediata_nao_e_sobrescrita_por_entrega_antiga(self):
+        exibidos = []
+        entregando = threading.Event()
+        liberar_entrega = threading.Event()
+
+        def ao_concluir(termo, resultados):
+            # A View demora a desenhar o resultado em segundo plano.
+            entregando.set()
+            liberar_entrega.wait(ESPERA_MAXIMA)
+            exibidos.append(termo)
+
+        busca = BuscaIncremental(lambda termo: [termo], ao_concluir, atraso=0)
+        busca.agendar("antigo")
+        self.assertTrue(entregando.wait(ESPERA_MAXIMA))
+
+        def busca_imediata():
+            # Como nos gerir_*: Enter no campo de busca.
+            with busca.entrega:
+                busca.cancelar("novo")
+                exibidos.append("novo")
+
+        thread = threading.Thread(target=busca_imediata)
+        thread.start()
+        time.sleep(0.05)
+        self.assertEqual(exibidos, [])  # a busca imediata espera a entrega em andamento
+        liberar_entrega.set()
+        thread.join(ESPERA_MAXIMA)
+
+        # O termo mais recente é o último exibido.
+        self.assertEqual(exibidos, ["antigo", "novo"])
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+# =================================================================================
+# TESTES DA VALIDAÇÃO DO LOTE DE ENTRADA DE ESTOQUE (queries.py)
+#
+# Executar na raiz do projeto: python -m pytest -q  (ou python -m unittest)
+# =================================================================================
+import sqlite3
+import unittest
+
+from src.database.database import CREATE_TABLES_SQL
+from src.database.queries import _validar_lote_entrada
+
+
+class TestValidarLoteEntrada(unittest.TestCase):
+
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        self.addCleanup(self.conn.close)
+        self.cursor = self.conn.cursor()
+        for sql in CREATE_TABLES_SQL:
+            self.cursor.execute(sql)
+        self.cursor.execute(
+            "INSERT INTO pecas (id, nome, referencia, fabricante, preco_compra, preco_venda, quantidade_em_estoque) "
+            "VALUES (1, 'Filtro', 'F1', 'X', 10, 20, 0)")
+
+    def test_linhas_validas_somam_por_peca(self):
+        linhas, deltas = _validar_lote_entrada(
+            self.cursor, [{"peca_id": 1, "quantidade": 2}, {"peca_id": 1, "quantidade": 3}])
+        self.assertTrue(all(linha["ok"] for linha in linhas))
+        self.assertEqual(deltas, {1: 5})
+
+    def test_quantidade_bool_e_recusada(self):
+        linhas, deltas = _validar_lote_entrada(self.cursor, [{"peca_id": 1, "quantidade": True}])
+        self.assertFalse(linhas[0]["ok"])
+        self.assertEqual(deltas, {})
+
+    def test_peca_id_bool_e_recusado(self):
+        # True == 1: sem a verificação de tipo, a entrada iria para a peça 1.
+        linhas, deltas = _validar_lote_entrada(self.cursor, [{"peca_id": True, "quantidade": 2}])
+        self.assertFalse(linhas[0]["ok"])
+        self.assertEqual(deltas, {})
+
+    def test_quantidade_invalida(self):
+        for quantidade in (0, -1, 1.5, "2", None):
+            linhas, _ = _validar_lote_entrada(self.cursor, [{"peca_id": 1, "quantidade": quantidade}])
+            self.assertFalse(linhas[0]["ok"], quantidade)
+
+
+if __name__ == "__main__":
+    unittest.main()
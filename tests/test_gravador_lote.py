@@ -0,0 +1,101 @@
+# =================================================================================
+# TESTES DO GRAVADOR EM LOTE (gravador_lote.py)
+#
+# Executar na raiz do projeto: python -m pytest -q  (ou python -m unittest)
+# =================================================================================
+import os
+import sqlite3
+import tempfile
+import unittest
+from contextlib import contextmanager
+from unittest import mock
+
+from src.database import gravador_lote
+from src.database.database import CREATE_TABLES_SQL
+from src.database.gravador_lote import GravadorEmLote
+
+SQL_AUDITORIA = "INSERT INTO auditoria_logs (usuario_id, acao, detalhes, data_hora) VALUES (?, ?, ?, ?)"
+
+
+class TestGravadorEmLote(unittest.TestCase):
+
+    def setUp(self):
+        self._pasta = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self._pasta.name, "teste.db")
+        with self._conexao() as conn:
+            for sql in CREATE_TABLES_SQL:
+                conn.execute(sql)
+            conn.execute("INSERT INTO usuarios (id, nome, senha, perfil) VALUES (1, 'admin', 'x', 'admin')")
+        patcher = mock.patch.object(gravador_lote, "get_db_connection", self._conexao)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self._pasta.cleanup)
+
+    @contextmanager
+    def _conexao(self):
+        # Mesmo comportamento da conexão do pool: commit no fim, rollback em erro.
+        conn = sqlite3.connect(self.caminho)
+        conn.execute("PRAGMA foreign_keys = ON")
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _acoes_gravadas(self):
+        with self._conexao() as conn:
+            return [linha[0] for linha in conn.execute("SELECT acao FROM auditoria_logs ORDER BY id")]
+
+    def test_linha_invalida_nao_impede_as_validas(self):
+        gravador = GravadorEmLote("teste", SQL_AUDITORIA)
+        gravador.adicionar((1, "A", "", "2025-01-01 10:00:00"))
+        gravador.adicionar((999, "INVALIDA", "", "2025-01-01 10:00:01"))  # usuário inexistente (FK)
+        gravador.adicionar((None, "B", "", "2025-01-01 10:00:02"))
+        gravador.adicionar((1, "C", "", "2025-01-01 10:00:03"))
+        gravador.encerrar()
+
+        self.assertEqual(self._acoes_gravadas(), ["A", "B", "C"])
+        estatisticas = gravador.estatisticas()
+        self.assertEqual(estatisticas["pendentes"], 0)
+        self.assertEqual(estatisticas["gravadas"], 3)
+        self.assertEqual(estatisticas["descartadas"], 1)
+
+    def test_banco_ocupado_devolve_o_lote_e_descarta_apos_o_limite(self):
+        gravador = GravadorEmLote("teste", SQL_AUDITORIA)
+        gravador._parar.set()  # sem thread de fundo: as descargas são chamadas pelo teste
+        gravador.adicionar((1, "A", "", "2025-01-01 10:00:00"))
+
+        @contextmanager
+        def ocupado():
+            raise sqlite3.OperationalError("database is locked")
+            yield
+
+        with mock.patch.object(gravador_lote, "get_db_connection", ocupado):
+            for _ in range(gravador_lote.MAX_TENTATIVAS_OCUPADO):
+                self.assertEqual(gravador.descarregar(), 0)
+                self.assertEqual(gravador.pendentes, 1)
+            gravador.descarregar()
+
+        estatisticas = gravador.estatisticas()
+        self.assertEqual(estatisticas["pendentes"], 0)
+        self.assertEqual(estatisticas["descartadas"], 1)
+        self.assertEqual(self._acoes_gravadas(), [])
+
+    def test_banco_liberado_grava_o_lote_adiado(self):
+        gravador = GravadorEmLote("teste", SQL_AUDITORIA)
+        gravador._parar.set()
+        gravador.adicionar((1, "A", "", "2025-01-01 10:00:00"))
+
+        @contextmanager
+        def ocupado():
+            raise sqlite3.OperationalError("database is locked")
+            yield
+
+        with mock.patch.object(gravador_lote, "get_db_connection", ocupado):
+            gravador.descarregar()
+        self.assertEqual(gravador.descarregar(), 1)
+        self.assertEqual(self._acoes_gravadas(), ["A"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+# =================================================================================
+# TESTES DO MAPEADOR DE LINHAS (mapeador.py)
+#
+# Executar na raiz do projeto: python -m pytest -q  (ou python -m unittest)
+# =================================================================================
+import sqlite3
+import unittest
+
+from src.database.mapeador import mapear_linhas
+from src.models.models import MovimentacaoPeca
+
+
+class TestMapearLinhas(unittest.TestCase):
+
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        self.addCleanup(self.conn.close)
+        self.conn.execute("""
+            CREATE TABLE movimentacao_pecas (
+                id INTEGER PRIMARY KEY, peca_id INTEGER, data_movimentacao TEXT,
+                tipo_movimentacao TEXT, quantidade INTEGER, ordem_servico_id INTEGER,
+                valor_custo REAL, descricao TEXT)
+        """)
+        self.conn.execute(
+            "INSERT INTO movimentacao_pecas VALUES (1, 7, '2025-01-01', 'saida', 2, 30, 9.5, 'OS #30')")
+
+    def _mapear(self, colunas):
+        cursor = self.conn.execute(f"SELECT {colunas} FROM movimentacao_pecas")
+        movimentacao, = mapear_linhas(cursor, MovimentacaoPeca)
+        return movimentacao
+
+    def test_colunas_na_ordem_do_construtor(self):
+        m = self._mapear("id, peca_id, data_movimentacao, tipo_movimentacao, quantidade, "
+                         "ordem_servico_id, valor_custo, descricao")
+        self.assertEqual((m.ordem_servico_id, m.valor_custo, m.descricao), (30, 9.5, "OS #30"))
+
+    def test_opcional_ausente_no_meio_usa_o_padrao(self):
+        # ordem_servico_id e valor_custo ficam de fora; descricao vem logo após quantidade.
+        m = self._mapear("id, peca_id, data_movimentacao, tipo_movimentacao, quantidade, descricao")
+        self.assertEqual(m.quantidade, 2)
+        self.assertIsNone(m.ordem_servico_id)
+        self.assertIsNone(m.valor_custo)
+        self.assertEqual(m.descricao, "OS #30")
+
+    def test_colunas_fora_de_ordem_e_extras(self):
+        m = self._mapear("descricao, quantidade, 'x' AS apelido, tipo_movimentacao, "
+                         "data_movimentacao, peca_id, id")
+        self.assertEqual((m.id, m.peca_id, m.quantidade, m.descricao), (1, 7, 2, "OS #30"))
+        self.assertIsNone(m.ordem_servico_id)
+
+    def test_coluna_obrigatoria_ausente(self):
+        with self.assertRaises(ValueError):
+            self._mapear("id, peca_id, data_movimentacao, tipo_movimentacao")
+
+
+if __name__ == "__main__":
+    unittest.main()
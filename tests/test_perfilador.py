@@ -0,0 +1,48 @@
+# =================================================================================
+# TESTES DO PERFILADOR DE CONSULTAS (perfilador.py)
+#
+# Executar na raiz do projeto: python -m pytest -q  (ou python -m unittest)
+# =================================================================================
+import sqlite3
+import unittest
+
+from src.database.perfilador import (
+    PLANO_EXECUTEMANY_INDISPONIVEL, ConexaoPerfilada, perfilador_consultas)
+
+
+class TestExecutemanyPerfilado(unittest.TestCase):
+
+    def setUp(self):
+        ativo, limiar = perfilador_consultas.ativo, perfilador_consultas.limiar_lenta_ms
+        self.addCleanup(setattr, perfilador_consultas, "ativo", ativo)
+        self.addCleanup(setattr, perfilador_consultas, "limiar_lenta_ms", limiar)
+        self.addCleanup(perfilador_consultas.limpar)
+        # Limiar zero: todo comando entra no log de consultas lentas.
+        perfilador_consultas.limpar()
+        perfilador_consultas.ativar(limiar_lenta_ms=0)
+
+        self.conn = sqlite3.connect(":memory:", factory=ConexaoPerfilada)
+        self.addCleanup(self.conn.close)
+        self.conn.execute("CREATE TABLE pecas (id INTEGER PRIMARY KEY, estoque INTEGER NOT NULL)")
+        self.conn.executemany("INSERT INTO pecas (id, estoque) VALUES (?, 0)", [(1,), (2,), (3,)])
+        perfilador_consultas.limpar()
+
+    def test_plano_usa_o_primeiro_conjunto_de_parametros(self):
+        # Um gerador: o EXPLAIN não pode consumir as linhas da gravação.
+        self.conn.executemany("UPDATE pecas SET estoque = estoque + ? WHERE id = ?",
+                              ((10, peca_id) for peca_id in (1, 2, 3)))
+
+        lenta, = perfilador_consultas.consultas_lentas()
+        self.assertEqual(lenta["linhas"], 3)
+        self.assertTrue(any("pecas" in passo for passo in lenta["plano"]), lenta["plano"])
+        self.assertEqual(self.conn.execute("SELECT SUM(estoque) FROM pecas").fetchone()[0], 30)
+
+    def test_sequencia_vazia_e_marcada_sem_plano(self):
+        self.conn.executemany("UPDATE pecas SET estoque = ? WHERE id = ?", [])
+
+        lenta, = perfilador_consultas.consultas_lentas()
+        self.assertEqual(lenta["plano"], PLANO_EXECUTEMANY_INDISPONIVEL)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+# =================================================================================
+# TESTES DOS ÍNDICES DE BUSCA TEXTUAL (search_index.py)
+#
+# Executar na raiz do projeto: python -m pytest -q  (ou python -m unittest)
+# =================================================================================
+import sqlite3
+import unittest
+from unittest import mock
+
+from src.database import search_index
+from src.database.database import CREATE_TABLES_SQL
+from src.database.search_index import criar_indices_busca
+
+
+class TestCriarIndicesBusca(unittest.TestCase):
+
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        self.addCleanup(self.conn.close)
+        self.cursor = self.conn.cursor()
+        for sql in CREATE_TABLES_SQL:
+            self.cursor.execute(sql)
+        self.cursor.execute("INSERT INTO clientes (nome, telefone) VALUES ('João da Silva', '1199')")
+        if not criar_indices_busca(self.cursor):
+            self.skipTest("SQLite sem o módulo FTS5.")
+
+    def _buscar_clientes(self, termo):
+        return [linha[0] for linha in self.cursor.execute(
+            "SELECT nome FROM clientes_fts WHERE clientes_fts MATCH ?", (f'"{termo}"*',))]
+
+    def _versao_gravada(self):
+        return self.cursor.execute("SELECT versao FROM indices_busca_versao").fetchone()[0]
+
+    def test_primeira_criacao_repovoa_e_grava_a_versao(self):
+        self.assertEqual(self._buscar_clientes("joao"), ["João da Silva"])
+        self.assertEqual(self._versao_gravada(), search_index.VERSAO_INDICES_BUSCA)
+
+    def test_mesma_versao_nao_reconstroi(self):
+        # Sem trigger, o índice não acompanha a inclusão; só uma reconstrução a veria.
+        self.cursor.execute("DROP TRIGGER clientes_fts_ai")
+        self.cursor.execute("INSERT INTO clientes (nome, telefone) VALUES ('Maria', '1188')")
+        with mock.patch.object(search_index, "_remover_indices_busca") as remover:
+            criar_indices_busca(self.cursor)
+        remover.assert_not_called()
+        self.assertEqual(self._buscar_clientes("maria"), [])
+
+    def test_nova_versao_recria_triggers_e_repovoa(self):
+        self.cursor.execute("DROP TRIGGER clientes_fts_ai")
+        self.cursor.execute("INSERT INTO clientes (nome, telefone) VALUES ('Maria', '1188')")
+        nova_versao = search_index.VERSAO_INDICES_BUSCA + 1
+        with mock.patch.object(search_index, "VERSAO_INDICES_BUSCA", nova_versao):
+            criar_indices_busca(self.cursor)
+
+        self.assertEqual(self._buscar_clientes("maria"), ["Maria"])
+        self.assertEqual(self._buscar_clientes("joao"), ["João da Silva"])
+        self.assertEqual(self._versao_gravada(), nova_versao)
+        # O trigger removido voltou a existir.
+        self.cursor.execute("INSERT INTO clientes (nome, telefone) VALUES ('Pedro', '1177')")
+        self.assertEqual(self._buscar_clientes("pedro"), ["Pedro"])
+
+    def test_sqlite_sem_suporte_usa_like_e_remove_os_triggers(self):
+        # Ex.: SQLite anterior ao 3.27 rejeita 'remove_diacritics 2' com
+        # "error in tokenizer constructor".
+        with mock.patch.object(search_index, "_OPCOES_FTS", "tokenize = 'tokenizador_inexistente'"):
+            self.assertFalse(criar_indices_busca(self.cursor))
+        self.assertFalse(search_index.fts_disponivel())
+        self.assertEqual(self.cursor.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE '%_fts_%'").fetchone()[0], 0)
+        self.assertIsNone(self.cursor.execute("SELECT versao FROM indices_busca_versao").fetchone())
+
+        # Com o FTS5 de volta, os índices são recriados.
+        self.cursor.execute("INSERT INTO clientes (nome, telefone) VALUES ('Maria', '1188')")
+        self.assertTrue(criar_indices_busca(self.cursor))
+        self.assertEqual(self._buscar_clientes("maria"), ["Maria"])
+
+
+
+if __name__ == "__main__":
+    unittest.main()